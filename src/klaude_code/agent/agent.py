@@ -3,6 +3,7 @@ from __future__ import annotations
 from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable
 
 from klaude_code.agent.agent_profile import AgentProfile, ModelProfileProvider
+from klaude_code.agent.compaction import SpeculativeCompactor
 from klaude_code.agent.task import SessionContext, TaskExecutionContext, TaskExecutor
 from klaude_code.llm import LLMClientABC
 from klaude_code.log import DebugType, log_debug
@@ -37,6 +38,11 @@ class Agent:
         self.session: Session = session
         self.profile: AgentProfile = profile
         self.compact_llm_client: LLMClientABC | None = compact_llm_client
+        # Threshold compaction only runs for the main agent; it outlives tasks so a
+        # summary started near the end of one task can be committed by the next.
+        self.speculative_compaction: SpeculativeCompactor | None = (
+            SpeculativeCompactor() if session.sub_agent_state is None else None
+        )
         self._current_task: TaskExecutor | None = None
         self._follow_up_queue: list[QueuedUserInput] = list(session.follow_up_queue)
         # Head popped by begin_follow_up but not yet confirmed durable by
@@ -204,6 +210,7 @@ class Agent:
             sub_agent_state=self.session.sub_agent_state,
             compact_llm_client=self.compact_llm_client,
             apply_llm_client_change=self._apply_llm_client_change,
+            speculative_compaction=self.speculative_compaction,
         )
 
         task = TaskExecutor(context)
@@ -215,6 +222,11 @@ class Agent:
         finally:
             self._current_task = None
 
+    def cancel_background_work(self) -> None:
+        """Cancel work that outlives tasks; called when the session is released."""
+        if self.speculative_compaction is not None:
+            self.speculative_compaction.cancel()
+
     async def replay_history(self) -> AsyncGenerator[events.Event]:
         """Yield UI events reconstructed from saved conversation history."""
 
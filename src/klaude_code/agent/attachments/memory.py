@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import threading
+import time
 from collections.abc import Callable
 from pathlib import Path
+from typing import NamedTuple
 
 from pydantic import BaseModel
 
 from klaude_code.const import (
     ATTACHMENT_MEMORY_MAX_BYTES_PER_FILE,
     ATTACHMENT_MEMORY_MAX_LINES,
+    DISCOVERY_CACHE_RACY_WINDOW_NS,
     ProjectPaths,
     find_git_repo_root,
     project_key_from_path,
@@ -48,7 +52,40 @@ class Memory(BaseModel):
     content: str
 
 
-def _get_memory_path(directory: Path) -> Path | None:
+class _CachedMemoryDir(NamedTuple):
+    mtime_ns: int
+    memory_path: Path | None
+
+
+class _CachedSearchDirs(NamedTuple):
+    signature: tuple[int, int, int]
+    dirs: tuple[Path, ...]
+
+
+class _CachedMemoryText(NamedTuple):
+    signature: tuple[int, int, int]
+    text: str
+
+
+# Shared by every session and sub-agent in the process. A directory's memory
+# file is re-probed only when the directory's mtime changes (creating,
+# deleting or renaming an entry bumps it); file text is re-read only when its
+# (mtime_ns, size, inode) signature changes.
+_memory_dir_cache: dict[Path, _CachedMemoryDir] = {}
+_search_dirs_cache: dict[tuple[Path, str], _CachedSearchDirs] = {}
+_memory_text_cache: dict[Path, _CachedMemoryText] = {}
+_memory_cache_lock = threading.Lock()
+
+
+def clear_memory_discovery_cache() -> None:
+    """Drop cached memory-file lookups and contents."""
+    with _memory_cache_lock:
+        _memory_dir_cache.clear()
+        _search_dirs_cache.clear()
+        _memory_text_cache.clear()
+
+
+def _find_memory_file(directory: Path) -> Path | None:
     for file_name in MEMORY_FILE_NAMES:
         memory_path = directory / file_name
         if memory_path.exists() and memory_path.is_file():
@@ -56,6 +93,40 @@ def _get_memory_path(directory: Path) -> Path | None:
     return None
 
 
+def _get_memory_path(directory: Path) -> Path | None:
+    cacheable_before = time.time_ns() - DISCOVERY_CACHE_RACY_WINDOW_NS
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _memory_dir_cache.get(directory)
+    if cached is not None and cached.mtime_ns == mtime_ns:
+        return cached.memory_path
+
+    memory_path = _find_memory_file(directory)
+    if mtime_ns < cacheable_before:
+        with _memory_cache_lock:
+            _memory_dir_cache[directory] = _CachedMemoryDir(mtime_ns, memory_path)
+    return memory_path
+
+
+def _read_memory_text(memory_path: Path) -> str:
+    """Read a memory file, reusing the cached text while its stat signature is unchanged."""
+    cacheable_before = time.time_ns() - DISCOVERY_CACHE_RACY_WINDOW_NS
+    stat = memory_path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    cached = _memory_text_cache.get(memory_path)
+    if cached is not None and cached.signature == signature:
+        return cached.text
+
+    text = memory_path.read_text(encoding="utf-8", errors="replace")
+    if stat.st_mtime_ns < cacheable_before:
+        with _memory_cache_lock:
+            _memory_text_cache[memory_path] = _CachedMemoryText(signature, text)
+    return text
+
+
 def _fmt_memory_truncated(budget_bytes: int) -> str:
     return MEMORY_TRUNCATED_TEMPLATE.format(budget_bytes=budget_bytes)
 
@@ -181,6 +252,53 @@ def truncate_memory_content(text: str, path: str) -> str:
     return result
 
 
+def _resolve_memory_search_dirs(path_str: str, *, work_dir: Path) -> tuple[Path, ...]:
+    path = Path(path_str)
+    full_path = (work_dir / path).resolve() if not path.is_absolute() else path.resolve()
+    try:
+        _ = full_path.relative_to(work_dir)
+    except ValueError:
+        return ()
+
+    deepest_dir = full_path if full_path.is_dir() else full_path.parent
+    try:
+        rel_parts = deepest_dir.relative_to(work_dir).parts
+    except ValueError:
+        return ()
+
+    dirs: list[Path] = []
+    current_dir = work_dir
+    for part in rel_parts:
+        current_dir = current_dir / part
+        dirs.append(current_dir)
+    return tuple(dirs)
+
+
+def _memory_search_dirs(path_str: str, *, work_dir: Path) -> tuple[Path, ...]:
+    """Return the directories below *work_dir* leading to an accessed path.
+
+    Resolving the path costs an lstat per component; the result is reused
+    while a single stat still finds the same file, so repointed symlinks or
+    a replaced file invalidate it.
+    """
+    path = Path(path_str)
+    try:
+        stat = (work_dir / path).stat()
+    except OSError:
+        return _resolve_memory_search_dirs(path_str, work_dir=work_dir)
+
+    key = (work_dir, path_str)
+    signature = (stat.st_dev, stat.st_ino, stat.st_mode)
+    cached = _search_dirs_cache.get(key)
+    if cached is not None and cached.signature == signature:
+        return cached.dirs
+
+    dirs = _resolve_memory_search_dirs(path_str, work_dir=work_dir)
+    with _memory_cache_lock:
+        _search_dirs_cache[key] = _CachedSearchDirs(signature, dirs)
+    return dirs
+
+
 def discover_memory_files_near_paths(
     paths: list[str],
     *,
@@ -196,22 +314,7 @@ def discover_memory_files_near_paths(
     seen_resolved: set[Path] = set()
 
     for path_str in paths:
-        path = Path(path_str)
-        full_path = (work_dir / path).resolve() if not path.is_absolute() else path.resolve()
-        try:
-            _ = full_path.relative_to(work_dir)
-        except ValueError:
-            continue
-
-        deepest_dir = full_path if full_path.is_dir() else full_path.parent
-        try:
-            rel_parts = deepest_dir.relative_to(work_dir).parts
-        except ValueError:
-            continue
-
-        current_dir = work_dir
-        for part in rel_parts:
-            current_dir = current_dir / part
+        for current_dir in _memory_search_dirs(path_str, work_dir=work_dir):
             if current_dir in seen_dirs:
                 continue
             seen_dirs.add(current_dir)
@@ -228,8 +331,7 @@ def discover_memory_files_near_paths(
                 if is_memory_loaded(memory_path_str):
                     continue
                 try:
-                    text = memory_path.read_text(encoding="utf-8", errors="replace")
-                    text = truncate_memory_content(text, memory_path_str)
+                    text = truncate_memory_content(_read_memory_text(memory_path), memory_path_str)
                 except (PermissionError, UnicodeDecodeError, OSError):
                     continue
                 mark_memory_loaded(memory_path_str)
@@ -260,10 +362,10 @@ def get_claude_code_auto_memory_path(work_dir: Path) -> Path:
 
 
 def _load_auto_memory_file(memory_path: Path) -> Memory | None:
-    if not memory_path.exists() or not memory_path.is_file():
+    if not memory_path.is_file():
         return None
     try:
-        text = memory_path.read_text(encoding="utf-8", errors="replace")
+        text = _read_memory_text(memory_path)
     except (PermissionError, UnicodeDecodeError, OSError):
         return None
     lines = text.splitlines()
@@ -321,10 +423,11 @@ async def memory_attachment(session: Session) -> message.DeveloperMessage | None
     remaining_budget = MEMORY_MAX_SESSION_BYTES - session_bytes
     for memory_path, instruction in get_memory_paths(work_dir=session.work_dir):
         path_str = str(memory_path)
-        if not (memory_path.exists() and memory_path.is_file()) or is_memory_loaded(session, path_str):
+        # get_memory_paths only returns files that existed when their directory was last probed.
+        if is_memory_loaded(session, path_str):
             continue
         try:
-            text = truncate_memory_content(memory_path.read_text(encoding="utf-8", errors="replace"), path_str)
+            text = truncate_memory_content(_read_memory_text(memory_path), path_str)
             text_bytes = len(text.encode("utf-8"))
             if text_bytes > remaining_budget:
                 if remaining_budget > 256:
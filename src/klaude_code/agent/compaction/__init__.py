@@ -3,17 +3,22 @@ from .compaction import (
     CompactionReason,
     CompactionResult,
     autocompact_reserve_tokens,
+    plan_compaction_cut,
     run_compaction,
     should_compact_threshold,
 )
 from .overflow import is_context_overflow
+from .speculative import SpeculativeCompactionStats, SpeculativeCompactor
 
 __all__ = [
     "CompactionConfig",
     "CompactionReason",
     "CompactionResult",
+    "SpeculativeCompactionStats",
+    "SpeculativeCompactor",
     "autocompact_reserve_tokens",
     "is_context_overflow",
+    "plan_compaction_cut",
     "run_compaction",
     "should_compact_threshold",
 ]
@@ -6,7 +6,7 @@ import re
 from collections.abc import Sequence
 from dataclasses import dataclass
 from enum import Enum
-from typing import cast
+from typing import NamedTuple, cast
 
 from klaude_code.agent.agent_profile import AgentProfile
 from klaude_code.agent.cache_safe import (
@@ -15,15 +15,20 @@ from klaude_code.agent.cache_safe import (
     build_fork_cache_event,
     is_cache_sharable,
 )
+from klaude_code.agent.token_estimate import MessageTokenCache
 from klaude_code.const import (
+    COMPACTION_SEGMENT_CONCURRENCY,
     DEFAULT_MAX_TOKENS,
 )
 from klaude_code.llm import LLMClientABC
+from klaude_code.log import DebugType, log_debug
 from klaude_code.prompts.compaction import (
     COMPACT_FORK_PROMPT,
     COMPACT_FORK_UPDATE_PROMPT,
     COMPACTION_CONTINUATION_INSTRUCTION,
     COMPACTION_SUMMARY_PREFIX,
+    SEGMENT_SUMMARIES_HEADER,
+    SEGMENT_SUMMARIZATION_PROMPT,
     SUMMARIZATION_PROMPT,
     SUMMARIZATION_SYSTEM_PROMPT,
     TASK_PREFIX_SUMMARIZATION_PROMPT,
@@ -36,6 +41,7 @@ from klaude_code.session.session import Session
 _MAX_TOOL_OUTPUT_CHARS = 4000
 _MAX_TOOL_CALL_CHARS = 2000
 _DEFAULT_IMAGE_TOKENS = 1200
+_DEFAULT_SEGMENT_TOKENS = 64_000
 _SYSTEM_REMINDER_RE = re.compile(r"<system-reminder>.*?</system-reminder>", re.DOTALL)
 _CONSTRAINTS_SECTION_RE = re.compile(r"(?ms)^(## Constraints & Preferences\s*\n)(.*?)(?=^## |\Z)")
 _SUMMARY_INSTRUCTION_LEAK_MARKERS = (
@@ -65,6 +71,8 @@ class CompactionConfig:
     reserve_tokens: int
     keep_recent_tokens: int
     max_summary_tokens: int
+    segment_tokens: int = _DEFAULT_SEGMENT_TOKENS
+    """Serialized conversation one summarizer call takes; larger prefixes are summarized in segments."""
 
 
 @dataclass(frozen=True)
@@ -137,19 +145,35 @@ def _resolve_compaction_config(
     # Summary budget stays capped at the legacy reserve scale; the reserve
     # itself now scales to a large fraction of the window.
     max_summary = max(1024, int(min(reserve, default_reserve) * 0.8))
-    return CompactionConfig(reserve_tokens=reserve, keep_recent_tokens=keep_recent, max_summary_tokens=max_summary)
+    # Half the summarizer's input window leaves room for prompts and for the
+    # chars/4 estimate undercounting dense text.
+    segment = _DEFAULT_SEGMENT_TOKENS if context_limit <= 0 else max(4096, (context_limit - max_summary) // 2)
+    return CompactionConfig(
+        reserve_tokens=reserve,
+        keep_recent_tokens=keep_recent,
+        max_summary_tokens=max_summary,
+        segment_tokens=segment,
+    )
 
 
-def should_compact_threshold(
+class ThresholdUsage(NamedTuple):
+    tokens: int
+    """Current LLM-facing context size, measured or estimated."""
+    trigger: int
+    """Context size at which threshold compaction fires."""
+
+
+def threshold_usage(
     *,
     session: Session,
     config: CompactionConfig | None,
     llm_config: llm_param.LLMConfigParameter,
-) -> bool:
+) -> ThresholdUsage | None:
+    """Return current context usage against the compaction trigger, or None if unknown."""
     compaction_config = config or _resolve_compaction_config(llm_config)
     context_limit = llm_config.context_limit or _get_last_context_limit(session)
     if context_limit is None:
-        return False
+        return None
 
     max_tokens = llm_config.max_tokens
     if max_tokens is None:
@@ -158,7 +182,7 @@ def should_compact_threshold(
         max_tokens = DEFAULT_MAX_TOKENS
     effective_context_limit = context_limit - max_tokens
     if effective_context_limit <= 0:
-        return False
+        return None
 
     tokens_before = get_last_context_tokens(session)
     if tokens_before is None:
@@ -169,7 +193,17 @@ def should_compact_threshold(
         tokens_before = estimate_history_tokens(session.get_llm_history())
     else:
         tokens_before += _estimate_tokens_after_last_successful_usage(session)
-    return tokens_before >= effective_context_limit - compaction_config.reserve_tokens
+    return ThresholdUsage(tokens=tokens_before, trigger=effective_context_limit - compaction_config.reserve_tokens)
+
+
+def should_compact_threshold(
+    *,
+    session: Session,
+    config: CompactionConfig | None,
+    llm_config: llm_param.LLMConfigParameter,
+) -> bool:
+    usage = threshold_usage(session=session, config=config, llm_config=llm_config)
+    return usage is not None and usage.tokens >= usage.trigger
 
 
 def _has_compaction_after_last_successful_usage(session: Session) -> bool:
@@ -226,7 +260,13 @@ async def run_compaction(
     llm_config: llm_param.LLMConfigParameter,
     cancel: asyncio.Event | None = None,
     main_profile: AgentProfile | None = None,
+    cut_index: int | None = None,
 ) -> CompactionResult:
+    """Summarize history before the cut index into a ``CompactionResult``.
+
+    ``cut_index`` pins the boundary to one planned earlier with
+    ``plan_compaction_cut``; by default it is planned from the current history.
+    """
     if cancel is not None and cancel.is_set():
         raise asyncio.CancelledError
 
@@ -237,8 +277,10 @@ async def run_compaction(
     _, last_compaction = _find_last_compaction(history)
     base_start_index = last_compaction.first_kept_index if last_compaction else 0
 
-    cut_index = _find_cut_index(history, base_start_index, compaction_config.keep_recent_tokens)
-    cut_index = _adjust_cut_index(history, cut_index, base_start_index)
+    if cut_index is None:
+        cut_index = _plan_cut_index(history, base_start_index, compaction_config)
+    elif cut_index > len(history):
+        raise ValueError("Planned cut index is past the end of history")
 
     if cut_index <= base_start_index:
         raise ValueError("Nothing to compact (session too small)")
@@ -330,6 +372,30 @@ async def run_compaction(
     )
 
 
+def plan_compaction_cut(
+    *,
+    session: Session,
+    llm_config: llm_param.LLMConfigParameter,
+    reason: CompactionReason = CompactionReason.THRESHOLD,
+) -> int:
+    """Return the history index ``run_compaction`` would currently cut at.
+
+    Items before the index are summarized; a value at or below the previous
+    compaction's first kept index means there is nothing to compact yet.
+    """
+    history = session.conversation_history
+    _, last_compaction = _find_last_compaction(history)
+    base_start_index = last_compaction.first_kept_index if last_compaction else 0
+    return _plan_cut_index(history, base_start_index, _resolve_compaction_config(llm_config, reason=reason))
+
+
+def _plan_cut_index(
+    history: list[message.HistoryEvent], base_start_index: int, compaction_config: CompactionConfig
+) -> int:
+    cut_index = _find_cut_index(history, base_start_index, compaction_config.keep_recent_tokens)
+    return _adjust_cut_index(history, cut_index, base_start_index)
+
+
 async def _build_summary_fork(
     *,
     session: Session,
@@ -784,7 +850,7 @@ async def _generate_summary(
     cancel: asyncio.Event | None,
     session_id: str,
 ) -> str:
-    serialized = serialize_conversation(messages_to_summarize)
+    serialized = await _serialize_for_summarizer(messages_to_summarize, llm_client, config, cancel, session_id)
     parts: list[message.Part] = [
         message.TextPart(text=f"<conversation>\n{serialized}\n</conversation>"),
     ]
@@ -818,7 +884,7 @@ async def _generate_task_prefix_summary(
     cancel: asyncio.Event | None,
     session_id: str,
 ) -> str:
-    serialized = serialize_conversation(messages)
+    serialized = await _serialize_for_summarizer(messages, llm_client, config, cancel, session_id)
     return await _call_summarizer(
         input=[
             message.UserMessage(
@@ -835,6 +901,129 @@ async def _generate_task_prefix_summary(
     )
 
 
+async def _serialize_for_summarizer(
+    messages: list[message.Message],
+    llm_client: LLMClientABC,
+    config: CompactionConfig,
+    cancel: asyncio.Event | None,
+    session_id: str,
+) -> str:
+    """Serialize ``messages`` for one summarizer call, condensing them first if they do not fit.
+
+    Oversized conversations are split into segments along turn boundaries and
+    summarized concurrently (map); the caller's summarizer call then merges the
+    segment summaries (reduce). Segment summaries that still do not fit are
+    folded again the same way.
+    """
+    serialized = serialize_conversation(messages)
+    if _text_tokens(serialized) <= config.segment_tokens:
+        return serialized
+
+    segments = [serialize_conversation(segment) for segment in _split_segments(messages, config.segment_tokens)]
+    summaries = await _summarize_segments(segments, llm_client, config, cancel, session_id)
+    while len(summaries) > 1:
+        joined = _join_segment_summaries(summaries)
+        if _text_tokens(joined) <= config.segment_tokens:
+            break
+        groups = _pack([_text_tokens(summary) for summary in summaries], config.segment_tokens)
+        if len(groups) == len(summaries):
+            break
+        folded = ["\n\n".join(summaries[group.start : group.stop]) for group in groups]
+        summaries = await _summarize_segments(folded, llm_client, config, cancel, session_id)
+    log_debug(
+        f"[Compact] summarized {len(messages)} messages in {len(segments)} segments",
+        debug_type=DebugType.RESPONSE,
+    )
+    return f"{SEGMENT_SUMMARIES_HEADER}\n\n{_join_segment_summaries(summaries)}"
+
+
+def _split_segments(messages: list[message.Message], budget: int) -> list[list[message.Message]]:
+    """Pack whole turns into segments of at most ``budget`` tokens.
+
+    A turn starts at a user message. Turns larger than the budget are split
+    between messages; a single message larger than the budget gets a segment
+    of its own.
+    """
+    turns: list[list[message.Message]] = []
+    for msg in messages:
+        if not turns or isinstance(msg, message.UserMessage):
+            turns.append([])
+        turns[-1].append(msg)
+
+    units: list[list[message.Message]] = []
+    unit_tokens: list[int] = []
+    for turn in turns:
+        message_tokens = [_text_tokens(serialize_conversation([msg])) for msg in turn]
+        if sum(message_tokens) <= budget:
+            units.append(turn)
+            unit_tokens.append(sum(message_tokens))
+        else:
+            units.extend([msg] for msg in turn)
+            unit_tokens.extend(message_tokens)
+    return [[msg for unit in units[group.start : group.stop] for msg in unit] for group in _pack(unit_tokens, budget)]
+
+
+def _pack(sizes: list[int], budget: int) -> list[range]:
+    """Greedily group consecutive items so each group's total stays within ``budget``."""
+    groups: list[range] = []
+    start = 0
+    total = 0
+    for index, size in enumerate(sizes):
+        if index > start and total + size > budget:
+            groups.append(range(start, index))
+            start = index
+            total = 0
+        total += size
+    if start < len(sizes):
+        groups.append(range(start, len(sizes)))
+    return groups
+
+
+async def _summarize_segments(
+    segments: list[str],
+    llm_client: LLMClientABC,
+    config: CompactionConfig,
+    cancel: asyncio.Event | None,
+    session_id: str,
+) -> list[str]:
+    semaphore = asyncio.Semaphore(max(1, COMPACTION_SEGMENT_CONCURRENCY))
+
+    async def _summarize(index: int, serialized: str) -> str:
+        async with semaphore:
+            prompt = SEGMENT_SUMMARIZATION_PROMPT.format(index=index + 1, total=len(segments))
+            return await _call_summarizer(
+                input=[
+                    message.UserMessage(
+                        parts=[
+                            message.TextPart(text=f"<conversation>\n{serialized}\n</conversation>\n\n"),
+                            message.TextPart(text=prompt),
+                        ]
+                    )
+                ],
+                llm_client=llm_client,
+                max_tokens=config.max_summary_tokens,
+                cancel=cancel,
+                session_id=session_id,
+            )
+
+    tasks = [asyncio.ensure_future(_summarize(index, serialized)) for index, serialized in enumerate(segments)]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def _join_segment_summaries(summaries: list[str]) -> str:
+    total = len(summaries)
+    return "\n\n".join(f"[Segment {index} of {total}]:\n{summary}" for index, summary in enumerate(summaries, start=1))
+
+
+def _text_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
 async def _call_summarizer(
     *,
     input: list[message.Message],
@@ -967,6 +1156,10 @@ def estimate_history_tokens(history: list[message.HistoryEvent]) -> int:
 
 
 def _estimate_tokens(msg: message.Message) -> int:
+    return _token_cache(msg)
+
+
+def _estimate_chars_tokens(msg: message.Message) -> int:
     chars = 0
     if isinstance(msg, message.UserMessage):
         chars = sum(len(part.text) for part in msg.parts if isinstance(part, message.TextPart))
@@ -985,6 +1178,10 @@ def _estimate_tokens(msg: message.Message) -> int:
     return max(1, (chars + 3) // 4)
 
 
+# Threshold checks run before every step and rescan the whole LLM-facing history.
+_token_cache = MessageTokenCache(_estimate_chars_tokens)
+
+
 def _count_image_tokens(parts: list[message.Part]) -> int:
     count = sum(1 for part in parts if isinstance(part, (message.ImageURLPart, message.ImageFilePart)))
     return count * _DEFAULT_IMAGE_TOKENS
@@ -0,0 +1,254 @@
+"""Speculative threshold compaction.
+
+Threshold compaction blocks the task while the summarizer runs. Once context
+usage crosses a lower watermark, ``SpeculativeCompactor`` plans the cut the
+threshold would use and summarizes that prefix in a background task. When the
+threshold arrives, the ready summary is committed if the history before the
+cut is still exactly what was summarized, and discarded otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, replace
+
+from klaude_code.agent.agent_profile import AgentProfile
+from klaude_code.const import SPECULATIVE_COMPACTION_MAX_RUNS, SPECULATIVE_COMPACTION_WATERMARK_PERCENT
+from klaude_code.llm import LLMClientABC
+from klaude_code.log import DebugType, log_debug
+from klaude_code.protocol import llm_param, message
+from klaude_code.session.session import Session
+
+from .compaction import (
+    CompactionReason,
+    CompactionResult,
+    collect_kept_items_brief,
+    estimate_history_tokens,
+    get_last_context_tokens,
+    plan_compaction_cut,
+    run_compaction,
+    threshold_usage,
+)
+
+
+@dataclass
+class SpeculativeCompactionStats:
+    started: int = 0
+    committed: int = 0
+    discarded: int = 0
+    failed: int = 0
+    saved_s: float = 0.0
+    """Summarizer time the task did not block on, summed over committed runs."""
+
+    @property
+    def hit_rate(self) -> float:
+        finished = self.committed + self.discarded + self.failed
+        return self.committed / finished if finished else 0.0
+
+
+@dataclass
+class _SpeculativeRun:
+    task: asyncio.Task[CompactionResult]
+    cut_index: int
+    prefix: list[message.HistoryEvent]
+    """Snapshot of ``history[:cut_index]``; compared by identity before committing."""
+    last_compaction: message.CompactionEntry | None
+    started_at: float
+    finished_at: float | None = None
+
+
+def _last_compaction(history: list[message.HistoryEvent]) -> message.CompactionEntry | None:
+    for item in reversed(history):
+        if isinstance(item, message.CompactionEntry):
+            return item
+    return None
+
+
+class SpeculativeCompactor:
+    """Runs at most one background summary per session ahead of the compaction threshold.
+
+    Owned by the main agent so a run started late in one task can be committed
+    by the next. Each compaction cycle may start ``max_runs`` summaries; a run
+    whose prefix was rewritten (rewind, retraction, another compaction) is
+    cancelled and counts against that budget.
+    """
+
+    def __init__(
+        self,
+        *,
+        watermark_percent: int = SPECULATIVE_COMPACTION_WATERMARK_PERCENT,
+        max_runs: int = SPECULATIVE_COMPACTION_MAX_RUNS,
+    ) -> None:
+        self.stats = SpeculativeCompactionStats()
+        self._watermark_percent = watermark_percent
+        self._max_runs = max_runs
+        self._runs_this_cycle = 0
+        self._run: _SpeculativeRun | None = None
+
+    @property
+    def pending(self) -> bool:
+        return self._run is not None
+
+    def maybe_start(
+        self,
+        *,
+        session: Session,
+        llm_config: llm_param.LLMConfigParameter,
+        llm_client: LLMClientABC,
+        main_profile: AgentProfile | None,
+    ) -> bool:
+        """Start a background summary if usage is between the watermark and the threshold.
+
+        ``llm_config`` is the main model's config the threshold is measured
+        against; ``llm_client`` is the client that would run the compaction.
+        """
+        if self._watermark_percent <= 0:
+            return False
+        run = self._run
+        if run is not None:
+            if run.task.done() and (run.task.cancelled() or run.task.exception() is not None):
+                self._drop_failed(run)
+            elif self._is_current(run, session.conversation_history):
+                return False
+            else:
+                self._discard(run, "history before the cut changed")
+        if self._runs_this_cycle >= self._max_runs:
+            return False
+
+        usage = threshold_usage(session=session, config=None, llm_config=llm_config)
+        if usage is None or usage.tokens >= usage.trigger:
+            return False
+        if usage.tokens * 100 < usage.trigger * self._watermark_percent:
+            return False
+
+        history = session.conversation_history
+        compact_config = llm_client.get_llm_config()
+        cut_index = plan_compaction_cut(session=session, llm_config=compact_config)
+        last_compaction = _last_compaction(history)
+        if cut_index <= (last_compaction.first_kept_index if last_compaction else 0):
+            return False
+
+        task = asyncio.create_task(
+            run_compaction(
+                session=session,
+                reason=CompactionReason.THRESHOLD,
+                focus=None,
+                llm_client=llm_client,
+                llm_config=compact_config,
+                main_profile=main_profile,
+                cut_index=cut_index,
+            )
+        )
+        run = _SpeculativeRun(
+            task=task,
+            cut_index=cut_index,
+            prefix=history[:cut_index],
+            last_compaction=last_compaction,
+            started_at=time.perf_counter(),
+        )
+        task.add_done_callback(lambda _task: self._on_done(run))
+        self._run = run
+        self._runs_this_cycle += 1
+        self.stats.started += 1
+        log_debug(
+            f"[Compact:speculative] start cut={cut_index} tokens={usage.tokens} trigger={usage.trigger}",
+            debug_type=DebugType.RESPONSE,
+        )
+        return True
+
+    async def take(self, *, session: Session, llm_config: llm_param.LLMConfigParameter) -> CompactionResult | None:
+        """Return the speculative result for the threshold compaction, or None to compact normally.
+
+        Waits for a run that is still summarizing; an interrupt while waiting
+        leaves the run in place for the next threshold check.
+        """
+        self._runs_this_cycle = 0
+        run = self._run
+        if run is None:
+            return None
+        if not self._is_current(run, session.conversation_history):
+            self._discard(run, "history before the cut changed")
+            return None
+
+        requested_at = time.perf_counter()
+        try:
+            result = await asyncio.shield(run.task)
+        except asyncio.CancelledError:
+            if not run.task.cancelled():
+                raise
+            self._drop_failed(run)
+            return None
+        except Exception:
+            self._drop_failed(run)
+            return None
+        self._run = None
+
+        history = session.conversation_history
+        if not self._is_current(run, history):
+            self._discard(run, "history before the cut changed")
+            return None
+        usage = threshold_usage(session=session, config=None, llm_config=llm_config)
+        summary_message = message.UserMessage(parts=[message.TextPart(text=result.summary)])
+        kept_tokens = estimate_history_tokens([summary_message, *history[run.cut_index :]])
+        if usage is not None and kept_tokens >= usage.trigger:
+            self._discard(run, "kept tail alone reaches the threshold")
+            return None
+
+        tokens_before = get_last_context_tokens(session)
+        if tokens_before is None:
+            tokens_before = estimate_history_tokens(history)
+        finished_at = run.finished_at if run.finished_at is not None else requested_at
+        saved_s = min(finished_at, requested_at) - run.started_at
+        self.stats.committed += 1
+        self.stats.saved_s += saved_s
+        log_debug(
+            f"[Compact:speculative] commit cut={run.cut_index} saved={saved_s:.2f}s "
+            f"hit_rate={self.stats.hit_rate:.0%} total_saved={self.stats.saved_s:.1f}s",
+            debug_type=DebugType.RESPONSE,
+        )
+        return replace(
+            result,
+            tokens_before=tokens_before,
+            kept_items_brief=collect_kept_items_brief(history, run.cut_index),
+        )
+
+    def cancel(self) -> None:
+        """Cancel the pending run, e.g. when the session is released."""
+        if self._run is not None:
+            self._discard(self._run, "cancelled")
+
+    def _is_current(self, run: _SpeculativeRun, history: list[message.HistoryEvent]) -> bool:
+        if len(history) < run.cut_index:
+            return False
+        if _last_compaction(history) is not run.last_compaction:
+            return False
+        return all(current is snapshot for current, snapshot in zip(history, run.prefix, strict=False))
+
+    def _on_done(self, run: _SpeculativeRun) -> None:
+        run.finished_at = time.perf_counter()
+        if run.task.cancelled():
+            return
+        error = run.task.exception()
+        if error is not None:
+            log_debug(
+                "[Compact:speculative] error",
+                error.__class__.__name__,
+                str(error),
+                debug_type=DebugType.RESPONSE,
+            )
+
+    def _discard(self, run: _SpeculativeRun, reason: str) -> None:
+        run.task.cancel()
+        if self._run is run:
+            self._run = None
+        self.stats.discarded += 1
+        log_debug(
+            f"[Compact:speculative] discard cut={run.cut_index} ({reason}) hit_rate={self.stats.hit_rate:.0%}",
+            debug_type=DebugType.RESPONSE,
+        )
+
+    def _drop_failed(self, run: _SpeculativeRun) -> None:
+        if self._run is run:
+            self._run = None
+        self.stats.failed += 1
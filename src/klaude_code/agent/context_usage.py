@@ -19,7 +19,7 @@ from dataclasses import dataclass, field
 from klaude_code.agent.attachments.memory import memory_attachment
 from klaude_code.agent.attachments.skills import available_skills_attachment
 from klaude_code.agent.compaction import autocompact_reserve_tokens
-from klaude_code.agent.token_estimate import IMAGE_TOKENS, MESSAGE_OVERHEAD_TOKENS, estimate_text_tokens
+from klaude_code.agent.token_estimate import estimate_message_tokens, estimate_text_tokens
 from klaude_code.const import DEFAULT_MAX_TOKENS
 from klaude_code.log import log_debug
 from klaude_code.protocol import llm_param, message
@@ -57,21 +57,6 @@ class _Bucket:
         self.entries.append(ContextDetailEntry(name=name, tokens=tokens))
 
 
-def _estimate_message_tokens(msg: message.Message) -> int:
-    """Estimate one message, including its structural overhead on the wire."""
-    tokens = MESSAGE_OVERHEAD_TOKENS
-    for part in msg.parts:
-        if isinstance(part, (message.TextPart, message.ThinkingTextPart)):
-            tokens += estimate_text_tokens(part.text)
-        elif isinstance(part, message.ToolCallPart):
-            tokens += estimate_text_tokens(part.tool_name) + estimate_text_tokens(part.arguments_json)
-        elif isinstance(part, (message.ImageURLPart, message.ImageFilePart)):
-            tokens += IMAGE_TOKENS
-    if isinstance(msg, message.ToolResultMessage):
-        tokens += estimate_text_tokens(msg.output_text)
-    return tokens
-
-
 def _estimate_tool_tokens(tool: llm_param.ToolSchema) -> int:
     """A tool costs its name, description, and the serialized JSON schema of its parameters."""
     schema_json = json.dumps(tool.parameters, separators=(",", ":"), ensure_ascii=False)
@@ -201,7 +186,7 @@ def _split_history_tokens(
         if not isinstance(item, message.Message):
             continue
         message_count += 1
-        tokens = _estimate_message_tokens(item)
+        tokens = estimate_message_tokens(item)
 
         if isinstance(item, message.DeveloperMessage):
             category = _classify_developer_message(item)
@@ -266,7 +251,7 @@ async def _preview_pending_attachments(session: Session) -> dict[ContextCategory
         category = _classify_developer_message(item)
         if category not in buckets:
             continue
-        _add_named_entries(buckets[category], item, category, _estimate_message_tokens(item))
+        _add_named_entries(buckets[category], item, category, estimate_message_tokens(item))
     return buckets
 
 
@@ -2,8 +2,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel
 
-from klaude_code.protocol import message
-from klaude_code.protocol.models import SessionStatsUIExtra, TaskMetadata, TaskMetadataItem, Usage
+from klaude_code.protocol.models import SessionStatsUIExtra, TaskMetadata, Usage
 from klaude_code.session.session import Session
 
 
@@ -46,72 +45,23 @@ def format_cost(cost: float | None, currency: str = "USD") -> str:
 
 
 def accumulate_session_usage(session: Session) -> AggregatedUsage:
-    """Accumulate usage statistics from all TaskMetadataItems in session history."""
-    all_metadata: list[TaskMetadata] = []
-    task_count = 0
-
-    for item in session.conversation_history:
-        if isinstance(item, TaskMetadataItem):
-            task_count += 1
-            all_metadata.append(item.main_agent)
-            all_metadata.extend(item.sub_agent_task_metadata)
-
-    by_model = TaskMetadata.aggregate_by_model(all_metadata)
-
-    total = Usage()
-    for meta in by_model:
-        if not meta.usage:
-            continue
-        usage = meta.usage
-
-        if total.currency == "USD" and usage.currency:
-            total.currency = usage.currency
-
-        total.input_tokens += usage.input_tokens
-        total.cached_tokens += usage.cached_tokens
-        total.cache_write_tokens += usage.cache_write_tokens
-        total.reasoning_tokens += usage.reasoning_tokens
-        total.output_tokens += usage.output_tokens
-
-        if usage.input_cost is not None:
-            total.input_cost = (total.input_cost or 0.0) + usage.input_cost
-        if usage.output_cost is not None:
-            total.output_cost = (total.output_cost or 0.0) + usage.output_cost
-        if usage.cache_read_cost is not None:
-            total.cache_read_cost = (total.cache_read_cost or 0.0) + usage.cache_read_cost
-        if usage.cache_write_cost is not None:
-            total.cache_write_cost = (total.cache_write_cost or 0.0) + usage.cache_write_cost
-
-        if usage.context_size is not None:
-            total.context_size = usage.context_size
-        if usage.context_limit is not None:
-            total.context_limit = usage.context_limit
-
-    return AggregatedUsage(total=total, by_model=by_model, task_count=task_count)
+    """Usage statistics from the session's running totals (see ``SessionStats``)."""
+    stats = session.stats
+    by_model = sorted(
+        (meta.model_copy(deep=True) for meta in stats.by_model),
+        key=lambda item: item.usage.total_cost if item.usage and item.usage.total_cost else 0.0,
+        reverse=True,
+    )
+    return AggregatedUsage(total=stats.total_usage(), by_model=by_model, task_count=stats.task_count)
 
 
 def collect_message_stats(session: Session) -> MessageStats:
-    user_messages = 0
-    assistant_messages = 0
-    tool_calls = 0
-    tool_results = 0
-
-    for item in session.conversation_history:
-        if isinstance(item, message.UserMessage):
-            user_messages += 1
-            continue
-        if isinstance(item, message.AssistantMessage):
-            assistant_messages += 1
-            tool_calls += sum(1 for part in item.parts if isinstance(part, message.ToolCallPart))
-            continue
-        if isinstance(item, message.ToolResultMessage):
-            tool_results += 1
-
+    stats = session.stats
     return MessageStats(
-        user_messages=user_messages,
-        assistant_messages=assistant_messages,
-        tool_calls=tool_calls,
-        tool_results=tool_results,
+        user_messages=stats.user_messages,
+        assistant_messages=stats.assistant_messages,
+        tool_calls=stats.tool_calls,
+        tool_results=stats.tool_results,
     )
 
 
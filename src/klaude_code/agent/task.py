@@ -13,6 +13,7 @@ from klaude_code.agent.attachments.state import reset_attachment_loaded_flags
 from klaude_code.agent.cache_break_detection import CacheBreakReport, CacheTracker
 from klaude_code.agent.compaction import (
     CompactionReason,
+    SpeculativeCompactor,
     is_context_overflow,
     run_compaction,
     should_compact_threshold,
@@ -237,6 +238,8 @@ class TaskExecutionContext:
     # LLM client for compaction (uses main if not set)
     compact_llm_client: LLMClientABC | None = None
     apply_llm_client_change: Callable[[LLMClientABC], AgentProfile] | None = None
+    # Background summarizer for threshold compaction (main agent only)
+    speculative_compaction: SpeculativeCompactor | None = None
 
 
 def _build_task_file_change_summary(
@@ -472,18 +475,26 @@ class TaskExecutor:
         ctx = self._context
         session_ctx = ctx.session_ctx
         result.profile = profile
+        speculative = ctx.speculative_compaction if reason == CompactionReason.THRESHOLD else None
         while True:
             try:
                 log_debug(f"[Compact:{reason.value}] start", debug_type=DebugType.RESPONSE)
-                compact_client = ctx.compact_llm_client or profile.llm_client
-                compaction = await run_compaction(
-                    session=ctx.session,
-                    reason=reason,
-                    focus=None,
-                    llm_client=compact_client,
-                    llm_config=compact_client.get_llm_config(),
-                    main_profile=profile,
-                )
+                compaction = None
+                if speculative is not None:
+                    compaction = await speculative.take(
+                        session=ctx.session, llm_config=profile.llm_client.get_llm_config()
+                    )
+                    speculative = None
+                if compaction is None:
+                    compact_client = ctx.compact_llm_client or profile.llm_client
+                    compaction = await run_compaction(
+                        session=ctx.session,
+                        reason=reason,
+                        focus=None,
+                        llm_client=compact_client,
+                        llm_config=compact_client.get_llm_config(),
+                        main_profile=profile,
+                    )
                 log_debug(f"[Compact:{reason.value}] result", str(compaction.to_entry()), debug_type=DebugType.RESPONSE)
                 _reset_attachment_loaded_flags(ctx.session.file_tracker)
                 session_ctx.append_history([compaction.to_entry()])
@@ -694,6 +705,13 @@ class TaskExecutor:
                         can_retry=True,
                         session_id=session_ctx.session_id,
                     )
+            elif ctx.speculative_compaction is not None and not skip_threshold_compaction:
+                ctx.speculative_compaction.maybe_start(
+                    session=ctx.session,
+                    llm_config=profile.llm_client.get_llm_config(),
+                    llm_client=ctx.compact_llm_client or profile.llm_client,
+                    main_profile=profile,
+                )
 
             # Process attachments in parallel with error isolation after compaction
             # resets transient loaded flags.
@@ -8,10 +8,21 @@ A flat ``chars / 4`` is close enough for English prose but wrong in two ways tha
 
 So characters are weighted by script instead. The result is still an estimate; when a real
 API usage report exists, prefer calibrating against it (see ``agent/context_usage.py``).
+
+History is re-estimated constantly (``/context``, compaction threshold checks, the status
+line), while only its tail changes between turns. ``MessageTokenCache`` memoizes a
+per-message estimator so each scan only pays for the messages it has not seen yet.
 """
 
 from __future__ import annotations
 
+import re
+import weakref
+from collections.abc import Callable
+from typing import NamedTuple
+
+from klaude_code.protocol import message
+
 # Roughly one token per CJK character; Claude's tokenizer lands a little under 1.
 _CJK_TOKENS_PER_CHAR = 0.7
 # Latin text averages ~3.8 chars/token across prose and punctuation-dense code.
@@ -27,6 +38,7 @@ _CJK_RANGES: tuple[tuple[int, int], ...] = (
     (0xF900, 0xFAFF),  # CJK compatibility ideographs
     (0xFF00, 0xFFEF),  # halfwidth and fullwidth forms
 )
+_CJK_RUN_RE = re.compile("[" + "".join(f"{chr(start)}-{chr(end)}" for start, end in _CJK_RANGES) + "]+")
 
 # Every message carries role and structural framing on the wire beyond its text.
 MESSAGE_OVERHEAD_TOKENS = 4
@@ -35,9 +47,11 @@ MESSAGE_OVERHEAD_TOKENS = 4
 IMAGE_TOKENS = 1600
 
 
-def _is_cjk(char: str) -> bool:
-    code_point = ord(char)
-    return any(start <= code_point <= end for start, end in _CJK_RANGES)
+def _count_cjk_chars(text: str) -> int:
+    if text.isascii():
+        return 0
+    # Deleting the CJK runs keeps the scan in the regex engine instead of a per-char loop.
+    return len(text) - len(_CJK_RUN_RE.sub("", text))
 
 
 def estimate_text_tokens(text: str) -> int:
@@ -45,7 +59,93 @@ def estimate_text_tokens(text: str) -> int:
     if not text:
         return 0
 
-    cjk_chars = sum(1 for char in text if _is_cjk(char))
+    cjk_chars = _count_cjk_chars(text)
     latin_chars = len(text) - cjk_chars
     estimated = cjk_chars * _CJK_TOKENS_PER_CHAR + latin_chars / _LATIN_CHARS_PER_TOKEN
     return max(1, round(estimated))
+
+
+def _estimate_message_tokens(msg: message.Message) -> int:
+    tokens = MESSAGE_OVERHEAD_TOKENS
+    for part in msg.parts:
+        if isinstance(part, (message.TextPart, message.ThinkingTextPart)):
+            tokens += estimate_text_tokens(part.text)
+        elif isinstance(part, message.ToolCallPart):
+            tokens += estimate_text_tokens(part.tool_name) + estimate_text_tokens(part.arguments_json)
+        elif isinstance(part, (message.ImageURLPart, message.ImageFilePart)):
+            tokens += IMAGE_TOKENS
+    if isinstance(msg, message.ToolResultMessage):
+        tokens += estimate_text_tokens(msg.output_text)
+    return tokens
+
+
+def _content_key(msg: message.Message) -> tuple[object, ...]:
+    """The objects an estimate depends on: every text string, plus non-text parts themselves."""
+    key: list[object] = []
+    for part in msg.parts:
+        if isinstance(part, (message.TextPart, message.ThinkingTextPart)):
+            key.append(part.text)
+        elif isinstance(part, message.ToolCallPart):
+            key.append(part.tool_name)
+            key.append(part.arguments_json)
+        else:
+            key.append(part)
+    if isinstance(msg, message.ToolResultMessage):
+        key.append(msg.output_text)
+    return tuple(key)
+
+
+class _CachedEstimate(NamedTuple):
+    ref: weakref.ref[message.Message]
+    key: tuple[object, ...]
+    tokens: int
+
+
+class MessageTokenCache:
+    """Memoize ``estimate`` per message object.
+
+    Entries are keyed by identity and dropped when their message is garbage collected.
+    Messages are mutable, so an entry also holds the exact objects it was computed from
+    (see ``_content_key``); when any of them has been replaced -- streamed text, an
+    offloaded tool output -- the message is estimated again. Strings are immutable, so
+    identical objects guarantee identical text without rescanning it.
+    """
+
+    def __init__(self, estimate: Callable[[message.Message], int]) -> None:
+        self._estimate = estimate
+        self._entries: dict[int, _CachedEstimate] = {}
+
+    def __call__(self, msg: message.Message) -> int:
+        key = _content_key(msg)
+        ident = id(msg)
+        cached = self._entries.get(ident)
+        if (
+            cached is not None
+            and cached.ref() is msg
+            and len(cached.key) == len(key)
+            and all(old is new for old, new in zip(cached.key, key, strict=True))
+        ):
+            return cached.tokens
+
+        tokens = self._estimate(msg)
+        ref = cached.ref if cached is not None and cached.ref() is msg else weakref.ref(msg, self._forget(ident))
+        self._entries[ident] = _CachedEstimate(ref, key, tokens)
+        return tokens
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _forget(self, ident: int) -> Callable[[weakref.ref[message.Message]], None]:
+        def _drop(ref: weakref.ref[message.Message]) -> None:
+            cached = self._entries.get(ident)
+            if cached is not None and cached.ref is ref:
+                del self._entries[ident]
+
+        return _drop
+
+
+# Estimate one message, including its structural overhead on the wire.
+estimate_message_tokens = MessageTokenCache(_estimate_message_tokens)
@@ -0,0 +1,418 @@
+"""Sidecar line index for debug log files.
+
+The log viewer never loads a whole log: it asks for the last N lines, the lines
+appended after a byte offset, or a raw byte range. To answer those without
+rescanning, every viewed log gets a ``<name>.idx`` file next to it that records,
+for each complete line, its byte offset and its debug type.
+
+Index format
+------------
+A fixed header (magic, inode, source size, indexed bytes, digest of the leading
+bytes) followed by one native-endian uint64 per line: ``offset << 8 | type``.
+Records are only ever appended, so a growing log extends its index by scanning
+just the new bytes. A different inode, a shrunk file, or changed leading bytes
+mean the log was rotated or rewritten, and the index is rebuilt.
+
+Rotated ``.gz`` logs are indexed by decompressed offsets and read through
+``gzip`` streaming, so neither indexing nor serving a window ever holds a
+decompressed file in memory.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import re
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Generator, Iterable, Iterator
+from dataclasses import dataclass
+from io import BufferedIOBase
+from itertools import islice
+from pathlib import Path
+
+from klaude_code.log import DebugType
+
+INDEX_SUFFIX = ".idx"
+
+_MAGIC = b"KLIDX1\0\0"
+# magic, inode, source size, indexed bytes, head length, head digest
+_HEADER = struct.Struct("<8sQQQQ8s")
+_HEAD_BYTES = 256
+_READ_SIZE = 1024 * 1024
+_TYPE_PREFIX_BYTES = 96
+# Candidate lines read per pass when walking backwards through a plain log.
+_TAIL_BATCH_LINES = 2048
+
+_TYPE_RE = re.compile(rb"\[[^\]\n]*\][ \t]+([A-Z_]+)")
+# Code 0 is reserved for lines without a type label (continuations, tracebacks).
+_TYPE_CODES: dict[bytes, int] = {
+    debug_type.value.upper().encode(): code for code, debug_type in enumerate(DebugType, start=1)
+}
+
+
+@dataclass(frozen=True)
+class LineFilter:
+    """Server-side selection of log lines.
+
+    `types` matches the debug type label; untyped lines always pass it so
+    multi-line records stay readable. `text` is a case-insensitive substring and
+    `session_id` matches either the full id or the 8-character short form used
+    in log prefixes.
+    """
+
+    types: frozenset[str] = frozenset()
+    text: str = ""
+    session_id: str = ""
+
+    @property
+    def needs_content(self) -> bool:
+        return bool(self.text or self.session_id)
+
+    def type_codes(self) -> frozenset[int] | None:
+        if not self.types:
+            return None
+        return frozenset({0} | {_TYPE_CODES[t.encode()] for t in self.types if t.encode() in _TYPE_CODES})
+
+    def matches(self, chunks: Iterable[bytes]) -> bool:
+        """Test a line given as consecutive chunks, without joining them."""
+        # Each group is satisfied by any of its needles; every group must be.
+        groups: list[tuple[bool, tuple[bytes, ...]]] = []
+        if self.text:
+            groups.append((True, (self.text.lower().encode(),)))
+        if self.session_id:
+            full = self.session_id.encode()
+            groups.append((False, (full, full[:8])))
+        if not groups:
+            return True
+        overlap = max(len(needle) for _, needles in groups for needle in needles) - 1
+        pending = list(groups)
+        carry = b""
+        for chunk in chunks:
+            window = carry + chunk
+            lowered = window.lower() if any(fold for fold, _ in pending) else window
+            pending = [
+                (fold, needles)
+                for fold, needles in pending
+                if not any(needle in (lowered if fold else window) for needle in needles)
+            ]
+            if not pending:
+                return True
+            carry = window[-overlap:] if overlap else b""
+        return False
+
+
+@dataclass(frozen=True)
+class LogLine:
+    number: int
+    offset: int
+    end: int
+    text: str
+    truncated: bool
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "no": self.number,
+            "offset": self.offset,
+            "end": self.end,
+            "text": self.text,
+            "truncated": self.truncated,
+        }
+
+
+def open_log(path: Path) -> BufferedIOBase:
+    """Open a log for binary reading, transparently decompressing ``.gz``."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+
+def iter_log_bytes(path: Path, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+    """Yield the (decompressed) bytes of `path` in ``[start, end)`` in bounded chunks."""
+    with open_log(path) as f:
+        if start:
+            f.seek(start)
+        remaining = None if end is None else max(0, end - start)
+        while remaining is None or remaining > 0:
+            chunk = f.read(_READ_SIZE if remaining is None else min(_READ_SIZE, remaining))
+            if not chunk:
+                return
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+class LogLineIndex:
+    """Line offsets and types for one log file, kept in sync with its sidecar.
+
+    Safe to share between server threads. Every query refreshes the index first,
+    so it always covers each complete line on disk; a trailing partial line is
+    left for the next refresh.
+    """
+
+    def __init__(self, path: Path, *, max_line_bytes: int) -> None:
+        self.path = path
+        self.compressed = path.suffix == ".gz"
+        self.max_line_bytes = max_line_bytes
+        self.sidecar = path.with_name(path.name + INDEX_SUFFIX)
+        self._lock = threading.Lock()
+        self._records = array("Q")
+        self._indexed_bytes = 0
+        self._inode = -1
+        self._source_size = 0
+        self._head_len = 0
+        self._head_digest = b""
+        self._loaded = False
+        self._generation = 0
+
+    @property
+    def line_count(self) -> int:
+        return len(self._records)
+
+    @property
+    def end_offset(self) -> int:
+        """Offset just past the last complete line."""
+        return self._indexed_bytes
+
+    @property
+    def generation(self) -> int:
+        """Bumped whenever the file is found replaced or rewritten; offsets from older generations are void."""
+        return self._generation
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._refresh_locked()
+
+    def tail(self, limit: int, line_filter: LineFilter, *, before: int | None = None) -> list[LogLine]:
+        """Return the last `limit` matching lines that start before offset `before`."""
+        with self._lock:
+            self._refresh_locked()
+            if limit <= 0:
+                return []
+            stop = len(self._records) if before is None else bisect_left(self._records, before << 8)
+            backward = self._candidates(range(stop - 1, -1, -1), line_filter)
+            if not line_filter.needs_content:
+                picked = list(islice(backward, limit))
+                picked.reverse()
+                return list(self._iter_lines(picked, line_filter))
+            if self.compressed:
+                # Seeking backwards in a gzip stream restarts decompression, so scan forwards once.
+                forward = self._candidates(range(stop), line_filter)
+                return list(deque(self._iter_lines(forward, line_filter), maxlen=limit))
+            found: list[LogLine] = []
+            while len(found) < limit:
+                batch = list(islice(backward, _TAIL_BATCH_LINES))
+                if not batch:
+                    break
+                batch.reverse()
+                found[:0] = self._iter_lines(batch, line_filter)
+            return found[-limit:]
+
+    def since(self, offset: int, limit: int, line_filter: LineFilter) -> tuple[list[LogLine], int]:
+        """Return up to `limit` matching lines starting at or after `offset`.
+
+        The second element is the offset to continue from: the end of the last
+        returned line, or the end of the index once every line has been examined.
+        """
+        with self._lock:
+            self._refresh_locked()
+            start = bisect_left(self._records, offset << 8)
+            forward = self._candidates(range(start, len(self._records)), line_filter)
+            found: list[LogLine] = []
+            lines = self._iter_lines(forward, line_filter)
+            try:
+                for line in lines:
+                    found.append(line)
+                    if len(found) >= limit:
+                        return found, line.end
+            finally:
+                # Stopping early must still close the file the generator holds open.
+                lines.close()
+            return found, max(offset, self._indexed_bytes)
+
+    def _candidates(self, indices: Iterable[int], line_filter: LineFilter) -> Iterator[int]:
+        codes = line_filter.type_codes()
+        if codes is None:
+            return iter(indices)
+        records = self._records
+        return (index for index in indices if records[index] & 0xFF in codes)
+
+    def _iter_lines(self, indices: Iterable[int], line_filter: LineFilter) -> Generator[LogLine]:
+        """Read the given line indices (ascending) in one forward pass over the file."""
+        f: BufferedIOBase | None = None
+        try:
+            for index in indices:
+                if f is None:
+                    f = open_log(self.path)
+                start = self._records[index] >> 8
+                end = self._records[index + 1] >> 8 if index + 1 < len(self._records) else self._indexed_bytes
+                if f.tell() != start:
+                    f.seek(start)
+                data = f.read(min(end - start, self.max_line_bytes))
+                truncated = end - start > len(data)
+                if line_filter.needs_content:
+                    # A long line is matched in full but only its prefix is kept.
+                    chunks = _prepend(data, _read_chunks(f, end - start - len(data))) if truncated else (data,)
+                    if not line_filter.matches(chunks):
+                        continue
+                if not truncated:
+                    data = data.rstrip(b"\r\n")
+                yield LogLine(index + 1, start, end, data.decode("utf-8", errors="replace"), truncated)
+        finally:
+            if f is not None:
+                f.close()
+
+    def _refresh_locked(self) -> None:
+        if not self._loaded:
+            self._loaded = True
+            self._load_sidecar()
+        try:
+            stat = self.path.stat()
+        except OSError:
+            if self._inode != -1:
+                self._reset(-1)
+            return
+
+        if self._same_source(stat.st_ino, stat.st_size):
+            if stat.st_size > self._source_size:
+                self._extend(stat.st_size)
+            return
+
+        self._reset(stat.st_ino)
+        self._extend(stat.st_size)
+
+    def _same_source(self, inode: int, size: int) -> bool:
+        if inode != self._inode:
+            return False
+        if size < self._source_size or (self.compressed and size != self._source_size):
+            return False
+        return _head_digest(self.path, self._head_len) == self._head_digest
+
+    def _reset(self, inode: int) -> None:
+        self._generation += 1
+        self._records = array("Q")
+        self._indexed_bytes = 0
+        self._inode = inode
+        self._source_size = 0
+        self._head_len = 0
+        self._head_digest = b""
+
+    def _extend(self, source_size: int) -> None:
+        first_new = len(self._records)
+        with open_log(self.path) as f:
+            f.seek(self._indexed_bytes)
+            self._indexed_bytes = _scan_lines(f, self._indexed_bytes, self._records)
+        self._source_size = source_size
+        if self._head_len < _HEAD_BYTES:
+            self._head_len = min(source_size, _HEAD_BYTES)
+            self._head_digest = _head_digest(self.path, self._head_len)
+        self._write_sidecar(first_new)
+
+    def _load_sidecar(self) -> None:
+        try:
+            raw = self.sidecar.read_bytes()
+        except OSError:
+            return
+        if len(raw) < _HEADER.size or (len(raw) - _HEADER.size) % 8:
+            return
+        magic, inode, source_size, indexed_bytes, head_len, digest = _HEADER.unpack_from(raw)
+        if magic != _MAGIC:
+            return
+        records = array("Q")
+        records.frombytes(raw[_HEADER.size :])
+        if records and records[-1] >> 8 >= indexed_bytes:
+            return
+        self._records = records
+        self._inode = inode
+        self._source_size = source_size
+        self._indexed_bytes = indexed_bytes
+        self._head_len = head_len
+        self._head_digest = digest
+
+    def _write_sidecar(self, first_new: int) -> None:
+        header = _HEADER.pack(
+            _MAGIC, self._inode, self._source_size, self._indexed_bytes, self._head_len, self._head_digest
+        )
+        try:
+            if first_new == 0 or not self.sidecar.exists():
+                self.sidecar.write_bytes(header + self._records.tobytes())
+                return
+            with self.sidecar.open("r+b") as f:
+                f.seek(_HEADER.size + first_new * 8)
+                f.write(self._records[first_new:].tobytes())
+                f.truncate()
+                f.seek(0)
+                f.write(header)
+        except OSError:
+            # Read-only log directory: the in-memory index still serves this process.
+            pass
+
+
+def _head_digest(path: Path, length: int) -> bytes:
+    """Digest of the leading bytes, used to notice a log rewritten in place."""
+    try:
+        with path.open("rb") as f:
+            data = f.read(length)
+    except OSError:
+        return b""
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def _read_chunks(f: BufferedIOBase, size: int) -> Iterator[bytes]:
+    while size > 0:
+        chunk = f.read(min(_READ_SIZE, size))
+        if not chunk:
+            return
+        size -= len(chunk)
+        yield chunk
+
+
+def _prepend(first: bytes, rest: Iterable[bytes]) -> Iterator[bytes]:
+    yield first
+    yield from rest
+
+
+def _scan_lines(f: BufferedIOBase, offset: int, records: array[int]) -> int:
+    """Append a record for every complete line from `offset`; return the end of the last one."""
+    line_start = offset
+    prefix = b""
+    position = offset
+    while chunk := f.read(_READ_SIZE):
+        cursor = 0
+        while True:
+            newline = chunk.find(b"\n", cursor)
+            if len(prefix) < _TYPE_PREFIX_BYTES:
+                stop = len(chunk) if newline == -1 else newline
+                prefix += chunk[cursor : min(stop, cursor + _TYPE_PREFIX_BYTES - len(prefix))]
+            if newline == -1:
+                break
+            records.append(line_start << 8 | _type_code(prefix))
+            cursor = newline + 1
+            line_start = position + cursor
+            prefix = b""
+        position += len(chunk)
+    return line_start
+
+
+def _type_code(prefix: bytes) -> int:
+    match = _TYPE_RE.match(prefix)
+    if match is None:
+        return 0
+    return _TYPE_CODES.get(match.group(1), 0)
+
+
+_INDEXES: dict[Path, LogLineIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_line_index(path: Path, *, max_line_bytes: int) -> LogLineIndex:
+    """Return the shared index for `path`, creating it on first use."""
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(path)
+        if index is None or index.max_line_bytes != max_line_bytes:
+            index = LogLineIndex(path, max_line_bytes=max_line_bytes)
+            _INDEXES[path] = index
+        return index
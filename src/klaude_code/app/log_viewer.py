@@ -1,17 +1,42 @@
-"""Minimal HTTP server for the debug log viewer."""
+"""Minimal HTTP server for the debug log viewer.
+
+Besides the whole-file endpoint, logs are served in windows so the browser
+never downloads more than it shows:
+
+- ``/api/log/tail``: the last N lines (optionally before an offset), filtered.
+- ``/api/log/range``: raw bytes ``[start, end)``, e.g. one long line in full.
+- ``/api/log/since``: lines appended after an offset, filtered.
+- ``/api/log/follow``: the same as a Server-Sent Events stream.
+
+Line lookups go through the sidecar index in `log_index`; ``.gz`` rotations are
+decompressed as a stream.
+"""
 
 import errno
 import json
 import threading
+import time
 import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
+from klaude_code.app.log_index import LineFilter, LogLine, LogLineIndex, get_line_index, iter_log_bytes
 from klaude_code.const import DEFAULT_DEBUG_LOG_DIR
 
 _VIEWER_HTML = Path(__file__).parent / "log_viewer.html"
 _DEFAULT_LOG_VIEWER_PORT = 8765
+_DEFAULT_TAIL_LINES = 2000
+_MAX_WINDOW_LINES = 20_000
+# Longer lines are cut in line listings; /api/log/range returns them in full.
+_MAX_LINE_BYTES = 256 * 1024
+_FOLLOW_POLL_SEC = 0.5
+_FOLLOW_HEARTBEAT_SEC = 15.0
+
+
+class _BadRequest(Exception):
+    pass
 
 
 class _LogViewerHandler(BaseHTTPRequestHandler):
@@ -19,21 +44,36 @@ class _LogViewerHandler(BaseHTTPRequestHandler):
 
     def do_GET(self) -> None:
         parsed = urlparse(self.path)
+        qs = parse_qs(parsed.query)
 
         if parsed.path == "/" or parsed.path == "":
             self._serve_html()
-        elif parsed.path == "/api/log":
-            qs = parse_qs(parsed.query)
-            paths = qs.get("path", [])
-            if paths:
-                self._serve_log(paths[0])
-            else:
-                self._error(400, "missing path parameter")
         elif parsed.path == "/api/logs":
             self._serve_logs()
+        elif parsed.path.startswith("/api/log"):
+            self._serve_log_api(parsed.path, qs)
         else:
             self._error(404, "not found")
 
+    def _serve_log_api(self, route: str, qs: dict[str, list[str]]) -> None:
+        serve = {
+            "/api/log": self._serve_log,
+            "/api/log/range": self._serve_range,
+            "/api/log/tail": self._serve_tail,
+            "/api/log/since": self._serve_since,
+            "/api/log/follow": self._serve_follow,
+        }.get(route)
+        if serve is None:
+            self._error(404, "not found")
+            return
+        log_path = self._resolve_log_path(qs)
+        if log_path is None:
+            return
+        try:
+            serve(log_path, qs)
+        except _BadRequest as exc:
+            self._error(400, str(exc))
+
     def _serve_html(self) -> None:
         content = _VIEWER_HTML.read_bytes()
         self.send_response(200)
@@ -42,31 +82,114 @@ class _LogViewerHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(content)
 
-    def _serve_log(self, raw_path: str) -> None:
-        log_path = Path(raw_path).resolve()
+    def _resolve_log_path(self, qs: dict[str, list[str]]) -> Path | None:
+        paths = qs.get("path", [])
+        if not paths:
+            self._error(400, "missing path parameter")
+            return None
+        log_path = Path(paths[0]).resolve()
         log_dir = DEFAULT_DEBUG_LOG_DIR.resolve()
         if not _is_path_within(log_path, log_dir):
             self._error(403, "access denied: path outside log directory")
-            return
+            return None
         if not log_path.is_file():
             self._error(404, "log file not found")
+            return None
+        return log_path
+
+    def _serve_log(self, log_path: Path, qs: dict[str, list[str]]) -> None:
+        del qs
+        self._stream_text(iter_log_bytes(log_path))
+
+    def _serve_range(self, log_path: Path, qs: dict[str, list[str]]) -> None:
+        start = _int_param(qs, "start", 0)
+        end = _int_param(qs, "end", None)
+        if start < 0 or (end is not None and end < start):
+            raise _BadRequest("invalid byte range")
+        self._stream_text(iter_log_bytes(log_path, start, end))
+
+    def _serve_tail(self, log_path: Path, qs: dict[str, list[str]]) -> None:
+        limit = min(_int_param(qs, "lines", _DEFAULT_TAIL_LINES), _MAX_WINDOW_LINES)
+        before = _int_param(qs, "before", None)
+        index = _line_index(log_path)
+        lines = index.tail(limit, _line_filter(qs), before=before)
+        self._json(
+            {
+                "lines": [line.to_dict() for line in lines],
+                "offset": index.end_offset,
+                "generation": index.generation,
+                "line_count": index.line_count,
+            }
+        )
+
+    def _serve_since(self, log_path: Path, qs: dict[str, list[str]]) -> None:
+        offset, generation, limit, line_filter = _since_query(qs)
+        index = _line_index(log_path)
+        lines, offset, reset = _read_since(index, offset, generation, limit, line_filter)
+        self._json(
+            {
+                "lines": [line.to_dict() for line in lines],
+                "offset": offset,
+                "generation": index.generation,
+                "reset": reset,
+            }
+        )
+
+    def _serve_follow(self, log_path: Path, qs: dict[str, list[str]]) -> None:
+        offset, generation, limit, line_filter = _since_query(qs)
+        index = _line_index(log_path)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        last_write = time.monotonic()
+        try:
+            while True:
+                lines, offset, reset = _read_since(index, offset, generation, limit, line_filter)
+                if reset:
+                    self._write_event("reset", {"generation": index.generation})
+                    return
+                # Pin the file the client started on so a later rotation is reported.
+                generation = index.generation
+                if lines:
+                    self._write_event("lines", {"lines": [line.to_dict() for line in lines], "offset": offset})
+                    last_write = time.monotonic()
+                elif time.monotonic() - last_write >= _FOLLOW_HEARTBEAT_SEC:
+                    # Comments keep the connection alive and reveal a closed client.
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+                    last_write = time.monotonic()
+                if len(lines) < limit:
+                    time.sleep(_FOLLOW_POLL_SEC)
+        except (BrokenPipeError, ConnectionResetError):
             return
-        content = log_path.read_bytes()
+
+    def _write_event(self, event: str, payload: dict[str, object]) -> None:
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode())
+        self.wfile.flush()
+
+    def _stream_text(self, chunks: Iterator[bytes]) -> None:
+        # No Content-Length: HTTP/1.0 ends the body when the connection closes.
         self.send_response(200)
         self.send_header("Content-Type", "text/plain; charset=utf-8")
-        self.send_header("Content-Length", str(len(content)))
         self.end_headers()
-        self.wfile.write(content)
+        try:
+            for chunk in chunks:
+                self.wfile.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            return
 
-    def _serve_logs(self) -> None:
-        logs = _list_log_files(DEFAULT_DEBUG_LOG_DIR.resolve())
-        body = json.dumps(logs).encode()
+    def _json(self, payload: object) -> None:
+        body = json.dumps(payload).encode()
         self.send_response(200)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
 
+    def _serve_logs(self) -> None:
+        self._json(_list_log_files(DEFAULT_DEBUG_LOG_DIR.resolve()))
+
     def _error(self, code: int, msg: str) -> None:
         body = msg.encode()
         self.send_response(code)
@@ -79,14 +202,57 @@ class _LogViewerHandler(BaseHTTPRequestHandler):
         pass
 
 
-def _create_server_with_fallback(start_port: int) -> tuple[HTTPServer, int]:
+def _line_index(log_path: Path) -> LogLineIndex:
+    return get_line_index(log_path, max_line_bytes=_MAX_LINE_BYTES)
+
+
+def _int_param[T: int | None](qs: dict[str, list[str]], name: str, default: T) -> int | T:
+    values = qs.get(name)
+    if not values or values[0] == "":
+        return default
+    try:
+        return int(values[0])
+    except ValueError:
+        raise _BadRequest(f"invalid {name} parameter") from None
+
+
+def _line_filter(qs: dict[str, list[str]]) -> LineFilter:
+    types = frozenset(t.strip().upper() for value in qs.get("type", []) for t in value.split(",") if t.strip())
+    return LineFilter(
+        types=types,
+        text=qs.get("q", [""])[0],
+        session_id=qs.get("session", [""])[0].strip(),
+    )
+
+
+def _since_query(qs: dict[str, list[str]]) -> tuple[int, int | None, int, LineFilter]:
+    offset = _int_param(qs, "offset", 0)
+    limit = min(_int_param(qs, "limit", _MAX_WINDOW_LINES), _MAX_WINDOW_LINES)
+    if offset < 0 or limit <= 0:
+        raise _BadRequest("invalid offset or limit")
+    return offset, _int_param(qs, "generation", None), limit, _line_filter(qs)
+
+
+def _read_since(
+    index: LogLineIndex, offset: int, generation: int | None, limit: int, line_filter: LineFilter
+) -> tuple[list[LogLine], int, bool]:
+    """Lines after `offset`; the flag is set when the client's generation or offset is stale."""
+    index.refresh()
+    if (generation is not None and generation != index.generation) or offset > index.end_offset:
+        return [], 0, True
+    lines, next_offset = index.since(offset, limit, line_filter)
+    return lines, next_offset, False
+
+
+def _create_server_with_fallback(start_port: int) -> tuple[ThreadingHTTPServer, int]:
     for port in range(start_port, 65536):
         try:
-            server = HTTPServer(("127.0.0.1", port), _LogViewerHandler)
+            server = ThreadingHTTPServer(("127.0.0.1", port), _LogViewerHandler)
         except OSError as exc:
             if exc.errno == errno.EADDRINUSE:
                 continue
             raise
+        server.daemon_threads = True
         return server, port
     raise RuntimeError(f"no available port from {start_port} to 65535")
 
@@ -99,14 +265,19 @@ def _is_path_within(path: Path, root: Path) -> bool:
         return False
 
 
+def _is_log_name(name: str) -> bool:
+    """Active logs end in ``.log``; rotations are named like ``x.log.1.gz``."""
+    return name.endswith(".log") or (name.endswith(".gz") and ".log." in name)
+
+
 def _list_log_files(log_dir: Path) -> list[dict[str, object]]:
     if not log_dir.exists():
         return []
 
     files: list[tuple[float, dict[str, object]]] = []
     seen_paths: set[Path] = set()
-    for path in log_dir.rglob("*.log"):
-        if not path.is_file():
+    for path in log_dir.rglob("*"):
+        if not _is_log_name(path.name) or not path.is_file():
             continue
 
         try:
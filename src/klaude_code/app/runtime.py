@@ -18,6 +18,7 @@ from klaude_code.app.ports import DisplayABC, InteractionHandlerABC
 from klaude_code.app.runtime_facade import RuntimeFacade
 from klaude_code.config import Config, load_config
 from klaude_code.config.config import ModelPreference
+from klaude_code.const import SESSION_MEMORY_BUDGET_BYTES
 from klaude_code.control.event_bus import EventBus, EventSubscription
 from klaude_code.llm.proxy_support import configured_socks_proxy_var, is_missing_socks_proxy_support_error
 from klaude_code.log import DebugType, log, log_debug, set_debug_logging
@@ -97,7 +98,10 @@ async def _consume_display_from_subscription(
 async def _reclaim_idle_sessions_loop(runtime: RuntimeFacade) -> None:
     while True:
         await asyncio.sleep(SESSION_IDLE_RECLAIM_INTERVAL_SECONDS)
-        await runtime.reclaim_idle_sessions(idle_for_seconds=SESSION_IDLE_TTL_SECONDS)
+        await runtime.reclaim_idle_sessions(
+            idle_for_seconds=SESSION_IDLE_TTL_SECONDS,
+            memory_budget_bytes=SESSION_MEMORY_BUDGET_BYTES or None,
+        )
 
 
 async def _consume_interactions_from_subscription(
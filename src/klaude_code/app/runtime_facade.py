@@ -15,6 +15,7 @@ from klaude_code.control.user_interaction import PendingUserInteractionRequest
 from klaude_code.log import DebugType, log_debug
 from klaude_code.protocol import events, op, user_interaction
 from klaude_code.session.session import Session
+from klaude_code.tool.shell.persistent_shell import close_all_persistent_shells, close_persistent_shell
 
 
 class OperationCompletionAwaiter:
@@ -365,6 +366,7 @@ class RuntimeFacade:
 
         closed = await self.session_registry.close_session(session_id, force=force)
         if closed:
+            await close_persistent_shell(session_id)
             for request in cancelled_requests:
                 await self._operation_dispatcher.emit_event(
                     events.UserInteractionCancelledEvent(
@@ -388,7 +390,9 @@ class RuntimeFacade:
         """Sessions the idle reaper must leave alone (e.g. WS-attached ones)."""
         self._reclaim_exclusions_provider = provider
 
-    async def reclaim_idle_sessions(self, *, idle_for_seconds: float) -> list[str]:
+    async def reclaim_idle_sessions(
+        self, *, idle_for_seconds: float, memory_budget_bytes: int | None = None
+    ) -> list[str]:
         # Never reclaim the primary (TUI-active) session or any session an
         # exclusion provider vouches for (the server excludes every session
         # with a live WS attach — an attached-but-quiet TUI is still in use).
@@ -400,7 +404,9 @@ class RuntimeFacade:
             with contextlib.suppress(Exception):
                 exclude |= self._reclaim_exclusions_provider()
         return await self.session_registry.reclaim_idle_sessions(
-            idle_for_seconds=idle_for_seconds, exclude=exclude or None
+            idle_for_seconds=idle_for_seconds,
+            exclude=exclude or None,
+            memory_budget_bytes=memory_budget_bytes,
         )
 
     async def wait_for(self, operation_id: str) -> Literal["completed", "rejected", "failed"] | None:
@@ -453,6 +459,7 @@ class RuntimeFacade:
                 await agent.session.wait_for_flush()
 
         await self.session_registry.stop()
+        await close_all_persistent_shells()
         await self._operation_awaiter.stop()
         self._operation_dispatcher.clear_active_tasks()
 
@@ -1,12 +1,13 @@
 """Cost command for aggregating usage statistics across all sessions."""
 
+import hashlib
 import json
 import os
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, BinaryIO, cast
 
 import pydantic
 import typer
@@ -19,10 +20,15 @@ from klaude_code.protocol.models import TaskMetadata, TaskMetadataItem, Usage
 from klaude_code.session.codec import decode_jsonl_line
 
 ASCII_HORIZONAL = Box(" -- \n    \n -- \n    \n -- \n -- \n    \n -- \n")
-COST_CACHE_VERSION = 2
+COST_CACHE_VERSION = 3
 COST_CACHE_PATH = Path.home() / ".klaude" / "cache" / "cost_cache.json"
 SPLIT_SUB_PROVIDER = False
 
+# Usage only lives in TaskMetadataItem lines; anything without this marker is skipped undecoded.
+_TASK_METADATA_MARKER = b'"TaskMetadataItem"'
+# Bytes before the aggregated offset that must still match for an append-only resume.
+_RESUME_CHECK_BYTES = 256
+
 
 @dataclass
 class ModelUsageStats:
@@ -201,18 +207,20 @@ def _load_cost_cache() -> dict[str, Any]:
     try:
         raw = json.loads(COST_CACHE_PATH.read_text(encoding="utf-8"))
     except (OSError, json.JSONDecodeError):
-        return {"version": COST_CACHE_VERSION, "sessions": {}}
+        return {"version": COST_CACHE_VERSION, "sessions": {}, "meta": {}}
 
     if not isinstance(raw, dict):
-        return {"version": COST_CACHE_VERSION, "sessions": {}}
+        return {"version": COST_CACHE_VERSION, "sessions": {}, "meta": {}}
 
     data = cast(dict[str, Any], raw)
 
     if data.get("version") != COST_CACHE_VERSION:
-        return {"version": COST_CACHE_VERSION, "sessions": {}}
+        return {"version": COST_CACHE_VERSION, "sessions": {}, "meta": {}}
 
     if not isinstance(data.get("sessions"), dict):
         data["sessions"] = {}
+    if not isinstance(data.get("meta"), dict):
+        data["meta"] = {}
 
     return data
 
@@ -225,12 +233,7 @@ def _save_cost_cache(cache: dict[str, Any]) -> None:
     tmp_path.replace(COST_CACHE_PATH)
 
 
-def _is_cache_entry_valid(entry: dict[str, Any], events_path: Path) -> bool:
-    try:
-        stat = events_path.stat()
-    except OSError:
-        return False
-
+def _is_cache_entry_valid(entry: dict[str, Any], stat: os.stat_result) -> bool:
     return entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size
 
 
@@ -264,16 +267,7 @@ def _apply_entries(daily_stats: dict[str, DailyStats], entries: list[dict[str, A
     return True
 
 
-def _aggregate_session_entries(events_path: Path) -> list[dict[str, Any]]:
-    per_day: dict[str, DailyStats] = {}
-
-    for date_str, metadata_item in iter_task_metadata_from_events(events_path):
-        day_stats = per_day.setdefault(date_str, DailyStats(date=date_str))
-
-        day_stats.add_task_metadata(metadata_item.main_agent, date_str)
-        for sub_meta in metadata_item.sub_agent_task_metadata:
-            day_stats.add_task_metadata(sub_meta, date_str)
-
+def _daily_stats_to_entries(per_day: dict[str, DailyStats]) -> list[dict[str, Any]]:
     entries: list[dict[str, Any]] = []
     for date_str, day_stats in per_day.items():
         for stats in day_stats.by_model.values():
@@ -294,15 +288,83 @@ def _aggregate_session_entries(events_path: Path) -> list[dict[str, Any]]:
     return entries
 
 
-def iter_all_sessions() -> Iterator[tuple[str, Path]]:
+def _resume_digest(f: BinaryIO, offset: int) -> str:
+    start = max(0, offset - _RESUME_CHECK_BYTES)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def _update_session_entry(events_path: Path, entry: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Return the cache entry for `events_path`, decoding only lines appended since `entry`.
+
+    Events files are append-only, so an entry remembers the byte offset it has
+    aggregated up to together with the per-day/per-model totals so far. The resume
+    is trusted only when the file is the same inode, has not shrunk and still holds
+    the same bytes just before the offset; otherwise the file is rescanned.
+    Returns None when the file cannot be read.
+    """
+    try:
+        stat = events_path.stat()
+    except OSError:
+        return None
+    if entry is not None and _is_cache_entry_valid(entry, stat):
+        return entry
+
+    try:
+        f = events_path.open("rb")
+    except OSError:
+        return None
+    with f:
+        per_day: dict[str, DailyStats] = {}
+        offset = 0
+        if entry is not None:
+            resume_offset = entry.get("offset")
+            if (
+                isinstance(resume_offset, int)
+                and 0 < resume_offset <= stat.st_size
+                and entry.get("inode") == stat.st_ino
+                and isinstance(entry.get("entries"), list)
+                and entry.get("resume_digest") == _resume_digest(f, resume_offset)
+                and _apply_entries(per_day, cast(list[dict[str, Any]], entry["entries"]))
+            ):
+                offset = resume_offset
+            else:
+                per_day = {}
+
+        metadata_items, offset = _read_task_metadata(f, offset)
+        for date_str, metadata_item in metadata_items:
+            day_stats = per_day.setdefault(date_str, DailyStats(date=date_str))
+            day_stats.add_task_metadata(metadata_item.main_agent, date_str)
+            for sub_meta in metadata_item.sub_agent_task_metadata:
+                day_stats.add_task_metadata(sub_meta, date_str)
+
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "inode": stat.st_ino,
+            "offset": offset,
+            "resume_digest": _resume_digest(f, offset),
+            "entries": _daily_stats_to_entries(per_day),
+        }
+
+
+def iter_all_sessions(meta_cache: dict[str, Any] | None = None) -> Iterator[tuple[str, Path]]:
     """Iterate over all top-level sessions across all projects.
 
-    Yields (session_id, events_file_path) tuples.
+    Yields (session_id, events_file_path) tuples. When `meta_cache` is given, the
+    sub-agent check of each meta.json is remembered there keyed by its (mtime, size),
+    so unchanged sessions are classified without reading the file. The mapping is
+    rebuilt in place, so entries for deleted sessions drop out.
     """
     projects_dir = Path.home() / ".klaude" / "projects"
     if not projects_dir.exists():
         return
 
+    previous_meta: dict[str, Any] | None = None
+    if meta_cache is not None:
+        previous_meta = dict(meta_cache)
+        meta_cache.clear()
+
     # os.scandir is faster than repeated Path.iterdir/is_dir for large trees.
     with os.scandir(projects_dir) as project_entries:
         for project_entry in project_entries:
@@ -323,18 +385,45 @@ def iter_all_sessions() -> Iterator[tuple[str, Path]]:
                     meta_file = session_dir / "meta.json"
 
                     # Skip sub-agent sessions by checking meta.json.
-                    if meta_file.exists():
-                        try:
-                            meta = json.loads(meta_file.read_text(encoding="utf-8"))
-                            if meta.get("sub_agent_state") is not None or meta.get("parent_session_id"):
-                                continue
-                        except (json.JSONDecodeError, OSError):
-                            pass
+                    if _is_sub_agent_session(meta_file, previous_meta, meta_cache):
+                        continue
 
                     if events_file.exists():
                         yield session_dir.name, events_file
 
 
+def _is_sub_agent_session(
+    meta_file: Path,
+    previous_meta: dict[str, Any] | None,
+    meta_cache: dict[str, Any] | None,
+) -> bool:
+    try:
+        stat = meta_file.stat()
+    except OSError:
+        return False
+
+    cache_key = str(meta_file)
+    if previous_meta is not None and meta_cache is not None:
+        cached = previous_meta.get(cache_key)
+        if isinstance(cached, dict):
+            typed_cached = cast(dict[str, Any], cached)
+            if _is_cache_entry_valid(typed_cached, stat) and isinstance(typed_cached.get("sub_agent"), bool):
+                meta_cache[cache_key] = typed_cached
+                return typed_cached["sub_agent"]
+
+    sub_agent = False
+    try:
+        meta = json.loads(meta_file.read_text(encoding="utf-8"))
+        if meta.get("sub_agent_state") is not None or meta.get("parent_session_id"):
+            sub_agent = True
+    except (json.JSONDecodeError, OSError):
+        pass
+
+    if meta_cache is not None:
+        meta_cache[cache_key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sub_agent": sub_agent}
+    return sub_agent
+
+
 def iter_task_metadata_from_events(events_path: Path) -> Iterator[tuple[str, TaskMetadataItem]]:
     """Extract TaskMetadataItem entries from events.jsonl with their dates.
 
@@ -342,19 +431,38 @@ def iter_task_metadata_from_events(events_path: Path) -> Iterator[tuple[str, Tas
     Skips lines that fail pydantic validation.
     """
     try:
-        with events_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                if not line:
-                    continue
-                try:
-                    item = decode_jsonl_line(line)
-                except pydantic.ValidationError:
-                    continue
-                if isinstance(item, TaskMetadataItem):
-                    date_str = item.created_at.strftime("%Y-%m-%d")
-                    yield date_str, item
+        with events_path.open("rb") as f:
+            items, _offset = _read_task_metadata(f, 0)
     except OSError:
         return
+    yield from items
+
+
+def _read_task_metadata(f: BinaryIO, offset: int) -> tuple[list[tuple[str, TaskMetadataItem]], int]:
+    """Decode TaskMetadataItem lines from `offset`; return them and the offset consumed up to.
+
+    Lines without the type marker are skipped without JSON or pydantic decoding.
+    An unterminated last line is left for the next scan unless it already parses,
+    since the session writer may be midway through appending it.
+    """
+    items: list[tuple[str, TaskMetadataItem]] = []
+    f.seek(offset)
+    for line in f:
+        if not line.endswith(b"\n"):
+            try:
+                json.loads(line)
+            except ValueError:
+                break
+        offset += len(line)
+        if _TASK_METADATA_MARKER not in line:
+            continue
+        try:
+            item = decode_jsonl_line(line.decode("utf-8", errors="replace"))
+        except pydantic.ValidationError:
+            continue
+        if isinstance(item, TaskMetadataItem):
+            items.append((item.created_at.strftime("%Y-%m-%d"), item))
+    return items, offset
 
 
 def aggregate_all_sessions() -> dict[str, DailyStats]:
@@ -374,36 +482,30 @@ def aggregate_all_sessions() -> dict[str, DailyStats]:
         cache["sessions"] = cache_sessions
         cache_changed = True
 
+    raw_meta = cache.get("meta")
+    meta_cache = cast(dict[str, Any], raw_meta) if isinstance(raw_meta, dict) else {}
+    cache["meta"] = meta_cache
+    meta_before = dict(meta_cache)
+
     seen_paths: set[str] = set()
 
-    for _session_id, events_path in iter_all_sessions():
+    for _session_id, events_path in iter_all_sessions(meta_cache):
         cache_key = str(events_path)
         seen_paths.add(cache_key)
-        entry = cache_sessions.get(cache_key)
-
-        if isinstance(entry, dict):
-            typed_entry = cast(dict[str, Any], entry)
-            if not _is_cache_entry_valid(typed_entry, events_path):
-                pass
-            elif isinstance(typed_entry.get("entries"), list) and _apply_entries(
-                daily_stats, cast(list[dict[str, Any]], typed_entry["entries"])
-            ):
-                continue
-
-        entries = _aggregate_session_entries(events_path)
-        _apply_entries(daily_stats, entries)
-
-        try:
-            stat = events_path.stat()
-        except OSError:
+        raw_entry = cache_sessions.get(cache_key)
+        entry = cast(dict[str, Any], raw_entry) if isinstance(raw_entry, dict) else None
+
+        updated = _update_session_entry(events_path, entry)
+        if updated is not None and not _apply_entries(daily_stats, cast(list[dict[str, Any]], updated["entries"])):
+            # Malformed cached totals; rebuild this session from scratch.
+            updated = _update_session_entry(events_path, None)
+            if updated is not None:
+                _apply_entries(daily_stats, cast(list[dict[str, Any]], updated["entries"]))
+        if updated is None:
             continue
-
-        cache_sessions[cache_key] = {
-            "mtime_ns": stat.st_mtime_ns,
-            "size": stat.st_size,
-            "entries": entries,
-        }
-        cache_changed = True
+        if updated is not entry:
+            cache_sessions[cache_key] = updated
+            cache_changed = True
 
     stale_paths = [path for path in cache_sessions if path not in seen_paths]
     if stale_paths:
@@ -411,6 +513,9 @@ def aggregate_all_sessions() -> dict[str, DailyStats]:
             cache_sessions.pop(path, None)
         cache_changed = True
 
+    if meta_cache != meta_before:
+        cache_changed = True
+
     if cache_changed:
         _save_cost_cache(cache)
 
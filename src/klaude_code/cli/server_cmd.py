@@ -87,7 +87,7 @@ def run_command(
 
 @server_app.command("status")
 def status_command() -> None:
-    """Show pid, socket path, uptime, version, and session counts."""
+    """Show pid, socket path, uptime, version, session counts, and web search stats."""
 
     from klaude_code.server.paths import server_socket_path
 
@@ -114,6 +114,15 @@ def status_command() -> None:
         f"{sessions.get('waiting_input', 0)} waiting for input, "
         f"{sessions.get('queued', 0)} queued"
     )
+    for provider in body.get("web_search") or []:
+        latency_ms = provider.get("latency_ms")
+        log(
+            f"  search:   {provider.get('provider')} {provider.get('calls', 0)} calls, "
+            f"{provider.get('errors', 0)} errors, "
+            f"{'-' if latency_ms is None else f'{latency_ms}ms'} avg, "
+            f"{provider.get('hedge_wins', 0)}/{provider.get('hedges', 0)} hedges won, "
+            f"{provider.get('in_flight', 0)} in flight"
+        )
 
     from klaude_code.protocol.version import is_protocol_compatible
     from klaude_code.update import get_code_fingerprint
@@ -6,17 +6,21 @@ invocation, so heavy imports (httpx, server stack) stay inside functions.
 
 from __future__ import annotations
 
+import atexit
 import functools
 import os
 import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from klaude_code.protocol.env_sync import ENV_SYNC_HEADER, encode_env_header
 from klaude_code.protocol.version import is_protocol_compatible
 
+if TYPE_CHECKING:
+    import httpx
+
 
 class ServerNotRunningError(RuntimeError):
     pass
@@ -32,6 +36,12 @@ _RELOAD_WAIT_TIMEOUT = 30.0
 # requests and the check is only meaningful on the first contact.
 _handshake_done = False
 
+# One keep-alive client per process: status, handshake and the actual command
+# share a connection instead of reconnecting for every request.
+_client: httpx.Client | None = None
+_client_socket_path: str | None = None
+_client_close_registered = False
+
 
 @functools.cache
 def _client_env_header() -> str | None:
@@ -71,19 +81,46 @@ def request(
     socket_path = server_socket_path()
     if not socket_path.exists():
         raise ServerNotRunningError(str(socket_path))
-    transport = httpx.HTTPTransport(uds=str(socket_path))
-    headers = None
-    env_header = _client_env_header()
-    if env_header is not None:
-        headers = {ENV_SYNC_HEADER: env_header}
+    client = _get_client(str(socket_path))
     try:
-        with httpx.Client(transport=transport, base_url="http://klaude", timeout=timeout, headers=headers) as client:
-            response = client.request(method, path, json=json_body, params=params)
+        response = client.request(method, path, json=json_body, params=params, timeout=timeout)
     except httpx.TransportError as exc:
+        # The server may have gone away or re-exec'd; reconnect on the next request.
+        _close_client()
         raise ServerNotRunningError(str(socket_path)) from exc
     return response.status_code, response.json()
 
 
+def _get_client(socket_path: str) -> httpx.Client:
+    global _client, _client_socket_path, _client_close_registered
+
+    if _client is not None and _client_socket_path == socket_path:
+        return _client
+
+    import httpx
+
+    _close_client()
+    headers = None
+    env_header = _client_env_header()
+    if env_header is not None:
+        headers = {ENV_SYNC_HEADER: env_header}
+    _client = httpx.Client(transport=httpx.HTTPTransport(uds=socket_path), base_url="http://klaude", headers=headers)
+    _client_socket_path = socket_path
+    if not _client_close_registered:
+        atexit.register(_close_client)
+        _client_close_registered = True
+    return _client
+
+
+def _close_client() -> None:
+    """Close the pooled connection; the next request opens a fresh one."""
+
+    global _client, _client_socket_path
+    client, _client, _client_socket_path = _client, None, None
+    if client is not None:
+        client.close()
+
+
 def _spawn_server_detached() -> None:
     argv0 = Path(sys.argv[0])
     if argv0.exists() and os.access(argv0, os.X_OK):
@@ -338,6 +338,9 @@ class WebSearchConfig(BaseModel):
     """Web search provider chain. Providers are tried in list order."""
 
     providers: list[WebSearchProviderConfig] = Field(default_factory=lambda: [])
+    # Start the fastest provider first and race the next one when it is slower
+    # than usual, instead of waiting on each provider in list order.
+    hedge: bool = False
 
 
 def default_web_search_config() -> WebSearchConfig:
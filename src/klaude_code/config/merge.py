@@ -80,10 +80,11 @@ def _merge_web_search(user: WebSearchConfig | None, builtin: WebSearchConfig) ->
 
     A ``web_search: {}`` section (``providers`` never set) is not an override:
     it inherits the builtin chain. Only an explicit ``providers: []`` disables
-    web search.
+    web search. ``hedge`` is taken from the user section when set there.
     """
+    hedge = user.hedge if user is not None and "hedge" in user.model_fields_set else builtin.hedge
     if user is None or "providers" not in user.model_fields_set:
-        return builtin.model_copy(deep=True)
+        return builtin.model_copy(deep=True, update={"hedge": hedge})
     builtin_by_name = {p.provider: p for p in builtin.providers}
     merged_providers: list[WebSearchProviderConfig] = []
     for entry in user.providers:
@@ -99,7 +100,7 @@ def _merge_web_search(user: WebSearchConfig | None, builtin: WebSearchConfig) ->
                 model=entry.model if entry.model is not None else base.model,
             )
         )
-    return WebSearchConfig(providers=merged_providers)
+    return WebSearchConfig(providers=merged_providers, hedge=hedge)
 
 
 def merge_configs(user_config: UserConfig | None, builtin_config: Config) -> Config:
@@ -63,6 +63,15 @@ DEFAULT_MAX_TOKENS = 32000  # Default maximum tokens for LLM responses
 DEFAULT_TEMPERATURE = 1.0  # Default temperature for LLM requests
 DEFAULT_ANTHROPIC_THINKING_BUDGET_TOKENS = 2048  # Default thinking budget tokens for Anthropic models
 
+# Speculative compaction summarizes the compactable prefix in the background once
+# context usage reaches this percentage of the threshold, so the threshold itself
+# only commits the ready summary. 0 disables speculation.
+SPECULATIVE_COMPACTION_WATERMARK_PERCENT = _get_int_env("KLAUDE_SPECULATIVE_COMPACTION_WATERMARK_PERCENT", 80)
+# Summaries started per compaction cycle; discarded runs (rewind, stale prefix) count too.
+SPECULATIVE_COMPACTION_MAX_RUNS = _get_int_env("KLAUDE_SPECULATIVE_COMPACTION_MAX_RUNS", 2)
+# Prefixes larger than one summarizer call are summarized in segments, this many at a time.
+COMPACTION_SEGMENT_CONCURRENCY = _get_int_env("KLAUDE_COMPACTION_SEGMENT_CONCURRENCY", 4)
+
 # =============================================================================
 # Tool - Read
 # =============================================================================
@@ -101,6 +110,12 @@ BLOCKED_DEVICE_PATHS = frozenset(
 BASH_DEFAULT_TIMEOUT_MS = 120000  # Default timeout for bash commands (milliseconds)
 BASH_TERMINATE_TIMEOUT_SEC = 1.0  # Timeout before escalating to SIGKILL (seconds)
 BASH_MODE_SESSION_OUTPUT_MAX_BYTES = 200 * 1024 * 1024  # Max command output captured for session history
+# Capture Bash tool output through event-loop-watched pipes instead of polling temp files (POSIX only)
+BASH_PIPE_CAPTURE_ENABLED = _get_int_env("KLAUDE_BASH_PIPE_CAPTURE", 1) != 0
+BASH_OUTPUT_MEMORY_MAX_CHARS = 1_000_000  # Per-stream chars kept in memory before spilling to the offload dir
+# Keep one long-lived shell per session instead of spawning `bash -lc` per command (opt-in, POSIX only)
+BASH_PERSISTENT_SHELL_ENABLED = _get_int_env("KLAUDE_BASH_PERSISTENT_SHELL", 0) != 0
+BASH_PERSISTENT_SHELL_IDLE_TIMEOUT_SEC = 30 * 60  # Idle persistent shells are closed after this long
 
 # =============================================================================
 # Tool - Web
@@ -110,6 +125,9 @@ WEB_FETCH_DEFAULT_TIMEOUT_SEC = 30  # Default timeout for web fetch requests (se
 WEB_FETCH_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"  # User-Agent header for web requests
 WEB_FETCH_MAX_RESPONSE_BYTES = 5 * 1024 * 1024  # Maximum response body size (5MB)
 WEB_FETCH_MAX_REDIRECTS = 10  # Maximum number of redirects to follow
+WEB_FETCH_MAX_CONNECTIONS = 64  # Connections in the pool shared by all web fetches of a process
+WEB_FETCH_MAX_CONNECTIONS_PER_HOST = _get_int_env("KLAUDE_WEB_FETCH_MAX_CONNECTIONS_PER_HOST", 6)  # Concurrent per host
+WEB_FETCH_CONVERSION_WORKERS = _get_int_env("KLAUDE_WEB_FETCH_CONVERSION_WORKERS", 4)  # HTML-to-Markdown threads
 URL_FILENAME_MAX_LENGTH = 80  # Maximum length for extracting filename from URL
 WEB_SEARCH_DEFAULT_MAX_RESULTS = 10  # Default number of search results
 WEB_SEARCH_MAX_RESULTS_LIMIT = 20  # Maximum number of search results allowed
@@ -120,8 +138,11 @@ WEB_SEARCH_DEEPSEEK_MAX_TOKENS = 4096  # max_tokens for the DeepSeek Anthropic M
 WEB_SEARCH_DEEPSEEK_MAX_USES = 5  # max_uses for the DeepSeek native web_search server tool
 WEB_SEARCH_DEEPSEEK_API_VERSION = "2023-06-01"  # anthropic-version header for the DeepSeek search call
 WEB_SEARCH_SNIPPET_MAX_CHARS = 2000  # Per-result snippet length cap
+WEB_SEARCH_HEDGE_PERCENTILE = _get_int_env("KLAUDE_WEB_SEARCH_HEDGE_PERCENTILE", 90)  # Primary latency before hedging
+WEB_SEARCH_HEDGE_DEFAULT_DELAY_MS = 3000  # Hedge delay until a provider has enough latency samples
 WEB_CACHE_TTL_SECONDS = 900  # TTL for web search/fetch cache (15 minutes)
 WEB_CACHE_MAX_ENTRIES = 100  # Maximum entries in web cache
+WEB_DISK_CACHE_MAX_BYTES = _get_int_env("KLAUDE_WEB_DISK_CACHE_MAX_BYTES", 64 * 1024 * 1024)  # 0 disables disk cache
 
 # =============================================================================
 # Tool - Diff
@@ -129,6 +150,9 @@ WEB_CACHE_MAX_ENTRIES = 100  # Maximum entries in web cache
 
 DIFF_MAX_LINE_LENGTH_FOR_CHAR_DIFF = 2000  # Maximum line length for character-level diff
 DIFF_DEFAULT_CONTEXT_LINES = 2  # Default number of context lines in diff output
+DIFF_FAST_LINE_THRESHOLD = 5000  # Combined line count above which line diffs use the line-hash Myers engine
+DIFF_FAST_TIMEOUT_SEC = 2.0  # Time budget for the Myers engine before it settles for a coarser (still valid) diff
+DIFF_CHAR_SPAN_BUDGET_CHARS = 200_000  # Total chars of replaced line pairs that get char-level spans per file
 
 # =============================================================================
 # Tool - Output Truncation
@@ -141,6 +165,8 @@ TOOL_OUTPUT_MAX_LINES = 2000  # Maximum lines for tool output before truncation
 TOOL_OUTPUT_DISPLAY_HEAD_LINES = 1000  # Lines to show from the beginning of truncated output
 TOOL_OUTPUT_DISPLAY_TAIL_LINES = 1000  # Lines to show from the end of truncated output
 TOOL_OUTPUT_TRUNCATION_DIR = get_system_temp()  # Directory for saving full truncated output
+TOOL_OUTPUT_OFFLOAD_MAX_AGE_SEC = 7 * 24 * 60 * 60  # Offloaded outputs unused for this long are deleted
+TOOL_OUTPUT_OFFLOAD_DEDUP_MAX_BYTES = 64 * 1024 * 1024  # Largest streamed spill file hashed for dedup
 
 # =============================================================================
 # Attachment - DeveloperMessage reminder truncation
@@ -158,6 +184,11 @@ ATTACHMENT_DIFF_SOURCE_MAX_BYTES = 256 * 1024  # If old+new content exceeds this
 
 ATTACHMENT_SKILL_MAX_LINES = 500  # Lines to keep from a single SKILL.md inlined via /skill:xxx
 
+# Skill and memory discovery caches validate entries by mtime. Like Git's
+# racy-clean check, anything modified this recently when read is not cached,
+# since a second write in the same coarse timestamp tick would go unnoticed.
+DISCOVERY_CACHE_RACY_WINDOW_NS = 2_000_000_000
+
 # =============================================================================
 # UI - Display
 # =============================================================================
@@ -179,6 +210,10 @@ URL_TRUNCATE_MAX_LENGTH = 400  # Maximum length for URL truncation in display
 QUERY_DISPLAY_TRUNCATE_LENGTH = 80  # Maximum length for search query display
 WEB_SEARCH_COMPACT_RESULT_LIMIT = 3  # Search result titles listed in compact transcript mode
 NOTIFY_COMPACT_LIMIT = 160  # Maximum length for notification body text
+# Transcript repaints (resize, Ctrl+O, reattach) render about this many screens
+# of the newest history; older turns wait for /refresh. 0 always renders all.
+TRANSCRIPT_REBUILD_SCREENS = _get_int_env("KLAUDE_TRANSCRIPT_REBUILD_SCREENS", 3)
+TRANSCRIPT_REBUILD_CACHED_WIDTHS = 2  # Terminal widths whose per-event rebuild output is kept
 
 # =============================================================================
 # UI - Markdown Streaming
@@ -187,9 +222,10 @@ NOTIFY_COMPACT_LIMIT = 160  # Maximum length for notification body text
 UI_REFRESH_RATE_FPS = 10  # UI refresh rate (frames per second)
 MARKDOWN_STREAM_LIVE_REPAINT_ENABLED = False  # Enable live area for streaming markdown
 MARKDOWN_STREAM_SYNCHRONIZED_OUTPUT_ENABLED = True  # Use terminal "Synchronized Output" to reduce flicker
-# Each MarkdownStream frame re-parses the whole buffer with markdown-it (pure
-# Python, ~4ms per 10KB); at the base cadence long messages saturate the event
-# loop. Past this buffer size the frame interval scales up linearly, capped.
+# Each MarkdownStream frame re-parses the text after its last rendered block
+# checkpoint with markdown-it (pure Python, ~4ms per 10KB); at the base cadence
+# a long unfinished block saturates the event loop. Past this many unrendered
+# chars the frame interval scales up linearly, capped.
 MARKDOWN_STREAM_ADAPTIVE_DELAY_CHARS = 20_000
 MARKDOWN_STREAM_MAX_DELAY_S = 1.0
 MARKDOWN_LEFT_MARGIN = 2  # Left margin (columns) for markdown rendering
@@ -236,6 +272,15 @@ DEFAULT_DEBUG_LOG_DIR = Path.home() / ".klaude" / "logs"  # Default debug log di
 DEFAULT_DEBUG_LOG_FILE = DEFAULT_DEBUG_LOG_DIR / "debug.log"  # Default debug log file path
 LOG_MAX_BYTES = 10 * 1024 * 1024  # Maximum log file size before rotation (10MB)
 LOG_BACKUP_COUNT = 3  # Number of backup log files to keep
+LOG_QUEUE_MAX_RECORDS = 10_000  # Debug records buffered for the file-writer thread before new ones are dropped
+
+# =============================================================================
+# Server - Session Memory
+# =============================================================================
+
+# Idle sessions are evicted least-recently-used first once the estimated
+# resident size of all loaded sessions exceeds this budget; 0 disables it.
+SESSION_MEMORY_BUDGET_BYTES = _get_int_env("KLAUDE_SESSION_MEMORY_BUDGET_BYTES", 512 * 1024 * 1024)
 
 # =============================================================================
 # Project Paths
@@ -168,6 +168,9 @@ class SessionActor:
         self.clear_execution_state()
 
     def set_agent(self, agent: Agent) -> None:
+        previous = self._state.agent
+        if previous is not None and previous is not agent:
+            previous.cancel_background_work()
         self._state.agent = agent
         self._mark_active()
 
@@ -182,6 +185,8 @@ class SessionActor:
         return self._state.llm_clients
 
     def clear_execution_state(self) -> None:
+        if self._state.agent is not None:
+            self._state.agent.cancel_background_work()
         self._state.agent = None
         self._state.llm_clients = None
         self._state.task_handles.clear()
@@ -335,6 +340,13 @@ class SessionActor:
             config=self.config_snapshot(),
         )
 
+    def estimate_resident_bytes(self) -> int:
+        """Approximate memory held by the loaded session; 0 when no agent is loaded."""
+        agent = self._state.agent
+        if agent is None:
+            return 0
+        return agent.session.estimate_resident_bytes()
+
     def has_active_root_task(self) -> bool:
         return self._state.active_root_task is not None
 
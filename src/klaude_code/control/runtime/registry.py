@@ -195,7 +195,12 @@ class SessionRegistry:
             if runtime_id == session_id:
                 self._operation_runtime_ids.pop(operation_id, None)
 
+        agent = runtime.get_agent()
         await runtime.stop()
+        if agent is not None:
+            # The store keeps a decoded copy for fast reloads; a closed session
+            # should not stay resident through it.
+            agent.session.release_history_cache()
         return True
 
     async def reclaim_idle_sessions(
@@ -203,7 +208,14 @@ class SessionRegistry:
         *,
         idle_for_seconds: float = 0.0,
         exclude: set[str] | None = None,
+        memory_budget_bytes: int | None = None,
     ) -> list[str]:
+        """Close sessions idle for at least ``idle_for_seconds``.
+
+        With ``memory_budget_bytes``, also close idle sessions least recently
+        used first while the loaded sessions' estimated size exceeds it.
+        Closed sessions are reloaded from disk by their next operation.
+        """
         reclaimed: list[str] = []
         now = time.monotonic()
         for session_id in list(self._session_actors):
@@ -218,6 +230,41 @@ class SessionRegistry:
             closed = await self.close_session(session_id, force=False)
             if closed:
                 reclaimed.append(session_id)
+        if memory_budget_bytes is not None:
+            reclaimed.extend(await self._reclaim_over_budget(memory_budget_bytes, exclude=exclude))
+        return reclaimed
+
+    def memory_usage(self) -> dict[str, int]:
+        """Estimated resident bytes per loaded session."""
+        return {session_id: runtime.estimate_resident_bytes() for session_id, runtime in self._session_actors.items()}
+
+    async def _reclaim_over_budget(self, budget_bytes: int, *, exclude: set[str] | None) -> list[str]:
+        usage = self.memory_usage()
+        total = sum(usage.values())
+        if total <= budget_bytes:
+            return []
+        now = time.monotonic()
+        candidates: list[tuple[float, str]] = []
+        for session_id, runtime in self._session_actors.items():
+            if exclude and session_id in exclude:
+                continue
+            idle_seconds = runtime.idle_for_seconds(now)
+            if idle_seconds is not None:
+                candidates.append((idle_seconds, session_id))
+        candidates.sort(reverse=True)
+
+        reclaimed: list[str] = []
+        for _idle_seconds, session_id in candidates:
+            if total <= budget_bytes:
+                break
+            if await self.close_session(session_id, force=False):
+                total -= usage.get(session_id, 0)
+                reclaimed.append(session_id)
+        if reclaimed:
+            log_debug(
+                f"[registry] evicted {len(reclaimed)} idle sessions over the memory budget, ~{total} bytes loaded",
+                debug_type=DebugType.EXECUTION,
+            )
         return reclaimed
 
     def has_session_actor(self, runtime_id: str) -> bool:
@@ -1,14 +1,19 @@
+import atexit
+import contextlib
 import gzip
 import json
 import logging
 import os
+import queue
 import shutil
 import subprocess
+import threading
+import time
 from base64 import b64encode
 from collections.abc import Callable, Iterable
 from datetime import datetime, timedelta
 from enum import Enum
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import cast
 
@@ -21,6 +26,7 @@ from klaude_code.const import (
     DEFAULT_DEBUG_LOG_FILE,
     LOG_BACKUP_COUNT,
     LOG_MAX_BYTES,
+    LOG_QUEUE_MAX_RECORDS,
 )
 
 # Module-level logger
@@ -48,6 +54,8 @@ class DebugType(str, Enum):
 
 # Handler references for reconfiguration
 _file_handler: RotatingFileHandler | None = None
+_queue_handler: "DroppingQueueHandler | None" = None
+_queue_listener: "DrainingQueueListener | None" = None
 _console_handler: RichHandler | None = None
 _debug_enabled = False
 _current_log_file: Path | None = None
@@ -72,6 +80,113 @@ class GzipRotatingFileHandler(RotatingFileHandler):
         Path(source).unlink(missing_ok=True)
 
 
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller.
+
+    File writes, rotation and gzip compression happen on a QueueListener thread,
+    so debug logging from the event loop costs one formatted record and a queue
+    put. When the writer falls behind and the bounded queue is full, records are
+    dropped and counted; the next record that fits is preceded by a warning with
+    the number lost.
+    """
+
+    def __init__(self, record_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(record_queue)
+        self._record_queue = record_queue
+        self._drop_lock = threading.Lock()
+        self._pending_drops = 0
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._pending_drops:
+            with self._drop_lock:
+                pending, self._pending_drops = self._pending_drops, 0
+            if pending and not self._put(self._drop_notice(pending, record)):
+                with self._drop_lock:
+                    self._pending_drops += pending
+        if not self._put(record):
+            with self._drop_lock:
+                self._pending_drops += 1
+                self.dropped += 1
+
+    def flush(self) -> None:
+        """Wait (bounded) until the listener has written everything queued so far."""
+
+        deadline = time.monotonic() + 5.0
+        while self._record_queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def _put(self, record: logging.LogRecord) -> bool:
+        try:
+            self._record_queue.put_nowait(record)
+        except queue.Full:
+            return False
+        return True
+
+    @staticmethod
+    def _drop_notice(count: int, template: logging.LogRecord) -> logging.LogRecord:
+        return logging.makeLogRecord(
+            {
+                "name": template.name,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"dropped {count} log records: writer thread fell behind",
+                "created": template.created,
+                "debug_type": DebugType.GENERAL,
+                "debug_type_label": DebugType.GENERAL.value.upper(),
+            }
+        )
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener whose stop sentinel always fits in the bounded queue.
+
+    The stock listener enqueues its sentinel with ``put_nowait``, which raises
+    ``queue.Full`` exactly when the writer has fallen behind. Here the sentinel
+    waits for the writer to make room, and after a bounded wait it displaces the
+    oldest queued record instead.
+    """
+
+    sentinel_timeout_s = 5.0
+
+    def enqueue_sentinel(self) -> None:
+        record_queue = cast("queue.Queue[logging.LogRecord | None]", self.queue)
+        # QueueListener's sentinel is None (``_sentinel`` is not in the stubs).
+        try:
+            record_queue.put(None, timeout=self.sentinel_timeout_s)
+            return
+        except queue.Full:
+            pass
+        while True:
+            try:
+                record_queue.put_nowait(None)
+                return
+            except queue.Full:
+                with contextlib.suppress(queue.Empty):
+                    record_queue.get_nowait()
+                    record_queue.task_done()
+
+
+def _stop_file_logging() -> None:
+    """Drain the queue, stop the writer thread and close the file."""
+
+    global _file_handler, _queue_handler, _queue_listener
+
+    if _queue_handler is not None:
+        logger.removeHandler(_queue_handler)
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    # Only forget the pair once the listener has stopped, so a failed stop can be retried.
+    _queue_handler = None
+    _queue_listener = None
+    if _file_handler is not None:
+        _file_handler.close()
+        _file_handler = None
+
+
+atexit.register(_stop_file_logging)
+
+
 def set_debug_logging(
     enabled: bool,
     *,
@@ -85,15 +200,12 @@ def set_debug_logging(
         write_to_file: If True, write to file; if False, output to console
         log_file: Path to the log file (default: debug.log)
     """
-    global _file_handler, _console_handler, _debug_enabled, _current_log_file
+    global _file_handler, _queue_handler, _queue_listener, _console_handler, _debug_enabled, _current_log_file
 
     _debug_enabled = enabled
 
     # Remove existing handlers
-    if _file_handler is not None:
-        logger.removeHandler(_file_handler)
-        _file_handler.close()
-        _file_handler = None
+    _stop_file_logging()
     if _console_handler is not None:
         logger.removeHandler(_console_handler)
         _console_handler = None
@@ -124,7 +236,12 @@ def set_debug_logging(
         )
         _file_handler.setLevel(logging.DEBUG)
         _file_handler.setFormatter(logging.Formatter("[%(asctime)s] %(debug_type_label)-12s %(message)s"))
-        logger.addHandler(_file_handler)
+        record_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=LOG_QUEUE_MAX_RECORDS)
+        _queue_handler = DroppingQueueHandler(record_queue)
+        _queue_handler.setLevel(logging.DEBUG)
+        _queue_listener = DrainingQueueListener(record_queue, _file_handler, respect_handler_level=True)
+        _queue_listener.start()
+        logger.addHandler(_queue_handler)
     else:
         # Console handler with Rich formatting
         _console_handler = RichHandler(
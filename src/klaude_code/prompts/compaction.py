@@ -96,6 +96,24 @@ Summarize the prefix to provide context for the retained suffix:
 
 Be concise. Focus on what's needed to understand the kept suffix."""
 
+SEGMENT_SUMMARIZATION_PROMPT = """This is segment {index} of {total} of a conversation too long to summarize in one pass. Each segment is summarized separately and the results are merged afterwards.
+
+Summarize only this segment, in chronological order:
+- User requests, constraints, and preferences stated here
+- Work done and its outcome, with exact file paths and function names
+- Key decisions with brief rationale
+- Errors encountered, with exact messages, and whether they were resolved
+- Anything still unfinished at the end of the segment
+
+IMPORTANT: Do NOT include any content from <system-reminder> tags. Do NOT continue the conversation.
+
+Be concise."""
+
+SEGMENT_SUMMARIES_HEADER = (
+    "This conversation was too long to summarize in one pass. It is given below as summaries of consecutive "
+    "segments, oldest first."
+)
+
 COMPACTION_SUMMARY_PREFIX = """The conversation history before this point was compacted into the following summary:
 """
 
@@ -512,8 +512,12 @@ class RefreshDisplayEvent(Event):
     """Display-local control: clear the terminal and re-render the transcript from the display's event tape.
 
     Consumed by the interactive TUI display only; other consumers ignore it.
+    Automatic repaints (resize, theme switch) only render the newest screens of
+    history; ``full_history`` asks for the whole transcript.
     """
 
+    full_history: bool = False
+
 
 type ReplayEventUnion = (
     TaskStartEvent
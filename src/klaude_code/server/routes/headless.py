@@ -201,6 +201,8 @@ def _serialize_row(
         "created_at": summary.created_at,
         "updated_at": summary.updated_at,
         "archived": summary.archived,
+        "total_cost": summary.total_cost,
+        "currency": summary.cost_currency,
         "activity": _activity_label(state, headless, summary.id, session_state),
         # This remains true across the idle teardown window between queued
         # follow-up turns. CLI wait uses it as the stable server contract.
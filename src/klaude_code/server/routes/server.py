@@ -6,10 +6,12 @@ from typing import Any, Final
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from klaude_code.const import SESSION_MEMORY_BUDGET_BYTES
 from klaude_code.protocol.version import PROTOCOL_VERSION
 from klaude_code.server.lifecycle import ServerLifecycle
 from klaude_code.server.session_state import derive_session_state_from_snapshot
 from klaude_code.server.state import ServerAppState, get_server_state
+from klaude_code.tool.web.web_search_tool import search_provider_stats
 from klaude_code.update import get_display_version
 
 router = APIRouter(prefix="/api/server", tags=["server"])
@@ -48,6 +50,24 @@ def list_active_sessions(state: ServerAppState) -> list[dict[str, str]]:
     return active
 
 
+def web_search_provider_summary() -> list[dict[str, Any]]:
+    """Per-provider WebSearch statistics for this process, in first-use order."""
+
+    return [
+        {
+            "provider": name,
+            "calls": stats.calls,
+            "errors": stats.errors,
+            "in_flight": stats.in_flight,
+            "hedges": stats.hedges,
+            "hedge_wins": stats.hedge_wins,
+            "latency_ms": round(stats.latency_ewma_s * 1000) if stats.latency_ewma_s is not None else None,
+            "error_rate": round(stats.error_ewma, 3),
+        }
+        for name, stats in search_provider_stats().items()
+    ]
+
+
 @router.get("/status")
 async def server_status(state: ServerAppState = _SERVER_STATE_DEP) -> dict[str, Any]:
     lifecycle = _require_lifecycle(state)
@@ -66,6 +86,38 @@ async def server_status(state: ServerAppState = _SERVER_STATE_DEP) -> dict[str,
             "waiting_input": sum(1 for item in active_sessions if item["state"] == "waiting_input"),
             "queued": sum(1 for item in active_sessions if item["state"] == "queued"),
         },
+        "web_search": web_search_provider_summary(),
+    }
+
+
+@router.get("/memory")
+async def server_memory(state: ServerAppState = _SERVER_STATE_DEP) -> dict[str, Any]:
+    """Estimated resident size of each loaded session, largest first.
+
+    ``resident_bytes`` covers the session's history and file tracker (what
+    the idle reaper weighs against the memory budget); ``tape_bytes`` is the
+    attach-replay tape kept alongside it.
+    """
+    registry = state.runtime.session_registry
+    usage = registry.memory_usage()
+    sessions: list[dict[str, Any]] = []
+    for actor in registry.list_session_actors():
+        agent = actor.get_agent()
+        sessions.append(
+            {
+                "session_id": actor.session_id,
+                "history_items": len(agent.session.conversation_history) if agent is not None else 0,
+                "resident_bytes": usage.get(actor.session_id, 0),
+                "tape_bytes": state.tapes.estimate_bytes(actor.session_id) if state.tapes is not None else 0,
+                "idle_seconds": actor.idle_for_seconds(),
+            }
+        )
+    sessions.sort(key=lambda item: item["resident_bytes"] + item["tape_bytes"], reverse=True)
+    return {
+        "ok": True,
+        "budget_bytes": SESSION_MEMORY_BUDGET_BYTES or None,
+        "total_bytes": sum(item["resident_bytes"] + item["tape_bytes"] for item in sessions),
+        "sessions": sessions,
     }
 
 
@@ -356,12 +356,13 @@ def _validate_incoming_frame(payload: dict[str, Any], frame_type: str) -> Incomi
 
 
 def _collect_descendant_session_ids(session_id: str, work_dir: Path) -> set[str]:
-    """Collect all descendant sub-agent session IDs by scanning session histories.
+    """Collect all descendant sub-agent session IDs from the session tree index.
 
-    Uses BFS to find SpawnSubAgentEntry items in the parent session and recurse
-    into child sessions.  This is needed when there is no in-memory session
-    snapshot (e.g. reattaching after a server restart) so that sub-agent
-    events can be forwarded via session-id matching.
+    Walks each session's ``child_session_ids`` meta (BFS), falling back to
+    scanning SpawnSubAgentEntry items for sessions written before the index.
+    This is needed when there is no in-memory session snapshot (e.g.
+    reattaching after a server restart) so that sub-agent events can be
+    forwarded via session-id matching.
     """
     result: set[str] = set()
     queue = [session_id]
@@ -370,16 +371,20 @@ def _collect_descendant_session_ids(session_id: str, work_dir: Path) -> set[str]
     while queue:
         current_id = queue.pop(0)
         try:
-            history = store.load_history(current_id)
+            child_ids = store.load_child_session_ids(current_id)
+            if child_ids is None:
+                child_ids = [
+                    item.session_id
+                    for item in store.iter_history(current_id)
+                    if isinstance(item, message.SpawnSubAgentEntry)
+                ]
         except Exception:
             continue
-        for item in history:
-            if isinstance(item, message.SpawnSubAgentEntry):
-                child_id = item.session_id
-                if child_id not in visited:
-                    visited.add(child_id)
-                    result.add(child_id)
-                    queue.append(child_id)
+        for child_id in child_ids:
+            if child_id not in visited:
+                visited.add(child_id)
+                result.add(child_id)
+                queue.append(child_id)
     return result
 
 
@@ -829,7 +834,13 @@ async def session_websocket(websocket: WebSocket, session_id: str) -> None:
                     registry = cast(Any, state.runtime.session_registry)
                     actor = registry.get_session_actor(session_id)
                     agent = actor.get_agent() if actor is not None else None
-                    if agent is not None and agent.session.messages_count == 0 and actor.snapshot().is_idle:
+                    if (
+                        agent is not None
+                        and agent.session.messages_count == 0
+                        and actor.snapshot().is_idle
+                        # A rewound session may still be the persisted base of a fork.
+                        and not get_store_for_path(agent.session.work_dir).is_history_base(session_id)
+                    ):
                         closed = await state.runtime.close_session(session_id)
                         if closed:
                             if state.tapes is not None:
@@ -8,6 +8,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, cast
 
+from klaude_code.session.meta import parse_session_stats
+
 type TodoSummary = dict[str, str]
 type FileChangeSummary = dict[str, list[str] | int | dict[str, dict[str, int]]]
 
@@ -49,6 +51,8 @@ class SessionSummary:
     approval_policy: str | None = None
     model_config_name: str | None = None
     parent_session_id: str | None = None
+    total_cost: float | None = None
+    cost_currency: str = "USD"
 
 
 def load_session_summary_from_meta(data: dict[str, Any], *, fallback_session_id: str) -> SessionSummary | None:
@@ -155,6 +159,9 @@ def load_session_summary_from_meta(data: dict[str, Any], *, fallback_session_id:
         "file_diffs": file_diffs,
     }
 
+    stats = parse_session_stats(data.get("stats"))
+    total_usage = stats.total_usage() if stats is not None else None
+
     def _optional_str(key: str) -> str | None:
         value = data.get(key)
         return value if isinstance(value, str) and value else None
@@ -178,6 +185,8 @@ def load_session_summary_from_meta(data: dict[str, Any], *, fallback_session_id:
         approval_policy=_optional_str("approval_policy"),
         model_config_name=_optional_str("model_config_name"),
         parent_session_id=_optional_str("parent_session_id"),
+        total_cost=total_usage.total_cost if total_usage is not None else None,
+        cost_currency=total_usage.currency if total_usage is not None else "USD",
     )
 
 
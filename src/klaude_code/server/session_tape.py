@@ -19,6 +19,7 @@ from collections.abc import Callable
 from dataclasses import dataclass
 
 from klaude_code.protocol import events
+from klaude_code.session.history import estimate_resident_bytes
 
 # Consecutive streaming deltas of the same kind collapse into one envelope so
 # tape memory stays proportional to transcript size (mirrors
@@ -137,5 +138,12 @@ class SessionEventTapes:
             return
         tape.reset(history_len)
 
+    def estimate_bytes(self, session_id: str) -> int:
+        """Approximate memory held by the session's tape."""
+        tape = self._tapes.get(session_id)
+        if tape is None:
+            return 0
+        return sum(estimate_resident_bytes(envelope) for envelope in tape.cut().envelopes)
+
     def drop(self, session_id: str) -> None:
         self._tapes.pop(session_id, None)
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
+from typing import cast
+
+from pydantic import BaseModel
 
 from klaude_code.prompts.messages import CHECKPOINT_TEMPLATE
 from klaude_code.protocol import message
 from klaude_code.protocol.models import Usage
 
+# Rough per-object cost (header, dict, slots) added on top of string payloads.
+_OBJECT_OVERHEAD_BYTES = 64
 _CHECKPOINT_RE = re.compile(r"<system-reminder>Checkpoint (\d+)</system-reminder>")
 _XML_TAG_RE_CACHE: dict[str, re.Pattern[str]] = {}
 
@@ -102,6 +107,27 @@ def rebuild_loaded_history(raw_history: Iterable[message.HistoryEvent]) -> list[
     return [normalized_compaction, *kept]
 
 
+def estimate_resident_bytes(value: object) -> int:
+    """Approximate memory held by a history item (or any nested value).
+
+    Counts string and bytes payloads plus a fixed overhead per object, which
+    is what dominates history size (text, tool output, inline images). Good
+    enough to rank sessions for eviction; not an exact ``sys.getsizeof`` walk.
+    """
+    if isinstance(value, str | bytes):
+        return len(value)
+    if isinstance(value, BaseModel):
+        return _OBJECT_OVERHEAD_BYTES + sum(estimate_resident_bytes(field) for field in value.__dict__.values())
+    if isinstance(value, Mapping):
+        items = cast(Mapping[object, object], value).items()
+        return _OBJECT_OVERHEAD_BYTES + sum(
+            estimate_resident_bytes(key) + estimate_resident_bytes(field) for key, field in items
+        )
+    if isinstance(value, list | tuple | set | frozenset):
+        return _OBJECT_OVERHEAD_BYTES + sum(estimate_resident_bytes(field) for field in cast(Iterable[object], value))
+    return 0 if value is None else 16
+
+
 def update_last_request_usage(
     usage: Usage | None,
     history: Iterable[message.HistoryEvent],
@@ -130,6 +156,7 @@ def last_request_usage(history: Iterable[message.HistoryEvent]) -> Usage | None:
 
 
 __all__ = [
+    "estimate_resident_bytes",
     "extract_checkpoint_id",
     "extract_xml_tag",
     "find_checkpoint_index_in_history",
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, cast
 
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
 from klaude_code.protocol import llm_param, message
 from klaude_code.protocol.models import (
@@ -15,6 +15,18 @@ from klaude_code.protocol.models import (
     SubAgentState,
     TodoItem,
 )
+from klaude_code.session.stats import SessionStats
+
+
+class HistoryBase(BaseModel):
+    """Marks a fork whose history starts with another session's.
+
+    The session's history is the first ``length`` items of ``session_id``'s
+    (itself possibly based) raw history followed by its own events.jsonl.
+    """
+
+    session_id: str
+    length: int
 
 
 @dataclass(frozen=True)
@@ -45,6 +57,10 @@ class LoadedSessionMeta:
     approval_policy: str | None
     parent_session_id: str | None
     vanilla: bool
+    stats: SessionStats | None = None
+    history_base: HistoryBase | None = None
+    # None for sessions written before sub-agent children were indexed in meta.
+    child_session_ids: list[str] | None = None
 
 
 def read_json_dict(path: Path) -> dict[str, Any] | None:
@@ -149,6 +165,30 @@ def _parse_headless_queued_turn(raw: dict[str, Any], *, fallback_enqueued_at: fl
     )
 
 
+def parse_session_stats(raw: object) -> SessionStats | None:
+    if not isinstance(raw, dict):
+        return None
+    try:
+        return SessionStats.model_validate(raw)
+    except ValidationError:
+        return None
+
+
+def parse_history_base(raw: object) -> HistoryBase | None:
+    if not isinstance(raw, dict):
+        return None
+    try:
+        return HistoryBase.model_validate(raw)
+    except ValidationError:
+        return None
+
+
+def parse_child_session_ids(raw: object) -> list[str] | None:
+    if not isinstance(raw, list):
+        return None
+    return [item for item in cast(list[object], raw) if isinstance(item, str) and item]
+
+
 def _parse_optional_str(raw: object) -> str | None:
     if isinstance(raw, str) and raw:
         return raw
@@ -206,7 +246,18 @@ def parse_session_meta(raw: dict[str, Any], *, work_dir: Path) -> LoadedSessionM
         approval_policy=_parse_optional_str(raw.get("approval_policy")),
         parent_session_id=_parse_optional_str(raw.get("parent_session_id")),
         vanilla=bool(raw.get("vanilla", False)),
+        stats=parse_session_stats(raw.get("stats")),
+        history_base=parse_history_base(raw.get("history_base")),
+        child_session_ids=parse_child_session_ids(raw.get("child_session_ids")),
     )
 
 
-__all__ = ["LoadedSessionMeta", "parse_session_meta", "read_json_dict"]
+__all__ = [
+    "HistoryBase",
+    "LoadedSessionMeta",
+    "parse_child_session_ids",
+    "parse_history_base",
+    "parse_session_meta",
+    "parse_session_stats",
+    "read_json_dict",
+]
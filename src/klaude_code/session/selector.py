@@ -22,6 +22,8 @@ class SessionSelectOption:
     messages_count: str
     relative_time: str
     model_name: str
+    total_cost: float | None = None
+    currency: str = "USD"
 
 
 def _format_message(msg: str) -> str:
@@ -78,6 +80,8 @@ def build_session_select_options(work_dir: Path) -> list[SessionSelectOption]:
                 messages_count=msg_count,
                 relative_time=_format_time(s.updated_at),
                 model_name=model,
+                total_cost=s.total_cost,
+                currency=s.currency,
             )
         )
 
@@ -22,6 +22,7 @@ from klaude_code.protocol.models import (
     Usage,
 )
 from klaude_code.session.history import (
+    estimate_resident_bytes,
     extract_checkpoint_id,
     extract_xml_tag,
     find_checkpoint_index_in_history,
@@ -29,7 +30,8 @@ from klaude_code.session.history import (
     rebuild_loaded_history,
     update_last_request_usage,
 )
-from klaude_code.session.meta import parse_session_meta, read_json_dict
+from klaude_code.session.meta import HistoryBase, parse_session_meta, parse_session_stats, read_json_dict
+from klaude_code.session.stats import SessionStats
 from klaude_code.session.store import JsonlSessionStore, build_meta_snapshot
 from klaude_code.session.store_registry import get_store_for_path
 
@@ -50,6 +52,14 @@ def _first_prompt_text(history: Sequence[message.HistoryEvent]) -> str:
     return ""
 
 
+def _spawned_session_ids(history: Iterable[message.HistoryEvent]) -> list[str]:
+    spawned: list[str] = []
+    for item in history:
+        if isinstance(item, message.SpawnSubAgentEntry) and item.session_id not in spawned:
+            spawned.append(item.session_id)
+    return spawned
+
+
 class Session(BaseModel):
     id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     work_dir: Path
@@ -75,8 +85,13 @@ class Session(BaseModel):
     approval_policy: str | None = None
     # Set on sessions spawned by another session's Agent tool call.
     parent_session_id: str | None = None
+    # Sessions spawned from this one (SpawnSubAgentEntry), in spawn order; kept
+    # in meta so sub-agent trees can be walked without loading histories.
+    child_session_ids: list[str] = Field(default_factory=list)  # pyright: ignore[reportUnknownVariableType]
     # Vanilla mode (basic tools, no system prompts) is a per-session flag.
     vanilla: bool = False
+    # Set on forks that share their parent's persisted history prefix.
+    history_base: HistoryBase | None = None
 
     next_checkpoint_id: int = 0
 
@@ -92,6 +107,18 @@ class Session(BaseModel):
     _messages_count_cache: int | None = PrivateAttr(default=None)
     _user_messages_cache: list[str] | None = PrivateAttr(default=None)
     _last_request_usage: Usage | None = PrivateAttr(default=None)
+    _stats: SessionStats | None = PrivateAttr(default=None)
+    # Length of conversation_history that _stats covers; a mismatch means the
+    # history was replaced or edited behind append_history and the totals are stale.
+    _stats_history_len: int = PrivateAttr(default=0)
+    # Persisted history items (base chain included), and how many leading
+    # conversation_history items are exactly those items. Forks within that
+    # prefix can reference the events instead of copying them.
+    _raw_len: int = PrivateAttr(default=0)
+    _raw_prefix_len: int = PrivateAttr(default=0)
+    # (history length, id of the last item, estimated bytes) of the last
+    # estimate_resident_bytes call; idle sessions are re-measured for free.
+    _history_bytes: tuple[int, int, int] | None = PrivateAttr(default=None)
     _store: JsonlSessionStore = PrivateAttr(default=None)  # ty: ignore[invalid-assignment]  # set in model_post_init
 
     def model_post_init(self, __context: Any) -> None:
@@ -118,6 +145,41 @@ class Session(BaseModel):
     def _invalidate_messages_count_cache(self) -> None:
         self._messages_count_cache = None
 
+    @property
+    def stats(self) -> SessionStats:
+        """Running usage, cost and message totals; see ``SessionStats``."""
+        if self._stats is None or self._stats_history_len != len(self.conversation_history):
+            self._stats = SessionStats.from_history(self.conversation_history)
+            self._stats_history_len = len(self.conversation_history)
+        return self._stats
+
+    def _update_stats(
+        self, *, added: Sequence[message.HistoryEvent] = (), removed: Sequence[message.HistoryEvent] = ()
+    ) -> None:
+        """Apply a history edit to the running totals; call after editing ``conversation_history``."""
+        stats = self._stats
+        if stats is None or self._stats_history_len != len(self.conversation_history) - len(added) + len(removed):
+            # Already stale; the next read rebuilds from the history.
+            self._stats = None
+            return
+        stats.add(added)
+        stats.remove(removed)
+        self._stats_history_len = len(self.conversation_history)
+
+    def estimate_resident_bytes(self) -> int:
+        """Approximate memory held by this session's history and file tracker."""
+        history = self.conversation_history
+        key = (len(history), id(history[-1]) if history else 0)
+        cached = self._history_bytes
+        if cached is None or cached[:2] != key:
+            cached = (*key, sum(estimate_resident_bytes(item) for item in history))
+            self._history_bytes = cached
+        return cached[2] + estimate_resident_bytes(self.file_tracker)
+
+    def release_history_cache(self) -> None:
+        """Drop the store's decoded copy of this session's history; the next load re-reads the events file."""
+        self._store.drop_history_cache(self.id)
+
     @property
     def user_messages(self) -> list[str]:
         """All user message contents in this session.
@@ -173,7 +235,7 @@ class Session(BaseModel):
 
         meta = parse_session_meta(raw, work_dir=work_dir)
 
-        return Session(
+        session = Session(
             id=id,
             work_dir=meta.work_dir,
             sub_agent_state=meta.sub_agent_state,
@@ -201,7 +263,11 @@ class Session(BaseModel):
             approval_policy=meta.approval_policy,
             parent_session_id=meta.parent_session_id,
             vanilla=meta.vanilla,
+            history_base=meta.history_base,
+            child_session_ids=meta.child_session_ids or [],
         )
+        session._stats = meta.stats
+        return session
 
     @classmethod
     def load(cls, id: str, work_dir: Path) -> Session:
@@ -209,6 +275,21 @@ class Session(BaseModel):
         raw_history = session._store.load_history(id)
         session._last_request_usage = last_request_usage(raw_history)
         session.conversation_history = rebuild_loaded_history(raw_history)
+        session._raw_len = len(raw_history)
+        if not session.child_session_ids:
+            # Covers meta written before children were indexed; the scan is
+            # over history that is already in memory.
+            session.child_session_ids = _spawned_session_ids(raw_history)
+        session._raw_prefix_len = next(
+            (
+                index
+                for index, (item, raw) in enumerate(zip(session.conversation_history, raw_history, strict=False))
+                if item is not raw
+            ),
+            min(len(session.conversation_history), len(raw_history)),
+        )
+        # Totals read from meta also cover items compaction dropped from the loaded history.
+        session._stats_history_len = len(session.conversation_history)
         return session
 
     @classmethod
@@ -252,9 +333,17 @@ class Session(BaseModel):
         if not items:
             return
 
+        in_sync = self._raw_prefix_len == self._raw_len == len(self.conversation_history)
         self.conversation_history.extend(items)
+        self._raw_len += len(items)
+        if in_sync:
+            self._raw_prefix_len = self._raw_len
+        self._update_stats(added=items)
         self._last_request_usage = update_last_request_usage(self._last_request_usage, items)
         self._invalidate_messages_count_cache()
+        for child_id in _spawned_session_ids(items):
+            if child_id not in self.child_session_ids:
+                self.child_session_ids.append(child_id)
 
         new_user_messages = [
             message.join_text_parts(it.parts)
@@ -287,6 +376,7 @@ class Session(BaseModel):
             created_at=self.created_at,
             updated_at=self.updated_at,
             messages_count=self.messages_count,
+            stats=self.stats,
             model_name=self.model_name,
             archived=self.archived,
             model_config_name=self.model_config_name,
@@ -305,6 +395,8 @@ class Session(BaseModel):
             approval_policy=self.approval_policy,
             parent_session_id=self.parent_session_id,
             vanilla=self.vanilla,
+            history_base=self.history_base,
+            child_session_ids=self.child_session_ids,
         )
         self._store.append_and_flush(session_id=self.id, items=items, meta=meta)
 
@@ -336,6 +428,7 @@ class Session(BaseModel):
             created_at=self.created_at,
             updated_at=self.updated_at,
             messages_count=self.messages_count,
+            stats=self.stats,
             model_name=self.model_name,
             archived=self.archived,
             model_config_name=self.model_config_name,
@@ -354,6 +447,8 @@ class Session(BaseModel):
             approval_policy=self.approval_policy,
             parent_session_id=self.parent_session_id,
             vanilla=self.vanilla,
+            history_base=self.history_base,
+            child_session_ids=self.child_session_ids,
         )
         self._store.create_meta_if_missing(self.id, meta)
 
@@ -415,7 +510,10 @@ class Session(BaseModel):
             original_user_message=user_message,
         )
 
+        removed = self.conversation_history[target_idx + 1 :]
         self.conversation_history = self.conversation_history[: target_idx + 1]
+        self._raw_prefix_len = min(self._raw_prefix_len, target_idx + 1)
+        self._update_stats(removed=removed)
         self.next_checkpoint_id = checkpoint_id + 1
         self._invalidate_messages_count_cache()
         self._user_messages_cache = None
@@ -437,6 +535,8 @@ class Session(BaseModel):
             if message.join_text_parts(item.parts) != text:
                 return False
             del self.conversation_history[idx]
+            self._raw_prefix_len = min(self._raw_prefix_len, idx)
+            self._update_stats(removed=[item])
             self._invalidate_messages_count_cache()
             self._user_messages_cache = None
             # append_history rebuilds the meta snapshot (user_messages, counts)
@@ -534,7 +634,10 @@ class Session(BaseModel):
         """Create a new session as a fork of the current session.
 
         The forked session copies metadata and conversation history, but does not
-        modify the current session.
+        modify the current session. When the copied history is exactly a
+        prefix of what this session has persisted, the fork records a
+        ``history_base`` pointer instead of rewriting those events and shares
+        the (immutable) history items with this session.
 
         Args:
             new_id: Optional ID for the forked session.
@@ -564,6 +667,14 @@ class Session(BaseModel):
             if (until_index is not None and until_index >= 0)
             else self.conversation_history
         )
+        if 0 < len(history_to_copy) <= self._raw_prefix_len:
+            forked.history_base = HistoryBase(session_id=self.id, length=len(history_to_copy))
+            forked.conversation_history = list(history_to_copy)
+            forked.child_session_ids = _spawned_session_ids(history_to_copy)
+            forked._raw_len = forked._raw_prefix_len = len(history_to_copy)
+            forked.ensure_meta_exists()
+            return forked
+
         items = [it.model_copy(deep=True) for it in history_to_copy]
         if items:
             forked.append_history(items)
@@ -1001,6 +1112,8 @@ class Session(BaseModel):
         messages_count: int = -1
         model_name: str | None = None
         archived: bool = False
+        total_cost: float | None = None
+        currency: str = "USD"
 
     @classmethod
     def list_sessions(cls, work_dir: Path) -> list[SessionMetaBrief]:
@@ -1068,6 +1181,8 @@ class Session(BaseModel):
             model_name = data.get("model_name") if isinstance(data.get("model_name"), str) else None
             archived_raw = data.get("archived")
             archived = archived_raw if isinstance(archived_raw, bool) else False
+            stats = parse_session_stats(data.get("stats"))
+            total_usage = stats.total_usage() if stats is not None else None
 
             items.append(
                 Session.SessionMetaBrief(
@@ -1081,6 +1196,8 @@ class Session(BaseModel):
                     messages_count=messages_count,
                     model_name=model_name,
                     archived=archived,
+                    total_cost=total_usage.total_cost if total_usage is not None else None,
+                    currency=total_usage.currency if total_usage is not None else "USD",
                 )
             )
 
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from pydantic import BaseModel, Field
+
+from klaude_code.protocol import message
+from klaude_code.protocol.models import TaskMetadata, TaskMetadataItem, Usage
+
+
+def _empty_by_model() -> list[TaskMetadata]:
+    return []
+
+
+class SessionStats(BaseModel):
+    """Running totals over a session's history, kept current by ``Session.append_history``.
+
+    Usage is summed per ``(model_name, provider)`` across every task, sub-agents
+    included. Totals are cumulative spend: compaction does not reduce them (the
+    compacted requests were still made), while rewind and retract subtract the
+    items they drop. Persisted in meta.json so listings can show them without
+    reading events.jsonl.
+    """
+
+    user_messages: int = 0
+    assistant_messages: int = 0
+    tool_calls: int = 0
+    tool_results: int = 0
+    task_count: int = 0
+    by_model: list[TaskMetadata] = Field(default_factory=_empty_by_model)
+
+    @property
+    def total_messages(self) -> int:
+        return self.user_messages + self.assistant_messages + self.tool_results
+
+    @classmethod
+    def from_history(cls, history: Iterable[message.HistoryEvent]) -> SessionStats:
+        stats = cls()
+        stats.add(history)
+        return stats
+
+    def add(self, items: Iterable[message.HistoryEvent]) -> None:
+        self._apply(items, sign=1)
+
+    def remove(self, items: Iterable[message.HistoryEvent]) -> None:
+        self._apply(items, sign=-1)
+
+    def total_usage(self) -> Usage:
+        """Sum of usage across models; the currency is the first non-USD one seen."""
+        total = Usage()
+        for meta in self.by_model:
+            if meta.usage is None:
+                continue
+            if total.currency == "USD" and meta.usage.currency:
+                total.currency = meta.usage.currency
+            TaskMetadata.merge_usage(total, meta.usage)
+        return total
+
+    def _apply(self, items: Iterable[message.HistoryEvent], *, sign: int) -> None:
+        for item in items:
+            if isinstance(item, message.UserMessage):
+                self.user_messages += sign
+            elif isinstance(item, message.AssistantMessage):
+                self.assistant_messages += sign
+                self.tool_calls += sign * sum(1 for part in item.parts if isinstance(part, message.ToolCallPart))
+            elif isinstance(item, message.ToolResultMessage):
+                self.tool_results += sign
+            elif isinstance(item, TaskMetadataItem):
+                self.task_count += sign
+                for meta in (item.main_agent, *item.sub_agent_task_metadata):
+                    self._apply_usage(meta, sign=sign)
+
+    def _apply_usage(self, meta: TaskMetadata, *, sign: int) -> None:
+        if meta.usage is None:
+            return
+        index = next(
+            (
+                index
+                for index, entry in enumerate(self.by_model)
+                if entry.model_name == meta.model_name and entry.provider == meta.provider
+            ),
+            None,
+        )
+        if sign > 0:
+            if index is None:
+                self.by_model.append(
+                    TaskMetadata(
+                        model_name=meta.model_name, provider=meta.provider, usage=Usage(currency=meta.usage.currency)
+                    )
+                )
+                index = len(self.by_model) - 1
+            aggregated = self.by_model[index].usage
+            if aggregated is not None:
+                TaskMetadata.merge_usage(aggregated, meta.usage)
+            return
+
+        if index is None:
+            return
+        aggregated = self.by_model[index].usage
+        if aggregated is None:
+            return
+        aggregated.input_tokens -= meta.usage.input_tokens
+        aggregated.cached_tokens -= meta.usage.cached_tokens
+        aggregated.cache_write_tokens -= meta.usage.cache_write_tokens
+        aggregated.reasoning_tokens -= meta.usage.reasoning_tokens
+        aggregated.output_tokens -= meta.usage.output_tokens
+        for cost_field in ("input_cost", "output_cost", "cache_read_cost", "cache_write_cost"):
+            removed = getattr(meta.usage, cost_field)
+            current = getattr(aggregated, cost_field)
+            if removed is not None and current is not None:
+                setattr(aggregated, cost_field, current - removed)
+        if not (aggregated.input_tokens or aggregated.cache_write_tokens or aggregated.output_tokens):
+            # Every task on this model was dropped.
+            del self.by_model[index]
+
+
+__all__ = ["SessionStats"]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
 import threading
 import uuid
@@ -19,6 +20,8 @@ from klaude_code.protocol.models import (
     TodoItem,
 )
 from klaude_code.session.codec import decode_jsonl_line, encode_jsonl_line
+from klaude_code.session.meta import HistoryBase, parse_child_session_ids, parse_history_base
+from klaude_code.session.stats import SessionStats
 
 # Meta keys owned by direct update_meta writes: a queued history batch carries
 # an older snapshot, so the on-disk value wins when the batch lands.
@@ -193,7 +196,7 @@ class JsonlSessionStore:
         self._paths = ProjectPaths(project_key=project_key)
         self._meta_lock = threading.Lock()
         self._writer = JsonlSessionWriter(
-            self._paths, meta_lock=self._meta_lock, on_history_written=self._invalidate_history_cache
+            self._paths, meta_lock=self._meta_lock, on_history_written=self.drop_history_cache
         )
         self._last_flush: dict[str, asyncio.Future[None]] = {}
         # In-memory cache of decoded history keyed by session_id. Invalidated
@@ -270,34 +273,76 @@ class JsonlSessionStore:
             _notify_session_meta_observers(session_id, meta)
             return True
 
-    def load_history(self, session_id: str) -> list[message.HistoryEvent]:
-        """Return the decoded history, using an mtime/size-keyed cache.
+    def load_history_base(self, session_id: str) -> HistoryBase | None:
+        meta = self.load_meta(session_id)
+        return parse_history_base(meta.get("history_base")) if meta is not None else None
+
+    def load_child_session_ids(self, session_id: str) -> list[str] | None:
+        """Sub-agent sessions spawned from this one, or None when meta predates the index."""
+        meta = self.load_meta(session_id)
+        return parse_child_session_ids(meta.get("child_session_ids")) if meta is not None else None
 
-        The cache stores the decoded items for an unchanged events file so
-        repeated loads avoid re-reading and re-deserializing the jsonl. Items
-        are deep-copied on the way out so callers may mutate their own copies
-        without affecting the cache or other callers (matching the previous
-        per-call decode semantics).
+    def is_history_base(self, session_id: str) -> bool:
+        """Return True when another session's history starts with this one's."""
+        for meta_path in self.iter_meta_files():
+            meta = _read_json_dict(meta_path)
+            base = parse_history_base(meta.get("history_base")) if meta is not None else None
+            if base is not None and base.session_id == session_id:
+                return True
+        return False
+
+    def load_history(self, session_id: str) -> list[message.HistoryEvent]:
+        """Return the decoded history, resolving fork base chains.
+
+        Each session's own events are cached keyed by its events file's
+        (mtime_ns, size), so repeated loads of an unchanged session (or of
+        the sessions it forks from) avoid re-reading and re-deserializing the
+        jsonl. Items are deep-copied on the way out so callers may mutate
+        their own copies without affecting the cache or other callers
+        (matching the previous per-call decode semantics).
         """
+        # Walk up the base chain, then rebuild from the root down: each fork
+        # keeps its base's first ``length`` items and adds its own.
+        chain = [session_id]
+        lengths: list[int] = []
+        base = self.load_history_base(session_id)
+        while base is not None and base.session_id not in chain:
+            chain.append(base.session_id)
+            lengths.append(base.length)
+            base = self.load_history_base(base.session_id)
+        items = self._load_own_history(chain[-1])
+        for fork_id, length in zip(reversed(chain[:-1]), reversed(lengths), strict=True):
+            items = [*items[:length], *self._load_own_history(fork_id)]
+        return [item.model_copy(deep=True) for item in items]
+
+    def _load_own_history(self, session_id: str) -> list[message.HistoryEvent]:
+        """Decoded items of the session's own events file; shared with the cache, do not mutate."""
         events_path = self._paths.events_file(session_id)
         try:
             stat = events_path.stat()
         except OSError:
-            self._invalidate_history_cache(session_id)
+            self.drop_history_cache(session_id)
             return []
         mtime_ns, size = stat.st_mtime_ns, stat.st_size
 
         with self._history_cache_lock:
             entry = self._history_cache.get(session_id)
             if entry is not None and entry.mtime_ns == mtime_ns and entry.size == size:
-                return [item.model_copy(deep=True) for item in entry.items]
+                return entry.items
 
         items = list(self._decode_history(events_path))
         with self._history_cache_lock:
             self._history_cache[session_id] = _HistoryCacheEntry(mtime_ns=mtime_ns, size=size, items=items)
-        return [item.model_copy(deep=True) for item in items]
+        return items
 
     def iter_history(self, session_id: str) -> Iterable[message.HistoryEvent]:
+        yield from self._iter_history(session_id, seen=set())
+
+    def _iter_history(self, session_id: str, *, seen: set[str]) -> Iterable[message.HistoryEvent]:
+        seen.add(session_id)
+        base = self.load_history_base(session_id)
+        if base is not None and base.session_id not in seen:
+            yield from itertools.islice(self._iter_history(base.session_id, seen=seen), base.length)
         events_path = self._paths.events_file(session_id)
         if not events_path.exists():
             return
@@ -314,7 +359,7 @@ class JsonlSessionStore:
         except OSError:
             return
 
-    def _invalidate_history_cache(self, session_id: str) -> None:
+    def drop_history_cache(self, session_id: str) -> None:
         with self._history_cache_lock:
             self._history_cache.pop(session_id, None)
 
@@ -385,6 +430,9 @@ def build_meta_snapshot(
     approval_policy: str | None = None,
     parent_session_id: str | None = None,
     vanilla: bool = False,
+    stats: SessionStats | None = None,
+    history_base: HistoryBase | None = None,
+    child_session_ids: Sequence[str] = (),
 ) -> dict[str, Any]:
     follow_up_queue_payload = [item.model_dump(mode="json", exclude_none=True) for item in follow_up_queue]
     # sub_agent_state is no longer persisted: sub-agent identity lives in
@@ -402,6 +450,8 @@ def build_meta_snapshot(
         "created_at": created_at,
         "updated_at": updated_at,
         "messages_count": messages_count,
+        # Running usage/cost totals, so listings can show them without loading events.
+        "stats": stats.model_dump(mode="json", exclude_defaults=True) if stats is not None else None,
         "model_name": model_name,
         "archived": archived,
         "model_config_name": model_config_name,
@@ -425,6 +475,11 @@ def build_meta_snapshot(
         "spawn_kind": spawn_kind,
         "approval_policy": approval_policy,
         "parent_session_id": parent_session_id,
+        # Always written (even empty) so readers can tell an indexed session
+        # without children from one written before the index existed.
+        "child_session_ids": list(child_session_ids),
         "vanilla": vanilla or None,
+        # Forks share their parent's leading events instead of copying them.
+        "history_base": history_base.model_dump(mode="json") if history_base is not None else None,
     }
     return {k: v for k, v in snapshot.items() if v is not None}
@@ -1,6 +1,8 @@
 import html
 import os
 import re
+import threading
+import time
 from collections.abc import Iterable
 from dataclasses import dataclass
 from functools import lru_cache
@@ -10,6 +12,7 @@ from xml.sax.saxutils import escape
 
 import yaml
 
+from klaude_code.const import DISCOVERY_CACHE_RACY_WINDOW_NS
 from klaude_code.log import log_debug
 
 SKILL_XML_ENTRY_PATTERN = re.compile(
@@ -96,9 +99,9 @@ def get_candidate_skill_dirs_for_anchor(
 _get_candidate_skill_dirs_for_anchor = get_candidate_skill_dirs_for_anchor
 
 
-@dataclass
+@dataclass(frozen=True)
 class Skill:
-    """Skill data structure"""
+    """Skill data structure (shared between sessions through the discovery cache)"""
 
     name: str  # Skill identifier (lowercase-hyphen)
     description: str  # What the skill does and when to use it
@@ -120,6 +123,45 @@ class Skill:
         return self.description
 
 
+@dataclass(frozen=True)
+class _CachedSkillFile:
+    signature: tuple[int, int, int]
+    skill: Skill | None
+    warning: str | None
+
+
+@dataclass(frozen=True)
+class _CachedSkillTree:
+    dir_signatures: tuple[tuple[str, int], ...]
+    skill_files: tuple[Path, ...]
+
+
+# Process-wide discovery caches shared by every session and sub-agent. Walks are
+# reused while every visited directory keeps its mtime (adding, removing or
+# renaming an entry bumps it); SKILL.md files are re-parsed only when their
+# stat signature changes.
+_skill_file_cache: dict[tuple[Path, str], _CachedSkillFile] = {}
+_skill_tree_cache: dict[Path, _CachedSkillTree] = {}
+_skill_cache_lock = threading.Lock()
+
+
+def clear_skill_discovery_cache() -> None:
+    """Drop cached skill directory walks and parsed SKILL.md files."""
+    with _skill_cache_lock:
+        _skill_file_cache.clear()
+        _skill_tree_cache.clear()
+
+
+def _dir_signatures_match(signatures: tuple[tuple[str, int], ...]) -> bool:
+    for directory, mtime_ns in signatures:
+        try:
+            if os.stat(directory).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
 class SkillLoader:
     """Load and manage Claude Skills from SKILL.md files"""
 
@@ -145,8 +187,14 @@ class SkillLoader:
         self.skill_warnings_by_location: dict[str, list[str]] = {"system": [], "user": [], "project": []}
 
     def iter_skill_files(self, root_dir: Path) -> list[Path]:
+        cached = _skill_tree_cache.get(root_dir)
+        if cached is not None and _dir_signatures_match(cached.dir_signatures):
+            return list(cached.skill_files)
+
+        cacheable_before = time.time_ns() - DISCOVERY_CACHE_RACY_WINDOW_NS
         skill_files: list[Path] = []
         visited_dirs: set[Path] = set()
+        dir_signatures: list[tuple[str, int]] = []
 
         for dirpath, dirnames, filenames in os.walk(root_dir, topdown=True, followlinks=True):
             current_dir = Path(dirpath)
@@ -160,6 +208,11 @@ class SkillLoader:
                 dirnames[:] = []
                 continue
             visited_dirs.add(current_real)
+            try:
+                dir_signatures.append((str(current_real), current_real.stat().st_mtime_ns))
+            except OSError:
+                dirnames[:] = []
+                continue
 
             kept_dirnames: list[str] = []
             for dirname in dirnames:
@@ -176,6 +229,9 @@ class SkillLoader:
             if "SKILL.md" in filenames:
                 skill_files.append(current_dir / "SKILL.md")
 
+        if all(mtime_ns < cacheable_before for _, mtime_ns in dir_signatures):
+            with _skill_cache_lock:
+                _skill_tree_cache[root_dir] = _CachedSkillTree(tuple(dir_signatures), tuple(skill_files))
         return skill_files
 
     def _find_git_repo_root(self, cwd: Path) -> Path | None:
@@ -216,9 +272,28 @@ class SkillLoader:
         Returns:
             Skill object or None if loading failed
         """
-        if not skill_path.exists():
+        cacheable_before = time.time_ns() - DISCOVERY_CACHE_RACY_WINDOW_NS
+        try:
+            stat = skill_path.stat()
+        except OSError:
             return None
 
+        key = (skill_path, location)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        cached = _skill_file_cache.get(key)
+        if cached is None or cached.signature != signature:
+            skill, warning = self._parse_skill_file(skill_path, location)
+            cached = _CachedSkillFile(signature, skill, warning)
+            if stat.st_mtime_ns < cacheable_before:
+                with _skill_cache_lock:
+                    _skill_file_cache[key] = cached
+
+        if cached.warning is not None:
+            self.skill_warnings_by_location.setdefault(location, []).append(cached.warning)
+        return cached.skill
+
+    def _parse_skill_file(self, skill_path: Path, location: str) -> tuple[Skill | None, str | None]:
+        """Parse SKILL.md front-matter into a Skill and an optional name-mismatch warning."""
         try:
             content = skill_path.read_text(encoding="utf-8")
 
@@ -241,13 +316,13 @@ class SkillLoader:
                 name = parent_dir_name
 
             if not description:
-                return None
+                return None, None
 
+            warning: str | None = None
             if name != parent_dir_name:
                 warning = (
                     f'skill name "{name}" should match directory name "{parent_dir_name}":\n- [{location}] {skill_path}'
                 )
-                self.skill_warnings_by_location.setdefault(location, []).append(warning)
 
             # Create Skill object
             license_val = frontmatter.get("license")
@@ -275,11 +350,11 @@ class SkillLoader:
                 base_dir=skill_path.parent.resolve(),
             )
 
-            return skill
+            return skill, warning
 
         except (OSError, yaml.YAMLError) as e:
             log_debug(f"Failed to load skill from {skill_path}: {e}")
-            return None
+            return None, None
 
     def discover_skills(self, work_dir: Path) -> list[Skill]:
         """Recursively find all SKILL.md files and load them from system, user and project directories.
@@ -21,6 +21,16 @@ class ToolABC(ABC):
     def metadata(cls) -> "ToolMetadata":
         return ToolMetadata()
 
+    @classmethod
+    def resource_access(cls, arguments: str, work_dir: Path) -> "ToolResourceAccess | None":
+        """Describe what a call touches so independent calls in a step can overlap.
+
+        ``None`` (the default) makes the call exclusive: it waits for every earlier
+        call in the step and every later call waits for it.
+        """
+        del arguments, work_dir
+        return None
+
     @classmethod
     @abstractmethod
     def schema(cls) -> llm_param.ToolSchema:
@@ -42,3 +52,22 @@ class ToolMetadata:
     concurrency_policy: ToolConcurrencyPolicy = ToolConcurrencyPolicy.SEQUENTIAL
     has_side_effects: bool = False
     requires_tool_context: bool = True
+
+
+@dataclass(frozen=True)
+class ToolResourceAccess:
+    """Resources a single tool call reads or writes.
+
+    ``paths=None`` means the call may touch any path (e.g. a shell command), so it
+    conflicts with every writer.
+    """
+
+    read_only: bool
+    paths: frozenset[str] | None = None
+
+    def conflicts_with(self, other: "ToolResourceAccess") -> bool:
+        if self.read_only and other.read_only:
+            return False
+        if self.paths is None or other.paths is None:
+            return True
+        return not self.paths.isdisjoint(other.paths)
@@ -30,4 +30,6 @@ ANSI_ESCAPE_RE = re.compile(
 
 def strip_ansi(text: str) -> str:
     """Remove ANSI/terminal control sequences from `text`."""
+    if "\x1b" not in text:
+        return text
     return ANSI_ESCAPE_RE.sub("", text)
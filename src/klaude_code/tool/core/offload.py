@@ -26,11 +26,17 @@ Implementation Notes
 - Read tool handles its own truncation internally (see read_tool.py)
 - WebFetch handles its own file saving internally (see web_fetch_tool.py)
 - All offload decisions are centralized in this module
+- Offloaded output is content-addressed (see OffloadStore): repeated identical
+  output (the same `git diff`, test run, sub-agents re-reading a big file) is
+  written once and every result points at the same blob
 """
 
 from __future__ import annotations
 
+import hashlib
+import os
 import secrets
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum, auto
@@ -44,6 +50,8 @@ from klaude_code.const import (
     TOOL_OUTPUT_DISPLAY_TAIL_LINES,
     TOOL_OUTPUT_MAX_LENGTH,
     TOOL_OUTPUT_MAX_LINES,
+    TOOL_OUTPUT_OFFLOAD_DEDUP_MAX_BYTES,
+    TOOL_OUTPUT_OFFLOAD_MAX_AGE_SEC,
     TOOL_OUTPUT_TRUNCATION_DIR,
 )
 from klaude_code.protocol import tools
@@ -93,6 +101,111 @@ class OffloadStrategy(ABC):
         ...
 
 
+# =============================================================================
+# Content-Addressed Store
+# =============================================================================
+
+_OFFLOAD_STORE_DIRNAME = "klaude-offload"
+_OFFLOAD_GC_INTERVAL_SEC = 60 * 60
+
+
+class OffloadStore:
+    """Content-addressed blobs for offloaded tool output.
+
+    Each unique payload is written once as ``<root>/klaude-offload/<sha256>.log``;
+    storing it again only refreshes the blob's mtime. Blobs not stored again for
+    ``max_age_sec`` are deleted by a sweep that runs at most hourly, on write.
+    """
+
+    def __init__(self, root: str | Path, *, max_age_sec: float = TOOL_OUTPUT_OFFLOAD_MAX_AGE_SEC) -> None:
+        self.directory = Path(root) / _OFFLOAD_STORE_DIRNAME
+        self._max_age_sec = max_age_sec
+        self._last_gc: float | None = None
+
+    def put(self, text: str) -> Path:
+        """Store ``text`` and return its blob path. Raises OSError if the store is unusable."""
+        data = text.encode("utf-8")
+        path = self.directory / f"{hashlib.sha256(data).hexdigest()}.log"
+        self._ensure_directory()
+        if not self._reuse(path, len(data)):
+            # Write-then-rename: a concurrent reader or writer of the same blob
+            # never sees a partial file.
+            tmp = self.directory / f".{path.name}.{secrets.token_hex(4)}.tmp"
+            try:
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+            finally:
+                tmp.unlink(missing_ok=True)
+        self._maybe_collect_garbage()
+        return path
+
+    def adopt(self, path: Path) -> None:
+        """Deduplicate an already written file against the store, keeping ``path`` valid.
+
+        Identical files become hard links to one blob. Best effort: oversized
+        files and file systems without hard links are left as they are.
+        """
+        tmp: Path | None = None
+        try:
+            size = path.stat().st_size
+            if size > TOOL_OUTPUT_OFFLOAD_DEDUP_MAX_BYTES:
+                return
+            with path.open("rb") as f:
+                blob = self.directory / f"{hashlib.file_digest(f, 'sha256').hexdigest()}.log"
+            self._ensure_directory()
+            if self._reuse(blob, size):
+                tmp = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+                os.link(blob, tmp)
+                os.replace(tmp, path)
+            else:
+                os.link(path, blob)
+        except OSError:
+            return
+        finally:
+            if tmp is not None:
+                tmp.unlink(missing_ok=True)
+
+    def collect_garbage(self, *, now: float | None = None) -> int:
+        """Delete blobs (and stray temp files) older than the max age; returns how many."""
+        cutoff = (time.time() if now is None else now) - self._max_age_sec
+        removed = 0
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                            os.unlink(entry.path)
+                            removed += 1
+                    except OSError:
+                        continue
+        except OSError:
+            return removed
+        return removed
+
+    def _ensure_directory(self) -> None:
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # The default root is the shared system temp dir; never reuse blobs
+        # another user could have planted.
+        if hasattr(os, "getuid") and self.directory.stat().st_uid != os.getuid():
+            raise PermissionError(f"{self.directory} is owned by another user")
+
+    def _reuse(self, path: Path, size: int) -> bool:
+        try:
+            if path.stat().st_size != size:
+                return False
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _maybe_collect_garbage(self) -> None:
+        now = time.monotonic()
+        if self._last_gc is not None and now - self._last_gc < _OFFLOAD_GC_INTERVAL_SEC:
+            return
+        self._last_gc = now
+        self.collect_garbage()
+
+
 # =============================================================================
 # Strategy Implementations
 # =============================================================================
@@ -137,9 +250,15 @@ class HeadTailOffloadStrategy(OffloadStrategy):
         self.tail_lines = tail_lines
         self.offload_dir = Path(offload_dir or TOOL_OUTPUT_TRUNCATION_DIR)
         self._policy = policy
+        self._store = OffloadStore(self.offload_dir)
 
     def _save_to_file(self, output: str, tool_call: ToolCallLike | None) -> str | None:
         """Save full output to file. Returns path or None on failure."""
+        try:
+            return str(self._store.put(output))
+        except OSError:
+            pass
+        # Store unusable (e.g. its directory belongs to another user): one file per output.
         try:
             self.offload_dir.mkdir(parents=True, exist_ok=True)
             tool_name = (tool_call.tool_name if tool_call else "unknown").replace("/", "_").lower()
@@ -187,22 +306,7 @@ class HeadTailOffloadStrategy(OffloadStrategy):
         hidden_chars = original_length - self.head_chars - self.tail_chars
         head = output[: self.head_chars]
         tail = output[-self.tail_chars :]
-
-        if offloaded_path:
-            header = (
-                f"<system-reminder>Output truncated due to length. "
-                f"Showing first {self.head_chars} and last {self.tail_chars} chars of {original_length} chars. "
-                f"Full output saved to: {offloaded_path} </system-reminder>\n\n"
-            )
-        else:
-            header = (
-                f"<system-reminder>Output truncated due to length. "
-                f"Showing first {self.head_chars} and last {self.tail_chars} chars of {original_length} chars."
-                f"</system-reminder>\n\n"
-            )
-
-        truncated_output = f"{header}{head}\n\n<...{hidden_chars} chars omitted...>\n\n{tail}"
-        return truncated_output, hidden_chars
+        return format_char_truncation(head, tail, original_length, offloaded_path), hidden_chars
 
     def process(self, output: str, tool_call: ToolCallLike | None = None) -> OffloadResult:
         original_length = len(output)
@@ -242,6 +346,28 @@ class HeadTailOffloadStrategy(OffloadStrategy):
         )
 
 
+def format_char_truncation(head: str, tail: str, original_length: int, offloaded_path: str | None) -> str:
+    """Render a head + tail view of `original_length` chars of output.
+
+    Shared with producers that truncate while streaming (e.g. Bash capture) so the
+    model always sees the same notice shape.
+    """
+    hidden_chars = original_length - len(head) - len(tail)
+    if offloaded_path:
+        header = (
+            f"<system-reminder>Output truncated due to length. "
+            f"Showing first {len(head)} and last {len(tail)} chars of {original_length} chars. "
+            f"Full output saved to: {offloaded_path} </system-reminder>\n\n"
+        )
+    else:
+        header = (
+            f"<system-reminder>Output truncated due to length. "
+            f"Showing first {len(head)} and last {len(tail)} chars of {original_length} chars."
+            f"</system-reminder>\n\n"
+        )
+    return f"{header}{head}\n\n<...{hidden_chars} chars omitted...>\n\n{tail}"
+
+
 # =============================================================================
 # Strategy Registry
 # =============================================================================
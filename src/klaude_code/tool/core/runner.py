@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from klaude_code.prompts.messages import CANCEL_OUTPUT
 from klaude_code.protocol import message, tools
 from klaude_code.protocol.models import SessionIdUIExtra, TaskMetadata, TodoItem, TodoListUIExtra, ToolSideEffect
-from klaude_code.tool.core.abc import ToolABC, ToolConcurrencyPolicy
+from klaude_code.tool.core.abc import ToolABC, ToolConcurrencyPolicy, ToolResourceAccess
 from klaude_code.tool.core.context import GetInterruptResultFn, ToolContext
 from klaude_code.tool.core.offload import offload_tool_output
 
@@ -119,7 +119,9 @@ class ToolExecutor:
 
     The executor is responsible for:
     - Partitioning tool calls into sequential and concurrent tools
-    - Running sequential tools one by one and concurrent tools in parallel
+    - Running sequential tools in call order, overlapping calls whose resource
+      accesses do not conflict (e.g. several `Read`s or read-only `Bash` commands)
+    - Running concurrent tools in parallel
     - Emitting ToolCall/ToolResult events and tool side-effect events
     - Tracking unfinished calls so `on_interrupt()` can synthesize cancellation results
     """
@@ -164,22 +166,33 @@ class ToolExecutor:
             self._unfinished_calls[tool_call.call_id] = tool_call
 
         sequential_tool_calls, concurrent_tool_calls = self._partition_tool_calls(tool_calls)
+        dependencies = self._plan_sequential_dependencies(sequential_tool_calls)
+
+        if any(idx - 1 not in deps for idx, deps in enumerate(dependencies) if idx > 0):
+            # Some calls are independent of their predecessor: overlap them while
+            # keeping the transcript in call order.
+            async for exec_event in self._run_scheduled_tool_calls(
+                sequential_tool_calls,
+                dependencies,
+                ends_step=not concurrent_tool_calls,
+            ):
+                yield exec_event
+        else:
+            # Run sequential tools one by one.
+            for idx, tool_call in enumerate(sequential_tool_calls):
+                tool_call_event = self._build_tool_call_started(tool_call)
+                self._call_event_emitted.add(tool_call.call_id)
+                yield tool_call_event
 
-        # Run sequential tools one by one.
-        for idx, tool_call in enumerate(sequential_tool_calls):
-            tool_call_event = self._build_tool_call_started(tool_call)
-            self._call_event_emitted.add(tool_call.call_id)
-            yield tool_call_event
-
-            try:
-                is_last_in_step = idx == len(sequential_tool_calls) - 1 and not concurrent_tool_calls
-                async for exec_event in self._run_single_tool_call(tool_call):
-                    if isinstance(exec_event, ToolExecutionResult):
-                        exec_event.is_last_in_step = is_last_in_step
-                    yield exec_event
-            except asyncio.CancelledError:
-                # Propagate cooperative cancellation so the agent task can be stopped.
-                raise
+                try:
+                    is_last_in_step = idx == len(sequential_tool_calls) - 1 and not concurrent_tool_calls
+                    async for exec_event in self._run_single_tool_call(tool_call):
+                        if isinstance(exec_event, ToolExecutionResult):
+                            exec_event.is_last_in_step = is_last_in_step
+                        yield exec_event
+                except asyncio.CancelledError:
+                    # Propagate cooperative cancellation so the agent task can be stopped.
+                    raise
 
         # Run concurrent tools (sub-agents, web tools) in parallel.
         if concurrent_tool_calls:
@@ -320,6 +333,95 @@ class ToolExecutor:
                 sequential_tool_calls.append(tool_call)
         return sequential_tool_calls, concurrent_tool_calls
 
+    def _plan_sequential_dependencies(self, tool_calls: list[ToolCallRequest]) -> list[frozenset[int]]:
+        """Return, for each call, the indices of earlier calls it must wait for.
+
+        Calls without a declared resource access are exclusive and depend on every
+        earlier call; otherwise a call only waits for earlier calls it conflicts with
+        (a writer against readers or writers of the same path).
+        """
+        accesses: list[ToolResourceAccess | None] = []
+        for tool_call in tool_calls:
+            tool_cls = self._registry.get(tool_call.tool_name)
+            access: ToolResourceAccess | None = None
+            if tool_cls is not None:
+                try:
+                    access = tool_cls.resource_access(tool_call.arguments_json, self._context.work_dir)
+                except Exception:
+                    access = None
+            accesses.append(access)
+
+        dependencies: list[frozenset[int]] = []
+        for idx, access in enumerate(accesses):
+            deps = frozenset(
+                earlier
+                for earlier in range(idx)
+                if access is None
+                or (earlier_access := accesses[earlier]) is None
+                or access.conflicts_with(earlier_access)
+            )
+            dependencies.append(deps)
+        return dependencies
+
+    async def _run_scheduled_tool_calls(
+        self,
+        tool_calls: list[ToolCallRequest],
+        dependencies: list[frozenset[int]],
+        *,
+        ends_step: bool,
+    ) -> AsyncGenerator[ToolExecutorEvent]:
+        """Run calls as soon as their dependencies finish, emitting events in call order.
+
+        Events of calls that finish ahead of their turn are buffered, and results are
+        appended to history only when they are emitted, so the transcript matches a
+        purely sequential run.
+        """
+        event_queues: list[asyncio.Queue[ToolExecutorEvent | BaseException | None]] = [
+            asyncio.Queue() for _ in tool_calls
+        ]
+        finished = [asyncio.Event() for _ in tool_calls]
+
+        async def _run_when_ready(idx: int) -> None:
+            for dep in dependencies[idx]:
+                await finished[dep].wait()
+            await self._forward_tool_call_events(tool_calls[idx], event_queues[idx], defer_history=True)
+            # Dependents only start after a clean finish. If this call raised or was
+            # cancelled, the loop below re-raises at its turn and cancels them, so
+            # they never start, as in a sequential run.
+            finished[idx].set()
+
+        execution_tasks: list[asyncio.Task[None]] = []
+        for idx in range(len(tool_calls)):
+            task = asyncio.create_task(_run_when_ready(idx))
+            self._register_concurrent_task(task)
+            execution_tasks.append(task)
+
+        try:
+            for idx, tool_call in enumerate(tool_calls):
+                self._call_event_emitted.add(tool_call.call_id)
+                yield self._build_tool_call_started(tool_call)
+
+                while True:
+                    exec_event = await event_queues[idx].get()
+                    if exec_event is None:
+                        break
+                    if isinstance(exec_event, BaseException):
+                        raise exec_event
+                    if isinstance(exec_event, ToolExecutionResult):
+                        self._commit_deferred_result(exec_event.tool_call, exec_event.tool_result)
+                        exec_event.is_last_in_step = ends_step and idx == len(tool_calls) - 1
+                    yield exec_event
+        finally:
+            for task in execution_tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*execution_tasks, return_exceptions=True)
+
+    def _commit_deferred_result(self, tool_call: ToolCallRequest, tool_result: message.ToolResultMessage) -> None:
+        self._append_history([tool_result])
+        self._unfinished_calls.pop(tool_call.call_id, None)
+        self._tool_interrupt_result_getters.pop(tool_call.call_id, None)
+
     def _build_tool_call_started(self, tool_call: ToolCallRequest) -> ToolExecutionCallStarted:
         return ToolExecutionCallStarted(tool_call=tool_call)
 
@@ -327,9 +429,11 @@ class ToolExecutor:
         self,
         tool_call: ToolCallRequest,
         event_queue: asyncio.Queue[ToolExecutorEvent | BaseException | None],
+        *,
+        defer_history: bool = False,
     ) -> None:
         try:
-            async for event in self._run_single_tool_call(tool_call):
+            async for event in self._run_single_tool_call(tool_call, defer_history=defer_history):
                 await event_queue.put(event)
         except BaseException as exc:
             await event_queue.put(exc)
@@ -337,7 +441,12 @@ class ToolExecutor:
         finally:
             await event_queue.put(None)
 
-    async def _run_single_tool_call(self, tool_call: ToolCallRequest) -> AsyncGenerator[ToolExecutorEvent]:
+    async def _run_single_tool_call(
+        self,
+        tool_call: ToolCallRequest,
+        *,
+        defer_history: bool = False,
+    ) -> AsyncGenerator[ToolExecutorEvent]:
         def _record_sub_agent_session_id(session_id: str) -> None:
             if tool_call.call_id not in self._sub_agent_session_ids:
                 self._sub_agent_session_ids[tool_call.call_id] = session_id
@@ -409,16 +518,20 @@ class ToolExecutor:
                 cleanup_tasks.append(long_running_task)
             await asyncio.gather(*cleanup_tasks, return_exceptions=True)
 
-        self._append_history([tool_result])
-
         result_event = ToolExecutionResult(tool_call=tool_call, tool_result=tool_result)
 
-        self._unfinished_calls.pop(tool_call.call_id, None)
         self._sub_agent_session_ids.pop(tool_call.call_id, None)
         self._sub_agent_metadata_getters.pop(tool_call.call_id, None)
         self._sub_agent_progress_getters.pop(tool_call.call_id, None)
-        self._tool_interrupt_result_getters.pop(tool_call.call_id, None)
         self._tool_batch_info.pop(tool_call.call_id, None)
+        if defer_history:
+            # The caller appends the result once it is this call's turn. Until then an
+            # interrupt should report the finished result rather than a cancellation.
+            self._tool_interrupt_result_getters[tool_call.call_id] = lambda: tool_result
+        else:
+            self._append_history([tool_result])
+            self._unfinished_calls.pop(tool_call.call_id, None)
+            self._tool_interrupt_result_getters.pop(tool_call.call_id, None)
 
         extra_events = self._build_tool_side_effect_events(tool_result)
         yield result_event
@@ -164,6 +164,7 @@ class Parser(BaseModel):
             type=ActionType.UPDATE,
         )
         lines = text.split("\n")
+        line_index = LineIndex(lines)
         index = 0
         while not self.is_done(
             (
@@ -183,26 +184,24 @@ class Parser(BaseModel):
                 raise DiffError(f"Invalid Line:\n{self.lines[self.index]}")
             if def_str.strip():
                 found = False
-                if not [s for s in lines[:index] if s == def_str]:
+                if not line_index.occurs_before(0, def_str, index):
                     # def str is a skip ahead operator
-                    for i, s in enumerate(lines[index:], index):
-                        if s == def_str:
-                            # print(f"Jump ahead @@: {index} -> {i}: {def_str}")
-                            index = i + 1
-                            found = True
-                            break
-                if not found and not [s for s in lines[:index] if s.strip() == def_str.strip()]:
+                    i = line_index.next_occurrence(0, def_str, index)
+                    if i != -1:
+                        # print(f"Jump ahead @@: {index} -> {i}: {def_str}")
+                        index = i + 1
+                        found = True
+                if not found and not line_index.occurs_before(2, def_str.strip(), index):
                     # def str is a skip ahead operator
-                    for i, s in enumerate(lines[index:], index):
-                        if s.strip() == def_str.strip():
-                            # print(f"Jump ahead @@: {index} -> {i}: {def_str}")
-                            index = i + 1
-                            self.fuzz += 1
-                            found = True
-                            break
+                    i = line_index.next_occurrence(2, def_str.strip(), index)
+                    if i != -1:
+                        # print(f"Jump ahead @@: {index} -> {i}: {def_str}")
+                        index = i + 1
+                        self.fuzz += 1
+                        found = True
             next_chunk_context, chunks, end_patch_index, eof = peek_next_section(self.lines, self.index)
             next_chunk_text = "\n".join(next_chunk_context)
-            new_index, fuzz = find_context(lines, next_chunk_context, index, eof)
+            new_index, fuzz = find_context(lines, next_chunk_context, index, eof, line_index)
             if new_index == -1:
                 if eof:
                     raise DiffError(f"Invalid EOF Context {index}:\n{next_chunk_text}")
@@ -232,34 +231,104 @@ class Parser(BaseModel):
         )
 
 
-def find_context_core(lines: list[str], context: list[str], start: int) -> tuple[int, int]:
+class LineIndex:
+    """Per-file lookup tables for context matching.
+
+    Level 0 holds the lines as-is, level 1 rstripped and level 2 stripped, mirroring
+    the fuzz levels of `find_context_core`. Each level maps every distinct line to
+    its last position, so a context containing a line absent from the file is
+    rejected in O(1), and otherwise only the occurrences of one anchor line are
+    checked instead of every window. The tables are built with C-level dict/map
+    calls and levels are built lazily, because most patches match exactly.
+    """
+
+    _NORMALIZERS: tuple[Callable[[str], str] | None, ...] = (None, str.rstrip, str.strip)
+
+    def __init__(self, lines: list[str]) -> None:
+        self._lines = lines
+        self._levels: list[tuple[list[str], dict[str, int]] | None] = [None, None, None]
+
+    def _level(self, level: int) -> tuple[list[str], dict[str, int]]:
+        built = self._levels[level]
+        if built is None:
+            normalizer = self._NORMALIZERS[level]
+            normalized = self._lines if normalizer is None else list(map(normalizer, self._lines))
+            built = (normalized, dict(zip(normalized, range(len(normalized)))))  # noqa: B905
+            self._levels[level] = built
+        return built
+
+    def _normalize(self, level: int, line: str) -> str:
+        normalizer = self._NORMALIZERS[level]
+        return line if normalizer is None else normalizer(line)
+
+    def _position(self, level: int, line: str, start: int, end: int) -> int:
+        """Position of normalized `line` within [start, end), or -1."""
+        normalized, last = self._level(level)
+        stop = min(end, last.get(line, -1) + 1)
+        if start >= stop:
+            return -1
+        try:
+            return normalized.index(line, start, stop)
+        except ValueError:
+            return -1
+
+    def occurs_before(self, level: int, line: str, end: int) -> bool:
+        """Whether `line`, normalized for `level`, occurs at a position below `end`."""
+        return self._position(level, self._normalize(level, line), 0, end) != -1
+
+    def next_occurrence(self, level: int, line: str, start: int) -> int:
+        """First position >= `start` holding `line` normalized for `level`, or -1."""
+        return self._position(level, self._normalize(level, line), max(start, 0), len(self._lines))
+
+    def find(self, level: int, context: list[str], start: int) -> int:
+        """First window at or after `start` whose normalized lines equal `context`, or -1."""
+        normalized, last = self._level(level)
+        wanted = [self._normalize(level, s) for s in context]
+        if any(s not in last for s in wanted):
+            return -1
+        # Longer lines repeat less often, which keeps the candidate list short.
+        anchor_offset = max(range(len(wanted)), key=lambda offset: len(wanted[offset]))
+        anchor = wanted[anchor_offset]
+        size = len(wanted)
+        end = len(normalized) - size + anchor_offset + 1
+        pos = self._position(level, anchor, max(start, 0) + anchor_offset, end)
+        while pos != -1:
+            i = pos - anchor_offset
+            if normalized[i : i + size] == wanted:
+                return i
+            pos = self._position(level, anchor, pos + 1, end)
+        return -1
+
+
+def find_context_core(
+    lines: list[str], context: list[str], start: int, line_index: LineIndex | None = None
+) -> tuple[int, int]:
     if not context:
         # print("context is empty")
         return start, 0
 
-    # Prefer identical
-    for i in range(start, len(lines)):
-        if lines[i : i + len(context)] == context:
-            return i, 0
-    # RStrip is ok
-    for i in range(start, len(lines)):
-        if [s.rstrip() for s in lines[i : i + len(context)]] == [s.rstrip() for s in context]:
-            return i, 1
-    # Fine, Strip is ok too.
-    for i in range(start, len(lines)):
-        if [s.strip() for s in lines[i : i + len(context)]] == [s.strip() for s in context]:
-            return i, 100
+    if line_index is None:
+        line_index = LineIndex(lines)
+    # Prefer identical, then rstrip is ok, then fine, strip is ok too.
+    for level, fuzz in ((0, 0), (1, 1), (2, 100)):
+        i = line_index.find(level, context, start)
+        if i != -1:
+            return i, fuzz
     return -1, 0
 
 
-def find_context(lines: list[str], context: list[str], start: int, eof: bool) -> tuple[int, int]:
+def find_context(
+    lines: list[str], context: list[str], start: int, eof: bool, line_index: LineIndex | None = None
+) -> tuple[int, int]:
+    if line_index is None:
+        line_index = LineIndex(lines)
     if eof:
-        new_index, fuzz = find_context_core(lines, context, len(lines) - len(context))
+        new_index, fuzz = find_context_core(lines, context, len(lines) - len(context), line_index)
         if new_index != -1:
             return new_index, fuzz
-        new_index, fuzz = find_context_core(lines, context, start)
+        new_index, fuzz = find_context_core(lines, context, start, line_index)
         return new_index, fuzz + 10000
-    return find_context_core(lines, context, start)
+    return find_context_core(lines, context, start, line_index)
 
 
 def peek_next_section(lines: list[str], index: int) -> tuple[list[str], list[Chunk], int, bool]:
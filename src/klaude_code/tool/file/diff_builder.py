@@ -1,18 +1,41 @@
 from __future__ import annotations
 
 import difflib
-from typing import cast
+from typing import Literal, cast
 
 from diff_match_patch import diff_match_patch  # type: ignore[import-untyped]
 
-from klaude_code.const import DIFF_DEFAULT_CONTEXT_LINES, DIFF_MAX_LINE_LENGTH_FOR_CHAR_DIFF
+from klaude_code.const import (
+    DIFF_CHAR_SPAN_BUDGET_CHARS,
+    DIFF_DEFAULT_CONTEXT_LINES,
+    DIFF_FAST_LINE_THRESHOLD,
+    DIFF_FAST_TIMEOUT_SEC,
+    DIFF_MAX_LINE_LENGTH_FOR_CHAR_DIFF,
+)
 from klaude_code.protocol.models import DiffFileDiff, DiffLine, DiffSpan, DiffUIExtra
 
+# (tag, i1, i2, j1, j2) as produced by difflib.SequenceMatcher.get_opcodes().
+Opcode = tuple[Literal["replace", "delete", "insert", "equal"], int, int, int, int]
+
+# diff_match_patch keeps no per-call state, so one instance per configuration is reused.
+_CHAR_DIFFER = diff_match_patch()
+_LINE_DIFFER = diff_match_patch()
+_LINE_DIFFER.Diff_Timeout = DIFF_FAST_TIMEOUT_SEC
+
 
 def build_structured_diff(before: str, after: str, *, file_path: str) -> DiffUIExtra:
     """Build a structured diff with char-level spans for a single file."""
-    file_diff = _build_file_diff(before, after, file_path=file_path)
-    raw_unified_diff = build_unified_diff_text(before, after, from_file=file_path)
+    before_lines = _split_lines(before)
+    after_lines = _split_lines(after)
+    eof_newline_diff = _build_eof_newline_file_diff(before, after, before_lines, after_lines, file_path=file_path)
+    if eof_newline_diff is not None:
+        raw_unified_diff = build_unified_diff_text(before, after, from_file=file_path)
+        return DiffUIExtra(files=[eof_newline_diff], raw_unified_diff=raw_unified_diff)
+
+    # One line diff feeds both the structured view and the raw unified text.
+    groups = _grouped_opcodes(before_lines, after_lines)
+    file_diff = _file_diff_from_groups(before_lines, after_lines, groups, file_path=file_path)
+    raw_unified_diff = _format_unified_diff(before_lines, after_lines, groups, from_file=file_path, to_file=file_path)
     return DiffUIExtra(files=[file_diff], raw_unified_diff=raw_unified_diff)
 
 
@@ -28,15 +51,133 @@ def build_unified_diff_text(before: str, after: str, *, from_file: str, to_file:
     if eof_newline_diff is not None:
         return eof_newline_diff
 
-    lines = difflib.unified_diff(
-        before.splitlines(),
-        after.splitlines(),
-        fromfile=from_file,
-        tofile=target_file,
-        n=DIFF_DEFAULT_CONTEXT_LINES,
-        lineterm="",
-    )
-    return "\n".join(lines)
+    before_lines = _split_lines(before)
+    after_lines = _split_lines(after)
+    groups = _grouped_opcodes(before_lines, after_lines)
+    return _format_unified_diff(before_lines, after_lines, groups, from_file=from_file, to_file=target_file)
+
+
+def _line_opcodes(before_lines: list[str], after_lines: list[str]) -> list[Opcode]:
+    """Line-level opcodes in `difflib.SequenceMatcher.get_opcodes()` form.
+
+    Small inputs use SequenceMatcher. Above DIFF_FAST_LINE_THRESHOLD combined lines,
+    each distinct line is mapped to a single code point and the resulting strings
+    are diffed with diff_match_patch's Myers implementation, which trims common
+    prefixes/suffixes in C-backed string operations and gives up on refinement
+    (not correctness) after DIFF_FAST_TIMEOUT_SEC.
+    """
+    if len(before_lines) + len(after_lines) <= DIFF_FAST_LINE_THRESHOLD:
+        return difflib.SequenceMatcher(None, before_lines, after_lines).get_opcodes()
+
+    codes: dict[str, str] = {}
+    try:
+        before_text = "".join([codes.setdefault(line, chr(len(codes))) for line in before_lines])
+        after_text = "".join([codes.setdefault(line, chr(len(codes))) for line in after_lines])
+    except ValueError:
+        # More distinct lines than code points; treat the whole file as replaced.
+        return [("replace", 0, len(before_lines), 0, len(after_lines))]
+
+    diffs = cast(list[tuple[int, str]], _LINE_DIFFER.diff_main(before_text, after_text, False))  # type: ignore[no-untyped-call]
+
+    opcodes: list[Opcode] = []
+    i = j = 0
+    deleted = inserted = 0
+
+    def flush() -> None:
+        nonlocal i, j, deleted, inserted
+        if deleted and inserted:
+            opcodes.append(("replace", i, i + deleted, j, j + inserted))
+        elif deleted:
+            opcodes.append(("delete", i, i + deleted, j, j))
+        elif inserted:
+            opcodes.append(("insert", i, i, j, j + inserted))
+        i += deleted
+        j += inserted
+        deleted = inserted = 0
+
+    for op, text in diffs:
+        if op == diff_match_patch.DIFF_EQUAL:  # type: ignore[no-untyped-call]
+            flush()
+            opcodes.append(("equal", i, i + len(text), j, j + len(text)))
+            i += len(text)
+            j += len(text)
+        elif op == diff_match_patch.DIFF_DELETE:  # type: ignore[no-untyped-call]
+            deleted += len(text)
+        else:
+            inserted += len(text)
+    flush()
+    return opcodes
+
+
+def _grouped_opcodes(before_lines: list[str], after_lines: list[str]) -> list[list[Opcode]]:
+    return _group_opcodes(_line_opcodes(before_lines, after_lines), DIFF_DEFAULT_CONTEXT_LINES)
+
+
+def _group_opcodes(opcodes: list[Opcode], n: int) -> list[list[Opcode]]:
+    """Hunks with up to `n` context lines, as `SequenceMatcher.get_grouped_opcodes(n)`."""
+    codes = list(opcodes)
+    if not codes:
+        codes.append(("equal", 0, 1, 0, 1))
+    # Fixup leading and trailing groups if they show no changes.
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    nn = n + n
+    groups: list[list[Opcode]] = []
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        # End the current group and start a new one whenever there is a large range with no changes.
+        if tag == "equal" and i2 - i1 > nn:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
+
+
+def _format_unified_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _format_unified_diff(
+    before_lines: list[str],
+    after_lines: list[str],
+    groups: list[list[Opcode]],
+    *,
+    from_file: str,
+    to_file: str,
+) -> str:
+    """Render hunks exactly as `difflib.unified_diff(..., lineterm="")` would."""
+    if not groups:
+        return ""
+    out = [f"--- {from_file}", f"+++ {to_file}"]
+    for group in groups:
+        first, last = group[0], group[-1]
+        file1_range = _format_unified_range(first[1], last[2])
+        file2_range = _format_unified_range(first[3], last[4])
+        out.append(f"@@ -{file1_range} +{file2_range} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in before_lines[i1:i2])
+                continue
+            if tag in {"replace", "delete"}:
+                out.extend("-" + line for line in before_lines[i1:i2])
+            if tag in {"replace", "insert"}:
+                out.extend("+" + line for line in after_lines[j1:j2])
+    return "\n".join(out)
 
 
 def _build_file_diff(before: str, after: str, *, file_path: str) -> DiffFileDiff:
@@ -47,13 +188,24 @@ def _build_file_diff(before: str, after: str, *, file_path: str) -> DiffFileDiff
     if eof_newline_diff is not None:
         return eof_newline_diff
 
-    matcher = difflib.SequenceMatcher(None, before_lines, after_lines)
+    groups = _grouped_opcodes(before_lines, after_lines)
+    return _file_diff_from_groups(before_lines, after_lines, groups, file_path=file_path)
+
+
+def _file_diff_from_groups(
+    before_lines: list[str],
+    after_lines: list[str],
+    groups: list[list[Opcode]],
+    *,
+    file_path: str,
+) -> DiffFileDiff:
     lines: list[DiffLine] = []
     stats_add = 0
     stats_remove = 0
+    # Char-level spans are a readability aid; past this budget replaced lines are shown whole.
+    char_budget = DIFF_CHAR_SPAN_BUDGET_CHARS
 
-    grouped_opcodes = matcher.get_grouped_opcodes(n=DIFF_DEFAULT_CONTEXT_LINES)
-    for group_idx, group in enumerate(grouped_opcodes):
+    for group_idx, group in enumerate(groups):
         if group_idx > 0:
             lines.append(_gap_line())
 
@@ -88,7 +240,16 @@ def _build_file_diff(before: str, after: str, *, file_path: str) -> DiffFileDiff
 
                 paired_len = min(len(old_block), len(new_block))
                 for idx in range(paired_len):
-                    remove_spans, add_spans = _diff_line_spans(old_block[idx], new_block[idx])
+                    old_line, new_line = old_block[idx], new_block[idx]
+                    cost = len(old_line) + len(new_line)
+                    if cost <= char_budget:
+                        char_budget -= cost
+                        remove_spans, add_spans = _diff_line_spans(old_line, new_line)
+                    else:
+                        remove_spans, add_spans = (
+                            [DiffSpan(op="equal", text=old_line)],
+                            [DiffSpan(op="equal", text=new_line)],
+                        )
                     remove_block.append(remove_spans)
                     add_block.append(add_spans)
 
@@ -212,9 +373,8 @@ def _diff_line_spans(old_line: str, new_line: str) -> tuple[list[DiffSpan], list
             [DiffSpan(op="equal", text=new_line)],
         )
 
-    differ = diff_match_patch()
-    diffs = cast(list[tuple[int, str]], differ.diff_main(old_line, new_line))  # type: ignore[no-untyped-call]
-    differ.diff_cleanupSemantic(diffs)  # type: ignore[no-untyped-call]
+    diffs = cast(list[tuple[int, str]], _CHAR_DIFFER.diff_main(old_line, new_line))  # type: ignore[no-untyped-call]
+    _CHAR_DIFFER.diff_cleanupSemantic(diffs)  # type: ignore[no-untyped-call]
 
     remove_spans: list[DiffSpan] = []
     add_spans: list[DiffSpan] = []
@@ -9,7 +9,7 @@ from pydantic import BaseModel, Field
 from klaude_code.const import EDIT_MAX_FILE_SIZE
 from klaude_code.protocol import llm_param, message, tools
 from klaude_code.protocol.models import FileStatus
-from klaude_code.tool.core.abc import ToolABC, load_desc
+from klaude_code.tool.core.abc import ToolABC, ToolResourceAccess, load_desc
 from klaude_code.tool.core.context import ToolContext
 from klaude_code.tool.core.registry import register
 from klaude_code.tool.file._utils import (
@@ -101,6 +101,15 @@ class EditTool(ToolABC):
         # Replace one occurrence only (we already ensured uniqueness)
         return content.replace(old_string, new_string, 1)
 
+    @classmethod
+    def resource_access(cls, arguments: str, work_dir: Path) -> ToolResourceAccess | None:
+        try:
+            args = EditTool.EditArguments.model_validate_json(arguments)
+        except ValueError:
+            return None
+        file_path = str(resolve_workspace_path(args.file_path, work_dir))
+        return ToolResourceAccess(read_only=False, paths=frozenset({file_path}))
+
     @classmethod
     async def call(cls, arguments: str, context: ToolContext) -> message.ToolResultMessage:
         try:
@@ -14,7 +14,7 @@ from klaude_code.const import (
 from klaude_code.log import log_debug
 from klaude_code.prompts.messages import FILE_UNCHANGED_STUB
 from klaude_code.protocol import llm_param, message, tools
-from klaude_code.tool.core.abc import ToolABC, load_desc
+from klaude_code.tool.core.abc import ToolABC, ToolResourceAccess, load_desc
 from klaude_code.tool.core.context import ToolContext
 from klaude_code.tool.core.registry import register
 from klaude_code.tool.file import read_handlers
@@ -155,6 +155,15 @@ class ReadTool(ToolABC):
             },
         )
 
+    @classmethod
+    def resource_access(cls, arguments: str, work_dir: Path) -> ToolResourceAccess | None:
+        try:
+            args = ReadTool.ReadArguments.model_validate_json(arguments)
+        except ValueError:
+            return None
+        file_path = str(resolve_workspace_path(args.file_path, work_dir))
+        return ToolResourceAccess(read_only=True, paths=frozenset({file_path}))
+
     @classmethod
     async def call(cls, arguments: str, context: ToolContext) -> message.ToolResultMessage:
         try:
@@ -3,24 +3,28 @@ import contextlib
 import os
 import signal
 import subprocess
-import tempfile
 import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
 
-from klaude_code.const import BASH_DEFAULT_TIMEOUT_MS, BASH_TERMINATE_TIMEOUT_SEC
+from klaude_code.const import BASH_DEFAULT_TIMEOUT_MS, BASH_PERSISTENT_SHELL_ENABLED, BASH_PIPE_CAPTURE_ENABLED
 from klaude_code.protocol import llm_param, message, tools
 from klaude_code.protocol.models import BashUIExtra
-from klaude_code.tool.core.abc import ToolABC, load_desc
-from klaude_code.tool.core.ansi import strip_ansi
+from klaude_code.tool.core.abc import ToolABC, ToolResourceAccess, load_desc
 from klaude_code.tool.core.context import ToolContext
 from klaude_code.tool.core.registry import register
-from klaude_code.tool.shell.command_safety import is_safe_command
+from klaude_code.tool.shell.command_safety import is_read_only_command, is_safe_command
 from klaude_code.tool.shell.file_tracking import ShellFileTracker
-
-_STREAM_POLL_INTERVAL_SEC = 0.05
+from klaude_code.tool.shell.output_capture import HeadTailBuffer, OutputCapture, StreamDecoder, create_output_capture
+from klaude_code.tool.shell.persistent_shell import (
+    PersistentShell,
+    ShellExitedError,
+    acquire_persistent_shell,
+    terminate_process_group,
+)
 
 # 128 + SIGPIPE. A downstream stage closing the pipe early (`rg foo | head -5`)
 # is normal, but pipefail reports it as a pipeline failure, so it is normalized
@@ -39,6 +43,49 @@ def _build_interrupted_output(command: str, elapsed_seconds: float, stdout: str,
     return "\n".join(parts)
 
 
+def _build_timeout_result(command: str, timeout_ms: int, stdout: str, stderr: str) -> message.ToolResultMessage:
+    parts = [f"Timeout after {timeout_ms} ms running: {command}"]
+    stdout = stdout.rstrip("\n")
+    stderr = stderr.rstrip("\n")
+    if stdout:
+        parts.append(f"[stdout before timeout]\n{stdout}")
+    if stderr:
+        parts.append(f"[stderr before timeout]\n{stderr}")
+    return message.ToolResultMessage(
+        status="error",
+        output_text="\n".join(parts),
+    )
+
+
+def _build_exit_result(rc: int, stdout: str, stderr: str) -> message.ToolResultMessage:
+    if rc == 0:
+        output = stdout
+        # Include stderr if there is useful diagnostics despite success
+        if stderr.strip():
+            output = (output + ("\n" if output else "")) + f"[stderr]\n{stderr}"
+        return message.ToolResultMessage(
+            status="success",
+            # Preserve leading whitespace for tools like `nl -ba`.
+            # Only trim trailing newlines to avoid adding an extra blank line in the UI.
+            output_text=output.rstrip("\n"),
+            ui_extra=BashUIExtra(exit_code=rc),
+        )
+
+    # Lead with the exit code so the failure stays visible even when the
+    # output is long enough to be truncated later.
+    combined = f"Command exited with code {rc}\n"
+    if stdout.strip():
+        combined += f"[stdout]\n{stdout}\n"
+    if stderr.strip():
+        combined += f"[stderr]\n{stderr}"
+    return message.ToolResultMessage(
+        status="success",
+        # Preserve leading whitespace; only trim trailing newlines.
+        output_text=combined.rstrip("\n"),
+        ui_extra=BashUIExtra(exit_code=rc),
+    )
+
+
 @register(tools.BASH)
 class BashTool(ToolABC):
     @classmethod
@@ -82,6 +129,18 @@ class BashTool(ToolABC):
         description: str | None = None
         timeout_ms: int = BASH_DEFAULT_TIMEOUT_MS
 
+    @classmethod
+    def resource_access(cls, arguments: str, work_dir: Path) -> ToolResourceAccess | None:
+        del work_dir
+        try:
+            args = BashTool.BashArguments.model_validate_json(arguments)
+        except ValueError:
+            return None
+        if not is_read_only_command(args.command, persistent_shell=BASH_PERSISTENT_SHELL_ENABLED):
+            return None
+        # Reads are not attributed to specific paths, so any writer in the step waits for it.
+        return ToolResourceAccess(read_only=True)
+
     @classmethod
     async def call(cls, arguments: str, context: ToolContext) -> message.ToolResultMessage:
         try:
@@ -141,209 +200,132 @@ class BashTool(ToolABC):
         )
 
         emit_tool_output_delta = context.emit_tool_output_delta
-        shell_file_tracker = ShellFileTracker(context.file_tracker, context.work_dir)
 
-        async def _terminate_process(proc: asyncio.subprocess.Process) -> None:
-            # Best-effort termination. Ensure we don't hang on cancellation.
-            if proc.returncode is not None:
+        async def _emit_output_delta(content: str) -> None:
+            if emit_tool_output_delta is None or not content:
                 return
+            await emit_tool_output_delta(content)
 
-            try:
-                if os.name == "posix":
-                    os.killpg(proc.pid, signal.SIGTERM)
-                else:
-                    proc.terminate()
-            except ProcessLookupError:
-                return
-            except OSError:
-                # Fall back to kill below.
-                pass
+        if BASH_PERSISTENT_SHELL_ENABLED and os.name == "posix":
+            shell = acquire_persistent_shell(context.session_id, work_dir=context.work_dir, env=env)
+            return await cls._run_in_persistent_shell(
+                shell,
+                args,
+                context,
+                timeout_sec=timeout_sec,
+                emit_output_delta=_emit_output_delta,
+            )
 
-            with contextlib.suppress(Exception):
-                await asyncio.wait_for(proc.wait(), timeout=BASH_TERMINATE_TIMEOUT_SEC)
-                return
+        shell_file_tracker = ShellFileTracker(context.file_tracker, context.work_dir)
 
-            # Escalate to hard kill if it didn't exit quickly.
-            with contextlib.suppress(Exception):
-                if os.name == "posix":
-                    os.killpg(proc.pid, signal.SIGKILL)
-                else:
-                    proc.kill()
-            with contextlib.suppress(Exception):
-                await asyncio.wait_for(proc.wait(), timeout=BASH_TERMINATE_TIMEOUT_SEC)
+        capture: OutputCapture | None = None
+        stdout_buffer = HeadTailBuffer(label="bash-stdout")
+        stderr_buffer = HeadTailBuffer(label="bash-stderr")
 
-        async def _emit_output_delta(content: str) -> None:
-            if emit_tool_output_delta is None or not content:
-                return
-            await emit_tool_output_delta(content)
+        def _append_available_output() -> tuple[str, str]:
+            if capture is None:
+                return "", ""
+            stdout_chunk, stderr_chunk = capture.read_available()
+            stdout_buffer.append(stdout_chunk)
+            stderr_buffer.append(stderr_chunk)
+            return stdout_chunk, stderr_chunk
 
-        def _read_available_text(temp_file: Any, *, offset: int) -> tuple[str, int]:
-            temp_file.flush()
-            temp_file.seek(offset)
-            data = temp_file.read()
-            next_offset = temp_file.tell()
-            if not data:
-                return "", next_offset
-            return strip_ansi(data.decode(errors="replace")), next_offset
+        async def _append_and_emit_available_output() -> None:
+            stdout_chunk, stderr_chunk = _append_available_output()
+            await _emit_output_delta(stdout_chunk)
+            await _emit_output_delta(stderr_chunk)
 
         try:
+            capture = create_output_capture(use_pipes=BASH_PIPE_CAPTURE_ENABLED)
             # Create a dedicated process group so we can terminate the whole tree.
             # (macOS/Linux support start_new_session; Windows does not.)
             #
-            # Use temp files instead of PIPE for stdout/stderr to avoid hanging
-            # on background processes. With pipes, communicate() waits for EOF
-            # which only arrives when ALL holders of the write end close it.
-            # Background processes (cmd &) inherit pipe fds, so communicate()
-            # blocks even after the shell exits. Temp files sidestep this:
-            # proc.wait() returns as soon as the shell itself exits.
-            with tempfile.TemporaryFile() as stdout_tmp, tempfile.TemporaryFile() as stderr_tmp:
-                kwargs: dict[str, Any] = {
-                    "stdin": asyncio.subprocess.DEVNULL,
-                    "stdout": stdout_tmp,
-                    "stderr": stderr_tmp,
-                    "env": env,
-                    "cwd": str(context.work_dir),
-                }
-                if os.name == "posix":
-                    kwargs["start_new_session"] = True
-                elif os.name == "nt":  # pragma: no cover
-                    kwargs["creationflags"] = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+            # Output is never awaited to EOF: background processes (cmd &) inherit
+            # the stdout/stderr handles, so EOF only arrives once they exit too.
+            # Completion is driven by the shell's own exit and the capture reports
+            # whatever output is available at that point.
+            kwargs: dict[str, Any] = {
+                "stdin": asyncio.subprocess.DEVNULL,
+                **capture.popen_kwargs(),
+                "env": env,
+                "cwd": str(context.work_dir),
+            }
+            if os.name == "posix":
+                kwargs["start_new_session"] = True
+            elif os.name == "nt":  # pragma: no cover
+                kwargs["creationflags"] = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
 
+            try:
                 proc = await asyncio.create_subprocess_exec(*cmd, **kwargs)
-                started_at = time.monotonic()
-                deadline = asyncio.get_running_loop().time() + timeout_sec
-                stdout_offset = 0
-                stderr_offset = 0
-                stdout_chunks: list[str] = []
-                stderr_chunks: list[str] = []
-
-                def _append_available_output() -> None:
-                    nonlocal stdout_offset, stderr_offset
-
-                    stdout_chunk, stdout_offset = _read_available_text(stdout_tmp, offset=stdout_offset)
-                    stderr_chunk, stderr_offset = _read_available_text(stderr_tmp, offset=stderr_offset)
-                    if stdout_chunk:
-                        stdout_chunks.append(stdout_chunk)
-                    if stderr_chunk:
-                        stderr_chunks.append(stderr_chunk)
-
-                def _build_interrupt_result() -> message.ToolResultMessage:
-                    _append_available_output()
-                    return message.ToolResultMessage(
-                        status="aborted",
-                        output_text=_build_interrupted_output(
-                            args.command,
-                            time.monotonic() - started_at,
-                            "".join(stdout_chunks),
-                            "".join(stderr_chunks),
-                        ),
-                    )
-
-                if context.register_tool_interrupt_result_getter is not None:
-                    context.register_tool_interrupt_result_getter(_build_interrupt_result)
-
-                try:
-                    while True:
-                        remaining = deadline - asyncio.get_running_loop().time()
-                        if remaining <= 0:
-                            raise TimeoutError
-                        try:
-                            await asyncio.wait_for(proc.wait(), timeout=min(_STREAM_POLL_INTERVAL_SEC, remaining))
-                            break
-                        except TimeoutError:
-                            pass
-
-                        stdout_chunk, stdout_offset = _read_available_text(stdout_tmp, offset=stdout_offset)
-                        stderr_chunk, stderr_offset = _read_available_text(stderr_tmp, offset=stderr_offset)
-                        if stdout_chunk:
-                            stdout_chunks.append(stdout_chunk)
-                            await _emit_output_delta(stdout_chunk)
-                        if stderr_chunk:
-                            stderr_chunks.append(stderr_chunk)
-                            await _emit_output_delta(stderr_chunk)
-
-                    stdout_chunk, stdout_offset = _read_available_text(stdout_tmp, offset=stdout_offset)
-                    stderr_chunk, stderr_offset = _read_available_text(stderr_tmp, offset=stderr_offset)
-                    if stdout_chunk:
-                        stdout_chunks.append(stdout_chunk)
-                        await _emit_output_delta(stdout_chunk)
-                    if stderr_chunk:
-                        stderr_chunks.append(stderr_chunk)
-                        await _emit_output_delta(stderr_chunk)
-                except TimeoutError:
-                    # Read any remaining output before terminating.
-                    stdout_chunk, stdout_offset = _read_available_text(stdout_tmp, offset=stdout_offset)
-                    stderr_chunk, stderr_offset = _read_available_text(stderr_tmp, offset=stderr_offset)
-                    if stdout_chunk:
-                        stdout_chunks.append(stdout_chunk)
-                    if stderr_chunk:
-                        stderr_chunks.append(stderr_chunk)
-
-                    with contextlib.suppress(Exception):
-                        await _terminate_process(proc)
-
-                    timeout_header = f"Timeout after {args.timeout_ms} ms running: {args.command}"
-                    collected_stdout = "".join(stdout_chunks).rstrip("\n")
-                    collected_stderr = "".join(stderr_chunks).rstrip("\n")
-                    parts = [timeout_header]
-                    if collected_stdout:
-                        parts.append(f"[stdout before timeout]\n{collected_stdout}")
-                    if collected_stderr:
-                        parts.append(f"[stderr before timeout]\n{collected_stderr}")
-                    return message.ToolResultMessage(
-                        status="error",
-                        output_text="\n".join(parts),
-                    )
-                except asyncio.CancelledError:
-                    _append_available_output()
-                    with contextlib.suppress(asyncio.CancelledError, Exception):
-                        await asyncio.shield(_terminate_process(proc))
-                    _append_available_output()
-                    return message.ToolResultMessage(
-                        status="aborted",
-                        output_text=_build_interrupted_output(
-                            args.command,
-                            time.monotonic() - started_at,
-                            "".join(stdout_chunks),
-                            "".join(stderr_chunks),
-                        ),
-                    )
+            finally:
+                capture.after_spawn()
+            started_at = time.monotonic()
+            deadline = asyncio.get_running_loop().time() + timeout_sec
+            exit_task = asyncio.ensure_future(proc.wait())
+
+            def _build_interrupt_result() -> message.ToolResultMessage:
+                _append_available_output()
+                return message.ToolResultMessage(
+                    status="aborted",
+                    output_text=_build_interrupted_output(
+                        args.command,
+                        time.monotonic() - started_at,
+                        stdout_buffer.render(),
+                        stderr_buffer.render(),
+                    ),
+                )
+
+            if context.register_tool_interrupt_result_getter is not None:
+                context.register_tool_interrupt_result_getter(_build_interrupt_result)
+
+            try:
+                while True:
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    if remaining <= 0:
+                        raise TimeoutError
+                    exited = await capture.wait(exit_task, remaining)
+                    await _append_and_emit_available_output()
+                    if exited:
+                        break
+            except TimeoutError:
+                # Read any remaining output before terminating.
+                _append_available_output()
+
+                with contextlib.suppress(Exception):
+                    await terminate_process_group(proc)
+
+                return _build_timeout_result(
+                    args.command, args.timeout_ms, stdout_buffer.render(), stderr_buffer.render()
+                )
+            except asyncio.CancelledError:
+                _append_available_output()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await asyncio.shield(terminate_process_group(proc))
+                _append_available_output()
+                return message.ToolResultMessage(
+                    status="aborted",
+                    output_text=_build_interrupted_output(
+                        args.command,
+                        time.monotonic() - started_at,
+                        stdout_buffer.render(),
+                        stderr_buffer.render(),
+                    ),
+                )
+            finally:
+                if not exit_task.done():
+                    exit_task.cancel()
 
-            stdout = "".join(stdout_chunks)
-            stderr = "".join(stderr_chunks)
+            stdout = stdout_buffer.render()
+            stderr = stderr_buffer.render()
             rc = proc.returncode if proc.returncode is not None else 1
             if rc == _SIGPIPE_EXIT_CODE:
                 rc = 0
 
             if rc == 0:
-                output = stdout
-                # Include stderr if there is useful diagnostics despite success
-                if stderr.strip():
-                    output = (output + ("\n" if output else "")) + f"[stderr]\n{stderr}"
-
                 shell_file_tracker.update_from_command(args.command)
-                return message.ToolResultMessage(
-                    status="success",
-                    # Preserve leading whitespace for tools like `nl -ba`.
-                    # Only trim trailing newlines to avoid adding an extra blank line in the UI.
-                    output_text=output.rstrip("\n"),
-                    ui_extra=BashUIExtra(exit_code=rc),
-                )
             else:
                 await _emit_output_delta(f"\nCommand exited with code {rc}\n")
-                # Lead with the exit code so the failure stays visible even when the
-                # output is long enough to be truncated later.
-                combined = f"Command exited with code {rc}\n"
-                if stdout.strip():
-                    combined += f"[stdout]\n{stdout}\n"
-                if stderr.strip():
-                    combined += f"[stderr]\n{stderr}"
-                return message.ToolResultMessage(
-                    status="success",
-                    # Preserve leading whitespace; only trim trailing newlines.
-                    output_text=combined.rstrip("\n"),
-                    ui_extra=BashUIExtra(exit_code=rc),
-                )
+            return _build_exit_result(rc, stdout, stderr)
         except FileNotFoundError:
             return message.ToolResultMessage(
                 status="error",
@@ -357,3 +339,76 @@ class BashTool(ToolABC):
                 status="error",
                 output_text=f"Execution error: {e}",
             )
+        finally:
+            if capture is not None:
+                capture.close()
+            stdout_buffer.close()
+            stderr_buffer.close()
+
+    @classmethod
+    async def _run_in_persistent_shell(
+        cls,
+        shell: PersistentShell,
+        args: BashArguments,
+        context: ToolContext,
+        *,
+        timeout_sec: float,
+        emit_output_delta: Callable[[str], Awaitable[None]],
+    ) -> message.ToolResultMessage:
+        buffers = {"stdout": HeadTailBuffer(label="bash-stdout"), "stderr": HeadTailBuffer(label="bash-stderr")}
+        decoders = {"stdout": StreamDecoder(), "stderr": StreamDecoder()}
+        started_at = time.monotonic()
+        # Relative paths in the command resolve against the shell's directory,
+        # which an earlier `cd` may have moved away from the session's work_dir.
+        command_cwd = context.work_dir
+
+        def _on_start(cwd: Path) -> None:
+            nonlocal command_cwd
+            command_cwd = cwd
+
+        async def _on_output(stream: str, data: bytes) -> None:
+            text = decoders[stream].decode(data)
+            buffers[stream].append(text)
+            await emit_output_delta(text)
+
+        def _build_interrupt_result() -> message.ToolResultMessage:
+            return message.ToolResultMessage(
+                status="aborted",
+                output_text=_build_interrupted_output(
+                    args.command,
+                    time.monotonic() - started_at,
+                    buffers["stdout"].render(),
+                    buffers["stderr"].render(),
+                ),
+            )
+
+        if context.register_tool_interrupt_result_getter is not None:
+            context.register_tool_interrupt_result_getter(_build_interrupt_result)
+
+        try:
+            try:
+                rc = await shell.run(args.command, timeout_sec=timeout_sec, on_output=_on_output, on_start=_on_start)
+            except ShellExitedError as exc:
+                # `exit` or a crash took the shell down; the next call respawns it.
+                rc = exc.returncode
+            except TimeoutError:
+                return _build_timeout_result(
+                    args.command, args.timeout_ms, buffers["stdout"].render(), buffers["stderr"].render()
+                )
+            except asyncio.CancelledError:
+                return _build_interrupt_result()
+            except OSError as e:
+                return message.ToolResultMessage(status="error", output_text=f"Execution error: {e}")
+
+            for stream, decoder in decoders.items():
+                buffers[stream].append(decoder.decode(b"", final=True))
+            if rc == _SIGPIPE_EXIT_CODE:
+                rc = 0
+            if rc == 0:
+                ShellFileTracker(context.file_tracker, command_cwd).update_from_command(args.command)
+            else:
+                await emit_output_delta(f"\nCommand exited with code {rc}\n")
+            return _build_exit_result(rc, buffers["stdout"].render(), buffers["stderr"].render())
+        finally:
+            for buffer in buffers.values():
+                buffer.close()
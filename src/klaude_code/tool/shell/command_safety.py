@@ -1,4 +1,5 @@
 import os
+import re
 import shlex
 
 from klaude_code.log import log_debug
@@ -174,3 +175,196 @@ def is_safe_command(command: str, *, work_dir: str) -> SafetyCheckResult:
         return SafetyCheckResult(False, "Empty command")
 
     return _is_safe_argv(argv, work_dir)
+
+
+# Commands that only inspect the filesystem or print text. Anything not listed here is
+# treated as a potential writer.
+_READ_ONLY_COMMANDS = frozenset(
+    {
+        "basename",
+        "cat",
+        "cmp",
+        "column",
+        "comm",
+        "cut",
+        "df",
+        "diff",
+        "dirname",
+        "du",
+        "echo",
+        "egrep",
+        "fd",
+        "fgrep",
+        "file",
+        "grep",
+        "head",
+        "jq",
+        "ls",
+        "md5sum",
+        "nl",
+        "printf",
+        "pwd",
+        "readlink",
+        "realpath",
+        "rg",
+        "sha256sum",
+        "shasum",
+        "stat",
+        "tail",
+        "tr",
+        "tree",
+        "true",
+        "uname",
+        "wc",
+        "which",
+        "whoami",
+    }
+)
+
+_READ_ONLY_GIT_SUBCOMMANDS = frozenset(
+    {
+        "blame",
+        "cat-file",
+        "describe",
+        "diff",
+        "grep",
+        "log",
+        "ls-files",
+        "ls-tree",
+        "merge-base",
+        "rev-list",
+        "rev-parse",
+        "shortlog",
+        "show",
+        "status",
+    }
+)
+
+_FIND_WRITE_ACTIONS = frozenset(
+    {"-delete", "-exec", "-execdir", "-fls", "-fprint", "-fprint0", "-fprintf", "-ok", "-okdir"}
+)
+
+# Options that make an otherwise read-only command write a file or run another program,
+# as (short option letters, long options). Long options also match their unambiguous
+# GNU-style abbreviations, e.g. `sort --out=f`.
+_WRITING_OPTIONS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "fd": ("xX", ("--exec", "--exec-batch")),
+    "rg": ("", ("--pre",)),
+    "sort": ("o", ("--output", "--compress-program")),
+    # `-R` re-runs tree with `-o 00Tree.html` in every directory.
+    "tree": ("oR", ()),
+}
+# `--ext-diff` and `--textconv` run the diff drivers and filters named in git config.
+_WRITING_GIT_LONG_OPTIONS = ("--output", "--open-files-in-pager", "--ext-diff", "--textconv")
+_WRITING_GIT_OPTIONS: tuple[str, tuple[str, ...]] = ("", _WRITING_GIT_LONG_OPTIONS)
+_WRITING_GIT_GREP_OPTIONS: tuple[str, tuple[str, ...]] = ("O", _WRITING_GIT_LONG_OPTIONS)
+
+_SHELL_SEPARATORS = frozenset({"|", "||", "&&", ";"})
+_OUTPUT_REDIRECTS = frozenset({">", ">>", ">|", "&>"})
+_ENV_ASSIGNMENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+
+
+def _has_option(args: list[str], options: tuple[str, tuple[str, ...]]) -> bool:
+    """Return True when any of `options` appears in `args`.
+
+    Combined short flags are split (`-ni` counts as `-i`), and letters after a flag that
+    takes a value are checked too, so `-ti` is rejected by a check for `-i` even though
+    `i` is the value of `-t`. That only makes the check more conservative.
+    """
+    short_letters, long_options = options
+    for arg in args:
+        if arg == "--":
+            return False
+        if arg.startswith("--"):
+            name = arg.split("=", 1)[0]
+            if len(name) > 2 and any(option.startswith(name) for option in long_options):
+                return True
+        elif arg.startswith("-") and any(letter in arg[1:] for letter in short_letters):
+            return True
+    return False
+
+
+def _is_read_only_git_argv(argv: list[str]) -> bool:
+    index = 1
+    while index < len(argv) and argv[index].startswith("-"):
+        # `-c` can point git at arbitrary programs (core.pager, diff.external, ...).
+        if argv[index] == "-c" or argv[index].startswith("--config-env"):
+            return False
+        # Global options such as `git -C path` and `git --no-pager`.
+        index += 2 if argv[index] == "-C" else 1
+    if index >= len(argv) or argv[index] not in _READ_ONLY_GIT_SUBCOMMANDS:
+        return False
+    options = _WRITING_GIT_GREP_OPTIONS if argv[index] == "grep" else _WRITING_GIT_OPTIONS
+    return not _has_option(argv[index + 1 :], options)
+
+
+def _is_read_only_argv(argv: list[str], *, persistent_shell: bool) -> bool:
+    while argv and _ENV_ASSIGNMENT_RE.match(argv[0]):
+        argv = argv[1:]
+    if not argv:
+        return False
+
+    cmd0 = argv[0]
+    if cmd0 == "cd":
+        # A persistent shell keeps the new directory for later calls.
+        return not persistent_shell
+    if cmd0 == "git":
+        return _is_read_only_git_argv(argv)
+    if cmd0 == "find":
+        return not any(arg in _FIND_WRITE_ACTIONS for arg in argv[1:])
+    if cmd0 in _WRITING_OPTIONS:
+        return not _has_option(argv[1:], _WRITING_OPTIONS[cmd0])
+    return cmd0 in _READ_ONLY_COMMANDS
+
+
+def is_read_only_command(command: str, *, persistent_shell: bool = False) -> bool:
+    """Return True when `command` provably leaves the filesystem untouched.
+
+    Accepts pipelines and `&&`/`||`/`;` lists of allowlisted inspection commands
+    (`ls`, `rg`, `cat`, read-only `git` subcommands, ...). Output redirection other
+    than to /dev/null, command substitution, subshells and background jobs make the
+    command count as a writer, as do options that write files or run programs
+    (`sort -o`, `fd -x`, ...). `sed` is never read-only: its scripts can write files
+    (`w`) and run commands (`e`). With `persistent_shell`, `cd` changes state
+    later calls depend on and is not read-only either. A False result only means
+    "not proven read-only".
+    """
+    if "`" in command or "$(" in command or "<(" in command or ">(" in command:
+        return False
+    try:
+        lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+        lexer.whitespace_split = True
+        tokens = list(lexer)
+    except ValueError:
+        return False
+    if not tokens:
+        return False
+
+    segments: list[list[str]] = [[]]
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        next_token = tokens[index + 1] if index + 1 < len(tokens) else None
+        if token in _SHELL_SEPARATORS:
+            segments.append([])
+        elif token in _OUTPUT_REDIRECTS:
+            if next_token != "/dev/null":
+                return False
+            index += 1
+        elif token in (">&", "<&"):
+            if next_token is None or not next_token.isdigit():
+                return False
+            index += 1
+        elif token == "<":
+            index += 1
+        elif token.isdigit() and next_token is not None and next_token in (*_OUTPUT_REDIRECTS, ">&", "<&", "<"):
+            # File descriptor prefix of a redirect, e.g. the `2` in `2>/dev/null`.
+            pass
+        elif token and token[0] in "();<>|&":
+            # Subshells, background jobs and anything else the lexer split off.
+            return False
+        else:
+            segments[-1].append(token)
+        index += 1
+
+    return all(segment and _is_read_only_argv(segment, persistent_shell=persistent_shell) for segment in segments)
@@ -0,0 +1,373 @@
+"""Capture of Bash tool stdout/stderr.
+
+Two capture strategies share one interface:
+
+- ``PipeOutputCapture`` (POSIX): the command writes into pipes whose read ends
+  are watched with ``loop.add_reader``, so output is picked up as soon as it is
+  written instead of on a fixed poll interval. Once the shell exits, pipes still
+  held open by background children (``server &``) are handed to a discarding
+  reader rather than awaited, so the tool returns immediately and the children
+  keep running without hitting ``SIGPIPE``.
+- ``TempFileOutputCapture``: the portable fallback that redirects into temp files
+  and re-reads them on a poll interval.
+
+Either way the decoded text lands in a ``HeadTailBuffer`` per stream, which keeps
+everything in memory up to a cap and then spills the full stream to the offload
+directory, retaining only the head and tail. A multi-GB build log therefore never
+sits in memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import contextlib
+import os
+import secrets
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import IO, Any, Protocol
+
+from klaude_code.const import (
+    BASH_OUTPUT_MEMORY_MAX_CHARS,
+    TOOL_OUTPUT_DISPLAY_HEAD,
+    TOOL_OUTPUT_DISPLAY_TAIL,
+    TOOL_OUTPUT_TRUNCATION_DIR,
+)
+from klaude_code.tool.core.ansi import strip_ansi
+from klaude_code.tool.core.offload import OffloadStore, format_char_truncation
+
+_TEMP_FILE_POLL_INTERVAL_SEC = 0.05
+_PIPE_READ_SIZE = 64 * 1024
+# A stream that produced output within this window is considered busy: further
+# wakeups wait out the rest of the window so chatty builds are delivered in a few
+# large batches instead of one delta per write. An idle stream is flushed at once.
+_PIPE_COALESCE_SEC = 0.02
+
+
+class HeadTailBuffer:
+    """Accumulates a text stream, spilling it to disk once it grows past a cap.
+
+    Until ``memory_limit`` chars have been appended the full text is kept. Past
+    that, the whole stream (including what was buffered so far) is written to a
+    file under ``spill_dir`` and only the first ``head_chars`` and last
+    ``tail_chars`` stay in memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        label: str = "bash",
+        memory_limit: int = BASH_OUTPUT_MEMORY_MAX_CHARS,
+        head_chars: int = TOOL_OUTPUT_DISPLAY_HEAD,
+        tail_chars: int = TOOL_OUTPUT_DISPLAY_TAIL,
+        spill_dir: str | Path = TOOL_OUTPUT_TRUNCATION_DIR,
+    ) -> None:
+        self._label = label
+        self._memory_limit = memory_limit
+        self._head_chars = head_chars
+        self._tail_chars = tail_chars
+        self._spill_dir = Path(spill_dir)
+        self._chunks: list[str] = []
+        self._buffered_chars = 0
+        self._total_chars = 0
+        self._head = ""
+        self._tail: deque[str] = deque()
+        self._tail_len = 0
+        self._spill_file: IO[str] | None = None
+        self._spill_path: str | None = None
+        self._spill_failed = False
+
+    @property
+    def total_chars(self) -> int:
+        return self._total_chars
+
+    @property
+    def spill_path(self) -> str | None:
+        return self._spill_path
+
+    @property
+    def is_truncated(self) -> bool:
+        return self._spill_path is not None or self._spill_failed
+
+    def append(self, text: str) -> None:
+        if not text:
+            return
+        self._total_chars += len(text)
+        if not self.is_truncated:
+            self._chunks.append(text)
+            self._buffered_chars += len(text)
+            if self._buffered_chars > self._memory_limit:
+                self._spill()
+            return
+
+        if self._spill_file is not None:
+            try:
+                self._spill_file.write(text)
+            except OSError:
+                self._close_spill_file()
+        self._push_tail(text)
+
+    def render(self) -> str:
+        """Return the full text, or a head + tail view pointing at the spill file."""
+        if not self.is_truncated:
+            return "".join(self._chunks)
+        if self._spill_file is not None:
+            with contextlib.suppress(OSError):
+                self._spill_file.flush()
+        tail = "".join(self._tail)[-self._tail_chars :] if self._tail_chars > 0 else ""
+        return format_char_truncation(self._head, tail, self._total_chars, self._spill_path)
+
+    def close(self) -> None:
+        completed = self._spill_file is not None
+        self._close_spill_file()
+        if completed and self._spill_path is not None:
+            # The rendered output already points at the spill path; an identical
+            # earlier run turns it into a hard link to the same blob.
+            OffloadStore(self._spill_dir).adopt(Path(self._spill_path))
+
+    def _spill(self) -> None:
+        text = "".join(self._chunks)
+        self._chunks = []
+        self._buffered_chars = 0
+        self._head = text[: self._head_chars]
+        self._push_tail(text[self._head_chars :])
+        try:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+            path = self._spill_dir / f"klaude-{self._label}-{secrets.token_hex(8)}.log"
+            self._spill_file = path.open("w", encoding="utf-8")
+            self._spill_file.write(text)
+            self._spill_path = str(path)
+        except OSError:
+            # Keep truncating in memory; the model just loses the pointer to the full log.
+            self._close_spill_file()
+            self._spill_failed = True
+
+    def _push_tail(self, text: str) -> None:
+        if not text or self._tail_chars <= 0:
+            return
+        self._tail.append(text)
+        self._tail_len += len(text)
+        while self._tail and self._tail_len - len(self._tail[0]) >= self._tail_chars:
+            self._tail_len -= len(self._tail.popleft())
+
+    def _close_spill_file(self) -> None:
+        if self._spill_file is None:
+            return
+        with contextlib.suppress(OSError):
+            self._spill_file.close()
+        self._spill_file = None
+
+
+class StreamDecoder:
+    """Incremental UTF-8 decoding plus ANSI stripping for one output stream."""
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def decode(self, data: bytes, *, final: bool = False) -> str:
+        text = self._decoder.decode(data, final)
+        return strip_ansi(text) if text else ""
+
+
+class OutputCapture(Protocol):
+    """Interface BashTool uses to collect command output while it runs."""
+
+    def popen_kwargs(self) -> dict[str, Any]:
+        """Return the ``stdout``/``stderr`` arguments for process creation."""
+        ...
+
+    def after_spawn(self) -> None:
+        """Release handles the parent no longer needs once the child has started."""
+        ...
+
+    async def wait(self, exit_task: asyncio.Future[int], timeout: float) -> bool:
+        """Wait for new output, process exit or `timeout`. Returns True once the process exited."""
+        ...
+
+    def read_available(self) -> tuple[str, str]:
+        """Return newly captured (stdout, stderr) text."""
+        ...
+
+    def close(self) -> None:
+        """Stop capturing. Output still written by background children is discarded."""
+        ...
+
+
+class TempFileOutputCapture:
+    """Polls temp files the command's stdout/stderr are redirected to."""
+
+    def __init__(self) -> None:
+        # Both files are closed in close().
+        self._stdout_file = tempfile.TemporaryFile()  # noqa: SIM115
+        self._stderr_file = tempfile.TemporaryFile()  # noqa: SIM115
+        self._offsets = [0, 0]
+        self._decoders = (StreamDecoder(), StreamDecoder())
+
+    def popen_kwargs(self) -> dict[str, Any]:
+        return {"stdout": self._stdout_file, "stderr": self._stderr_file}
+
+    def after_spawn(self) -> None:
+        return None
+
+    async def wait(self, exit_task: asyncio.Future[int], timeout: float) -> bool:
+        done, _ = await asyncio.wait({exit_task}, timeout=min(_TEMP_FILE_POLL_INTERVAL_SEC, timeout))
+        return bool(done)
+
+    def read_available(self) -> tuple[str, str]:
+        return self._read_file(0, self._stdout_file), self._read_file(1, self._stderr_file)
+
+    def close(self) -> None:
+        for temp_file in (self._stdout_file, self._stderr_file):
+            with contextlib.suppress(OSError):
+                temp_file.close()
+
+    def _read_file(self, index: int, temp_file: IO[bytes]) -> str:
+        try:
+            temp_file.flush()
+            temp_file.seek(self._offsets[index])
+            data = temp_file.read()
+            self._offsets[index] = temp_file.tell()
+        except (OSError, ValueError):
+            return ""
+        return self._decoders[index].decode(data) if data else ""
+
+
+class PipeOutputCapture:
+    """Event-driven capture through pipes watched by the running event loop."""
+
+    def __init__(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._read_fds: list[int | None] = []
+        self._write_fds: list[int | None] = []
+        for _ in range(2):
+            read_fd, write_fd = os.pipe()
+            os.set_blocking(read_fd, False)
+            self._read_fds.append(read_fd)
+            self._write_fds.append(write_fd)
+        self._pending = (bytearray(), bytearray())
+        self._decoders = (StreamDecoder(), StreamDecoder())
+        self._data_ready = asyncio.Event()
+        self._last_flush = 0.0
+        try:
+            for index, read_fd in enumerate(self._read_fds):
+                assert read_fd is not None
+                self._loop.add_reader(read_fd, self._on_readable, index)
+        except NotImplementedError:
+            # e.g. the Windows proactor loop; the caller falls back to temp files.
+            for fd in (*self._read_fds, *self._write_fds):
+                if fd is not None:
+                    with contextlib.suppress(ValueError, OSError):
+                        self._loop.remove_reader(fd)
+                    with contextlib.suppress(OSError):
+                        os.close(fd)
+            raise
+
+    def popen_kwargs(self) -> dict[str, Any]:
+        return {"stdout": self._write_fds[0], "stderr": self._write_fds[1]}
+
+    def after_spawn(self) -> None:
+        # The child holds its own copies; closing ours lets EOF arrive once every
+        # writer (shell and background children) is gone.
+        for index, write_fd in enumerate(self._write_fds):
+            if write_fd is not None:
+                with contextlib.suppress(OSError):
+                    os.close(write_fd)
+                self._write_fds[index] = None
+
+    async def wait(self, exit_task: asyncio.Future[int], timeout: float) -> bool:
+        if not self._data_ready.is_set():
+            data_task = asyncio.ensure_future(self._data_ready.wait())
+            try:
+                await asyncio.wait({exit_task, data_task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                if not data_task.done():
+                    data_task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await data_task
+        if exit_task.done():
+            return True
+
+        since_flush = time.monotonic() - self._last_flush
+        if self._data_ready.is_set() and since_flush < _PIPE_COALESCE_SEC:
+            await asyncio.wait({exit_task}, timeout=min(_PIPE_COALESCE_SEC - since_flush, timeout))
+        return exit_task.done()
+
+    def read_available(self) -> tuple[str, str]:
+        for index in range(2):
+            self._drain(index)
+        self._data_ready.clear()
+        self._last_flush = time.monotonic()
+        return self._take(0), self._take(1)
+
+    def close(self) -> None:
+        self.after_spawn()
+        for index, read_fd in enumerate(self._read_fds):
+            if read_fd is None:
+                continue
+            self._read_fds[index] = None
+            # Background children may still hold the write end. Keep reading (and
+            # dropping) until they exit so they never block on a full pipe or die
+            # from SIGPIPE.
+            self._loop.remove_reader(read_fd)
+            self._loop.add_reader(read_fd, _discard_until_eof, self._loop, read_fd)
+
+    def _on_readable(self, index: int) -> None:
+        if self._drain(index):
+            self._data_ready.set()
+
+    def _drain(self, index: int) -> bool:
+        read_fd = self._read_fds[index]
+        if read_fd is None:
+            return False
+        received = False
+        while True:
+            try:
+                data = os.read(read_fd, _PIPE_READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self._loop.remove_reader(read_fd)
+                with contextlib.suppress(OSError):
+                    os.close(read_fd)
+                self._read_fds[index] = None
+                # Wake the waiter so the final decoder flush is picked up.
+                received = True
+                break
+            self._pending[index].extend(data)
+            received = True
+            if len(data) < _PIPE_READ_SIZE:
+                break
+        return received
+
+    def _take(self, index: int) -> str:
+        pending = self._pending[index]
+        data = bytes(pending)
+        pending.clear()
+        return self._decoders[index].decode(data, final=self._read_fds[index] is None)
+
+
+def _discard_until_eof(loop: asyncio.AbstractEventLoop, read_fd: int) -> None:
+    try:
+        data = os.read(read_fd, _PIPE_READ_SIZE)
+    except BlockingIOError:
+        return
+    except OSError:
+        data = b""
+    if data:
+        return
+    loop.remove_reader(read_fd)
+    with contextlib.suppress(OSError):
+        os.close(read_fd)
+
+
+def create_output_capture(*, use_pipes: bool) -> OutputCapture:
+    """Pick the event-driven pipe capture where the event loop supports fd readers."""
+    if use_pipes and os.name == "posix":
+        with contextlib.suppress(NotImplementedError):
+            return PipeOutputCapture()
+    return TempFileOutputCapture()
@@ -0,0 +1,391 @@
+"""Opt-in long-lived shell per session for the Bash tool.
+
+Spawning ``bash -lc`` per command pays fork/exec plus login-profile startup every
+time and forgets ``cd``/``export`` between calls. With
+``KLAUDE_BASH_PERSISTENT_SHELL=1`` each session instead keeps one ``bash -l``
+reading commands from a pipe.
+
+Framing
+-------
+Every command is sent as a quoted heredoc that is ``eval``-ed with stdin detached,
+followed by sentinel lines on stdout and stderr::
+
+    IFS= read -r -d '' __klaude_cmd <<'__KLAUDE_CMD_<nonce>'
+    <command text, verbatim>
+    __KLAUDE_CMD_<nonce>
+    eval "$__klaude_cmd" </dev/null
+    printf '__KLAUDE_DONE_<nonce>__ %s %s\\n' "$?" "$PWD"
+    printf '__KLAUDE_DONE_<nonce>__\\n' >&2
+
+The heredoc keeps arbitrary command text (unbalanced quotes included) from
+desynchronizing the shell: a syntax error surfaces as a non-zero exit code of
+``eval``. The per-command nonce keeps a previous command's background children
+from being mistaken for the end of the current one. Each sentinel is a single line,
+which bash's printf emits in one write, so output from background children cannot
+land inside it; the marker is matched wherever it starts.
+
+Background output is not attributed reliably. Children started with ``cmd &``
+share the shell's pipes. While no command runs, an idle reader task keeps both
+pipes drained and discards what they print, so a chatty job never blocks on a full
+pipe. Output they print while a later command runs ends up in that command's
+result. Redirecting such jobs (``cmd >log 2>&1 &``) avoids this.
+
+Concurrency
+-----------
+Commands of one session run one at a time under the shell's lock. Overlapping
+calls queue on it rather than falling back to a separate process, so every call
+sees the same working directory and environment.
+
+Failure handling
+----------------
+A timeout or interrupt kills the whole shell process group with the same
+SIGTERM-then-SIGKILL escalation the one-shot path uses. A command that ends the
+shell (``exit``) or a crash is reported with the shell's exit status. In all of
+these cases the next command transparently respawns the shell in the last known
+working directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import secrets
+import signal
+import subprocess
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from klaude_code.const import BASH_PERSISTENT_SHELL_IDLE_TIMEOUT_SEC, BASH_TERMINATE_TIMEOUT_SEC
+from klaude_code.log import DebugType, log_debug
+
+_READ_SIZE = 64 * 1024
+
+OnOutput = Callable[[str, bytes], Awaitable[None]]
+
+
+class ShellExitedError(Exception):
+    """The shell ended before the command finished framing its output."""
+
+    def __init__(self, returncode: int) -> None:
+        super().__init__(f"shell exited with code {returncode}")
+        self.returncode = returncode
+
+
+async def terminate_process_group(proc: asyncio.subprocess.Process) -> None:
+    """Best-effort SIGTERM, then SIGKILL, of `proc` and its process group."""
+    if proc.returncode is not None:
+        return
+
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGTERM)
+        else:  # pragma: no cover
+            proc.terminate()
+    except ProcessLookupError:
+        return
+    except OSError:
+        pass
+
+    with contextlib.suppress(Exception):
+        await asyncio.wait_for(proc.wait(), timeout=BASH_TERMINATE_TIMEOUT_SEC)
+        return
+
+    with contextlib.suppress(Exception):
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:  # pragma: no cover
+            proc.kill()
+    with contextlib.suppress(Exception):
+        await asyncio.wait_for(proc.wait(), timeout=BASH_TERMINATE_TIMEOUT_SEC)
+
+
+class _FramedReader:
+    """Reads one stream up to a sentinel line, forwarding the payload as it arrives."""
+
+    def __init__(self, reader: asyncio.StreamReader, stream: str) -> None:
+        self._reader = reader
+        self._stream = stream
+        self._pending = bytearray()
+        self.discarded = 0
+
+    async def discard_until_eof(self) -> None:
+        """Drop output as it arrives until EOF; meant to run as a cancellable task."""
+        self.discarded += len(self._pending)
+        self._pending.clear()
+        with contextlib.suppress(Exception):
+            # EOF is left for read_frame to report.
+            while data := await self._reader.read(_READ_SIZE):
+                self.discarded += len(data)
+
+    async def discard_available(self) -> None:
+        """Drop output that is already buffered without waiting for more."""
+        self.discarded += len(self._pending)
+        self._pending.clear()
+        while True:
+            try:
+                # A zero timeout only lets reads complete that need no new data.
+                async with asyncio.timeout(0):
+                    data = await self._reader.read(_READ_SIZE)
+            except TimeoutError:
+                return
+            if not data:
+                return
+            self.discarded += len(data)
+
+    def take_discarded(self) -> int:
+        dropped, self.discarded = self.discarded, 0
+        return dropped
+
+    async def read_frame(self, marker: bytes, on_output: OnOutput) -> bytes:
+        """Forward output until `marker`; return the rest of the sentinel line."""
+        while True:
+            index = self._pending.find(marker)
+            if index != -1:
+                line_end = self._pending.find(b"\n", index + len(marker))
+                if line_end != -1:
+                    payload = bytes(self._pending[:index])
+                    trailer = bytes(self._pending[index + len(marker) : line_end])
+                    del self._pending[: line_end + 1]
+                    if payload:
+                        await on_output(self._stream, payload)
+                    return trailer.strip()
+            else:
+                # Everything except a possible partial marker at the end is payload.
+                safe = len(self._pending) - len(marker) + 1
+                if safe > 0:
+                    payload = bytes(self._pending[:safe])
+                    del self._pending[:safe]
+                    await on_output(self._stream, payload)
+
+            data = await self._reader.read(_READ_SIZE)
+            if not data:
+                if self._pending:
+                    await on_output(self._stream, bytes(self._pending))
+                    self._pending.clear()
+                raise EOFError
+            self._pending.extend(data)
+
+
+class PersistentShell:
+    """One ``bash -l`` process that runs commands sequentially for a session."""
+
+    def __init__(self, *, work_dir: Path, env: dict[str, str]) -> None:
+        self._work_dir = work_dir
+        self._env = env
+        self._cwd: str | None = None
+        self._proc: asyncio.subprocess.Process | None = None
+        self._stdout: _FramedReader | None = None
+        self._stderr: _FramedReader | None = None
+        self._idle_drain: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+        self.spawn_count = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    @property
+    def cwd(self) -> Path:
+        """Working directory the next command starts in."""
+        return Path(self._cwd) if self._cwd else self._work_dir
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def run(
+        self,
+        command: str,
+        *,
+        timeout_sec: float,
+        on_output: OnOutput,
+        on_start: Callable[[Path], None] | None = None,
+    ) -> int:
+        """Run `command` and return its exit code.
+
+        Waits for any command already running in this shell. `on_start(cwd)` is
+        called with the directory the command starts in once it has the shell.
+        Output is forwarded through `on_output(stream, data)` as raw bytes while the
+        command runs. Raises TimeoutError after `timeout_sec` and ShellExitedError if
+        the shell dies mid-command; both leave the shell dead so the next call
+        respawns it. Cancellation kills the shell as well.
+        """
+        async with self._lock:
+            self.last_used = time.monotonic()
+            try:
+                async with asyncio.timeout(timeout_sec):
+                    return await self._run_locked(command, on_output, on_start)
+            except (TimeoutError, asyncio.CancelledError):
+                await asyncio.shield(self.close())
+                raise
+            finally:
+                self.last_used = time.monotonic()
+
+    async def close(self) -> None:
+        drain = self._stop_idle_drain()
+        proc = self._proc
+        self._proc = None
+        self._stdout = None
+        self._stderr = None
+        if drain is not None:
+            await asyncio.wait([drain])
+        if proc is None:
+            return
+        if proc.stdin is not None:
+            with contextlib.suppress(Exception):
+                proc.stdin.close()
+        await terminate_process_group(proc)
+
+    async def _run_locked(self, command: str, on_output: OnOutput, on_start: Callable[[Path], None] | None) -> int:
+        drain = self._stop_idle_drain()
+        if drain is not None:
+            await asyncio.wait([drain])
+        proc, stdout, stderr = await self._ensure_started()
+        # Catch output that arrived after the idle drain's last read.
+        await stdout.discard_available()
+        await stderr.discard_available()
+        dropped = stdout.take_discarded() + stderr.take_discarded()
+        if dropped:
+            log_debug(f"persistent shell dropped {dropped} bytes of background output", debug_type=DebugType.EXECUTION)
+        if on_start is not None:
+            on_start(self.cwd)
+        returncode = await self._run_framed(proc, stdout, stderr, command, on_output)
+        self._start_idle_drain(stdout, stderr)
+        return returncode
+
+    def _start_idle_drain(self, stdout: _FramedReader, stderr: _FramedReader) -> None:
+        async def _drain() -> None:
+            await asyncio.gather(stdout.discard_until_eof(), stderr.discard_until_eof())
+
+        self._idle_drain = asyncio.get_running_loop().create_task(_drain())
+
+    def _stop_idle_drain(self) -> asyncio.Task[None] | None:
+        drain = self._idle_drain
+        self._idle_drain = None
+        if drain is not None:
+            drain.cancel()
+        return drain
+
+    async def _run_framed(
+        self,
+        proc: asyncio.subprocess.Process,
+        stdout: _FramedReader,
+        stderr: _FramedReader,
+        command: str,
+        on_output: OnOutput,
+    ) -> int:
+        assert proc.stdin is not None
+
+        nonce = secrets.token_hex(8)
+        cmd_tag = f"__KLAUDE_CMD_{nonce}"
+        done_marker = f"__KLAUDE_DONE_{nonce}__"
+        script = (
+            f"IFS= read -r -d '' __klaude_cmd <<'{cmd_tag}'\n"
+            f"{command}\n"
+            f"{cmd_tag}\n"
+            'eval "$__klaude_cmd" </dev/null\n'
+            f'printf \'{done_marker} %s %s\\n\' "$?" "$PWD"\n'
+            f"printf '{done_marker}\\n' >&2\n"
+        )
+        try:
+            proc.stdin.write(script.encode())
+            await proc.stdin.drain()
+            stdout_trailer, _ = await asyncio.gather(
+                stdout.read_frame(done_marker.encode(), on_output),
+                stderr.read_frame(done_marker.encode(), on_output),
+            )
+        except (EOFError, BrokenPipeError, ConnectionResetError) as exc:
+            returncode = await proc.wait()
+            self._proc = None
+            log_debug(f"persistent shell exited with {returncode}", debug_type=DebugType.EXECUTION)
+            raise ShellExitedError(returncode) from exc
+
+        rc_text, _, cwd = stdout_trailer.decode(errors="replace").partition(" ")
+        if cwd:
+            self._cwd = cwd
+        try:
+            return int(rc_text)
+        except ValueError:
+            return 1
+
+    async def _ensure_started(self) -> tuple[asyncio.subprocess.Process, _FramedReader, _FramedReader]:
+        if self._proc is not None and self._proc.returncode is None:
+            assert self._stdout is not None and self._stderr is not None
+            return self._proc, self._stdout, self._stderr
+
+        cwd = self._cwd if self._cwd and os.path.isdir(self._cwd) else str(self._work_dir)
+        kwargs: dict[str, Any] = {
+            "stdin": asyncio.subprocess.PIPE,
+            "stdout": asyncio.subprocess.PIPE,
+            "stderr": asyncio.subprocess.PIPE,
+            "env": self._env,
+            "cwd": cwd,
+        }
+        if os.name == "posix":
+            kwargs["start_new_session"] = True
+        elif os.name == "nt":  # pragma: no cover
+            kwargs["creationflags"] = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+        proc = await asyncio.create_subprocess_exec("bash", "-l", **kwargs)
+        assert proc.stdin is not None and proc.stdout is not None and proc.stderr is not None
+        # Same prologue as the one-shot path, applied once for the shell's lifetime.
+        proc.stdin.write(b"set -o pipefail\n")
+        self._proc = proc
+        self._stdout = _FramedReader(proc.stdout, "stdout")
+        self._stderr = _FramedReader(proc.stderr, "stderr")
+        self.spawn_count += 1
+        log_debug(f"persistent shell started (pid {proc.pid}) in {cwd}", debug_type=DebugType.EXECUTION)
+
+        async def _discard(stream: str, data: bytes) -> None:
+            del stream, data
+
+        # Whatever the login profile prints must not leak into the first command.
+        await self._run_framed(proc, self._stdout, self._stderr, "true", _discard)
+        return proc, self._stdout, self._stderr
+
+
+_SHELLS: dict[str, PersistentShell] = {}
+
+
+def acquire_persistent_shell(session_id: str, *, work_dir: Path, env: dict[str, str]) -> PersistentShell:
+    """Return the session's shell, creating it on first use.
+
+    Calls the tool executor overlaps queue on the shell's lock in `run`.
+    """
+    _expire_idle_shells(exclude=session_id)
+    shell = _SHELLS.get(session_id)
+    if shell is None:
+        shell = PersistentShell(work_dir=work_dir, env=env)
+        _SHELLS[session_id] = shell
+    return shell
+
+
+async def close_persistent_shell(session_id: str) -> None:
+    shell = _SHELLS.pop(session_id, None)
+    if shell is not None:
+        await shell.close()
+
+
+async def close_all_persistent_shells() -> None:
+    shells = list(_SHELLS.values())
+    _SHELLS.clear()
+    await asyncio.gather(*(shell.close() for shell in shells), return_exceptions=True)
+
+
+def _expire_idle_shells(*, exclude: str) -> None:
+    now = time.monotonic()
+    for session_id, shell in list(_SHELLS.items()):
+        if session_id == exclude or shell.busy:
+            continue
+        if now - shell.last_used < BASH_PERSISTENT_SHELL_IDLE_TIMEOUT_SEC:
+            continue
+        _SHELLS.pop(session_id, None)
+        task = asyncio.get_running_loop().create_task(shell.close())
+        _PENDING_CLOSES.add(task)
+        task.add_done_callback(_PENDING_CLOSES.discard)
+
+
+_PENDING_CLOSES: set[asyncio.Task[None]] = set()
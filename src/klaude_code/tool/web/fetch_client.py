@@ -0,0 +1,71 @@
+"""Pooled async HTTP client for WebFetch.
+
+Every fetch on an event loop shares one ``httpx.AsyncClient``, so concurrent
+sub-agents reading pages from the same site reuse keep-alive connections
+instead of opening one per request. Concurrency against a single host is
+capped separately from the pool size so a burst of fetches cannot monopolize
+(or hammer) one server.
+
+The client never stores cookies: a fetch that needs them across its own
+redirect hops keeps a private ``httpx.Cookies`` jar (see ``web_fetch_tool``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.cookiejar
+
+import httpx
+
+from klaude_code.const import (
+    WEB_FETCH_DEFAULT_TIMEOUT_SEC,
+    WEB_FETCH_MAX_CONNECTIONS,
+    WEB_FETCH_MAX_CONNECTIONS_PER_HOST,
+)
+
+
+class FetchClient:
+    """A pooled client plus per-host concurrency slots, bound to one event loop."""
+
+    def __init__(
+        self,
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+        max_connections: int = WEB_FETCH_MAX_CONNECTIONS,
+        max_per_host: int = WEB_FETCH_MAX_CONNECTIONS_PER_HOST,
+    ) -> None:
+        self.http = httpx.AsyncClient(
+            transport=transport,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(WEB_FETCH_DEFAULT_TIMEOUT_SEC),
+            follow_redirects=False,
+            cookies=http.cookiejar.CookieJar(policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[])),
+        )
+        self._max_per_host = max(1, max_per_host)
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    def host_slot(self, host: str) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent requests to ``host``."""
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self._max_per_host)
+        return slot
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+
+# httpx connections belong to the loop that opened them, so each loop gets its
+# own client. Clients of closed loops are dropped on the next lookup.
+_clients: dict[asyncio.AbstractEventLoop, FetchClient] = {}
+
+
+def get_fetch_client() -> FetchClient:
+    """Return the shared client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        for stale in [other for other in _clients if other.is_closed()]:
+            del _clients[stale]
+        client = _clients[loop] = FetchClient()
+    return client
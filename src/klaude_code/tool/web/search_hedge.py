@@ -0,0 +1,219 @@
+"""Per-provider search statistics and hedged dispatch.
+
+``SearchProviderStatsRegistry`` keeps exponentially weighted moving averages
+of each provider's latency and error rate plus a window of recent latencies.
+``hedged_call`` uses them to pick the primary provider (lowest expected time
+to a good answer) and to decide how long to wait for it: once the primary has
+been running longer than its own latency percentile, the next provider is
+started as a hedge and the first good result wins. A failure starts the next
+provider immediately, alongside any hedge still running, as long as fewer than
+``max_in_flight`` calls are running.
+
+Losing calls are cancelled but not awaited. Cancelling does not stop a blocking
+HTTP request running in a worker thread, so such a call keeps spending provider
+quota until it ends on its own. Its task should stay pending until then, and
+``SearchProviderStats.in_flight`` counts it until it does.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Any
+
+from klaude_code.const import WEB_SEARCH_HEDGE_DEFAULT_DELAY_MS, WEB_SEARCH_HEDGE_PERCENTILE
+from klaude_code.log import log_debug
+
+_EWMA_ALPHA = 0.2
+_LATENCY_WINDOW = 64
+# Latency samples needed before a provider's own percentile replaces the default hedge delay.
+_MIN_PERCENTILE_SAMPLES = 5
+# Keeps providers that always fail from ranking ahead on a near-zero error latency.
+_MIN_SUCCESS_RATE = 0.05
+
+
+@dataclass
+class SearchProviderStats:
+    calls: int = 0
+    errors: int = 0
+    hedges: int = 0
+    """Times the provider was started because another one was slow."""
+    hedge_wins: int = 0
+    in_flight: int = 0
+    """Calls started and not yet ended, including abandoned losers still running."""
+    latency_ewma_s: float | None = None
+    error_ewma: float = 0.0
+    recent_latencies_s: deque[float] = field(default_factory=lambda: deque(maxlen=_LATENCY_WINDOW))
+
+    def latency_percentile(self, percentile: int) -> float | None:
+        if not self.recent_latencies_s:
+            return None
+        ordered = sorted(self.recent_latencies_s)
+        rank = math.ceil(percentile / 100 * len(ordered)) - 1
+        return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+    def expected_latency_s(self, default_s: float) -> float:
+        """Latency scaled by the expected number of attempts until one succeeds."""
+        latency = self.latency_ewma_s if self.latency_ewma_s is not None else default_s
+        return latency / max(1.0 - self.error_ewma, _MIN_SUCCESS_RATE)
+
+
+class SearchProviderStatsRegistry:
+    def __init__(
+        self,
+        *,
+        percentile: int = WEB_SEARCH_HEDGE_PERCENTILE,
+        default_delay_s: float = WEB_SEARCH_HEDGE_DEFAULT_DELAY_MS / 1000,
+    ) -> None:
+        self._percentile = percentile
+        self._default_delay_s = default_delay_s
+        self._stats: dict[str, SearchProviderStats] = {}
+
+    def get(self, name: str) -> SearchProviderStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = SearchProviderStats()
+        return stats
+
+    def record_success(self, name: str, latency_s: float) -> None:
+        stats = self.get(name)
+        stats.calls += 1
+        self._record_latency(stats, latency_s)
+        stats.error_ewma *= 1 - _EWMA_ALPHA
+
+    def record_failure(self, name: str, latency_s: float) -> None:
+        stats = self.get(name)
+        stats.calls += 1
+        stats.errors += 1
+        stats.error_ewma = stats.error_ewma * (1 - _EWMA_ALPHA) + _EWMA_ALPHA
+
+    def record_abandoned(self, name: str, elapsed_s: float) -> None:
+        """A call lost the race and has ended; ``elapsed_s`` is a lower bound on its latency."""
+        stats = self.get(name)
+        stats.calls += 1
+        self._record_latency(stats, elapsed_s)
+
+    def rank(self, names: Sequence[str]) -> list[str]:
+        """Order providers by expected latency; unmeasured ones keep their configured order."""
+        order = {name: index for index, name in enumerate(names)}
+        return sorted(
+            names,
+            key=lambda name: (self.get(name).expected_latency_s(self._default_delay_s), order[name]),
+        )
+
+    def hedge_delay(self, name: str) -> float:
+        """How long to wait for ``name`` before starting a hedge."""
+        stats = self.get(name)
+        if len(stats.recent_latencies_s) < _MIN_PERCENTILE_SAMPLES:
+            return self._default_delay_s
+        delay = stats.latency_percentile(self._percentile)
+        return self._default_delay_s if delay is None else delay
+
+    def snapshot(self) -> dict[str, SearchProviderStats]:
+        return {
+            name: replace(stats, recent_latencies_s=deque(stats.recent_latencies_s, maxlen=_LATENCY_WINDOW))
+            for name, stats in self._stats.items()
+        }
+
+    def clear(self) -> None:
+        self._stats.clear()
+
+    @staticmethod
+    def _record_latency(stats: SearchProviderStats, latency_s: float) -> None:
+        stats.recent_latencies_s.append(latency_s)
+        if stats.latency_ewma_s is None:
+            stats.latency_ewma_s = latency_s
+        else:
+            stats.latency_ewma_s += _EWMA_ALPHA * (latency_s - stats.latency_ewma_s)
+
+
+class AllProvidersFailedError(Exception):
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+async def hedged_call[T](
+    names: Sequence[str],
+    call: Callable[[str], Awaitable[T]],
+    stats: SearchProviderStatsRegistry,
+    *,
+    max_in_flight: int = 2,
+) -> tuple[str, T]:
+    """Run ``call`` on the best-ranked provider, hedging with the next ones; return the first success.
+
+    A single search starts at most ``max_in_flight`` providers at once.
+    Once a provider succeeds, the others are cancelled but not awaited. They
+    stay in their provider's ``in_flight`` count until their task ends, and
+    the time that took is recorded as a lower bound on their latency. Raises
+    AllProvidersFailedError when every provider failed.
+    """
+    queue = stats.rank(names)
+    in_flight: dict[asyncio.Task[T], tuple[str, float, bool]] = {}
+    errors: list[str] = []
+
+    def _launch(*, hedge: bool) -> None:
+        name = queue.pop(0)
+        provider_stats = stats.get(name)
+        if hedge:
+            provider_stats.hedges += 1
+        provider_stats.in_flight += 1
+        task = asyncio.ensure_future(call(name))
+        task.add_done_callback(lambda _: _call_ended(provider_stats))
+        in_flight[task] = (name, time.perf_counter(), hedge)
+
+    _launch(hedge=False)
+    try:
+        while in_flight:
+            newest_name, newest_started, _ = list(in_flight.values())[-1]
+            timeout = None
+            if queue and len(in_flight) < max_in_flight:
+                timeout = max(0.0, stats.hedge_delay(newest_name) - (time.perf_counter() - newest_started))
+            done, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                log_debug(f"[WebSearch] {newest_name} exceeded its hedge delay, starting {queue[0]}")
+                _launch(hedge=True)
+                continue
+            for task in done:
+                name, started, hedge = in_flight.pop(task)
+                elapsed = time.perf_counter() - started
+                error = task.exception()
+                if error is None:
+                    stats.record_success(name, elapsed)
+                    if hedge:
+                        stats.get(name).hedge_wins += 1
+                    return name, task.result()
+                stats.record_failure(name, elapsed)
+                errors.append(f"{name}: {error}")
+            # Replace failed calls right away instead of waiting out a running hedge's delay.
+            while queue and len(in_flight) < max_in_flight:
+                _launch(hedge=False)
+        raise AllProvidersFailedError(errors)
+    finally:
+        for task, (name, started, _) in in_flight.items():
+            task.cancel()
+            _ABANDONED.add(task)
+            task.add_done_callback(partial(_abandoned_call_ended, stats, name, started))
+
+
+# Losers that have not ended yet; referenced so they are not garbage-collected early.
+_ABANDONED: set[asyncio.Task[Any]] = set()
+
+
+def _call_ended(provider_stats: SearchProviderStats) -> None:
+    provider_stats.in_flight -= 1
+
+
+def _abandoned_call_ended(
+    stats: SearchProviderStatsRegistry, name: str, started: float, task: asyncio.Task[Any]
+) -> None:
+    _ABANDONED.discard(task)
+    if not task.cancelled():
+        # Retrieve a late failure so it is not reported as never retrieved.
+        task.exception()
+    stats.record_abandoned(name, time.perf_counter() - started)
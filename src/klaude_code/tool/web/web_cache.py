@@ -1,11 +1,29 @@
-"""In-memory TTL cache for web search and fetch results."""
+"""Caches for web search and fetch results.
+
+Two layers:
+
+- An in-process TTL dict (``get_cached``/``set_cached``) holding finished tool
+  output for the current process.
+- An optional on-disk LRU (``WebDiskCache``) under ``~/.klaude/cache/web``
+  shared by every session and sub-agent. It is bounded in bytes, keeps the
+  processed (post-HTML-conversion) text, and remembers ``ETag`` and
+  ``Last-Modified`` so an expired page can be revalidated with a conditional
+  request instead of being downloaded and converted again.
+"""
 
 from __future__ import annotations
 
-from time import monotonic
+import contextlib
+import hashlib
+import json
+import os
+import secrets
+from dataclasses import dataclass, replace
+from pathlib import Path
+from time import monotonic, time
 from typing import Any
 
-from klaude_code.const import WEB_CACHE_MAX_ENTRIES, WEB_CACHE_TTL_SECONDS
+from klaude_code.const import WEB_CACHE_MAX_ENTRIES, WEB_CACHE_TTL_SECONDS, WEB_DISK_CACHE_MAX_BYTES
 
 _cache: dict[str, tuple[float, Any]] = {}
 
@@ -33,3 +51,151 @@ def set_cached(key: str, value: Any) -> None:
 def make_cache_key(*parts: str) -> str:
     """Build a normalized cache key from parts."""
     return "|".join(p.strip().lower() for p in parts)
+
+
+# =============================================================================
+# Persistent cache
+# =============================================================================
+
+# Eviction trims the cache to this fraction of its budget so that a full cache
+# does not rescan the directory on every write.
+_EVICT_LOW_WATER = 0.9
+
+
+@dataclass(frozen=True)
+class WebCacheEntry:
+    value: str
+    stored_at: float
+    """Wall-clock time the value was fetched or last revalidated."""
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (time() if now is None else now) - self.stored_at <= WEB_CACHE_TTL_SECONDS
+
+    @property
+    def revalidatable(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def revalidated(self, *, etag: str | None, last_modified: str | None) -> WebCacheEntry:
+        """Return this entry marked fresh after a 304, taking any updated validators."""
+        return replace(
+            self,
+            stored_at=time(),
+            etag=etag or self.etag,
+            last_modified=last_modified or self.last_modified,
+        )
+
+
+class WebDiskCache:
+    """Byte-bounded LRU of web results persisted across sessions.
+
+    Each entry is a JSON file named by the SHA-256 of its key. A hit refreshes
+    the file's mtime, and eviction deletes the least recently used files until
+    the directory is back under its budget. Every operation is best effort: an
+    unreadable or corrupt entry is a miss and a failed write is ignored.
+    """
+
+    def __init__(self, root: str | Path, *, max_bytes: int) -> None:
+        self.directory = Path(root)
+        self._max_bytes = max_bytes
+        self._total_bytes: int | None = None
+
+    def get(self, key: str) -> WebCacheEntry | None:
+        """Return the stored entry for ``key`` regardless of age, or None."""
+        path = self._path(key)
+        try:
+            raw = json.loads(path.read_bytes())
+            if raw.get("key") != key:
+                return None
+            entry = WebCacheEntry(
+                value=str(raw["value"]),
+                stored_at=float(raw["stored_at"]),
+                etag=raw.get("etag"),
+                last_modified=raw.get("last_modified"),
+            )
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: WebCacheEntry) -> None:
+        payload = {
+            "key": key,
+            "value": entry.value,
+            "stored_at": entry.stored_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+        }
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        if len(data) > self._max_bytes:
+            return
+        path = self._path(key)
+        tmp = self.directory / f".{path.name}.{secrets.token_hex(4)}.tmp"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total()
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        finally:
+            tmp.unlink(missing_ok=True)
+        self._total_bytes += len(data) - replaced
+        if self._total_bytes > self._max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until under budget; returns how many."""
+        entries: list[tuple[float, int, Path]] = []
+        for path in self._entry_paths():
+            with contextlib.suppress(OSError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        target = int(self._max_bytes * _EVICT_LOW_WATER) if total > self._max_bytes else total
+        removed = 0
+        for _, size, path in sorted(entries, key=lambda item: item[0]):
+            if total <= target:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+                total -= size
+                removed += 1
+        self._total_bytes = total
+        return removed
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _entry_paths(self) -> list[Path]:
+        try:
+            return [path for path in self.directory.iterdir() if path.suffix == ".json"]
+        except OSError:
+            return []
+
+    def _scan_total(self) -> int:
+        total = 0
+        for path in self._entry_paths():
+            with contextlib.suppress(OSError):
+                total += path.stat().st_size
+        return total
+
+
+_disk_cache: WebDiskCache | None = None
+_disk_cache_resolved = False
+
+
+def get_disk_cache() -> WebDiskCache | None:
+    """Return the shared persistent cache, or None when it is disabled."""
+    global _disk_cache, _disk_cache_resolved
+    if not _disk_cache_resolved:
+        _disk_cache_resolved = True
+        if WEB_DISK_CACHE_MAX_BYTES > 0:
+            _disk_cache = WebDiskCache(Path.home() / ".klaude" / "cache" / "web", max_bytes=WEB_DISK_CACHE_MAX_BYTES)
+    return _disk_cache
@@ -1,22 +1,19 @@
 import asyncio
-import gzip as gzip_module
-import http.cookiejar
 import json
 import re
 import time
-import urllib.error
-import urllib.request
-import zlib
-from http.client import HTTPMessage, HTTPResponse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import IO, cast
+from typing import NamedTuple, cast
 from urllib.parse import quote, urljoin, urlparse, urlunparse
 
+import httpx
 from pydantic import BaseModel
 
 from klaude_code.const import (
     TOOL_OUTPUT_TRUNCATION_DIR,
     URL_FILENAME_MAX_LENGTH,
+    WEB_FETCH_CONVERSION_WORKERS,
     WEB_FETCH_DEFAULT_TIMEOUT_SEC,
     WEB_FETCH_MAX_REDIRECTS,
     WEB_FETCH_MAX_RESPONSE_BYTES,
@@ -27,8 +24,9 @@ from klaude_code.tool.core.abc import ToolABC, ToolConcurrencyPolicy, ToolMetada
 from klaude_code.tool.core.context import ToolContext
 from klaude_code.tool.core.registry import register
 from klaude_code.tool.web.external_content import wrap_web_content
+from klaude_code.tool.web.fetch_client import FetchClient, get_fetch_client
 from klaude_code.tool.web.ssrf import SSRFBlockedError, check_ssrf
-from klaude_code.tool.web.web_cache import get_cached, make_cache_key, set_cached
+from klaude_code.tool.web.web_cache import WebCacheEntry, get_cached, get_disk_cache, make_cache_key, set_cached
 
 WEB_FETCH_SAVE_DIR = Path(TOOL_OUTPUT_TRUNCATION_DIR)
 
@@ -38,28 +36,19 @@ _READABILITY_MAX_HTML_CHARS = 3_000_000
 # HTTP status codes that warrant a retry (transient server errors).
 _RETRY_HTTP_STATUS_CODES = frozenset({500, 502, 503, 504})
 _MAX_FETCH_RETRIES = 2
+_RETRY_BACKOFF_SEC = 1.0
 
+_REDIRECT_STATUS_CODES = frozenset({301, 302, 303, 307, 308})
 
-class _NoRedirectHandler(urllib.request.HTTPRedirectHandler):
-    """Suppress automatic redirects so we can check each hop for SSRF."""
 
-    def redirect_request(
-        self,
-        req: urllib.request.Request,
-        fp: IO[bytes],
-        code: int,
-        msg: str,
-        headers: HTTPMessage,
-        newurl: str,
-    ) -> urllib.request.Request | None:
-        del req, fp, code, msg, headers, newurl
-        return None
-
-
-def _build_opener() -> urllib.request.OpenerDirector:
-    """Build opener with manual redirect handling and per-request cookie jar."""
-    cookie_jar = http.cookiejar.CookieJar()
-    return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookie_jar), _NoRedirectHandler)
+class _FetchResult(NamedTuple):
+    content_type: str
+    data: bytes
+    charset: str | None
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+    """The server answered a conditional request with 304; ``data`` is empty."""
 
 
 def _encode_url(url: str) -> str:
@@ -74,9 +63,8 @@ def _encode_url(url: str) -> str:
     return urlunparse((parsed.scheme, netloc, encoded_path, parsed.params, encoded_query, parsed.fragment))
 
 
-def _extract_content_type_and_charset(response: HTTPResponse) -> tuple[str, str | None]:
-    """Extract the base content type and charset from Content-Type header."""
-    content_type_header = response.getheader("Content-Type", "")
+def _extract_content_type_and_charset(content_type_header: str) -> tuple[str, str | None]:
+    """Extract the base content type and charset from a Content-Type header value."""
     parts = content_type_header.split(";")
     content_type = parts[0].strip().lower()
 
@@ -90,26 +78,6 @@ def _extract_content_type_and_charset(response: HTTPResponse) -> tuple[str, str
     return content_type, charset
 
 
-def _decompress(data: bytes, content_encoding: str) -> bytes:
-    """Decompress response body based on Content-Encoding header."""
-    encoding = content_encoding.strip().lower()
-    if encoding == "gzip":
-        try:
-            return gzip_module.decompress(data)
-        except (OSError, EOFError):
-            return data
-    elif encoding == "deflate":
-        try:
-            return zlib.decompress(data)
-        except zlib.error:
-            try:
-                # Some servers send raw deflate without the zlib wrapper
-                return zlib.decompress(data, -zlib.MAX_WBITS)
-            except zlib.error:
-                return data
-    return data
-
-
 def _detect_encoding(data: bytes, declared_charset: str | None) -> str:
     """Detect the encoding of the data."""
     if declared_charset:
@@ -263,19 +231,59 @@ def _process_content(content_type: str, text: str) -> str:
         return text
 
 
-def _fetch_url(
+_conversion_executor: ThreadPoolExecutor | None = None
+
+
+def _get_conversion_executor() -> ThreadPoolExecutor:
+    """Bounded pool for decoding and HTML-to-Markdown conversion, off the event loop."""
+    global _conversion_executor
+    if _conversion_executor is None:
+        _conversion_executor = ThreadPoolExecutor(
+            max_workers=max(1, WEB_FETCH_CONVERSION_WORKERS), thread_name_prefix="klaude-webfetch"
+        )
+    return _conversion_executor
+
+
+def _decode_and_process(content_type: str, data: bytes, charset: str | None) -> str:
+    return _process_content(content_type, _decode_content(data, charset))
+
+
+async def _read_limited(response: httpx.Response, max_bytes: int) -> bytes:
+    """Read the decoded body, stopping as soon as more than ``max_bytes`` have arrived."""
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            break
+    return b"".join(chunks)[:max_bytes]
+
+
+async def _fetch_url(
     url: str,
     timeout: int = WEB_FETCH_DEFAULT_TIMEOUT_SEC,
     max_bytes: int = WEB_FETCH_MAX_RESPONSE_BYTES,
     max_redirects: int = WEB_FETCH_MAX_REDIRECTS,
-) -> tuple[str, bytes, str | None]:
-    """Fetch URL content with SSRF protection and redirect control."""
+    *,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    client: FetchClient | None = None,
+) -> _FetchResult:
+    """Fetch URL content with SSRF protection and redirect control.
+
+    Uses the shared pooled client unless ``client`` is given. The body is
+    streamed and reading stops once ``max_bytes`` of decoded content have
+    arrived. ``etag``/``last_modified`` make the request conditional; a 304
+    answer is returned as a result with ``not_modified`` set.
+    """
+    client = client or get_fetch_client()
+    # Cookies live for this fetch only, e.g. a login hop that sets one and redirects back.
+    cookies = httpx.Cookies()
     current_url = url
-    opener = _build_opener()
-    redirect_status_codes = (301, 302, 303, 307, 308)
 
     for _ in range(max_redirects + 1):
-        check_ssrf(current_url)
+        await asyncio.to_thread(check_ssrf, current_url)
 
         headers = {
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -287,67 +295,74 @@ def _fetch_url(
             "Sec-Fetch-Site": "none",
             "Upgrade-Insecure-Requests": "1",
         }
-        encoded_url = _encode_url(current_url)
-        request = urllib.request.Request(encoded_url, headers=headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        request = client.http.build_request("GET", _encode_url(current_url), headers=headers, timeout=timeout)
+        cookies.set_cookie_header(request)
+
+        async with client.host_slot(request.url.host):
+            response = await client.http.send(request, stream=True)
+            try:
+                cookies.extract_cookies(response)
+                if response.status_code in _REDIRECT_STATUS_CODES:
+                    location = response.headers.get("Location")
+                    if not location:
+                        raise httpx.RemoteProtocolError("Redirect without Location header", request=request)
+                    # Resolve relative redirects
+                    current_url = urljoin(current_url, location)
+                    continue
+                if response.status_code == 304 and (etag or last_modified):
+                    return _FetchResult(
+                        "",
+                        b"",
+                        None,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                        not_modified=True,
+                    )
+                response.raise_for_status()
+                data = await _read_limited(response, max_bytes)
+            finally:
+                await response.aclose()
+
+        content_type, charset = _extract_content_type_and_charset(response.headers.get("Content-Type", ""))
+        return _FetchResult(
+            content_type,
+            data,
+            charset,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    raise httpx.TooManyRedirects(f"Too many redirects (max {max_redirects})")
 
-        try:
-            response = opener.open(request, timeout=timeout)
-        except urllib.error.HTTPError as e:
-            if e.code in redirect_status_codes:
-                location = e.headers.get("Location")
-                if not location:
-                    raise urllib.error.URLError("Redirect without Location header") from e
-                # Resolve relative redirects
-                current_url = urljoin(current_url, location)
-                e.close()
-                continue
-            raise
 
-        if response.status in redirect_status_codes:
-            location = response.getheader("Location")
-            if not location:
-                raise urllib.error.URLError("Redirect without Location header")
-            # Resolve relative redirects
-            current_url = urljoin(current_url, location)
-            response.close()
-            continue
-
-        content_type, charset = _extract_content_type_and_charset(response)
-        content_encoding = response.getheader("Content-Encoding", "")
-        data = response.read(max_bytes + 1)
-        response.close()
-        # Decompress before truncating so we get valid content boundaries
-        data = _decompress(data, content_encoding)
-        if len(data) > max_bytes:
-            data = data[:max_bytes]
-        return content_type, data, charset
-
-    raise urllib.error.URLError(f"Too many redirects (max {max_redirects})")
-
-
-def _fetch_url_with_retry(
+async def _fetch_url_with_retry(
     url: str,
     timeout: int = WEB_FETCH_DEFAULT_TIMEOUT_SEC,
     max_bytes: int = WEB_FETCH_MAX_RESPONSE_BYTES,
     max_redirects: int = WEB_FETCH_MAX_REDIRECTS,
-) -> tuple[str, bytes, str | None]:
+    *,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> _FetchResult:
     """Fetch URL with automatic retry on transient server errors (5xx, timeout)."""
     last_exc: Exception = RuntimeError("unreachable")
     for attempt in range(_MAX_FETCH_RETRIES + 1):
         try:
-            return _fetch_url(url, timeout, max_bytes, max_redirects)
-        except urllib.error.HTTPError as e:
-            if e.code in _RETRY_HTTP_STATUS_CODES and attempt < _MAX_FETCH_RETRIES:
+            return await _fetch_url(url, timeout, max_bytes, max_redirects, etag=etag, last_modified=last_modified)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in _RETRY_HTTP_STATUS_CODES and attempt < _MAX_FETCH_RETRIES:
                 last_exc = e
-                time.sleep(2**attempt)
+                await asyncio.sleep(_RETRY_BACKOFF_SEC * 2**attempt)
                 continue
             raise
-        except (TimeoutError, urllib.error.URLError) as e:
-            # e is urllib.error.URLError here after the isinstance check fails
-            is_timeout = True if isinstance(e, TimeoutError) else isinstance(e.reason, TimeoutError)
-            if is_timeout and attempt < _MAX_FETCH_RETRIES:
+        except (TimeoutError, httpx.TimeoutException) as e:
+            if attempt < _MAX_FETCH_RETRIES:
                 last_exc = e
-                time.sleep(2**attempt)
+                await asyncio.sleep(_RETRY_BACKOFF_SEC * 2**attempt)
                 continue
             raise
     raise last_exc
@@ -391,6 +406,16 @@ class WebFetchTool(ToolABC):
             )
         return await cls.call_with_args(args, context)
 
+    @classmethod
+    def _text_result(cls, url: str, cache_key: str, processed: str) -> message.ToolResultMessage:
+        """Wrap processed text, save it to a file and remember the output for this process."""
+        wrapped = wrap_web_content(processed, source="Web Fetch", include_warning=True)
+        saved_path = _save_text_content(url, processed)
+        output = f"[Full content saved to {saved_path}]\n\n{wrapped}" if saved_path else wrapped
+
+        set_cached(cache_key, output)
+        return message.ToolResultMessage(status="success", output_text=output)
+
     @classmethod
     async def call_with_args(cls, args: WebFetchArguments, context: ToolContext) -> message.ToolResultMessage:
         del context
@@ -408,8 +433,28 @@ class WebFetchTool(ToolABC):
         if cached is not None:
             return message.ToolResultMessage(status="success", output_text=cached)
 
+        # The disk cache holds processed text: a fresh entry is served as is, an
+        # expired one with validators is revalidated instead of refetched.
+        disk_cache = get_disk_cache()
+        stored = disk_cache.get(cache_key) if disk_cache is not None else None
+        if stored is not None and stored.is_fresh():
+            return cls._text_result(url, cache_key, stored.value)
+        if stored is not None and not stored.revalidatable:
+            stored = None
+
         try:
-            content_type, data, charset = await asyncio.to_thread(_fetch_url_with_retry, url)
+            fetched = await _fetch_url_with_retry(
+                url,
+                etag=stored.etag if stored else None,
+                last_modified=stored.last_modified if stored else None,
+            )
+            if fetched.not_modified and stored is not None:
+                if disk_cache is not None:
+                    disk_cache.put(
+                        cache_key, stored.revalidated(etag=fetched.etag, last_modified=fetched.last_modified)
+                    )
+                return cls._text_result(url, cache_key, stored.value)
+            content_type, data, charset = fetched.content_type, fetched.data, fetched.charset
 
             # Handle PDF files - must save binary content
             if content_type == "application/pdf" or _is_pdf_url(url):
@@ -426,34 +471,40 @@ class WebFetchTool(ToolABC):
                 )
 
             # Handle text content - save to file and return with path hint
-            text = _decode_content(data, charset)
-            processed = _process_content(content_type, text)
-            wrapped = wrap_web_content(processed, source="Web Fetch", include_warning=True)
-            saved_path = _save_text_content(url, processed)
-            output = f"[Full content saved to {saved_path}]\n\n{wrapped}" if saved_path else wrapped
-
-            set_cached(cache_key, output)
-            return message.ToolResultMessage(status="success", output_text=output)
+            processed = await asyncio.get_running_loop().run_in_executor(
+                _get_conversion_executor(), _decode_and_process, content_type, data, charset
+            )
+            if disk_cache is not None:
+                disk_cache.put(
+                    cache_key,
+                    WebCacheEntry(
+                        value=processed,
+                        stored_at=time.time(),
+                        etag=fetched.etag,
+                        last_modified=fetched.last_modified,
+                    ),
+                )
+            return cls._text_result(url, cache_key, processed)
 
         except SSRFBlockedError as e:
             return message.ToolResultMessage(
                 status="error",
                 output_text=f"Blocked by security policy: {e} (url={url})",
             )
-        except urllib.error.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             return message.ToolResultMessage(
                 status="error",
-                output_text=f"HTTP error {e.code}: {e.reason} (url={url})",
+                output_text=f"HTTP error {e.response.status_code}: {e.response.reason_phrase} (url={url})",
             )
-        except urllib.error.URLError as e:
+        except (TimeoutError, httpx.TimeoutException):
             return message.ToolResultMessage(
                 status="error",
-                output_text=f"URL error: {e.reason} (url={url})",
+                output_text=f"Request timed out after {WEB_FETCH_DEFAULT_TIMEOUT_SEC} seconds (url={url})",
             )
-        except TimeoutError:
+        except httpx.RequestError as e:
             return message.ToolResultMessage(
                 status="error",
-                output_text=f"Request timed out after {WEB_FETCH_DEFAULT_TIMEOUT_SEC} seconds (url={url})",
+                output_text=f"URL error: {e} (url={url})",
             )
         except Exception as e:
             return message.ToolResultMessage(
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -11,7 +12,7 @@ from typing import Any
 
 from pydantic import BaseModel
 
-from klaude_code.config.config import WebSearchProviderName, resolve_api_key
+from klaude_code.config.config import WebSearchConfig, WebSearchProviderName, resolve_api_key
 from klaude_code.config.loader import load_config
 from klaude_code.const import (
     WEB_SEARCH_DEEPSEEK_API_VERSION,
@@ -27,7 +28,20 @@ from klaude_code.tool.core.abc import ToolABC, ToolConcurrencyPolicy, ToolMetada
 from klaude_code.tool.core.context import ToolContext
 from klaude_code.tool.core.registry import register
 from klaude_code.tool.web.external_content import wrap_web_content
-from klaude_code.tool.web.web_cache import get_cached, make_cache_key, set_cached
+from klaude_code.tool.web.search_hedge import (
+    AllProvidersFailedError,
+    SearchProviderStats,
+    SearchProviderStatsRegistry,
+    hedged_call,
+)
+from klaude_code.tool.web.web_cache import (
+    WebCacheEntry,
+    WebDiskCache,
+    get_cached,
+    get_disk_cache,
+    make_cache_key,
+    set_cached,
+)
 
 _BRAVE_LLM_CONTEXT_URL = "https://api.search.brave.com/res/v1/llm/context"
 _EXA_SEARCH_URL = "https://api.exa.ai/search"
@@ -357,11 +371,10 @@ def _search_openai(query: str, max_results: int, api_key: str, base_url: str, mo
 # ---------------------------------------------------------------------------
 
 
-def _resolve_provider_chain() -> list[_ResolvedProvider]:
+def _resolve_provider_chain(config: WebSearchConfig) -> list[_ResolvedProvider]:
     """Build the provider chain from config, skipping entries whose API key is missing."""
-    config = load_config()
     chain: list[_ResolvedProvider] = []
-    for entry in config.web_search.providers:
+    for entry in config.providers:
         api_key = resolve_api_key(entry.api_key)
         if not api_key:
             continue
@@ -383,6 +396,54 @@ def _run_provider(provider: _ResolvedProvider, query: str, max_results: int) ->
     return _search_openai(query, max_results, provider.api_key, provider.base_url, provider.model)
 
 
+_provider_stats = SearchProviderStatsRegistry()
+
+
+def search_provider_stats() -> dict[str, SearchProviderStats]:
+    """Latency and error statistics per search provider, for this process."""
+    return _provider_stats.snapshot()
+
+
+async def _run_provider_in_thread(provider: _ResolvedProvider, query: str, max_results: int) -> SearchOutcome:
+    """Run one provider in a worker thread for hedged_call.
+
+    Cancellation cannot stop the blocking request in the thread. A cancelled
+    call therefore waits for the thread before re-raising, so hedged_call
+    counts an abandoned loser as in flight until its request has ended.
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(_run_provider, provider, query, max_results))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        if not future.cancelled():
+            # Nobody awaits the result any more; retrieve a late failure so it is not logged.
+            future.exception()
+        raise
+
+
+async def _timed_run(provider: _ResolvedProvider, query: str, max_results: int) -> SearchOutcome:
+    """Run one provider off the event loop, recording its latency or failure."""
+    started = time.perf_counter()
+    try:
+        outcome = await asyncio.to_thread(_run_provider, provider, query, max_results)
+    except Exception:
+        _provider_stats.record_failure(provider.name, time.perf_counter() - started)
+        raise
+    _provider_stats.record_success(provider.name, time.perf_counter() - started)
+    return outcome
+
+
+def _lookup_cached(cache_key: str, disk_cache: WebDiskCache | None) -> str | None:
+    cached = get_cached(cache_key)
+    if cached is None and disk_cache is not None:
+        stored = disk_cache.get(cache_key)
+        if stored is not None and stored.is_fresh():
+            cached = stored.value
+            set_cached(cache_key, cached)
+    return cached
+
+
 def _format_results(results: list[SearchResult], answer: str | None = None) -> str:
     """Format search results for LLM consumption."""
     answer_block = f"<answer>\n{answer}\n</answer>\n" if answer else ""
@@ -453,6 +514,21 @@ class WebSearchTool(ToolABC):
             )
         return await cls.call_with_args(args, context)
 
+    @classmethod
+    def _success(
+        cls, cache_key: str, outcome: SearchOutcome, disk_cache: WebDiskCache | None
+    ) -> message.ToolResultMessage:
+        formatted = _format_results(outcome.results, outcome.answer)
+        wrapped = wrap_web_content(formatted, source="Web Search", include_warning=False)
+
+        set_cached(cache_key, wrapped)
+        if disk_cache is not None:
+            disk_cache.put(cache_key, WebCacheEntry(value=wrapped, stored_at=time.time()))
+        return message.ToolResultMessage(
+            status="success",
+            output_text=wrapped,
+        )
+
     @classmethod
     async def call_with_args(cls, args: WebSearchArguments, context: ToolContext) -> message.ToolResultMessage:
         del context
@@ -468,7 +544,8 @@ class WebSearchTool(ToolABC):
         # Provider chain comes from config (order = priority); on failure, fall
         # back to the next provider. Entries without a resolvable key are skipped.
         try:
-            providers = _resolve_provider_chain()
+            search_config = load_config().web_search
+            providers = _resolve_provider_chain(search_config)
         except (OSError, ValueError) as e:
             return message.ToolResultMessage(status="error", output_text=f"Search failed: cannot load config: {e}")
 
@@ -481,27 +558,41 @@ class WebSearchTool(ToolABC):
                 ),
             )
 
+        disk_cache = get_disk_cache()
+
+        def _cache_key(provider: _ResolvedProvider) -> str:
+            return make_cache_key("search", provider.name, query, str(max_results))
+
+        if search_config.hedge and len(providers) > 1:
+            for provider in providers:
+                cached = _lookup_cached(_cache_key(provider), disk_cache)
+                if cached is not None:
+                    return message.ToolResultMessage(status="success", output_text=cached)
+            by_name: dict[str, _ResolvedProvider] = {}
+            for provider in providers:
+                by_name.setdefault(provider.name, provider)
+            try:
+                name, outcome = await hedged_call(
+                    list(by_name),
+                    lambda name: _run_provider_in_thread(by_name[name], query, max_results),
+                    _provider_stats,
+                )
+            except AllProvidersFailedError as e:
+                return message.ToolResultMessage(status="error", output_text=f"Search failed: {e}")
+            return cls._success(_cache_key(by_name[name]), outcome, disk_cache)
+
         errors: list[str] = []
         for provider in providers:
-            cache_key = make_cache_key("search", provider.name, query, str(max_results))
-            cached = get_cached(cache_key)
+            cached = _lookup_cached(_cache_key(provider), disk_cache)
             if cached is not None:
                 return message.ToolResultMessage(status="success", output_text=cached)
 
             try:
-                outcome = await asyncio.to_thread(_run_provider, provider, query, max_results)
+                outcome = await _timed_run(provider, query, max_results)
             except Exception as e:
                 errors.append(f"{provider.name}: {e}")
                 continue
-
-            formatted = _format_results(outcome.results, outcome.answer)
-            wrapped = wrap_web_content(formatted, source="Web Search", include_warning=False)
-
-            set_cached(cache_key, wrapped)
-            return message.ToolResultMessage(
-                status="success",
-                output_text=wrapped,
-            )
+            return cls._success(_cache_key(provider), outcome, disk_cache)
 
         return message.ToolResultMessage(
             status="error",
@@ -23,7 +23,8 @@ class RefreshTerminalCommand(CommandABC):
         del user_input  # unused
         # The display clears the terminal and repaints the transcript from its
         # event tape — the same rebuild path Ctrl+O uses — so the banner and
-        # any in-flight turn survive the refresh.
+        # any in-flight turn survive the refresh. Unlike automatic repaints it
+        # renders the whole history, including turns a resize left out.
         return CommandResult(
-            events=[events.RefreshDisplayEvent(session_id=agent.session.id)],
+            events=[events.RefreshDisplayEvent(session_id=agent.session.id, full_history=True)],
         )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import io
 import re
 import time
@@ -37,6 +38,11 @@ _THINKING_HTML_BLOCK_RE = re.compile(
 
 _HTML_COMMENT_BLOCK_RE = re.compile(r"\A\s*<!--.*?-->\s*\Z", flags=re.DOTALL)
 
+# Block starts tried per frame when moving the render checkpoint forward.
+_CHECKPOINT_CUT_ATTEMPTS = 3
+# Rich gives every rendered hyperlink a fresh random OSC 8 id.
+_HYPERLINK_ID_RE = re.compile(r"\x1b\]8;id=[^;]*;")
+
 _CHECKBOX_UNCHECKED_RE = re.compile(r"^\[ \]\s*")
 _CHECKBOX_CHECKED_RE = re.compile(r"^\[x\]\s*", re.IGNORECASE)
 _ORDERED_LIST_LINE_RE = re.compile(r"^\s{0,3}\d+[.)]\s+.+")
@@ -44,6 +50,21 @@ _ORDERED_LIST_MARKER_PREFIX_RE = re.compile(r"^\s{0,3}\d{1,9}\s*$")
 _LOCAL_IMAGE_MARKDOWN_LINE_RE = re.compile(r"^\s*!\[[^\]]*\]\((?P<path>/[^)]+)\)\s*$")
 
 
+@functools.cache
+def _block_parser() -> MarkdownIt:
+    # Parsing keeps no state on the instance, and building one (rule chains,
+    # renderer method lookup) costs about as much as parsing a short message.
+    return MarkdownIt("commonmark")
+
+
+def _same_rendering(left: list[str], right: list[str]) -> bool:
+    if left == right:
+        return True
+    return len(left) == len(right) and all(
+        a == b or _HYPERLINK_ID_RE.sub("", a) == _HYPERLINK_ID_RE.sub("", b) for a, b in zip(left, right, strict=True)
+    )
+
+
 class ThinkingHTMLBlock(MarkdownElement):
     """Render `<thinking>...</thinking>` HTML blocks as Rich Markdown.
 
@@ -308,6 +329,12 @@ class MarkdownStream:
 
     Block boundaries are computed with `MarkdownIt("commonmark")` (token maps / top-level tokens).
     Rendering is done with Rich Markdown (customizable via `markdown_class`).
+
+    Finalized top-level blocks are cached as a rendered checkpoint, so each
+    frame only parses and renders the text after it. Rich renders a document as
+    its top-level elements in sequence, which makes the split exact; a
+    checkpoint is still only kept after verifying that the split renders the
+    same lines as the unsplit stable prefix.
     """
 
     def __init__(
@@ -341,6 +368,13 @@ class MarkdownStream:
         self._stable_rendered_lines: list[str] = []
         self._stable_source_line_count: int = 0
 
+        # Rendered-and-verified prefix of the stream: source text, its line
+        # count, its rendered lines, and the width it was rendered at.
+        self._checkpoint_source: str = ""
+        self._checkpoint_line_count: int = 0
+        self._checkpoint_rendered_lines: list[str] = []
+        self._checkpoint_width: int = 0
+
         if mdargs:
             self.mdargs: dict[str, Any] = mdargs
         else:
@@ -354,7 +388,7 @@ class MarkdownStream:
         # Streaming control
         self.when: float = 0.0  # Timestamp of last update
         self.min_delay: float = 1.0 / UI_REFRESH_RATE_FPS
-        self._parser: MarkdownIt = MarkdownIt("commonmark")
+        self._parser: MarkdownIt = _block_parser()
 
         self.theme = theme
         self.console = console
@@ -371,6 +405,18 @@ class MarkdownStream:
         scale = max(1.0, text_length / MARKDOWN_STREAM_ADAPTIVE_DELAY_CHARS)
         return min(self.min_delay * scale, MARKDOWN_STREAM_MAX_DELAY_S)
 
+    def is_due(self, text_length: int, *, final: bool = False) -> bool:
+        """Whether `update` would render a buffer of this length now.
+
+        Lets callers skip assembling the buffer for frames that would be dropped.
+        Only text after the rendered checkpoint is re-parsed, so that is what
+        scales the frame interval.
+        """
+        if final:
+            return True
+        uncached = max(text_length - len(self._checkpoint_source), 0)
+        return time.time() - self.when >= self._effective_min_delay(uncached)
+
     def _get_base_width(self) -> int:
         return self.console.options.max_width
 
@@ -428,17 +474,24 @@ class MarkdownStream:
                     if flush is not None:
                         flush()
 
-    def compute_candidate_stable_line(self, text: str) -> int:
+    def _parse(self, text: str) -> list[Token] | None:
+        try:
+            return self._parser.parse(text)
+        except Exception:  # markdown-it-py may raise various internal errors during parsing
+            return None
+
+    def compute_candidate_stable_line(self, text: str, *, tokens: list[Token] | None = None) -> int:
         """Return the start line of the last top-level block, or 0.
 
         This value is not monotonic; callers should clamp it (e.g. with the
-        previous stable line) before using it to advance state.
+        previous stable line) before using it to advance state. Pass `tokens`
+        to reuse a parse of `text` the caller already has.
         """
 
-        try:
-            tokens = self._parser.parse(text)
-        except Exception:  # markdown-it-py may raise various internal errors during parsing
-            return 0
+        if tokens is None:
+            tokens = self._parse(text)
+            if tokens is None:
+                return 0
 
         top_level: list[Token] = [token for token in tokens if token.level == 0 and token.map is not None]
         if not top_level:
@@ -512,7 +565,14 @@ class MarkdownStream:
         assert last_item.map is not None
         return max(last_item.map[0], 0)
 
-    def split_blocks(self, text: str, *, min_stable_line: int = 0, final: bool = False) -> tuple[str, str, int]:
+    def split_blocks(
+        self,
+        text: str,
+        *,
+        min_stable_line: int = 0,
+        final: bool = False,
+        tokens: list[Token] | None = None,
+    ) -> tuple[str, str, int]:
         """Split full markdown into stable and live sources.
 
         Returns:
@@ -524,7 +584,7 @@ class MarkdownStream:
         lines = text.splitlines(keepends=True)
         line_count = len(lines)
 
-        stable_line = line_count if final else self.compute_candidate_stable_line(text)
+        stable_line = line_count if final else self.compute_candidate_stable_line(text, tokens=tokens)
 
         stable_line = min(stable_line, line_count)
         stable_line = max(stable_line, min_stable_line)
@@ -549,24 +609,28 @@ class MarkdownStream:
         Returns:
             tuple: (ANSI string, collected local image paths)
         """
+        lines, images = self._render_stable_lines(stable_source, has_live_suffix=has_live_suffix, final=final)
+        return "".join(lines), images
+
+    def _render_stable_lines(
+        self, stable_source: str, *, has_live_suffix: bool, final: bool, apply_mark: bool = True
+    ) -> tuple[list[str], list[tuple[str, str]]]:
         if not stable_source:
-            return "", []
+            return [], []
 
         render_source = stable_source
         if not final and has_live_suffix and not self._stable_prefix_ends_inside_list(stable_source):
             render_source = self._append_nonfinal_sentinel(stable_source)
 
-        lines, images = self._render_markdown_to_lines(render_source, apply_mark=True)
-        return "".join(lines), images
+        return self._render_markdown_to_lines(render_source, apply_mark=apply_mark)
 
     def _stable_prefix_ends_inside_list(self, stable_source: str) -> bool:
         stable_line = len(stable_source.splitlines(keepends=True))
         if stable_line == 0:
             return False
 
-        try:
-            tokens = self._parser.parse(stable_source)
-        except Exception:
+        tokens = self._parse(stable_source)
+        if tokens is None:
             return False
 
         list_tokens = [
@@ -725,21 +789,83 @@ class MarkdownStream:
         with contextlib.suppress(Exception):
             self._live_sink(None)
 
+    def _reset_checkpoint(self) -> None:
+        self._checkpoint_source = ""
+        self._checkpoint_line_count = 0
+        self._checkpoint_rendered_lines = []
+        self._checkpoint_width = self._get_base_width()
+
+    def _advance_checkpoint(
+        self,
+        tail: str,
+        tokens: list[Token],
+        *,
+        stable_line: int,
+        stable_lines: list[str],
+        has_live_suffix: bool,
+    ) -> None:
+        """Move the checkpoint to a top-level block start inside the stable part of `tail`.
+
+        `stable_lines` is the rendering of the stable part of `tail`; a split is
+        kept only if rendering both sides separately reproduces it exactly. At
+        least one stable block stays after the cut so the spacing across the
+        boundary is part of that check. Some boundaries do not compose (Rich
+        spaces a list differently at the edge of a document), so a few earlier
+        block starts are tried before giving up until the next frame.
+        """
+        cuts = sorted(
+            {
+                token.map[0]
+                for token in tokens
+                if token.level == 0 and token.map is not None and 0 < token.map[0] < stable_line
+            },
+            reverse=True,
+        )
+        source_lines = tail.splitlines(keepends=True)
+        first = self._checkpoint_line_count == 0
+        for cut in cuts[:_CHECKPOINT_CUT_ATTEMPTS]:
+            chunk = "".join(source_lines[:cut])
+            chunk_lines, _ = self._render_stable_lines(chunk, has_live_suffix=True, final=False, apply_mark=first)
+            if first and not any(line.strip() for line in chunk_lines):
+                # The mark and leading-blank trimming belong to the first visible line.
+                return
+            if not _same_rendering(chunk_lines, stable_lines[: len(chunk_lines)]):
+                continue
+            rest = "".join(source_lines[cut:stable_line])
+            rest_lines, _ = self._render_stable_lines(
+                rest, has_live_suffix=has_live_suffix, final=False, apply_mark=False
+            )
+            if not _same_rendering(chunk_lines + rest_lines, stable_lines):
+                continue
+
+            self._checkpoint_source += chunk
+            self._checkpoint_line_count += cut
+            self._checkpoint_rendered_lines += chunk_lines
+            return
+
     def update(self, text: str, final: bool = False) -> None:
         """Update the display with the latest full markdown buffer."""
 
-        now = time.time()
-        if not final and now - self.when < self._effective_min_delay(len(text)):
+        if not self.is_due(len(text), final=final):
             return
-        self.when = now
+        self.when = time.time()
 
-        previous_stable_line = self._stable_source_line_count
+        if self._checkpoint_width != self._get_base_width() or not text.startswith(self._checkpoint_source):
+            self._reset_checkpoint()
+        base_line = self._checkpoint_line_count
+        tail = text[len(self._checkpoint_source) :]
+        tokens = None if final else self._parse(tail)
 
-        stable_source, live_source, stable_line = self.split_blocks(
-            text,
-            min_stable_line=previous_stable_line,
+        stable_source, live_source, tail_stable_line = self.split_blocks(
+            tail,
+            min_stable_line=self._stable_source_line_count - base_line,
             final=final,
+            tokens=tokens,
         )
+        stable_line = base_line + tail_stable_line
+        if base_line:
+            # Stable content before the checkpoint is already committed.
+            stable_source = self._checkpoint_source + stable_source
 
         start = time.time()
 
@@ -747,10 +873,19 @@ class MarkdownStream:
         new_images: list[tuple[str, str]] = []
         stable_changed = final or stable_line > self._stable_source_line_count
         if stable_changed and stable_source:
-            stable_ansi, collected_images = self.render_stable_ansi(
-                stable_source, has_live_suffix=bool(live_source), final=final
+            tail_stable_source = stable_source[len(self._checkpoint_source) :]
+            tail_lines, collected_images = self._render_stable_lines(
+                tail_stable_source, has_live_suffix=bool(live_source), final=final, apply_mark=base_line == 0
             )
-            stable_lines = stable_ansi.splitlines(keepends=True)
+            stable_lines = self._checkpoint_rendered_lines + tail_lines
+            if tokens is not None:
+                self._advance_checkpoint(
+                    tail,
+                    tokens,
+                    stable_line=tail_stable_line,
+                    stable_lines=tail_lines,
+                    has_live_suffix=bool(live_source),
+                )
             new_lines = stable_lines[len(self._stable_rendered_lines) :]
             if new_lines:
                 stable_chunk_to_print = "".join(new_lines)
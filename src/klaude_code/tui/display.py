@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+from collections import OrderedDict
 from collections.abc import Callable, Coroutine, Sequence
+from dataclasses import dataclass
 from typing import Any, override
 
 from klaude_code.app.ports import DisplayABC
+from klaude_code.const import TRANSCRIPT_REBUILD_CACHED_WIDTHS, TRANSCRIPT_REBUILD_SCREENS
 from klaude_code.control.event_tape import EventTape, apply_retractions
 from klaude_code.log import DebugType, log_debug
 from klaude_code.protocol import events
@@ -18,6 +21,33 @@ from klaude_code.tui.terminal.title import update_terminal_title
 from klaude_code.tui.transcript_detail import Detail, TranscriptDetail
 
 
+@dataclass
+class _RebuildOutputs:
+    """Scrollback output of each event in one rebuild, for reuse at the same width and detail.
+
+    An event's output only depends on the events before it, so an entry stays
+    valid while the tape prefix up to it is the same objects in the same order.
+    """
+
+    themes: object
+    items: list[events.Event]
+    outputs: dict[int, str]
+
+    def reusable(self, items: Sequence[events.Event]) -> dict[int, str]:
+        prefix = 0
+        for cached, item in zip(self.items, items, strict=False):
+            if cached is not item:
+                break
+            prefix += 1
+        return {index: output for index, output in self.outputs.items() if index < prefix}
+
+
+def _estimated_lines(item: events.Event, *, width: int, height: int) -> int:
+    # Serialized size is a rough, renderer-independent proxy; capped at a
+    # screen because long tool output is truncated when rendered.
+    return min(1 + len(item.model_dump_json()) // max(width, 1), height)
+
+
 class TUIDisplay(DisplayABC):
     """Interactive terminal display using Rich for rendering."""
 
@@ -52,6 +82,8 @@ class TUIDisplay(DisplayABC):
         # detail toggle, /refresh) can repaint the screen without asking the
         # runtime — including in-flight turns that are not persisted yet.
         self._tape = EventTape()
+        # Per-event rebuild output keyed by (terminal width, detail level).
+        self._rebuild_outputs: OrderedDict[tuple[int, Detail], _RebuildOutputs] = OrderedDict()
 
     @property
     def transcript_detail(self) -> Detail:
@@ -90,7 +122,9 @@ class TUIDisplay(DisplayABC):
             await self._render_events_to_scrollback(apply_retractions(self._tape.snapshot()), clear_screen=True)
             return
         if isinstance(event, events.RefreshDisplayEvent):
-            await self._render_events_to_scrollback(apply_retractions(self._tape.snapshot()), clear_screen=True)
+            await self._render_events_to_scrollback(
+                apply_retractions(self._tape.snapshot()), clear_screen=True, full_history=event.full_history
+            )
             return
         if isinstance(event, events.UserMessageRetractedEvent):
             # A transcript event (recorded so later rebuilds keep hiding the
@@ -109,7 +143,12 @@ class TUIDisplay(DisplayABC):
             await self._renderer.execute(commands)
 
     async def _render_events_to_scrollback(
-        self, items: Sequence[events.Event], *, clear_screen: bool, drop_dangling_tasks: bool = False
+        self,
+        items: Sequence[events.Event],
+        *,
+        clear_screen: bool,
+        drop_dangling_tasks: bool = False,
+        full_history: bool = False,
     ) -> None:
         """Rebuild machine state and scrollback from `items` in one bulk paint.
 
@@ -119,7 +158,20 @@ class TUIDisplay(DisplayABC):
         the rebuild its state matches what live consumption had built — open
         streams and running sub-agents included — and subsequent live events
         continue seamlessly.
+
+        Unless `full_history` is set, only the turns covering the last
+        `TRANSCRIPT_REBUILD_SCREENS` screens are painted; older events run with
+        output suppressed and a notice points at /refresh. Repaints of the tape
+        reuse each painted event's output from an earlier repaint at the same
+        width; a history replay is painted once and not cached.
         """
+        width, height = self._renderer.console.size
+        key = (width, self._detail.current)
+        cached = self._rebuild_outputs.get(key) if clear_screen else None
+        reusable = cached.reusable(items) if cached is not None and cached.themes is self._renderer.themes else {}
+        window_start = 0 if full_history else self._rebuild_window_start(items, reusable, width=width, height=height)
+        outputs: dict[int, str] = {}
+
         # A rebuild does not need streaming UI; disable prompt live rendering
         # while reconstructing stable scrollback history.
         self._renderer.set_stream_renderable(None)
@@ -134,16 +186,33 @@ class TUIDisplay(DisplayABC):
             # round trip and a bottom-UI redraw.
             with self._renderer.bulk_render_capture() as buffer:
                 await self._renderer.execute(self._machine.begin_rebuild())
-                for item in items:
+                for index, item in enumerate(items):
                     log_debug(
                         f"[Rebuild] [{item.__class__.__name__}]",
                         lambda item=item: item.model_dump_json(exclude_none=True),
                         debug_type=DebugType.UI_EVENT,
                     )
 
+                    if index == window_start and index > 0:
+                        hidden_turns = sum(isinstance(e, events.UserMessageEvent) for e in items[:index])
+                        self._renderer.print_hidden_history_notice(hidden_turns)
                     commands = self._machine.transition_rebuild(item)
                     if commands:
-                        await self._renderer.execute(commands)
+                        # The banner stays on top even when older turns are skipped.
+                        painted = index >= window_start or isinstance(item, events.WelcomeEvent)
+                        output = reusable.get(index) if painted else None
+                        if not painted or output is not None:
+                            with self._renderer.suppressed_output():
+                                await self._renderer.execute(commands)
+                            if output:
+                                buffer.write(output)
+                        else:
+                            start = buffer.tell()
+                            await self._renderer.execute(commands)
+                            buffer.seek(start)
+                            output = buffer.read()
+                        if output is not None:
+                            outputs[index] = output
                     await asyncio.sleep(0)
                 await self._renderer.execute(self._machine.end_rebuild(drop_dangling_tasks=drop_dangling_tasks))
                 self._renderer.flush_rebuild_tails()
@@ -151,9 +220,42 @@ class TUIDisplay(DisplayABC):
                 buffer.getvalue(),
                 clear_screen=clear_screen,
             )
+            if clear_screen:
+                self._rebuild_outputs[key] = _RebuildOutputs(
+                    themes=self._renderer.themes, items=list(items), outputs=outputs
+                )
+                self._rebuild_outputs.move_to_end(key)
+                while len(self._rebuild_outputs) > TRANSCRIPT_REBUILD_CACHED_WIDTHS:
+                    self._rebuild_outputs.popitem(last=False)
         finally:
             self._renderer.set_replay_mode(False)
 
+    def _rebuild_window_start(
+        self, items: Sequence[events.Event], reusable: dict[int, str], *, width: int, height: int
+    ) -> int:
+        """Index of the first event a bounded rebuild paints.
+
+        Walks back from the newest event until about `TRANSCRIPT_REBUILD_SCREENS`
+        screens are covered, then back to the start of that turn so no turn is
+        painted partially. Returns 0 when the whole transcript fits.
+        """
+        if TRANSCRIPT_REBUILD_SCREENS <= 0:
+            return 0
+        budget = TRANSCRIPT_REBUILD_SCREENS * height
+        lines = 0
+        index = len(items)
+        while index > 0 and lines < budget:
+            index -= 1
+            output = reusable.get(index)
+            lines += (
+                output.count("\n") if output is not None else _estimated_lines(items[index], width=width, height=height)
+            )
+        if lines < budget:
+            return 0
+        while index > 0 and not isinstance(items[index], events.UserMessageEvent):
+            index -= 1
+        return index
+
     def _set_prompt_suggestion(self, text: str | None) -> None:
         if self._on_prompt_suggestion is None:
             return
@@ -21,7 +21,8 @@ import shutil
 import subprocess
 import threading
 import time
-from bisect import insort
+from array import array
+from bisect import bisect_right, insort
 from collections import deque
 from collections.abc import Callable, Iterable
 from pathlib import Path
@@ -184,11 +185,15 @@ def _path_sort_key(path: str, query: str) -> _PathSortKey | None:
         return None
 
     normalized = path.removeprefix("./").removeprefix(".\\")
-    path_lower = normalized.lower()
-    is_hidden = any(segment.startswith(".") for segment in normalized.split("/") if segment)
-    has_test = "test" in path_lower
     depth = normalized.rstrip("/").count("/")
-    return (1 if is_hidden else 0, 1 if has_test else 0, *match_rank, depth, len(normalized))
+    return (*_path_penalty(normalized), *match_rank, depth, len(normalized))
+
+
+def _path_penalty(normalized: str) -> tuple[int, int]:
+    """Return the (hidden, test) flags that lead every path sort key."""
+    is_hidden = any(segment.startswith(".") for segment in normalized.split("/") if segment)
+    has_test = "test" in normalized.lower()
+    return (1 if is_hidden else 0, 1 if has_test else 0)
 
 
 def _add_ranked_path(ranked: list[_RankedPath], path: str, query: str, *, limit: int) -> bool:
@@ -204,6 +209,133 @@ def _add_ranked_path(ranked: list[_RankedPath], path: str, query: str, *, limit:
     return True
 
 
+def _subsequence_pattern(query: str, *, multiline: bool) -> re.Pattern[str]:
+    """Compile a linear-time regex matching lines that contain query as a subsequence."""
+    body = "".join(f"[^{re.escape(char)}\\n]*+{re.escape(char)}" for char in query)
+    return re.compile(f"^{body}", re.MULTILINE) if multiline else re.compile(body)
+
+
+def _join_lines(lines: list[str]) -> tuple[str, array[int]]:
+    """Join lines with newlines and return the blob with each line's start offset."""
+    starts = array("q")
+    offset = 0
+    for line in lines:
+        starts.append(offset)
+        offset += len(line) + 1
+    return "\n".join(lines), starts
+
+
+def _git_index_stamp(repo_root: Path) -> tuple[int, int] | None:
+    """Return a cheap change marker for the repository's Git index file."""
+    try:
+        stat = (repo_root / ".git" / "index").stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class _PathIndex:
+    """Workspace paths with lowercased blobs for tiered, incremental ranking.
+
+    Sort keys lead with (hidden, test, tier), where tiers 0-2 need the query in
+    the basename, tier 3 in the path, and tiers 4-5 as a subsequence. Ranking
+    walks those groups cheapest first, finding hits with regexes over joined
+    strings, and stops once the kept paths beat anything a later group could
+    produce. Subsequence candidates are remembered per query prefix: typing
+    another character filters the previous set and deleting one pops back to
+    an earlier set instead of rescanning.
+    """
+
+    def __init__(
+        self,
+        cwd: Path,
+        directories: list[str],
+        files: list[str],
+        *,
+        stamp: tuple[int, int] | None,
+    ) -> None:
+        self.cwd = cwd
+        self.stamp = stamp
+        self.built_at = time.monotonic()
+        self._paths = [*directories, *files]
+        self._lowered = [path.lower() for path in self._paths]
+        self._basename_starts = array("q", (lowered.rstrip("/").rfind("/") + 1 for lowered in self._lowered))
+        basenames = [
+            lowered.rstrip("/")[start:] for lowered, start in zip(self._lowered, self._basename_starts, strict=True)
+        ]
+        self._blob, self._line_starts = _join_lines(self._lowered)
+        self._basename_blob, self._basename_line_starts = _join_lines(basenames)
+        self._penalties = bytearray(
+            hidden * 2 + test
+            for hidden, test in (_path_penalty(path.removeprefix("./").removeprefix(".\\")) for path in self._paths)
+        )
+        self._steps: list[tuple[str, array[int]]] = []
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def rank(self, query: str, *, limit: int) -> tuple[list[str], bool]:
+        """Return the best matches for a lowercase query and whether more may have matched."""
+        escaped = re.escape(query)
+        ranked: list[_RankedPath] = []
+        seen: set[int] = set()
+        truncated = False
+        # (hits, lowest tier any path outside the hits seen so far can reach)
+        groups: list[tuple[Callable[[], Iterable[int]], int]] = [
+            (lambda: self._hits(self._basename_blob, self._basename_line_starts, f"^{escaped}"), 2),
+            (lambda: self._hits(self._basename_blob, self._basename_line_starts, escaped), 3),
+            (lambda: self._hits(self._blob, self._line_starts, escaped), 4),
+        ]
+        for hits, next_tier in groups:
+            for index in hits():
+                if index in seen:
+                    continue
+                seen.add(index)
+                if _add_ranked_path(ranked, self._paths[index], query, limit=limit):
+                    truncated = True
+            if len(ranked) >= limit and ranked[-1][0][:3] < (0, 0, next_tier):
+                return [path for _, _, path in ranked], True
+
+        lowered = self._lowered
+        basename_starts = self._basename_starts
+        penalties = self._penalties
+        subsequence = _subsequence_pattern(query, multiline=False)
+        for index in self._candidates(query):
+            if index in seen:
+                continue
+            if len(ranked) >= limit:
+                # Fuzzy tiers: 4 needs a subsequence within the basename.
+                tier = 4 if subsequence.match(lowered[index], basename_starts[index]) else 5
+                penalty = penalties[index]
+                if ranked[-1][0][:3] < (penalty >> 1, penalty & 1, tier):
+                    truncated = True
+                    continue
+            if _add_ranked_path(ranked, self._paths[index], query, limit=limit):
+                truncated = True
+        return [path for _, _, path in ranked], truncated
+
+    def _hits(self, blob: str, line_starts: array[int], pattern: str) -> Iterable[int]:
+        for m in re.finditer(pattern, blob, re.MULTILINE):
+            yield bisect_right(line_starts, m.start()) - 1
+
+    def _candidates(self, query: str) -> array[int]:
+        steps = self._steps
+        while steps and not query.startswith(steps[-1][0]):
+            steps.pop()
+        if steps and steps[-1][0] == query:
+            return steps[-1][1]
+
+        if steps:
+            pattern = _subsequence_pattern(query, multiline=False)
+            lowered = self._lowered
+            found = array("q", (index for index in steps[-1][1] if pattern.match(lowered[index])))
+        else:
+            pattern = _subsequence_pattern(query, multiline=True)
+            found = array("q", self._hits(self._blob, self._line_starts, pattern.pattern))
+        steps.append((query, found))
+        return found
+
+
 def create_repl_completer(
     command_info_provider: Callable[[], list[CommandInfo]] | None = None,
 ) -> Completer:
@@ -469,7 +601,7 @@ class _AtFilesCompleter(Completer):
     - Only triggers when the cursor is after an "@…" token (until whitespace).
     - Completes paths relative to the session workspace directory.
     - Uses the Git index inside repositories and an in-process scan elsewhere.
-    - Caches Git indexes and query results to avoid excessive spawning.
+    - Keeps an incremental path index per workspace, refreshed in the background.
     - Inserts a trailing space after completion to stop further triggering.
     """
 
@@ -495,10 +627,12 @@ class _AtFilesCompleter(Completer):
         self._git_repo_root_time: float = 0.0
         self._git_repo_root_cwd: Path | None = None
 
-        self._git_file_list: list[str] | None = None
-        self._git_dir_list: list[str] | None = None
-        self._git_file_list_time: float = 0.0
-        self._git_file_list_cwd: Path | None = None
+        # Only the first listing for a workspace runs on the keystroke path.
+        # Later refreshes happen on a background thread when the Git index
+        # changes or the listing ages out, while queries use the previous index.
+        self._path_index: _PathIndex | None = None
+        self._path_index_lock = threading.Lock()
+        self._path_index_refresh: threading.Thread | None = None
 
         # Path searches are bounded and never overlap. ThreadedCompleter does
         # not cancel an in-flight generator when the user types another key.
@@ -730,66 +864,80 @@ class _AtFilesCompleter(Completer):
         if repo_root is None:
             return [], False
 
-        now = time.monotonic()
-        git_cache_ttl = max(self._cache_ttl, 30.0)
-        if (
-            self._git_file_list is None
-            or self._git_file_list_cwd != cwd
-            or now - self._git_file_list_time > git_cache_ttl
+        index = self._path_index
+        if index is None or index.cwd != cwd:
+            index = self._build_path_index(cwd, repo_root)
+            with self._path_index_lock:
+                self._path_index = index
+        elif (
+            time.monotonic() - index.built_at > max(self._cache_ttl, 30.0) or _git_index_stamp(repo_root) != index.stamp
         ):
-            cmd = ["git", "-c", "core.quotePath=false", "ls-files", "-co", "--exclude-standard"]
-            r = self._run_cmd(cmd, cwd=repo_root, timeout_sec=self._cmd_timeout_sec)
-            if not r.ok:
-                self._git_file_list = []
-                self._git_dir_list = []
-                self._git_file_list_time = now
-                self._git_file_list_cwd = cwd
-            else:
-                all_lines = [self._decode_git_path_line(line) for line in r.lines]
-                # Supplement with submodule contents: git ls-files -co doesn't
-                # recurse into submodules (they appear as single gitlink entries).
-                r_sub = self._run_cmd(
-                    ["git", "-c", "core.quotePath=false", "ls-files", "--recurse-submodules"],
-                    cwd=repo_root,
-                    timeout_sec=self._cmd_timeout_sec,
-                )
-                if r_sub.ok:
-                    main_set = set(all_lines)
-                    all_lines.extend(
-                        rel for line in r_sub.lines if (rel := self._decode_git_path_line(line)) not in main_set
-                    )
+            self._schedule_path_index_refresh(cwd, repo_root)
 
-                cwd_resolved = cwd.resolve()
-                root_resolved = repo_root.resolve()
-                files: list[str] = []
-                directories: set[str] = set()
-                for rel in all_lines:
-                    abs_path = root_resolved / rel
-                    try:
-                        rel_to_cwd = abs_path.relative_to(cwd_resolved)
-                    except ValueError:
-                        continue
-                    rel_posix = rel_to_cwd.as_posix()
-                    files.append(rel_posix)
-                    parent = os.path.dirname(rel_posix)
-                    while parent and parent != ".":
-                        directories.add(f"{parent}/")
-                        parent = os.path.dirname(parent)
-                self._git_file_list = files
-                self._git_dir_list = sorted(directories)
-                self._git_file_list_time = now
-                self._git_file_list_cwd = cwd
-
-        all_files = self._git_file_list or []
-        all_directories = self._git_dir_list or []
-        ranked: list[_RankedPath] = []
-        truncated = False
-        for paths in (all_directories, all_files):
-            for path in paths:
-                if _add_ranked_path(ranked, path, keyword_norm, limit=max_results):
-                    truncated = True
+        return index.rank(keyword_norm, limit=max_results)
 
-        return [path for _, _, path in ranked], truncated
+    def _schedule_path_index_refresh(self, cwd: Path, repo_root: Path) -> None:
+        with self._path_index_lock:
+            if self._path_index_refresh is not None and self._path_index_refresh.is_alive():
+                return
+            self._path_index_refresh = threading.Thread(
+                target=self._refresh_path_index,
+                args=(cwd, repo_root),
+                name="at-files-index",
+                daemon=True,
+            )
+            self._path_index_refresh.start()
+
+    def _refresh_path_index(self, cwd: Path, repo_root: Path) -> None:
+        index = self._build_path_index(cwd, repo_root)
+        with self._path_index_lock:
+            current = self._path_index
+            if current is not None and current.cwd != cwd:
+                return
+            if len(index) == 0 and current is not None and len(current) > 0:
+                # A failed listing keeps serving the previous paths until the next refresh.
+                current.stamp = index.stamp
+                current.built_at = index.built_at
+                return
+            self._path_index = index
+
+    def _build_path_index(self, cwd: Path, repo_root: Path) -> _PathIndex:
+        # Stamp before listing so changes made during the listing trigger another refresh.
+        stamp = _git_index_stamp(repo_root)
+        cmd = ["git", "-c", "core.quotePath=false", "ls-files", "-co", "--exclude-standard"]
+        r = self._run_cmd(cmd, cwd=repo_root, timeout_sec=self._cmd_timeout_sec)
+        if not r.ok:
+            return _PathIndex(cwd, [], [], stamp=stamp)
+
+        all_lines = [self._decode_git_path_line(line) for line in r.lines]
+        # Supplement with submodule contents: git ls-files -co doesn't
+        # recurse into submodules (they appear as single gitlink entries).
+        r_sub = self._run_cmd(
+            ["git", "-c", "core.quotePath=false", "ls-files", "--recurse-submodules"],
+            cwd=repo_root,
+            timeout_sec=self._cmd_timeout_sec,
+        )
+        if r_sub.ok:
+            main_set = set(all_lines)
+            all_lines.extend(rel for line in r_sub.lines if (rel := self._decode_git_path_line(line)) not in main_set)
+
+        cwd_resolved = cwd.resolve()
+        root_resolved = repo_root.resolve()
+        files: list[str] = []
+        directories: set[str] = set()
+        for rel in all_lines:
+            abs_path = root_resolved / rel
+            try:
+                rel_to_cwd = abs_path.relative_to(cwd_resolved)
+            except ValueError:
+                continue
+            rel_posix = rel_to_cwd.as_posix()
+            files.append(rel_posix)
+            parent = os.path.dirname(rel_posix)
+            while parent and parent != ".":
+                directories.add(f"{parent}/")
+                parent = os.path.dirname(parent)
+        return _PathIndex(cwd, sorted(directories), files, stamp=stamp)
 
     def _decode_git_path_line(self, line: str) -> str:
         """Decode git's C-style quoted path output when core.quotePath is enabled."""
@@ -8,7 +8,7 @@ import time
 from collections import deque
 from collections.abc import Callable, Iterator
 from contextlib import contextmanager
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, Literal, cast
 
@@ -185,11 +185,21 @@ class _TerminalCaptureBuffer(io.StringIO):
 
 @dataclass
 class _ActiveStream:
-    buffer: str
     mdstream: MarkdownStream
+    chunks: list[str] = field(default_factory=list[str])
+    length: int = 0
 
     def append(self, content: str) -> None:
-        self.buffer += content
+        # Deltas are collected and joined only when a frame is rendered, instead
+        # of re-copying the whole buffer on every token.
+        self.chunks.append(content)
+        self.length += len(content)
+
+    @property
+    def buffer(self) -> str:
+        if len(self.chunks) > 1:
+            self.chunks[:] = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
 
 
 class _StreamState:
@@ -205,7 +215,7 @@ class _StreamState:
         return self._active.buffer if self._active else ""
 
     def start(self, mdstream: MarkdownStream) -> None:
-        self._active = _ActiveStream(buffer="", mdstream=mdstream)
+        self._active = _ActiveStream(mdstream=mdstream)
 
     def append(self, content: str) -> None:
         if self._active is None:
@@ -215,6 +225,8 @@ class _StreamState:
     def render(self, *, transform: Callable[[str], str] | None = None, final: bool = False) -> bool:
         if self._active is None:
             return False
+        if not self._active.mdstream.is_due(self._active.length, final=final):
+            return True
         text = self._active.buffer
         if transform is not None:
             text = transform(text)
@@ -223,7 +235,10 @@ class _StreamState:
             self._active = None
         return True
 
-    def finalize(self, *, transform: Callable[[str], str] | None = None) -> bool:
+    def finalize(self, *, transform: Callable[[str], str] | None = None, discard: bool = False) -> bool:
+        if discard and self._active is not None:
+            self._active = None
+            return True
         return self.render(transform=transform, final=True)
 
 
@@ -284,6 +299,8 @@ class TUICommandRenderer:
         # When enabled, we avoid bottom Live rendering and defer markdown rendering until
         # the corresponding stream End event.
         self._replay_mode: bool = False
+        # Commands still update renderer state but print nothing (see `suppressed_output`).
+        self._output_suppressed: bool = False
 
         self._bash_stream_active: bool = False
         self._bash_live_tail_lines: deque[str] = deque(maxlen=BASH_LIVE_TAIL_MAX_LINES)
@@ -377,6 +394,35 @@ class TUICommandRenderer:
         if self._thinking_live_active:
             self._render_thinking_live_tail()
 
+    @contextmanager
+    def suppressed_output(self) -> Iterator[None]:
+        """Execute commands for their state changes only, printing nothing.
+
+        A viewport-bounded rebuild runs the history it does not paint (or
+        paints from its output cache) through here, so session, block and
+        stream bookkeeping end up exactly as a full render leaves them without
+        paying for Rich rendering.
+        """
+        previous = self._output_suppressed
+        self._output_suppressed = True
+        try:
+            yield
+        finally:
+            self._output_suppressed = previous
+
+    def print_hidden_history_notice(self, hidden_turns: int) -> None:
+        """Mark where a viewport-bounded rebuild skipped older history."""
+        # Leave the blank-line bookkeeping untouched so the events after the
+        # notice render exactly as they do in a full rebuild.
+        boundary_printed = self._scrollback_boundary_printed
+        noun = "turn" if hidden_turns == 1 else "turns"
+        self.print(
+            Text(f"… {hidden_turns} earlier {noun} not shown · /refresh to render the full transcript"),
+            style=ThemeKey.METADATA_DIM,
+        )
+        self.print()
+        self._scrollback_boundary_printed = boundary_printed
+
     @contextmanager
     def bulk_render_capture(self) -> Iterator[io.StringIO]:
         """Render into memory instead of the terminal.
@@ -479,13 +525,13 @@ class TUICommandRenderer:
             if objects:
                 self._set_scrollback_boundary(False)
                 content = objects[0] if len(objects) == 1 else objects
-                self.console.print(
+                self._console_print(
                     Quote(content, style=Style(color=self._current_sub_agent_color.color), prefix="▌ "),
                     overflow=overflow,
                 )
             elif not self._scrollback_boundary_printed:
                 self._set_scrollback_boundary(True)
-                self.console.print(
+                self._console_print(
                     Quote(Text(""), style=Style(color=self._current_sub_agent_color.color), prefix="▌ "),
                     overflow="ellipsis",
                 )
@@ -496,11 +542,15 @@ class TUICommandRenderer:
         if not objects and self._scrollback_boundary_printed:
             return
         self._set_scrollback_boundary(not objects)
-        self.console.print(*objects, style=style, end=end, overflow=overflow)
+        self._console_print(*objects, style=style, end=end, overflow=overflow)
         # Scrollback just grew: release any ended stream's reserved height in
         # the same redraw so the bar shrink never floats it above the bottom.
         self._flush_pending_stream_end()
 
+    def _console_print(self, *objects: Any, **kwargs: Any) -> None:
+        if not self._output_suppressed:
+            self.console.print(*objects, **kwargs)
+
     def _set_scrollback_boundary(self, printed: bool) -> None:
         if self._scrollback_boundary_printed == printed:
             return
@@ -1355,6 +1405,8 @@ class TUICommandRenderer:
 
     def display_image(self, file_path: str, caption: str | None = None) -> None:
         self._set_scrollback_boundary(False)
+        if self._output_suppressed:
+            return
         if caption:
             caption_style = self.console.get_style("markdown.image.placeholder", default="dim")
             caption_text = caption_style.render(
@@ -1725,7 +1777,9 @@ class TUICommandRenderer:
                         self._end_thinking_live_tail()
                     else:
                         had_content = bool(self._thinking_stream.buffer.strip())
-                        finalized = self._thinking_stream.finalize(transform=c_thinking.normalize_thinking_content)
+                        finalized = self._thinking_stream.finalize(
+                            transform=c_thinking.normalize_thinking_content, discard=self._output_suppressed
+                        )
                         if finalized and had_content:
                             self.print()
                 case RenderSubAgentThinking(
@@ -1747,7 +1801,7 @@ class TUICommandRenderer:
                             self._flush_assistant()
                 case EndAssistantStream(session_id=_):
                     had_content = bool(self._assistant_stream.buffer.strip())
-                    finalized = self._assistant_stream.finalize()
+                    finalized = self._assistant_stream.finalize(discard=self._output_suppressed)
                     if finalized and had_content:
                         self.print()
                 case RenderToolCall(event=event):
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+from klaude_code.agent.session_stats import format_cost
 from klaude_code.log import log
 from klaude_code.session.selector import build_session_select_options, format_user_messages_display
 from klaude_code.tui.terminal.selector import DEFAULT_PICKER_STYLE, SelectItem, select_one
@@ -27,6 +28,8 @@ def select_session_sync(session_ids: list[str] | None = None) -> str | None:
         if opt.title:
             title.append(("bold class:accent.cyan", f"{opt.title} "))
         title.append(("class:meta", f"{opt.relative_time} · {opt.messages_count} · {opt.model_name}"))
+        if opt.total_cost is not None:
+            title.append(("class:meta", f" · {format_cost(opt.total_cost, opt.currency)}"))
         title.append(("class:meta", f" · {opt.session_id}\n"))
         for i, msg in enumerate(display_msgs):
             is_last = i == len(display_msgs) - 1
@@ -25,6 +25,7 @@ PACKAGE_NAME = "klaude-code"
 PYPI_URL = f"https://pypi.org/pypi/{PACKAGE_NAME}/json"
 CHECK_INTERVAL_SECONDS = 3600  # Check at most once per hour
 UPDATE_STATE_FILE = "update_state.json"
+CODE_FINGERPRINT_CACHE_FILE = "code_fingerprint.json"
 AUTO_UPGRADE_DONE_ENV = "KLAUDE_AUTO_UPGRADE_DONE"
 
 INSTALL_KIND_UNKNOWN = "unknown"
@@ -40,6 +41,7 @@ UPDATE_SOURCE_GIT = "git"
 
 UPGRADE_BRANCH = "main"
 _FINGERPRINT_PATHS = ("src/klaude_code", "pyproject.toml", "uv.lock")
+_FINGERPRINT_CACHE_MAX_ENTRIES = 16
 
 
 class InstallationInfo(NamedTuple):
@@ -89,6 +91,10 @@ def _get_update_state_path() -> Path:
     return Path.home() / ".klaude" / UPDATE_STATE_FILE
 
 
+def _get_code_fingerprint_cache_path() -> Path:
+    return Path.home() / ".klaude" / CODE_FINGERPRINT_CACHE_FILE
+
+
 def _classify_install_kind(source_url: str | None, direct_url_data: dict[str, Any] | None) -> str:
     if isinstance(direct_url_data, dict):
         dir_info = direct_url_data.get("dir_info")
@@ -198,12 +204,132 @@ def _compute_code_fingerprint() -> str:
     if install_info.install_kind in {INSTALL_KIND_EDITABLE, INSTALL_KIND_LOCAL}:
         source_path = get_install_source_path()
         if source_path is not None:
-            fingerprint = _compute_git_fingerprint(source_path)
+            fingerprint = _cached_git_fingerprint(source_path)
             if fingerprint is not None:
                 return fingerprint
     return f"pkg:{install_info.version or 'unknown'}"
 
 
+def _cached_git_fingerprint(source_path: str) -> str | None:
+    """``_compute_git_fingerprint`` behind an on-disk cache keyed by stat data.
+
+    Thin-client commands (``klaude ps/send/wait``) each run the handshake in a
+    fresh process, and agents issue hundreds of them per task; spawning git and
+    rehashing dirty files every time dominated their latency. The key covers
+    git's HEAD, the ref it names, packed-refs and the index, plus (mtime, ctime,
+    size) of every file under the fingerprinted paths, so any edit, stage or
+    commit misses the cache while an unchanged checkout never spawns git.
+    """
+
+    repo_path = Path(source_path).expanduser()
+    git_dir = _resolve_git_dir(repo_path)
+    git_state = _git_state_digest(git_dir) if git_dir is not None else None
+    if git_dir is None or git_state is None:
+        return _compute_git_fingerprint(source_path)
+    worktree = _worktree_stat_digest(repo_path)
+
+    cache_path = _get_code_fingerprint_cache_path()
+    entries = _load_code_fingerprint_cache(cache_path)
+    entry = entries.get(source_path)
+    if isinstance(entry, dict):
+        entry_typed = cast(dict[str, Any], entry)
+        cached = entry_typed.get("fingerprint")
+        if entry_typed.get("key") == f"{git_state}:{worktree}" and isinstance(cached, str):
+            return cached
+
+    fingerprint = _compute_git_fingerprint(source_path)
+    if fingerprint is None:
+        return None
+    # `git status` refreshes stat data in the index, so the git state is re-read
+    # after it ran. A worktree that changed meanwhile is not cached at all.
+    git_state = _git_state_digest(git_dir)
+    if git_state is None or _worktree_stat_digest(repo_path) != worktree:
+        return fingerprint
+    entries.pop(source_path, None)
+    entries[source_path] = {"key": f"{git_state}:{worktree}", "fingerprint": fingerprint}
+    while len(entries) > _FINGERPRINT_CACHE_MAX_ENTRIES:
+        entries.pop(next(iter(entries)))
+    with contextlib.suppress(OSError):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Concurrent clients may race here; replace() keeps readers from seeing a torn file.
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entries, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    return fingerprint
+
+
+def _load_code_fingerprint_cache(path: Path) -> dict[str, object]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError, ValueError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    return cast(dict[str, object], payload)
+
+
+def _git_state_digest(git_dir: Path) -> str | None:
+    """Digest of HEAD and stat data of the ref it names, packed-refs and the index."""
+
+    try:
+        head = (git_dir / "HEAD").read_bytes()
+    except OSError:
+        return None
+    common_dir = git_dir
+    with contextlib.suppress(OSError):
+        common_dir = git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()
+
+    hasher = hashlib.sha256()
+    hasher.update(head + b"\0")
+    ref_paths = [git_dir / "index", common_dir / "packed-refs"]
+    if head.startswith(b"ref: "):
+        ref_name = os.fsdecode(head[5:].strip())
+        ref_paths.extend([git_dir / ref_name, common_dir / ref_name])
+    for path in ref_paths:
+        hasher.update(f"{path}\0{_stat_token(path)}\0".encode())
+    return hasher.hexdigest()
+
+
+def _worktree_stat_digest(repo_path: Path) -> str:
+    """Digest of stat data for every file under the fingerprinted paths."""
+
+    hasher = hashlib.sha256()
+    for rel_path in _FINGERPRINT_PATHS:
+        root = repo_path / rel_path
+        if not root.is_dir():
+            hasher.update(f"{rel_path}\0{_stat_token(root)}\0".encode())
+            continue
+        for dir_path, dir_names, file_names in os.walk(root):
+            # Bytecode caches churn on every import and are never part of the fingerprint.
+            dir_names[:] = sorted(name for name in dir_names if name != "__pycache__")
+            for name in sorted(file_names):
+                path = os.path.join(dir_path, name)
+                hasher.update(f"{path}\0{_stat_token(Path(path))}\0".encode())
+    return hasher.hexdigest()
+
+
+def _resolve_git_dir(repo_path: Path) -> Path | None:
+    dot_git = repo_path / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        content = dot_git.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    # Worktrees and submodules use a ``gitdir: <path>`` file instead of a directory.
+    if not content.startswith("gitdir:"):
+        return None
+    return repo_path / content[len("gitdir:") :].strip()
+
+
+def _stat_token(path: Path) -> str:
+    try:
+        path_stat = path.lstat()
+    except OSError:
+        return "missing"
+    return f"{path_stat.st_mode:o}:{path_stat.st_mtime_ns}:{path_stat.st_ctime_ns}:{path_stat.st_size}"
+
+
 def _compute_git_fingerprint(source_path: str) -> str | None:
     """HEAD hash plus dirty-state digest; None when not a usable git checkout."""
 
@@ -0,0 +1,179 @@
+import asyncio
+import re
+from collections.abc import AsyncGenerator, Coroutine
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import klaude_code.agent.compaction.compaction as compaction_module
+from klaude_code.agent.compaction import CompactionReason, run_compaction
+from klaude_code.llm import LLMClientABC
+from klaude_code.llm.client import LLMStreamABC
+from klaude_code.prompts.compaction import SEGMENT_SUMMARIES_HEADER
+from klaude_code.protocol import llm_param, message
+from klaude_code.session.session import Session
+
+# A 20k summarizer window gives 8k-token segments.
+_LLM_CONFIG = llm_param.LLMConfigParameter(
+    protocol=llm_param.LLMClientProtocol.OPENAI,
+    context_limit=20_000,
+    max_tokens=0,
+)
+_SEGMENT_RE = re.compile(r"This is segment (\d+) of (\d+)")
+
+
+def arun[T](coro: Coroutine[Any, Any, T]) -> T:
+    return asyncio.run(coro)
+
+
+class _StaticTextStream(LLMStreamABC):
+    def __init__(self, text: str) -> None:
+        self._message = message.AssistantMessage(parts=[message.TextPart(text=text)], response_id=None)
+
+    def __aiter__(self) -> AsyncGenerator[message.LLMStreamItem]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncGenerator[message.LLMStreamItem]:
+        yield self._message
+
+    def get_partial_message(self) -> message.AssistantMessage | None:
+        return self._message
+
+
+class _SegmentAwareClient(LLMClientABC):
+    """Answers segment prompts with the turns they saw and records peak concurrency."""
+
+    def __init__(self, config: llm_param.LLMConfigParameter, *, fail_segment: int | None = None) -> None:
+        super().__init__(config)
+        self.fail_segment = fail_segment
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @classmethod
+    def create(cls, config: llm_param.LLMConfigParameter) -> LLMClientABC:
+        return cls(config)
+
+    async def call(self, param: llm_param.LLMCallParameter) -> LLMStreamABC:
+        prompt = "".join(message.join_text_parts(m.parts) for m in param.input if isinstance(m, message.UserMessage))
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        segment = _SEGMENT_RE.search(prompt)
+        if segment is None:
+            return _StaticTextStream("FINAL_SUMMARY")
+        if self.fail_segment == int(segment.group(1)):
+            raise RuntimeError("segment summarizer failed")
+        turns = re.findall(r"\[User\]: turn (\d+)", prompt)
+        return _StaticTextStream(f"turns {turns[0]}-{turns[-1]}" if turns else "folded")
+
+
+def _turn(index: int) -> list[message.HistoryEvent]:
+    return [
+        message.UserMessage(parts=[message.TextPart(text=f"turn {index} " + "u" * 1200)]),
+        message.AssistantMessage(parts=[message.TextPart(text="a" * 1200)]),
+    ]
+
+
+def _session(tmp_path: Path, turns: int) -> Session:
+    session = Session(id="map-reduce", work_dir=tmp_path)
+    session.conversation_history = [item for index in range(turns) for item in _turn(index)]
+    return session
+
+
+def _compact(session: Session, client: LLMClientABC) -> Any:
+    return run_compaction(
+        session=session,
+        reason=CompactionReason.THRESHOLD,
+        focus=None,
+        llm_client=client,
+        llm_config=_LLM_CONFIG,
+    )
+
+
+def test_small_prefix_uses_a_single_summarizer_call(tmp_path: Path) -> None:
+    session = _session(tmp_path, turns=20)
+    client = _SegmentAwareClient(_LLM_CONFIG)
+
+    result = arun(_compact(session, client))
+
+    assert len(client.prompts) == 1
+    assert SEGMENT_SUMMARIES_HEADER not in client.prompts[0]
+    assert result.summary.startswith("FINAL_SUMMARY")
+
+
+def test_oversized_prefix_is_summarized_in_turn_aligned_segments(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(compaction_module, "COMPACTION_SEGMENT_CONCURRENCY", 2)
+    session = _session(tmp_path, turns=80)
+    client = _SegmentAwareClient(_LLM_CONFIG)
+
+    result = arun(_compact(session, client))
+
+    *segment_prompts, merge_prompt = client.prompts
+    totals = {int(match.group(2)) for prompt in segment_prompts if (match := _SEGMENT_RE.search(prompt))}
+    assert totals == {len(segment_prompts)}
+    assert len(segment_prompts) > 2
+    assert client.peak_in_flight == 2
+    for prompt in segment_prompts:
+        conversation = prompt.split("<conversation>\n", 1)[1].split("\n</conversation>", 1)[0]
+        assert conversation.startswith("[User]: turn ")  # segments start on a turn boundary
+        assert len(conversation) // 4 <= 8000
+
+    # The merge call sees every turn exactly once, in order.
+    ranges = re.findall(r"turns (\d+)-(\d+)", merge_prompt)
+    assert merge_prompt.startswith(f"<conversation>\n{SEGMENT_SUMMARIES_HEADER}")
+    assert int(ranges[0][0]) == 0
+    assert all(int(end) + 1 == int(start) for (_, end), (start, _) in pairwise(ranges))
+    assert int(ranges[-1][1]) + 1 == result.first_kept_index // 2
+
+    entry = result.to_entry()
+    assert isinstance(entry, message.CompactionEntry)
+    assert entry.summary.startswith("FINAL_SUMMARY")
+
+
+def test_failing_segment_fails_the_compaction(tmp_path: Path) -> None:
+    session = _session(tmp_path, turns=80)
+    client = _SegmentAwareClient(_LLM_CONFIG, fail_segment=2)
+
+    with pytest.raises(RuntimeError, match="segment summarizer failed"):
+        arun(_compact(session, client))
+    assert not any(_SEGMENT_RE.search(prompt) is None for prompt in client.prompts)
+
+
+def test_oversized_turn_is_split_between_messages() -> None:
+    user = message.UserMessage(parts=[message.TextPart(text="u" * 400)])
+    results = [
+        message.ToolResultMessage(call_id=f"c{i}", tool_name="Bash", status="success", output_text="o" * 400)
+        for i in range(4)
+    ]
+
+    segments = compaction_module._split_segments([user, *results], budget=250)  # pyright: ignore[reportPrivateUsage]
+
+    assert [len(segment) for segment in segments] == [2, 2, 1]
+    assert segments[0][0] is user
+
+
+def test_segment_summaries_that_do_not_fit_are_folded_again(tmp_path: Path) -> None:
+    class _VerboseClient(_SegmentAwareClient):
+        async def call(self, param: llm_param.LLMCallParameter) -> LLMStreamABC:
+            stream = await super().call(param)
+            if _SEGMENT_RE.search(self.prompts[-1]) is None:
+                return stream
+            return _StaticTextStream("v" * 12_000)
+
+    session = _session(tmp_path, turns=80)
+    client = _VerboseClient(_LLM_CONFIG)
+
+    arun(_compact(session, client))
+
+    first_pass_total = int(_SEGMENT_RE.findall(client.prompts[0])[0][1])
+    assert len(client.prompts) > first_pass_total + 1
+    assert len(client.prompts[-1]) // 4 <= 8000 + 1000  # merge input fits, plus the prompt itself
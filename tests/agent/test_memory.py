@@ -1,3 +1,6 @@
+import os
+import time
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
@@ -216,3 +219,117 @@ def test_truncate_memory_content_reports_byte_cap_for_single_long_line(tmp_path:
     assert "last visible line may be incomplete" in truncated
     assert "first 200 lines" not in truncated
     assert str(memory_path) in truncated
+
+
+@pytest.fixture
+def memory_cache() -> Iterator[None]:
+    memory.clear_memory_discovery_cache()
+    yield
+    memory.clear_memory_discovery_cache()
+
+
+def _memory_repo(root: Path, *, packages: int, files_per_package: int) -> list[str]:
+    """Create a repo with a memory file per package and return the source file paths."""
+    (root / "AGENTS.md").parent.mkdir(parents=True)
+    (root / "AGENTS.md").write_text("root instructions\n", encoding="utf-8")
+    sources: list[str] = []
+    for package in range(packages):
+        package_dir = root / "packages" / f"pkg{package}" / "src" / "module"
+        package_dir.mkdir(parents=True)
+        (package_dir.parent / "CLAUDE.md").write_text(f"package {package} rules\n", encoding="utf-8")
+        for index in range(files_per_package):
+            source = package_dir / f"file{index}.py"
+            source.write_text("pass\n", encoding="utf-8")
+            sources.append(str(source))
+    past = time.time() - 60
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            os.utime(Path(dirpath) / filename, (past, past))
+        os.utime(dirpath, (past, past))
+    return sources
+
+
+def _discover_as_new_session(paths: list[str], work_dir: Path) -> list[memory.Memory]:
+    loaded: set[str] = set()
+    return memory.discover_memory_files_near_paths(
+        paths,
+        work_dir=work_dir,
+        is_memory_loaded=lambda p: p in loaded,
+        mark_memory_loaded=loaded.add,
+    )
+
+
+def test_memory_discovery_is_shared_across_sessions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, memory_cache: None
+) -> None:
+    del memory_cache
+    work_dir = tmp_path / "repo"
+    sources = _memory_repo(work_dir, packages=3, files_per_package=2)
+    first = _discover_as_new_session(sources, work_dir)
+
+    probes: list[Path] = []
+    reads: list[Path] = []
+    original_find = memory._find_memory_file  # pyright: ignore[reportPrivateUsage]
+    original_read_text = Path.read_text
+
+    def _recording_find(directory: Path) -> Path | None:
+        probes.append(directory)
+        return original_find(directory)
+
+    def _recording_read_text(
+        self: Path, encoding: str | None = None, errors: str | None = None, newline: str | None = None
+    ) -> str:
+        reads.append(self)
+        return original_read_text(self, encoding, errors, newline)
+
+    monkeypatch.setattr(memory, "_find_memory_file", _recording_find)
+    monkeypatch.setattr(Path, "read_text", _recording_read_text)
+
+    for _ in range(30):
+        assert _discover_as_new_session(sources, work_dir) == first
+    assert probes == []
+    assert reads == []
+
+
+def test_memory_cache_notices_new_and_edited_files(tmp_path: Path, memory_cache: None) -> None:
+    del memory_cache
+    work_dir = tmp_path / "repo"
+    sources = _memory_repo(work_dir, packages=2, files_per_package=1)
+    _discover_as_new_session(sources, work_dir)
+
+    module_dir = Path(sources[0]).parent
+    (module_dir / "AGENTS.md").write_text("module rules\n", encoding="utf-8")
+    package_memory = module_dir.parent / "CLAUDE.md"
+    package_memory.write_text("package 0 rules, revised\n", encoding="utf-8")
+
+    contents = {item.path: item.content for item in _discover_as_new_session(sources, work_dir)}
+
+    assert contents[str(module_dir / "AGENTS.md")] == "module rules\n"
+    assert contents[str(package_memory)] == "package 0 rules, revised\n"
+
+
+@pytest.mark.benchmark
+def test_benchmark_sub_agent_memory_discovery(tmp_path: Path, memory_cache: None) -> None:
+    del memory_cache
+    work_dir = tmp_path / "repo"
+    sources = _memory_repo(work_dir, packages=40, files_per_package=5)
+
+    def _fan_out() -> float:
+        started = time.perf_counter()
+        for _ in range(30):
+            _discover_as_new_session(sources, work_dir)
+        return time.perf_counter() - started
+
+    uncached = 0.0
+    for _ in range(30):
+        memory.clear_memory_discovery_cache()
+        started = time.perf_counter()
+        _discover_as_new_session(sources, work_dir)
+        uncached += time.perf_counter() - started
+    _discover_as_new_session(sources, work_dir)
+    cached = _fan_out()
+
+    print(
+        f"\n30 sub-agents x {len(sources)} tracked files: uncached {uncached * 1000:.0f}ms, cached {cached * 1000:.0f}ms"
+    )
+    assert cached < uncached
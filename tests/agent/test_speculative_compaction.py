@@ -0,0 +1,222 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Coroutine
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from klaude_code.agent.compaction import CompactionReason, SpeculativeCompactor, plan_compaction_cut, run_compaction
+from klaude_code.llm import LLMClientABC
+from klaude_code.llm.client import LLMStreamABC
+from klaude_code.protocol import llm_param, message
+from klaude_code.session.session import Session
+
+# 20k window, no output budget: threshold at 15k tokens, 80% watermark at 12k,
+# ~7k recent tokens kept. Every message below is ~1k estimated tokens.
+_LLM_CONFIG = llm_param.LLMConfigParameter(
+    protocol=llm_param.LLMClientProtocol.OPENAI,
+    context_limit=20_000,
+    max_tokens=0,
+)
+
+
+def arun[T](coro: Coroutine[Any, Any, T]) -> T:
+    return asyncio.run(coro)
+
+
+class _StaticTextStream(LLMStreamABC):
+    def __init__(self, text: str) -> None:
+        self._message = message.AssistantMessage(parts=[message.TextPart(text=text)], response_id=None)
+
+    def __aiter__(self) -> AsyncGenerator[message.LLMStreamItem]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncGenerator[message.LLMStreamItem]:
+        yield self._message
+
+    def get_partial_message(self) -> message.AssistantMessage | None:
+        return self._message
+
+
+class _SlowSummarizerClient(LLMClientABC):
+    def __init__(self, config: llm_param.LLMConfigParameter, *, latency_s: float = 0.0) -> None:
+        super().__init__(config)
+        self.latency_s = latency_s
+        self.release = asyncio.Event()
+        self.release.set()
+        self.calls = 0
+
+    @classmethod
+    def create(cls, config: llm_param.LLMConfigParameter) -> LLMClientABC:
+        return cls(config)
+
+    async def call(self, param: llm_param.LLMCallParameter) -> LLMStreamABC:
+        del param
+        self.calls += 1
+        await self.release.wait()
+        await asyncio.sleep(self.latency_s)
+        return _StaticTextStream("SPECULATIVE_SUMMARY")
+
+
+def _turn(index: int) -> list[message.HistoryEvent]:
+    return [
+        message.UserMessage(parts=[message.TextPart(text=f"question {index} " + "q" * 4000)]),
+        message.AssistantMessage(parts=[message.TextPart(text=f"answer {index} " + "a" * 4000)]),
+    ]
+
+
+def _session(tmp_path: Path, turns: int) -> Session:
+    session = Session(id="speculative", work_dir=tmp_path)
+    session.conversation_history = [item for index in range(turns) for item in _turn(index)]
+    return session
+
+
+def _start(compactor: SpeculativeCompactor, session: Session, client: LLMClientABC) -> bool:
+    return compactor.maybe_start(session=session, llm_config=_LLM_CONFIG, llm_client=client, main_profile=None)
+
+
+def test_summary_started_at_watermark_is_committed_at_threshold(tmp_path: Path) -> None:
+    async def _test() -> None:
+        session = _session(tmp_path, turns=5)
+        client = _SlowSummarizerClient(_LLM_CONFIG)
+        compactor = SpeculativeCompactor(watermark_percent=80, max_runs=2)
+
+        assert not _start(compactor, session, client)  # 10k tokens: below the watermark
+        session.conversation_history.extend(_turn(5))
+        planned_cut = plan_compaction_cut(session=session, llm_config=_LLM_CONFIG)
+        assert _start(compactor, session, client)
+        assert not _start(compactor, session, client)  # one run at a time
+        await asyncio.sleep(0)
+
+        session.conversation_history.extend(_turn(6))
+        result = await compactor.take(session=session, llm_config=_LLM_CONFIG)
+
+        assert result is not None
+        assert "SPECULATIVE_SUMMARY" in result.summary
+        assert result.first_kept_index == planned_cut
+        assert planned_cut < plan_compaction_cut(session=session, llm_config=_LLM_CONFIG)
+        # The brief describes the tail as it is now, including the turn added after speculation.
+        assert result.kept_items_brief[-1].preview.startswith("answer 6")
+        assert compactor.stats.committed == 1
+        assert compactor.stats.hit_rate == 1.0
+        assert not compactor.pending
+
+    arun(_test())
+
+
+def test_take_waits_for_a_run_still_in_flight(tmp_path: Path) -> None:
+    async def _test() -> None:
+        session = _session(tmp_path, turns=6)
+        client = _SlowSummarizerClient(_LLM_CONFIG)
+        client.release.clear()
+        compactor = SpeculativeCompactor(watermark_percent=80, max_runs=2)
+        assert _start(compactor, session, client)
+
+        asyncio.get_running_loop().call_later(0.05, client.release.set)
+        result = await compactor.take(session=session, llm_config=_LLM_CONFIG)
+
+        assert result is not None
+        assert compactor.stats.committed == 1
+
+    arun(_test())
+
+
+def test_rewritten_prefix_discards_and_cancels_the_run(tmp_path: Path) -> None:
+    async def _test() -> None:
+        session = _session(tmp_path, turns=6)
+        client = _SlowSummarizerClient(_LLM_CONFIG)
+        client.release.clear()
+        compactor = SpeculativeCompactor(watermark_percent=80, max_runs=1)
+        assert _start(compactor, session, client)
+        await asyncio.sleep(0)
+
+        # A rewind truncates history and continues from an earlier checkpoint.
+        session.conversation_history = session.conversation_history[:2] + _turn(10) * 5
+        result = await compactor.take(session=session, llm_config=_LLM_CONFIG)
+
+        assert result is None
+        assert compactor.stats.discarded == 1
+        assert compactor.stats.hit_rate == 0.0
+
+    arun(_test())
+
+
+def test_compaction_landing_elsewhere_invalidates_the_run(tmp_path: Path) -> None:
+    async def _test() -> None:
+        session = _session(tmp_path, turns=6)
+        client = _SlowSummarizerClient(_LLM_CONFIG)
+        compactor = SpeculativeCompactor(watermark_percent=80, max_runs=1)
+        assert _start(compactor, session, client)
+        await asyncio.sleep(0.01)
+
+        # e.g. a manual /compact appends its entry after the summarized prefix.
+        session.conversation_history.append(message.CompactionEntry(summary="manual", first_kept_index=10))
+        assert not _start(compactor, session, client)  # discarded, and the budget is spent
+
+        assert compactor.stats.discarded == 1
+        assert await compactor.take(session=session, llm_config=_LLM_CONFIG) is None
+
+    arun(_test())
+
+
+def test_failed_run_falls_back_to_normal_compaction(tmp_path: Path) -> None:
+    class _FailingClient(_SlowSummarizerClient):
+        async def call(self, param: llm_param.LLMCallParameter) -> LLMStreamABC:
+            raise RuntimeError("summarizer down")
+
+    async def _test() -> None:
+        session = _session(tmp_path, turns=6)
+        compactor = SpeculativeCompactor(watermark_percent=80, max_runs=2)
+        assert _start(compactor, session, _FailingClient(_LLM_CONFIG))
+        await asyncio.sleep(0.01)
+
+        assert await compactor.take(session=session, llm_config=_LLM_CONFIG) is None
+        assert compactor.stats.failed == 1
+
+    arun(_test())
+
+
+@pytest.mark.parametrize("watermark_percent", [0, 100])
+def test_watermark_bounds_disable_speculation(tmp_path: Path, watermark_percent: int) -> None:
+    async def _test() -> None:
+        session = _session(tmp_path, turns=7)
+        compactor = SpeculativeCompactor(watermark_percent=watermark_percent, max_runs=2)
+        assert not _start(compactor, session, _SlowSummarizerClient(_LLM_CONFIG))
+
+    arun(_test())
+
+
+@pytest.mark.benchmark
+def test_benchmark_threshold_blocking_time(tmp_path: Path) -> None:
+    latency_s = 0.5
+
+    async def _blocking(speculative: bool) -> float:
+        session = _session(tmp_path, turns=6)
+        client = _SlowSummarizerClient(_LLM_CONFIG, latency_s=latency_s)
+        compactor = SpeculativeCompactor(watermark_percent=80, max_runs=2)
+        if speculative:
+            assert _start(compactor, session, client)
+        # The model keeps working while the summary is produced.
+        await asyncio.sleep(latency_s * 1.2)
+        session.conversation_history.extend(_turn(6))
+
+        started = time.perf_counter()
+        result = await compactor.take(session=session, llm_config=_LLM_CONFIG)
+        if result is None:
+            result = await run_compaction(
+                session=session,
+                reason=CompactionReason.THRESHOLD,
+                focus=None,
+                llm_client=client,
+                llm_config=_LLM_CONFIG,
+            )
+        return time.perf_counter() - started
+
+    blocking = arun(_blocking(speculative=False))
+    speculative = arun(_blocking(speculative=True))
+    print(
+        f"\nsummarizer latency {latency_s * 1000:.0f}ms: threshold blocks {blocking * 1000:.0f}ms, "
+        f"speculative commit blocks {speculative * 1000:.1f}ms"
+    )
+    assert speculative < blocking
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import gc
+import time
+
+import pytest
+
+from klaude_code.agent import token_estimate
+from klaude_code.agent.token_estimate import MessageTokenCache, estimate_message_tokens
+from klaude_code.protocol import message
+
+
+def _per_char_cjk_count(text: str) -> int:
+    """The original per-character scan, kept as the reference for the regex count."""
+    ranges = token_estimate._CJK_RANGES  # pyright: ignore[reportPrivateUsage]
+    return sum(1 for char in text if any(start <= ord(char) <= end for start, end in ranges))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "plain ascii only",
+        "混合 mixed テキスト and 한국어 text",
+        "fullwidth ＡＢＣ and punctuation 、。「」",
+        "range edges 　〿鿿가힯￯ and neighbours ⿿ꀀ￰",
+        "accents café naïve and emoji 🎉 are not CJK",
+    ],
+)
+def test_cjk_count_matches_the_per_character_scan(text: str) -> None:
+    count = token_estimate._count_cjk_chars(text)  # pyright: ignore[reportPrivateUsage]
+    assert count == _per_char_cjk_count(text)
+
+
+class _CountingEstimator:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, msg: message.Message) -> int:
+        self.calls += 1
+        return len(message.join_text_parts(msg.parts))
+
+
+def test_unchanged_messages_are_estimated_once() -> None:
+    estimator = _CountingEstimator()
+    cache = MessageTokenCache(estimator)
+    history = [message.UserMessage(parts=message.text_parts_from_str(f"turn {index}")) for index in range(10)]
+
+    first = [cache(msg) for msg in history]
+    second = [cache(msg) for msg in history]
+
+    assert first == second
+    assert estimator.calls == 10
+
+
+def test_replaced_text_is_estimated_again() -> None:
+    estimator = _CountingEstimator()
+    cache = MessageTokenCache(estimator)
+    msg = message.AssistantMessage(parts=message.text_parts_from_str("short"))
+    assert cache(msg) == 5
+
+    text_part = msg.parts[0]
+    assert isinstance(text_part, message.TextPart)
+    text_part.text = "a much longer answer"
+    assert cache(msg) == 20
+
+    msg.parts.append(message.TextPart(text="!"))
+    assert cache(msg) == 21
+    assert estimator.calls == 3
+
+
+def test_changed_tool_output_is_estimated_again() -> None:
+    msg = message.ToolResultMessage(call_id="c", tool_name="Bash", status="success", output_text="x" * 4000)
+    before = estimate_message_tokens(msg)
+
+    msg.output_text = "[output offloaded]"
+
+    assert estimate_message_tokens(msg) < before
+
+
+def test_entries_are_dropped_with_their_messages() -> None:
+    cache = MessageTokenCache(_CountingEstimator())
+    history = [message.UserMessage(parts=message.text_parts_from_str("x")) for _ in range(5)]
+    msg: message.UserMessage | None = None
+    for msg in history:
+        cache(msg)
+    assert len(cache) == 5
+
+    del history, msg
+    gc.collect()
+
+    assert len(cache) == 0
+
+
+@pytest.mark.benchmark
+def test_benchmark_mixed_cjk_history() -> None:
+    chunk = "def handler(request): return json.dumps(payload) # 处理请求并返回结果，日本語のコメントも混在 "
+    history: list[message.Message] = [
+        message.UserMessage(parts=message.text_parts_from_str(chunk * 20))
+        for _ in range(1_000_000 // (len(chunk) * 20))
+    ]
+    total_chars = sum(len(message.join_text_parts(msg.parts)) for msg in history)
+
+    started = time.perf_counter()
+    for msg in history:
+        _per_char_cjk_count(message.join_text_parts(msg.parts))
+    per_char = time.perf_counter() - started
+
+    estimate_message_tokens.clear()
+    started = time.perf_counter()
+    cold_total = sum(estimate_message_tokens(msg) for msg in history)
+    cold = time.perf_counter() - started
+
+    history.append(message.AssistantMessage(parts=message.text_parts_from_str(chunk)))
+    started = time.perf_counter()
+    warm_total = sum(estimate_message_tokens(msg) for msg in history)
+    warm = time.perf_counter() - started
+
+    print(
+        f"\n{total_chars / 1e6:.1f}M-char mixed history ({len(history)} messages): per-char CJK scan "
+        f"{per_char * 1000:.0f}ms, regex estimate {cold * 1000:.1f}ms, rescan after one new message "
+        f"{warm * 1000:.2f}ms"
+    )
+    assert warm_total > cold_total
+    assert cold < per_char
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import gzip
+import os
+import time
+from array import array
+from io import BufferedIOBase
+from pathlib import Path
+
+import pytest
+
+from klaude_code.app import log_index
+from klaude_code.app.log_index import LineFilter, LogLineIndex
+
+
+def _line(index: int, debug_type: str = "GENERAL", text: str = "") -> str:
+    return f"[2026-03-01 10:00:00,000] {debug_type:<12} message {index}{text}\n"
+
+
+def _texts(lines: list[log_index.LogLine]) -> list[str]:
+    return [line.text.rsplit(" ", 1)[-1] for line in lines]
+
+
+def test_tail_returns_last_lines_with_numbers_and_offsets(tmp_path: Path) -> None:
+    path = tmp_path / "debug.log"
+    path.write_text("".join(_line(i) for i in range(10)), encoding="utf-8")
+    index = LogLineIndex(path, max_line_bytes=1024)
+
+    lines = index.tail(3, LineFilter())
+
+    assert [line.number for line in lines] == [8, 9, 10]
+    assert _texts(lines) == ["7", "8", "9"]
+    raw = path.read_bytes()
+    assert raw[lines[0].offset : lines[0].end].decode() == _line(7)
+    assert index.end_offset == len(raw)
+
+    earlier = index.tail(3, LineFilter(), before=lines[0].offset)
+    assert _texts(earlier) == ["4", "5", "6"]
+
+
+def test_filters_by_type_text_and_session(tmp_path: Path) -> None:
+    path = tmp_path / "debug.log"
+    path.write_text(
+        _line(0, "LLM_PAYLOAD")
+        + _line(1, "OPERATION", " [ws:abcdef12] Session abcdef12-3456")
+        + "  continuation without a label\n"
+        + _line(2, "LLM_PAYLOAD", " NEEDLE")
+        + _line(3, "OPERATION", " needle"),
+        encoding="utf-8",
+    )
+    index = LogLineIndex(path, max_line_bytes=1024)
+
+    by_type = index.tail(10, LineFilter(types=frozenset({"LLM_PAYLOAD"})))
+    assert [line.number for line in by_type] == [1, 3, 4]  # untyped continuation lines stay visible
+
+    by_text = index.tail(10, LineFilter(text="needle"))
+    assert [line.number for line in by_text] == [4, 5]
+
+    by_session = index.tail(10, LineFilter(session_id="abcdef12-3456-7890"))
+    assert [line.number for line in by_session] == [2]
+
+    combined = index.tail(10, LineFilter(types=frozenset({"OPERATION"}), text="needle"))
+    assert [line.number for line in combined] == [5]
+
+
+def test_long_lines_are_truncated_but_matched_in_full(tmp_path: Path) -> None:
+    path = tmp_path / "debug.log"
+    path.write_text(_line(0, text=" " + "x" * 5000 + " tail-marker"), encoding="utf-8")
+    index = LogLineIndex(path, max_line_bytes=100)
+
+    [line] = index.tail(1, LineFilter(text="TAIL-MARKER"))
+
+    assert line.truncated
+    assert len(line.text) == 100
+    assert line.end - line.offset == path.stat().st_size
+
+
+def test_since_returns_appended_lines_and_skips_partial_tail(tmp_path: Path) -> None:
+    path = tmp_path / "debug.log"
+    path.write_text(_line(0) + _line(1), encoding="utf-8")
+    index = LogLineIndex(path, max_line_bytes=1024)
+    lines, offset = index.since(0, 100, LineFilter())
+    assert _texts(lines) == ["0", "1"]
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write(_line(2) + _line(3)[:10])
+    lines, offset = index.since(offset, 100, LineFilter())
+    assert _texts(lines) == ["2"]
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write(_line(3)[10:])
+    lines, _ = index.since(offset, 100, LineFilter())
+    assert _texts(lines) == ["3"]
+
+
+def test_since_limit_resumes_after_last_returned_line(tmp_path: Path) -> None:
+    path = tmp_path / "debug.log"
+    path.write_text("".join(_line(i) for i in range(5)), encoding="utf-8")
+    index = LogLineIndex(path, max_line_bytes=1024)
+
+    first, offset = index.since(0, 2, LineFilter())
+    rest, _ = index.since(offset, 10, LineFilter())
+
+    assert _texts(first) + _texts(rest) == ["0", "1", "2", "3", "4"]
+
+
+def test_sidecar_is_reused_and_extended_incrementally(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "debug.log"
+    path.write_text("".join(_line(i) for i in range(100)), encoding="utf-8")
+    LogLineIndex(path, max_line_bytes=1024).refresh()
+    assert (tmp_path / "debug.log.idx").is_file()
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write(_line(100))
+    scanned: list[int] = []
+    original_scan = log_index._scan_lines  # pyright: ignore[reportPrivateUsage]
+
+    def _recording_scan(f: BufferedIOBase, offset: int, records: array[int]) -> int:
+        scanned.append(offset)
+        return original_scan(f, offset, records)
+
+    monkeypatch.setattr(log_index, "_scan_lines", _recording_scan)
+
+    fresh = LogLineIndex(path, max_line_bytes=1024)
+    assert _texts(fresh.tail(2, LineFilter())) == ["99", "100"]
+    # Only the appended line was scanned; the first 100 came from the sidecar.
+    assert scanned == [len(path.read_bytes()) - len(_line(100))]
+
+
+def test_rewritten_file_bumps_generation(tmp_path: Path) -> None:
+    path = tmp_path / "debug.log"
+    path.write_text(_line(0) + _line(1), encoding="utf-8")
+    index = LogLineIndex(path, max_line_bytes=1024)
+    index.refresh()
+    generation = index.generation
+
+    # Rotation: a new file takes the name.
+    replacement = tmp_path / "new.log"
+    replacement.write_text(_line(7), encoding="utf-8")
+    os.replace(replacement, path)
+
+    assert _texts(index.tail(10, LineFilter())) == ["7"]
+    assert index.generation > generation
+
+
+def test_gzip_logs_are_indexed_by_decompressed_offsets(tmp_path: Path) -> None:
+    content = "".join(_line(i, "OPERATION" if i % 2 else "GENERAL") for i in range(50))
+    path = tmp_path / "debug.log.1.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(content)
+    index = LogLineIndex(path, max_line_bytes=1024)
+
+    lines = index.tail(2, LineFilter(types=frozenset({"OPERATION"}), text="message"))
+
+    assert _texts(lines) == ["47", "49"]
+    assert content.encode()[lines[0].offset : lines[0].end].decode() == _line(47, "OPERATION")
+    assert b"".join(log_index.iter_log_bytes(path, lines[1].offset, lines[1].end)).decode() == _line(49, "OPERATION")
+
+
+@pytest.mark.benchmark
+def test_benchmark_tail_vs_full_read(tmp_path: Path) -> None:
+    path = tmp_path / "debug.log"
+    payload = "p" * 400
+    with path.open("w", encoding="utf-8") as f:
+        for chunk in range(200):
+            f.write("".join(_line(chunk * 1000 + i, text=" " + payload) for i in range(1000)))
+    size_mb = path.stat().st_size / 1024 / 1024
+
+    started = time.perf_counter()
+    full = path.read_bytes().decode("utf-8").split("\n")
+    full_read = time.perf_counter() - started
+    del full
+
+    index = LogLineIndex(path, max_line_bytes=256 * 1024)
+    started = time.perf_counter()
+    index.refresh()
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    lines = index.tail(2000, LineFilter(types=frozenset({"GENERAL"})))
+    warm = time.perf_counter() - started
+
+    print(
+        f"\n{size_mb:.0f}MB log: full read {full_read * 1000:.0f}ms, "
+        f"first index {cold * 1000:.0f}ms, tail 2000 {warm * 1000:.1f}ms"
+    )
+    assert len(lines) == 2000
+    assert warm < full_read
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from klaude_code import log
+from klaude_code.log import (
+    DrainingQueueListener,
+    DroppingQueueHandler,
+    GzipRotatingFileHandler,
+    log_debug,
+    logger,
+    set_debug_logging,
+)
+
+
+@pytest.fixture
+def debug_log_file(isolated_home: Path) -> Iterator[Path]:
+    path = isolated_home / "debug.log"
+    yield path
+    set_debug_logging(False)
+
+
+def _flush() -> None:
+    for handler in logger.handlers:
+        handler.flush()
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": message, "levelno": logging.DEBUG, "levelname": "DEBUG"})
+
+
+def test_queued_records_reach_file_in_order(debug_log_file: Path) -> None:
+    set_debug_logging(True, write_to_file=True, log_file=str(debug_log_file))
+
+    for index in range(200):
+        log_debug(f"line {index}")
+    _flush()
+
+    lines = debug_log_file.read_text(encoding="utf-8").splitlines()
+    assert [line.rsplit(" ", 1)[-1] for line in lines] == [str(index) for index in range(200)]
+
+
+def test_disabling_drains_pending_records(debug_log_file: Path) -> None:
+    set_debug_logging(True, write_to_file=True, log_file=str(debug_log_file))
+    log_debug("last words")
+    set_debug_logging(False)
+
+    assert "last words" in debug_log_file.read_text(encoding="utf-8")
+
+
+def test_full_queue_drops_and_reports_count() -> None:
+    record_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(record_queue)
+
+    started = time.perf_counter()
+    for index in range(5):
+        handler.handle(_record(f"r{index}"))
+    assert time.perf_counter() - started < 0.5
+    assert handler.dropped == 3
+
+    drained = [record_queue.get_nowait().getMessage() for _ in range(2)]
+    handler.handle(_record("after"))
+
+    messages = drained + [record_queue.get_nowait().getMessage() for _ in range(2)]
+    assert messages == ["r0", "r1", "dropped 3 log records: writer thread fell behind", "after"]
+
+
+def test_disabling_with_a_full_queue_stops_the_listener(debug_log_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(log, "LOG_QUEUE_MAX_RECORDS", 5)
+    original_emit = GzipRotatingFileHandler.emit
+
+    def _slow_emit(self: GzipRotatingFileHandler, record: logging.LogRecord) -> None:
+        time.sleep(0.01)
+        original_emit(self, record)
+
+    monkeypatch.setattr(GzipRotatingFileHandler, "emit", _slow_emit)
+    set_debug_logging(True, write_to_file=True, log_file=str(debug_log_file))
+    for index in range(50):
+        log_debug(f"line {index}")
+
+    set_debug_logging(False)
+
+    assert log._queue_handler is None  # pyright: ignore[reportPrivateUsage]
+    assert log._queue_listener is None  # pyright: ignore[reportPrivateUsage]
+    assert "line 0" in debug_log_file.read_text(encoding="utf-8")
+
+
+def test_stop_sentinel_displaces_a_record_when_the_writer_is_stuck() -> None:
+    record_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=2)
+    for index in range(2):
+        record_queue.put_nowait(_record(f"r{index}"))
+    listener = DrainingQueueListener(record_queue)
+    listener.sentinel_timeout_s = 0.01
+
+    listener.enqueue_sentinel()
+
+    assert record_queue.get_nowait().getMessage() == "r1"
+    assert record_queue.get_nowait() is None
+
+
+def test_rotation_and_gzip_run_on_listener_thread(debug_log_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(log, "LOG_MAX_BYTES", 4096)
+    rotating_threads: list[threading.Thread] = []
+    original_rotate = GzipRotatingFileHandler.rotate
+
+    def _recording_rotate(self: GzipRotatingFileHandler, source: str, dest: str) -> None:
+        rotating_threads.append(threading.current_thread())
+        original_rotate(self, source, dest)
+
+    monkeypatch.setattr(GzipRotatingFileHandler, "rotate", _recording_rotate)
+    set_debug_logging(True, write_to_file=True, log_file=str(debug_log_file))
+
+    for index in range(100):
+        log_debug(f"{index} " + "x" * 200)
+    _flush()
+
+    assert rotating_threads
+    assert threading.main_thread() not in rotating_threads
+    assert list(debug_log_file.parent.glob("debug.log.*.gz"))
+
+
+@pytest.mark.benchmark
+def test_benchmark_event_loop_lag_with_debug_logging(debug_log_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Small files force frequent rotate+gzip, the worst case for an inline handler.
+    monkeypatch.setattr(log, "LOG_MAX_BYTES", 1024 * 1024)
+    payload = "y" * 1024
+
+    async def _worst_stall() -> float:
+        # The loop is blocked for as long as a single log call takes to return.
+        stalls: list[float] = []
+        for index in range(5000):
+            before = time.perf_counter()
+            log_debug(f"{index} {payload}")
+            stalls.append(time.perf_counter() - before)
+            await asyncio.sleep(0)
+        return max(stalls)
+
+    def _run(queued: bool) -> float:
+        set_debug_logging(True, write_to_file=True, log_file=str(debug_log_file))
+        if not queued:
+            # Previous behaviour: the file handler sits directly on the logger.
+            assert log._queue_handler is not None  # pyright: ignore[reportPrivateUsage]
+            assert log._file_handler is not None  # pyright: ignore[reportPrivateUsage]
+            logger.removeHandler(log._queue_handler)  # pyright: ignore[reportPrivateUsage]
+            logger.addHandler(log._file_handler)  # pyright: ignore[reportPrivateUsage]
+        try:
+            return asyncio.run(_worst_stall())
+        finally:
+            if not queued:
+                logger.removeHandler(log._file_handler)  # pyright: ignore[reportPrivateUsage]
+            set_debug_logging(False)
+
+    inline = _run(queued=False)
+    queued = _run(queued=True)
+    print(f"\n5000 x 1KB debug records: worst loop stall inline {inline * 1000:.1f}ms, queued {queued * 1000:.1f}ms")
+    assert queued < inline
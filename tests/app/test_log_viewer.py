@@ -1,7 +1,15 @@
 from __future__ import annotations
 
 import errno
+import gzip
+import json
 import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Iterator
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 from typing import Any, cast
 
@@ -22,7 +30,7 @@ def test_create_server_with_fallback_uses_start_port(monkeypatch: pytest.MonkeyP
         calls.append(address[1])
         return _DummyServer()
 
-    monkeypatch.setattr(log_viewer, "HTTPServer", cast(Any, _fake_http_server))
+    monkeypatch.setattr(log_viewer, "ThreadingHTTPServer", cast(Any, _fake_http_server))
 
     _server, port = log_viewer._create_server_with_fallback(8765)  # pyright: ignore[reportPrivateUsage]
 
@@ -40,7 +48,7 @@ def test_create_server_with_fallback_increments_when_port_in_use(monkeypatch: py
             raise OSError(errno.EADDRINUSE, "Address already in use")
         return _DummyServer()
 
-    monkeypatch.setattr(log_viewer, "HTTPServer", cast(Any, _fake_http_server))
+    monkeypatch.setattr(log_viewer, "ThreadingHTTPServer", cast(Any, _fake_http_server))
 
     _server, port = log_viewer._create_server_with_fallback(8765)  # pyright: ignore[reportPrivateUsage]
 
@@ -52,7 +60,7 @@ def test_create_server_with_fallback_raises_non_address_in_use_error(monkeypatch
     def _fake_http_server(_address: tuple[str, int], _handler: Any) -> _DummyServer:
         raise OSError(errno.EACCES, "Permission denied")
 
-    monkeypatch.setattr(log_viewer, "HTTPServer", cast(Any, _fake_http_server))
+    monkeypatch.setattr(log_viewer, "ThreadingHTTPServer", cast(Any, _fake_http_server))
 
     with pytest.raises(OSError, match="Permission denied"):
         log_viewer._create_server_with_fallback(8765)  # pyright: ignore[reportPrivateUsage]
@@ -82,3 +90,93 @@ def test_is_path_within_checks_directory_boundary(tmp_path: Path) -> None:
 
     assert log_viewer._is_path_within(inside, root) is True  # pyright: ignore[reportPrivateUsage]
     assert log_viewer._is_path_within(outside, root) is False  # pyright: ignore[reportPrivateUsage]
+
+
+@pytest.fixture
+def viewer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[tuple[str, Path]]:
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    monkeypatch.setattr(log_viewer, "DEFAULT_DEBUG_LOG_DIR", log_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), log_viewer._LogViewerHandler)  # pyright: ignore[reportPrivateUsage]
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", log_dir.resolve()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _get(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return resp.read()
+
+
+def _api(base: str, endpoint: str, **params: object) -> str:
+    return f"{base}/api/log/{endpoint}?{urllib.parse.urlencode(params)}"
+
+
+def _log_line(index: int, debug_type: str = "GENERAL") -> str:
+    return f"[2026-03-01 10:00:00,000] {debug_type:<12} message {index}\n"
+
+
+def test_tail_since_and_range_serve_windows(viewer: tuple[str, Path]) -> None:
+    base, log_dir = viewer
+    path = log_dir / "debug.log"
+    path.write_text("".join(_log_line(i, "OPERATION" if i % 2 else "GENERAL") for i in range(100)))
+
+    tail = json.loads(_get(_api(base, "tail", path=path, lines=3, type="OPERATION")))
+    assert [line["no"] for line in tail["lines"]] == [96, 98, 100]
+    assert tail["offset"] == path.stat().st_size
+
+    first = tail["lines"][0]
+    assert _get(_api(base, "range", path=path, start=first["offset"], end=first["end"])).decode() == _log_line(
+        95, "OPERATION"
+    )
+
+    with path.open("a") as f:
+        f.write(_log_line(100))
+    since = json.loads(_get(_api(base, "since", path=path, offset=tail["offset"], generation=tail["generation"])))
+    assert [line["text"] for line in since["lines"]] == [_log_line(100).rstrip("\n")]
+    assert since["reset"] is False
+
+    stale = json.loads(_get(_api(base, "since", path=path, offset=10**9)))
+    assert stale["reset"] is True
+
+
+def test_follow_streams_appended_lines(viewer: tuple[str, Path]) -> None:
+    base, log_dir = viewer
+    path = log_dir / "debug.log"
+    path.write_text(_log_line(0))
+
+    with urllib.request.urlopen(_api(base, "follow", path=path, offset=path.stat().st_size), timeout=5) as resp:
+        with path.open("a") as f:
+            f.write(_log_line(1))
+        assert resp.readline() == b"event: lines\n"
+        payload = json.loads(resp.readline().removeprefix(b"data: "))
+
+    assert [line["no"] for line in payload["lines"]] == [2]
+    assert payload["offset"] == path.stat().st_size
+
+
+def test_gzip_logs_are_listed_and_streamed(viewer: tuple[str, Path]) -> None:
+    base, log_dir = viewer
+    rotated = log_dir / "debug.log.1.gz"
+    with gzip.open(rotated, "wt") as f:
+        f.write(_log_line(0) + _log_line(1))
+
+    listed = json.loads(_get(f"{base}/api/logs"))
+    assert [entry["relative_path"] for entry in listed] == ["debug.log.1.gz"]
+    assert _get(f"{base}/api/log?{urllib.parse.urlencode({'path': rotated})}").decode() == _log_line(0) + _log_line(1)
+
+
+def test_log_endpoints_reject_paths_outside_log_dir(viewer: tuple[str, Path], tmp_path: Path) -> None:
+    base, _log_dir = viewer
+    outside = tmp_path / "secret.log"
+    outside.write_text("secret\n")
+
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        _get(_api(base, "tail", path=outside))
+
+    assert exc_info.value.code == 403
@@ -1,5 +1,143 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from klaude_code.cli import cost_cmd
 from klaude_code.cli.cost_cmd import COST_CACHE_VERSION
+from klaude_code.protocol import message
+from klaude_code.protocol.models import TaskMetadata, TaskMetadataItem, Usage
+from klaude_code.session.codec import encode_jsonl_line
 
 
 def test_cost_cache_version_includes_cache_write_tokens_schema() -> None:
     assert COST_CACHE_VERSION >= 2
+
+
+def _metadata_line(*, input_tokens: int, day: int = 1, model: str = "m1") -> str:
+    item = TaskMetadataItem(
+        main_agent=TaskMetadata(
+            model_name=model,
+            provider="p",
+            usage=Usage(input_tokens=input_tokens, output_tokens=1, input_cost=0.5),
+        ),
+        created_at=datetime(2026, 1, day, 12, 0),
+    )
+    return encode_jsonl_line(item)
+
+
+def _filler_line(text: str = "hello") -> str:
+    return encode_jsonl_line(message.UserMessage(parts=[message.TextPart(text=text)]))
+
+
+@pytest.fixture
+def sessions_root(isolated_home: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(cost_cmd, "COST_CACHE_PATH", isolated_home / ".klaude" / "cache" / "cost_cache.json")
+    root = isolated_home / ".klaude" / "projects" / "proj" / "sessions"
+    root.mkdir(parents=True)
+    return root
+
+
+def _session(root: Path, session_id: str, lines: list[str], meta: dict[str, object] | None = None) -> Path:
+    session_dir = root / session_id
+    session_dir.mkdir()
+    (session_dir / "meta.json").write_text(json.dumps(meta or {}), encoding="utf-8")
+    events = session_dir / "events.jsonl"
+    events.write_text("".join(lines), encoding="utf-8")
+    return events
+
+
+def _input_totals(daily: dict[str, cost_cmd.DailyStats]) -> dict[str, int]:
+    return {date: sum(stats.input_tokens for stats in day.by_model.values()) for date, day in daily.items()}
+
+
+def test_appended_lines_are_aggregated_incrementally(sessions_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    events = _session(sessions_root, "s1", [_metadata_line(input_tokens=10), _filler_line()])
+    assert _input_totals(cost_cmd.aggregate_all_sessions()) == {"2026-01-01": 10}
+
+    decoded: list[str] = []
+    original_decode = cost_cmd.decode_jsonl_line
+
+    def _recording_decode(line: str) -> message.HistoryEvent | None:
+        decoded.append(line)
+        return original_decode(line)
+
+    monkeypatch.setattr(cost_cmd, "decode_jsonl_line", _recording_decode)
+    with events.open("a", encoding="utf-8") as f:
+        f.write(_filler_line("x" * 5000))
+        f.write(_metadata_line(input_tokens=5, day=2))
+
+    assert _input_totals(cost_cmd.aggregate_all_sessions()) == {"2026-01-01": 10, "2026-01-02": 5}
+    # Only the appended metadata line was decoded; earlier and non-usage lines were not.
+    assert len(decoded) == 1
+
+
+def test_partial_trailing_line_waits_for_completion(sessions_root: Path) -> None:
+    full = _metadata_line(input_tokens=7)
+    events = _session(sessions_root, "s1", [_metadata_line(input_tokens=1), full[:40]])
+
+    assert _input_totals(cost_cmd.aggregate_all_sessions()) == {"2026-01-01": 1}
+
+    with events.open("a", encoding="utf-8") as f:
+        f.write(full[40:])
+
+    assert _input_totals(cost_cmd.aggregate_all_sessions()) == {"2026-01-01": 8}
+
+
+def test_rewritten_file_is_rescanned(sessions_root: Path) -> None:
+    events = _session(sessions_root, "s1", [_metadata_line(input_tokens=10), _metadata_line(input_tokens=20)])
+    assert _input_totals(cost_cmd.aggregate_all_sessions()) == {"2026-01-01": 30}
+
+    # Same length, different history: the bytes before the saved offset no longer match.
+    events.write_text(_metadata_line(input_tokens=40) + _metadata_line(input_tokens=50), encoding="utf-8")
+
+    assert _input_totals(cost_cmd.aggregate_all_sessions()) == {"2026-01-01": 90}
+
+
+def test_sub_agent_sessions_are_skipped_and_meta_is_cached(
+    sessions_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _session(sessions_root, "main", [_metadata_line(input_tokens=3)])
+    _session(sessions_root, "child", [_metadata_line(input_tokens=100)], meta={"parent_session_id": "main"})
+    assert _input_totals(cost_cmd.aggregate_all_sessions()) == {"2026-01-01": 3}
+
+    reads: list[Path] = []
+    original_read_text = Path.read_text
+
+    def _recording_read_text(
+        self: Path, encoding: str | None = None, errors: str | None = None, newline: str | None = None
+    ) -> str:
+        if self.name == "meta.json":
+            reads.append(self)
+        return original_read_text(self, encoding, errors, newline)
+
+    monkeypatch.setattr(Path, "read_text", _recording_read_text)
+
+    assert _input_totals(cost_cmd.aggregate_all_sessions()) == {"2026-01-01": 3}
+    assert reads == []
+
+
+@pytest.mark.benchmark
+def test_benchmark_incremental_cost_scan(sessions_root: Path) -> None:
+    filler = _filler_line("y" * 2000)
+    for index in range(200):
+        _session(sessions_root, f"s{index}", [_metadata_line(input_tokens=1), filler * 200])
+    # One long-lived session that keeps growing while the others are finished.
+    live = _session(sessions_root, "live", [filler * 5000])
+
+    started = time.perf_counter()
+    cost_cmd.aggregate_all_sessions()
+    cold = time.perf_counter() - started
+
+    with live.open("a", encoding="utf-8") as f:
+        f.write(_metadata_line(input_tokens=1))
+    started = time.perf_counter()
+    daily = cost_cmd.aggregate_all_sessions()
+    warm = time.perf_counter() - started
+
+    print(f"\n200 sessions x 400KB + one 10MB live: cold {cold * 1000:.0f}ms, after append {warm * 1000:.0f}ms")
+    assert _input_totals(daily) == {"2026-01-01": 201}
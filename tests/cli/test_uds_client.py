@@ -1,7 +1,16 @@
-"""Tests for the UDS client's env-sync header."""
+"""Tests for the UDS client's env-sync header and connection pooling."""
 
 from __future__ import annotations
 
+import http.server
+import json
+import shutil
+import socketserver
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
 import pytest
 
 import klaude_code.cli.uds_client as uds_client
@@ -44,3 +53,76 @@ def test_client_env_header_survives_config_load_failure(monkeypatch: pytest.Monk
     uds_client._client_env_header.cache_clear()  # pyright: ignore[reportPrivateUsage]
 
     assert uds_client._client_env_header() is None
+
+
+class _CountingHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self) -> None:
+        type(self).connections += 1
+        super().setup()
+
+    def do_GET(self) -> None:
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        del format, args
+
+    def address_string(self) -> str:
+        return "uds"
+
+
+@pytest.fixture
+def uds_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    # AF_UNIX paths are length-limited, so keep the socket out of the deep pytest tmp tree.
+    socket_dir = Path(tempfile.mkdtemp(prefix="kuds-", dir="/tmp"))
+    socket_path = socket_dir / "s.sock"
+    _CountingHandler.connections = 0
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), _CountingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr("klaude_code.server.paths.server_socket_path", lambda: socket_path)
+    monkeypatch.setattr(uds_client, "_client_env_header", lambda: None)
+    uds_client._close_client()  # pyright: ignore[reportPrivateUsage]
+    try:
+        yield socket_path
+    finally:
+        uds_client._close_client()  # pyright: ignore[reportPrivateUsage]
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+@pytest.mark.skipif(not hasattr(socketserver, "ThreadingUnixStreamServer"), reason="requires AF_UNIX")
+def test_requests_share_one_pooled_connection(uds_server: Path) -> None:
+    for index in range(20):
+        status, body = uds_client.request("GET", f"/api/ping/{index}")
+        assert (status, body) == (200, {"path": f"/api/ping/{index}"})
+
+    assert _CountingHandler.connections == 1
+
+
+@pytest.mark.skipif(not hasattr(socketserver, "ThreadingUnixStreamServer"), reason="requires AF_UNIX")
+def test_transport_error_resets_pooled_client(uds_server: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import httpx
+
+    uds_client.request("GET", "/api/ping")
+    pooled = uds_client._client  # pyright: ignore[reportPrivateUsage]
+    assert pooled is not None
+
+    def _broken_request(*args: object, **kwargs: object) -> httpx.Response:
+        raise httpx.RemoteProtocolError("server re-exec'd")
+
+    monkeypatch.setattr(pooled, "request", _broken_request)
+    with pytest.raises(uds_client.ServerNotRunningError):
+        uds_client.request("GET", "/api/ping")
+    assert uds_client._client is None  # pyright: ignore[reportPrivateUsage]
+
+    assert uds_client.request("GET", "/api/ping") == (200, {"path": "/api/ping"})
+    assert _CountingHandler.connections == 2
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import os
 import subprocess
+import time
 from pathlib import Path
 from typing import Any
 
@@ -16,6 +17,9 @@ from klaude_code import update
 from klaude_code.cli import uds_client
 from klaude_code.protocol.version import PROTOCOL_VERSION
 
+# Generous enough for slow CI disks; a cold path spawns git twice and hashes dirty files.
+_WARM_FINGERPRINT_BUDGET_SEC = 0.1
+
 
 def _git(repo: Path, *args: str) -> None:
     subprocess.run(
@@ -147,6 +151,85 @@ class TestCodeFingerprint:
         assert len(calls) == 1
 
 
+class TestCodeFingerprintCache:
+    @pytest.fixture
+    def git_calls(self, isolated_home: Path, monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+        calls: list[list[str]] = []
+        original_run_git = update._run_git
+
+        def _recording_run_git(repo: str, args: list[str], timeout: int, *, text: bool = True) -> Any:
+            calls.append(args)
+            return original_run_git(repo, args, timeout, text=text)
+
+        monkeypatch.setattr(update, "_run_git", _recording_run_git)
+        return calls
+
+    def test_unchanged_checkout_is_served_from_disk_without_git(self, git_repo: Path, git_calls: list[list[str]]):
+        first = update._cached_git_fingerprint(str(git_repo))
+        git_calls.clear()
+
+        assert update._cached_git_fingerprint(str(git_repo)) == first
+        assert git_calls == []
+        assert update._get_code_fingerprint_cache_path().exists()
+
+    @pytest.mark.parametrize("change", ["edit", "same_mtime_edit", "new_file", "stage", "commit"])
+    def test_any_relevant_change_misses_the_cache(self, git_repo: Path, git_calls: list[list[str]], change: str):
+        path = git_repo / "src" / "klaude_code" / "mod.py"
+        path.write_text("x = 2\n", encoding="utf-8")
+        before = update._cached_git_fingerprint(str(git_repo))
+
+        if change == "edit":
+            path.write_text("x = 22\n", encoding="utf-8")
+        elif change == "same_mtime_edit":
+            fixed_mtime = path.stat().st_mtime_ns
+            path.write_text("x = 3\n", encoding="utf-8")
+            os.utime(path, ns=(fixed_mtime, fixed_mtime))
+        elif change == "new_file":
+            (git_repo / "src" / "klaude_code" / "new.py").write_text("y = 2\n", encoding="utf-8")
+        elif change == "stage":
+            _git(git_repo, "add", "src/klaude_code/mod.py")
+        else:
+            _git(git_repo, "commit", "-am", "next")
+
+        after = update._cached_git_fingerprint(str(git_repo))
+        assert after != before
+        assert after == update._compute_git_fingerprint(str(git_repo))
+
+    def test_bytecode_churn_keeps_the_cache(self, git_repo: Path, git_calls: list[list[str]]):
+        first = update._cached_git_fingerprint(str(git_repo))
+        pycache = git_repo / "src" / "klaude_code" / "__pycache__"
+        pycache.mkdir()
+        (pycache / "mod.cpython-313.pyc").write_bytes(b"\0")
+        git_calls.clear()
+
+        assert update._cached_git_fingerprint(str(git_repo)) == first
+        assert git_calls == []
+
+    def test_corrupt_cache_file_is_recomputed(self, git_repo: Path, git_calls: list[list[str]]):
+        cache_path = update._get_code_fingerprint_cache_path()
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text("{not json", encoding="utf-8")
+
+        assert update._cached_git_fingerprint(str(git_repo)) == update._compute_git_fingerprint(str(git_repo))
+
+    def test_cached_startup_fits_latency_budget(self, git_calls: list[list[str]]):
+        """A warm handshake fingerprint on this checkout must stay far below a git spawn."""
+        repo_root = Path(__file__).resolve().parents[2]
+        if update._resolve_git_dir(repo_root) is None:
+            pytest.skip("not running from a git checkout")
+        update._cached_git_fingerprint(str(repo_root))
+        git_calls.clear()
+
+        samples: list[float] = []
+        for _ in range(5):
+            started = time.perf_counter()
+            update._cached_git_fingerprint(str(repo_root))
+            samples.append(time.perf_counter() - started)
+
+        assert git_calls == []
+        assert min(samples) < _WARM_FINGERPRINT_BUDGET_SEC
+
+
 def _status_body(
     *,
     fingerprint: str | None,
@@ -74,6 +74,18 @@ class TestWebSearchMerge:
         merged = merge_configs(user, get_builtin_config())
         assert merged.web_search.providers == []
 
+    def test_hedge_alone_keeps_the_builtin_chain(self) -> None:
+        user = UserConfig.model_validate({"web_search": {"hedge": True}})
+        merged = merge_configs(user, get_builtin_config())
+        assert merged.web_search.hedge
+        assert merged.web_search.providers == default_web_search_config().providers
+
+    def test_hedge_carries_over_with_a_user_chain(self) -> None:
+        user = UserConfig.model_validate({"web_search": {"hedge": True, "providers": [{"provider": "brave"}]}})
+        merged = merge_configs(user, get_builtin_config())
+        assert merged.web_search.hedge
+        assert [p.provider for p in merged.web_search.providers] == ["brave"]
+
 
 class TestWebSearchSave:
     def test_save_writes_web_search_override(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
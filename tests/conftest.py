@@ -16,6 +16,7 @@ def setup_src_path():
 setup_src_path()
 
 from klaude_code.session.store_registry import close_default_store  # noqa: E402
+from klaude_code.tool.web import web_cache  # noqa: E402
 
 
 @pytest.fixture(autouse=True)
@@ -26,6 +27,13 @@ def isolate_herdr_environment(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.delenv("HERDR_PANE_ID", raising=False)
 
 
+@pytest.fixture(autouse=True)
+def disable_web_disk_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep web tool tests from reading or writing the persistent cache in ~/.klaude."""
+    monkeypatch.setattr(web_cache, "_disk_cache", None)
+    monkeypatch.setattr(web_cache, "_disk_cache_resolved", True)
+
+
 @pytest.fixture
 def isolated_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
     """Redirect HOME/Path.home() to a per-test temp directory and close session stores afterward."""
@@ -3,13 +3,15 @@ from __future__ import annotations
 import asyncio
 import contextlib
 from collections.abc import Coroutine
-from typing import Any, TypeVar
+from pathlib import Path
+from typing import Any, TypeVar, cast
 
 from klaude_code.control.runtime.registry import SessionRegistry
 from klaude_code.control.user_interaction import PendingUserInteractionRequest
 from klaude_code.protocol import op, user_interaction
 from klaude_code.protocol.llm_param import Thinking
-from klaude_code.protocol.message import UserInputPayload
+from klaude_code.protocol.message import UserInputPayload, UserMessage, text_parts_from_str
+from klaude_code.session.session import Session
 
 T = TypeVar("T")
 
@@ -993,3 +995,55 @@ def test_actor_loop_survives_operation_failure() -> None:
         await hub.stop()
 
     arun(_test())
+
+
+class _LoadedAgent:
+    """Just enough of an Agent for the registry's memory accounting."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def cancel_background_work(self) -> None:
+        return None
+
+
+def _loaded_session(tmp_path: Path, text_bytes: int) -> Session:
+    return Session(
+        work_dir=tmp_path,
+        conversation_history=[UserMessage(parts=text_parts_from_str("x" * text_bytes))],
+    )
+
+
+def test_runtime_hub_evicts_least_recently_used_idle_sessions_over_the_memory_budget(tmp_path: Path) -> None:
+    async def _test() -> None:
+        async def _handle(_operation: op.Operation) -> None:
+            return None
+
+        async def _reject(_operation: op.Operation, _active_root_operation_id: str | None) -> None:
+            raise AssertionError("should not reject")
+
+        hub = SessionRegistry(handle_operation=_handle, reject_operation=_reject)
+        for session_id in ("oldest", "older", "recent", "attached"):
+            hub.ensure_session_actor(session_id).set_agent(cast(Any, _LoadedAgent(_loaded_session(tmp_path, 100_000))))
+            # Each session is last used in this order.
+            operation = op.ChangeThinkingOperation(session_id=session_id, thinking=Thinking(type="disabled"))
+            await hub.submit(operation)
+            await asyncio.sleep(0.01)
+            hub.mark_operation_completed(operation.id)
+
+        usage = hub.memory_usage()
+        assert set(usage) == {"oldest", "older", "recent", "attached"}
+        assert all(100_000 <= size < 101_000 for size in usage.values())
+
+        # Under budget: nothing is evicted even though every session is idle.
+        assert await hub.reclaim_idle_sessions(idle_for_seconds=60, memory_budget_bytes=1_000_000) == []
+
+        reclaimed = await hub.reclaim_idle_sessions(
+            idle_for_seconds=60, exclude={"attached"}, memory_budget_bytes=250_000
+        )
+        assert reclaimed == ["oldest", "older"]
+        assert set(hub.memory_usage()) == {"recent", "attached"}
+
+        await hub.stop()
+
+    arun(_test())
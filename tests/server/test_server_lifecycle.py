@@ -11,6 +11,8 @@ from klaude_code.protocol.env_sync import encode_env_header
 from klaude_code.protocol.version import PROTOCOL_VERSION
 from klaude_code.server import routes
 from klaude_code.server.server import ServerAlreadyRunningError, _SingletonLock  # pyright: ignore[reportPrivateUsage]
+from klaude_code.tool.web import web_search_tool
+from klaude_code.tool.web.search_hedge import SearchProviderStatsRegistry
 
 from .conftest import AppEnv
 
@@ -27,6 +29,42 @@ def test_status_endpoint_reports_server_info(app_env: AppEnv) -> None:
     assert isinstance(payload["code_fingerprint"], str) and payload["code_fingerprint"]
     assert payload["protocol_version"] == PROTOCOL_VERSION
     assert payload["sessions"] == {"loaded": 0, "running": 0, "waiting_input": 0, "queued": 0}
+    assert isinstance(payload["web_search"], list)
+
+
+def test_status_endpoint_reports_web_search_provider_stats(app_env: AppEnv, monkeypatch: pytest.MonkeyPatch) -> None:
+    stats = SearchProviderStatsRegistry()
+    stats.record_success("exa", 0.25)
+    stats.record_failure("exa", 0.01)
+    monkeypatch.setattr(web_search_tool, "_provider_stats", stats)
+
+    response = app_env.client.get("/api/server/status")
+
+    assert response.json()["web_search"] == [
+        {
+            "provider": "exa",
+            "calls": 2,
+            "errors": 1,
+            "in_flight": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "latency_ms": 250,
+            "error_rate": 0.2,
+        }
+    ]
+
+
+def test_memory_endpoint_reports_loaded_sessions(app_env: AppEnv) -> None:
+    session_id = app_env.create_session()
+
+    response = app_env.client.get("/api/server/memory")
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert [item["session_id"] for item in payload["sessions"]] == [session_id]
+    assert payload["sessions"][0]["resident_bytes"] >= 0
+    assert payload["total_bytes"] == sum(item["resident_bytes"] + item["tape_bytes"] for item in payload["sessions"])
+    assert payload["budget_bytes"] > 0
 
 
 def test_stop_endpoint_triggers_shutdown(app_env: AppEnv) -> None:
@@ -26,6 +26,7 @@ from klaude_code.server.interaction import ServerInteractionHandler
 from klaude_code.server.routes.ws import _collect_descendant_session_ids  # pyright: ignore[reportPrivateUsage]
 from klaude_code.server.state import ServerAppState
 from klaude_code.session.codec import encode_jsonl_line
+from klaude_code.session.session import Session
 from klaude_code.session.store_registry import close_default_store, get_store_for_path
 
 from .conftest import FakeLLMClient
@@ -194,6 +195,79 @@ def test_collect_descendant_session_ids_missing_child_history(tmp_path: Path, is
     assert result == {child_id}
 
 
+def _spawn_tree(work_dir: Path, *, children: int, grandchildren: int, history_items: int = 0) -> str:
+    """Persist a root session with ``children`` sub-agents, each spawning ``grandchildren``."""
+
+    def _spawn(session: Session, child_id: str) -> None:
+        session.append_history(
+            [message.SpawnSubAgentEntry(session_id=child_id, sub_agent_type="finder", sub_agent_desc=child_id)]
+        )
+
+    async def _build() -> str:
+        filler: list[message.HistoryEvent] = [
+            message.AssistantMessage(parts=message.text_parts_from_str("x" * 200)) for _ in range(history_items)
+        ]
+        root = Session(work_dir=work_dir)
+        root.append_history(filler)
+        for index in range(children):
+            child = Session(id=f"child-{index}", work_dir=work_dir, parent_session_id=root.id)
+            child.append_history(filler)
+            _spawn(root, child.id)
+            for sub_index in range(grandchildren):
+                grandchild = Session(id=f"{child.id}-{sub_index}", work_dir=work_dir, parent_session_id=child.id)
+                grandchild.append_history(filler)
+                _spawn(child, grandchild.id)
+                await grandchild.wait_for_flush()
+            await child.wait_for_flush()
+        await root.wait_for_flush()
+        await close_default_store()
+        return root.id
+
+    return asyncio.run(_build())
+
+
+def test_collect_descendant_session_ids_reads_only_the_meta_index(tmp_path: Path, isolated_home: Path) -> None:
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    root_id = _spawn_tree(work_dir, children=2, grandchildren=1)
+    paths = get_store_for_path(work_dir).paths
+    assert json.loads(paths.meta_file(root_id).read_text())["child_session_ids"] == ["child-0", "child-1"]
+
+    # Without any events files left, only the meta index can answer.
+    for session_id in (root_id, "child-0", "child-1", "child-0-0", "child-1-0"):
+        paths.events_file(session_id).unlink(missing_ok=True)
+
+    result = _collect_descendant_session_ids(root_id, work_dir)
+    assert result == {"child-0", "child-1", "child-0-0", "child-1-0"}
+
+
+@pytest.mark.benchmark
+def test_benchmark_collect_descendants_of_a_wide_tree(tmp_path: Path, isolated_home: Path) -> None:
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    root_id = _spawn_tree(work_dir, children=100, grandchildren=2, history_items=200)
+    store = get_store_for_path(work_dir)
+
+    started = time.perf_counter()
+    indexed = _collect_descendant_session_ids(root_id, work_dir)
+    indexed_s = time.perf_counter() - started
+
+    for meta_path in store.iter_meta_files():
+        meta = json.loads(meta_path.read_text())
+        meta.pop("child_session_ids", None)
+        meta_path.write_text(json.dumps(meta))
+    started = time.perf_counter()
+    scanned = _collect_descendant_session_ids(root_id, work_dir)
+    scanned_s = time.perf_counter() - started
+
+    print(
+        f"\n{len(indexed)} descendant sessions: history scan {scanned_s * 1000:.0f}ms, "
+        f"meta index {indexed_s * 1000:.0f}ms"
+    )
+    assert indexed == scanned
+    assert indexed_s < scanned_s
+
+
 # ---------------------------------------------------------------------------
 # Integration test: WebSocket forwards child session events
 # ---------------------------------------------------------------------------
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from klaude_code.protocol import message
+from klaude_code.session.meta import HistoryBase
+from klaude_code.session.session import Session
+from klaude_code.session.store_registry import close_default_store, get_store_for_path
+
+
+@pytest.fixture(autouse=True)
+def _isolate_home(isolated_home: Path) -> Path:  # pyright: ignore[reportUnusedFunction]
+    return isolated_home
+
+
+def _user(text: str) -> message.UserMessage:
+    return message.UserMessage(parts=message.text_parts_from_str(text))
+
+
+def _assistant(text: str) -> message.AssistantMessage:
+    return message.AssistantMessage(parts=message.text_parts_from_str(text))
+
+
+def _texts(history: list[message.HistoryEvent]) -> list[str]:
+    return [
+        message.join_text_parts(item.parts)
+        for item in history
+        if isinstance(item, message.UserMessage | message.AssistantMessage)
+    ]
+
+
+def test_fork_references_the_parent_events_and_shares_the_prefix(tmp_path: Path) -> None:
+    async def _test() -> None:
+        parent = Session(work_dir=tmp_path)
+        parent.append_history([_user("q1"), _assistant("a1"), _user("q2"), _assistant("a2")])
+        await parent.wait_for_flush()
+
+        child = parent.fork(until_index=2)
+
+        assert child.history_base == HistoryBase(session_id=parent.id, length=2)
+        assert all(a is b for a, b in zip(child.conversation_history, parent.conversation_history[:2], strict=False))
+        paths = Session.paths(tmp_path)
+        assert not paths.events_file(child.id).exists()
+        assert json.loads(paths.meta_file(child.id).read_text())["history_base"] == {
+            "session_id": parent.id,
+            "length": 2,
+        }
+        assert get_store_for_path(tmp_path).is_history_base(parent.id)
+
+        assert _texts(Session.load(child.id, work_dir=tmp_path).conversation_history) == ["q1", "a1"]
+
+        child.append_history([_user("child q")])
+        parent.append_history([_user("parent q3")])
+        await child.wait_for_flush()
+        await parent.wait_for_flush()
+
+        loaded = Session.load(child.id, work_dir=tmp_path)
+        assert _texts(loaded.conversation_history) == ["q1", "a1", "child q"]
+        assert loaded.history_base == child.history_base
+        assert _texts(Session.load(parent.id, work_dir=tmp_path).conversation_history) == [
+            "q1",
+            "a1",
+            "q2",
+            "a2",
+            "parent q3",
+        ]
+        listed = {brief.id: brief for brief in Session.list_sessions(work_dir=tmp_path)}
+        assert listed[child.id].user_messages == ["q1", "child q"]
+        await close_default_store()
+
+    asyncio.run(_test())
+
+
+def test_forks_of_loaded_forks_resolve_the_whole_chain(tmp_path: Path) -> None:
+    async def _test() -> None:
+        root = Session(work_dir=tmp_path)
+        root.append_history([_user("q1"), _assistant("a1")])
+        child = root.fork()
+        child.append_history([_user("q2"), _assistant("a2")])
+        await root.wait_for_flush()
+        await child.wait_for_flush()
+
+        grandchild = Session.load(child.id, work_dir=tmp_path).fork(until_index=3)
+        grandchild.append_history([_assistant("other a2")])
+        await grandchild.wait_for_flush()
+
+        assert grandchild.history_base == HistoryBase(session_id=child.id, length=3)
+        loaded = Session.load(grandchild.id, work_dir=tmp_path)
+        assert _texts(loaded.conversation_history) == ["q1", "a1", "q2", "other a2"]
+        store = get_store_for_path(tmp_path)
+        assert _texts(list(store.iter_history(grandchild.id))) == ["q1", "a1", "q2", "other a2"]
+        await close_default_store()
+
+    asyncio.run(_test())
+
+
+def test_fork_past_a_rewind_copies_the_history(tmp_path: Path) -> None:
+    async def _test() -> None:
+        parent = Session(work_dir=tmp_path)
+        parent.append_history([_user("q1")])
+        checkpoint = parent.create_checkpoint()
+        parent.append_history([_assistant("discarded")])
+        parent.append_history([parent.revert_to_checkpoint(checkpoint, note="", rationale="")])
+        parent.append_history([_assistant("kept")])
+
+        # The in-memory history no longer lines up with the persisted events
+        # after the checkpoint, so only forks before it can reference them.
+        assert parent.fork(until_index=2).history_base is not None
+        child = parent.fork()
+        await child.wait_for_flush()
+
+        assert child.history_base is None
+        assert _texts(Session.load(child.id, work_dir=tmp_path).conversation_history) == ["q1", "kept"]
+        await close_default_store()
+
+    asyncio.run(_test())
+
+
+def test_base_cycles_do_not_hang_loading(tmp_path: Path) -> None:
+    async def _test() -> None:
+        first = Session(work_dir=tmp_path)
+        first.append_history([_user("first")])
+        second = first.fork()
+        second.append_history([_user("second")])
+        await first.wait_for_flush()
+        await second.wait_for_flush()
+        store = get_store_for_path(tmp_path)
+        store.update_meta(first.id, {"history_base": {"session_id": second.id, "length": 1}})
+
+        assert _texts(Session.load(second.id, work_dir=tmp_path).conversation_history) == ["first", "second"]
+        assert _texts(list(store.iter_history(second.id))) == ["first", "second"]
+        await close_default_store()
+
+    asyncio.run(_test())
+
+
+@pytest.mark.benchmark
+def test_benchmark_fork_of_a_long_session(tmp_path: Path) -> None:
+    async def _test() -> tuple[float, float]:
+        parent = Session(work_dir=tmp_path)
+        for index in range(2000):
+            parent.append_history([_user(f"question {index} " * 20), _assistant(f"answer {index} " * 50)])
+        await parent.wait_for_flush()
+
+        started = time.perf_counter()
+        shared = parent.fork()
+        shared_s = time.perf_counter() - started
+
+        # Out of sync with the persisted events: the fork has to copy.
+        parent._raw_prefix_len = 0  # pyright: ignore[reportPrivateUsage]
+        started = time.perf_counter()
+        copied = parent.fork()
+        await copied.wait_for_flush()
+        copied_s = time.perf_counter() - started
+
+        assert shared.history_base is not None and copied.history_base is None
+        await close_default_store()
+        return shared_s, copied_s
+
+    shared_s, copied_s = asyncio.run(_test())
+    print(
+        f"\nfork of a 4000-item session: deep copy + rewrite {copied_s * 1000:.1f}ms, base pointer {shared_s * 1000:.2f}ms"
+    )
+    assert shared_s < copied_s
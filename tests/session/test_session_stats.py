@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from klaude_code.agent.session_stats import build_session_stats_ui_extra
+from klaude_code.protocol import message
+from klaude_code.protocol.models import TaskMetadata, TaskMetadataItem, Usage
+from klaude_code.session.session import Session
+from klaude_code.session.stats import SessionStats
+from klaude_code.session.store_registry import close_default_store
+
+
+@pytest.fixture(autouse=True)
+def _isolate_home(isolated_home: Path) -> Path:  # pyright: ignore[reportUnusedFunction]
+    return isolated_home
+
+
+def _turn(text: str, *, model: str = "sonnet", cost: float = 0.5) -> list[message.HistoryEvent]:
+    return [
+        message.UserMessage(parts=message.text_parts_from_str(text)),
+        message.AssistantMessage(
+            parts=[
+                message.ToolCallPart(call_id=f"{text}-call", tool_name="Read", arguments_json="{}"),
+            ]
+        ),
+        message.ToolResultMessage(call_id=f"{text}-call", tool_name="Read", status="success", output_text="ok"),
+        message.AssistantMessage(parts=message.text_parts_from_str("done")),
+        TaskMetadataItem(
+            main_agent=TaskMetadata(
+                model_name=model,
+                provider="anthropic",
+                usage=Usage(input_tokens=1000, output_tokens=100, input_cost=cost, output_cost=cost / 10),
+            ),
+            sub_agent_task_metadata=[
+                TaskMetadata(model_name="haiku", provider="anthropic", usage=Usage(input_tokens=10, input_cost=0.01))
+            ],
+        ),
+    ]
+
+
+def _as_dict(stats: SessionStats) -> dict[str, object]:
+    by_model = sorted(stats.by_model, key=lambda meta: meta.model_name)
+    return {
+        **stats.model_dump(exclude={"by_model"}),
+        "by_model": [
+            (meta.model_name, meta.usage.input_tokens, pytest.approx(meta.usage.total_cost))
+            for meta in by_model
+            if meta.usage is not None
+        ],
+    }
+
+
+def test_running_totals_match_a_full_recount(tmp_path: Path) -> None:
+    async def _test() -> None:
+        session = Session(work_dir=tmp_path)
+        for index in range(3):
+            session.append_history(_turn(f"q{index}", model="opus" if index == 1 else "sonnet"))
+
+        assert _as_dict(session.stats) == _as_dict(SessionStats.from_history(session.conversation_history))
+        assert session.stats.task_count == 3
+        assert session.stats.tool_calls == 3
+        assert session.stats.total_messages == 12
+        assert session.stats.total_usage().total_cost == pytest.approx(3 * 0.55 + 3 * 0.01)
+        await close_default_store()
+
+    asyncio.run(_test())
+
+
+def test_rewind_and_retract_subtract_what_they_drop(tmp_path: Path) -> None:
+    async def _test() -> None:
+        session = Session(work_dir=tmp_path)
+        session.append_history(_turn("first"))
+        checkpoint = session.create_checkpoint()
+        session.append_history(_turn("second", model="opus"))
+
+        session.revert_to_checkpoint(checkpoint, note="", rationale="")
+
+        assert _as_dict(session.stats) == _as_dict(SessionStats.from_history(session.conversation_history))
+        assert [meta.model_name for meta in session.stats.by_model] == ["sonnet", "haiku"]
+
+        session.append_history([message.UserMessage(parts=message.text_parts_from_str("oops"))])
+        assert session.retract_last_user_message("oops")
+        assert session.stats.user_messages == 1
+        await close_default_store()
+
+    asyncio.run(_test())
+
+
+def test_edits_behind_append_history_trigger_a_recount(tmp_path: Path) -> None:
+    async def _test() -> None:
+        session = Session(work_dir=tmp_path)
+        session.append_history(_turn("first"))
+        assert session.stats.task_count == 1
+
+        session.conversation_history.extend(_turn("second"))
+
+        assert session.stats.task_count == 2
+        await close_default_store()
+
+    asyncio.run(_test())
+
+
+def test_totals_are_persisted_and_survive_compaction_on_reload(tmp_path: Path) -> None:
+    async def _test() -> None:
+        session = Session(work_dir=tmp_path)
+        session.append_history(_turn("first"))
+        session.append_history(
+            [message.CompactionEntry(summary="earlier work", first_kept_index=len(session.conversation_history))]
+        )
+        session.append_history(_turn("second"))
+        await session.wait_for_flush()
+
+        loaded = Session.load(session.id, work_dir=tmp_path)
+        # Compaction dropped the first turn from the loaded history, but not from the spend.
+        assert loaded.stats.task_count == 2
+        assert loaded.stats.total_usage().total_cost == pytest.approx(2 * 0.56)
+
+        listed = Session.list_sessions(work_dir=tmp_path)
+        assert listed[0].total_cost == pytest.approx(2 * 0.56)
+        await close_default_store()
+
+    asyncio.run(_test())
+
+
+def test_status_reads_the_running_totals(tmp_path: Path) -> None:
+    async def _test() -> None:
+        session = Session(work_dir=tmp_path)
+        session.append_history(_turn("first"))
+        session.append_history(_turn("second", model="opus", cost=2.0))
+
+        stats = build_session_stats_ui_extra(session)
+
+        assert stats.task_count == 2
+        assert stats.tool_calls_count == 2
+        assert stats.total_messages_count == 8
+        assert [meta.model_name for meta in stats.by_model] == ["opus", "sonnet", "haiku"]
+        await close_default_store()
+
+    asyncio.run(_test())
+
+
+@pytest.mark.benchmark
+def test_benchmark_status_on_a_long_session(tmp_path: Path) -> None:
+    history: list[message.HistoryEvent] = []
+    for index in range(4000):
+        history.extend(_turn(f"q{index}"))
+    session = Session(work_dir=tmp_path, conversation_history=history)
+    rounds = 50
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        SessionStats.from_history(session.conversation_history)
+    recount = (time.perf_counter() - started) / rounds
+
+    session.stats  # noqa: B018 - builds the running totals once
+    started = time.perf_counter()
+    for _ in range(rounds):
+        build_session_stats_ui_extra(session)
+    running = (time.perf_counter() - started) / rounds
+
+    print(
+        f"\n/status over {len(history)} history items: full recount {recount * 1000:.1f}ms, "
+        f"running totals {running * 1000:.3f}ms"
+    )
+    assert running < recount
@@ -0,0 +1,143 @@
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from klaude_code.skill import loader as skill_loader
+from klaude_code.skill.loader import Skill, SkillLoader, clear_skill_discovery_cache
+
+
+@pytest.fixture
+def skills_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    root = tmp_path / "user-skills"
+    root.mkdir()
+    monkeypatch.setattr(SkillLoader, "SYSTEM_SKILLS_DIR", tmp_path / "missing-system")
+    monkeypatch.setattr(SkillLoader, "USER_SKILLS_DIRS", [root])
+    monkeypatch.setattr(SkillLoader, "PROJECT_SKILLS_DIRS", [])
+    clear_skill_discovery_cache()
+    yield root
+    clear_skill_discovery_cache()
+
+
+def _write_skill(root: Path, name: str, description: str = "demo") -> Path:
+    skill_file = root / name / "SKILL.md"
+    skill_file.parent.mkdir(parents=True, exist_ok=True)
+    skill_file.write_text(f"---\nname: {name}\ndescription: {description}\n---\n", encoding="utf-8")
+    return skill_file
+
+
+def _backdate(root: Path) -> None:
+    """Move mtimes out of the racy window so discovery results become cacheable."""
+    past = time.time() - 60
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            os.utime(Path(dirpath) / filename, (past, past))
+        os.utime(dirpath, (past, past))
+
+
+def _discover(work_dir: Path) -> dict[str, Skill]:
+    loader = SkillLoader()
+    loader.discover_skills(work_dir=work_dir)
+    return loader.loaded_skills
+
+
+def _count_parses(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    parsed: list[Path] = []
+    original = SkillLoader._parse_skill_file  # pyright: ignore[reportPrivateUsage]
+
+    def _recording_parse(self: SkillLoader, skill_path: Path, location: str) -> tuple[Skill | None, str | None]:
+        parsed.append(skill_path)
+        return original(self, skill_path, location)
+
+    monkeypatch.setattr(SkillLoader, "_parse_skill_file", _recording_parse)
+    return parsed
+
+
+def test_unchanged_tree_is_not_walked_or_parsed_again(
+    skills_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ("alpha", "beta"):
+        _write_skill(skills_root, name)
+    _backdate(skills_root)
+    first = _discover(tmp_path)
+
+    def _no_walk(*_args: object, **_kwargs: object) -> Iterator[tuple[str, list[str], list[str]]]:
+        raise AssertionError("unchanged skill tree was walked again")
+
+    monkeypatch.setattr(skill_loader.os, "walk", _no_walk)
+    parsed = _count_parses(monkeypatch)
+
+    second = _discover(tmp_path)
+
+    assert second == first
+    # Every session shares the same immutable Skill objects.
+    assert all(second[name] is first[name] for name in first)
+    assert parsed == []
+
+
+def test_only_changed_skill_files_are_parsed_again(
+    skills_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    alpha = _write_skill(skills_root, "alpha")
+    _write_skill(skills_root, "beta")
+    _backdate(skills_root)
+    _discover(tmp_path)
+    parsed = _count_parses(monkeypatch)
+
+    alpha.write_text("---\nname: alpha\ndescription: updated description\n---\n", encoding="utf-8")
+    _write_skill(skills_root, "gamma")
+
+    skills = _discover(tmp_path)
+
+    assert skills["alpha"].description == "updated description"
+    assert set(skills) == {"alpha", "beta", "gamma"}
+    assert sorted(path.parent.name for path in parsed) == ["alpha", "gamma"]
+
+
+def test_recently_modified_files_are_not_cached(skills_root: Path, tmp_path: Path) -> None:
+    skill_file = _write_skill(skills_root, "alpha", description="first")
+    assert _discover(tmp_path)["alpha"].description == "first"
+
+    # Same size and possibly the same coarse mtime tick as the first write.
+    skill_file.write_text(skill_file.read_text(encoding="utf-8").replace("first", "other"), encoding="utf-8")
+    (skills_root / "beta").mkdir()
+
+    assert _discover(tmp_path)["alpha"].description == "other"
+    assert skills_root.resolve() not in {path.resolve() for path in skill_loader._skill_tree_cache}  # pyright: ignore[reportPrivateUsage]
+
+
+def test_cached_name_warnings_are_reported_for_every_discovery(skills_root: Path, tmp_path: Path) -> None:
+    skill_file = skills_root / "folder-name" / "SKILL.md"
+    skill_file.parent.mkdir()
+    skill_file.write_text("---\nname: skill-name\ndescription: demo\n---\n", encoding="utf-8")
+    _backdate(skills_root)
+
+    for _ in range(2):
+        loader = SkillLoader()
+        loader.discover_skills(work_dir=tmp_path)
+        assert len(loader.skill_warnings_by_location["user"]) == 1
+
+
+@pytest.mark.benchmark
+def test_benchmark_repeated_skill_discovery(skills_root: Path, tmp_path: Path) -> None:
+    for index in range(300):
+        skill_file = _write_skill(skills_root, f"skill-{index}", description="x" * 400)
+        for sub in ("scripts", "references", "assets"):
+            (skill_file.parent / sub).mkdir()
+            (skill_file.parent / sub / "file.txt").write_text("data", encoding="utf-8")
+    _backdate(skills_root)
+
+    started = time.perf_counter()
+    _discover(tmp_path)
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(10):
+        _discover(tmp_path)
+    warm = (time.perf_counter() - started) / 10
+
+    print(f"\n300 skills: cold discovery {cold * 1000:.1f}ms, cached {warm * 1000:.1f}ms")
+    assert len(_discover(tmp_path)) == 300
+    assert warm < cold
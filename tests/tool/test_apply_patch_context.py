@@ -0,0 +1,89 @@
+import time
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from klaude_code.tool.file.apply_patch import LineIndex, find_context, text_to_patch
+
+
+def _linear_find_context_core(lines: list[str], context: list[str], start: int) -> tuple[int, int]:
+    """The original window-by-window scan, kept as the reference for matching semantics."""
+    if not context:
+        return start, 0
+    for i in range(start, len(lines)):
+        if lines[i : i + len(context)] == context:
+            return i, 0
+    for i in range(start, len(lines)):
+        if [s.rstrip() for s in lines[i : i + len(context)]] == [s.rstrip() for s in context]:
+            return i, 1
+    for i in range(start, len(lines)):
+        if [s.strip() for s in lines[i : i + len(context)]] == [s.strip() for s in context]:
+            return i, 100
+    return -1, 0
+
+
+def _linear_find_context(lines: list[str], context: list[str], start: int, eof: bool) -> tuple[int, int]:
+    if eof:
+        new_index, fuzz = _linear_find_context_core(lines, context, len(lines) - len(context))
+        if new_index != -1:
+            return new_index, fuzz
+        new_index, fuzz = _linear_find_context_core(lines, context, start)
+        return new_index, fuzz + 10000
+    return _linear_find_context_core(lines, context, start)
+
+
+# A tiny alphabet with whitespace variants makes repeated lines and fuzzy matches common.
+_line = st.sampled_from(["a", "a ", " a", "b", "b\t", "", " ", "c"])
+
+
+@given(
+    lines=st.lists(_line, max_size=30),
+    context=st.lists(_line, max_size=5),
+    start=st.integers(min_value=0, max_value=32),
+    eof=st.booleans(),
+)
+@settings(max_examples=500, deadline=None)
+def test_indexed_find_context_matches_linear_scan(lines: list[str], context: list[str], start: int, eof: bool) -> None:
+    index = LineIndex(lines)
+    assert find_context(lines, context, start, eof, index) == _linear_find_context(lines, context, start, eof)
+
+
+def test_def_anchor_jumps_forward_using_index() -> None:
+    orig = {"f.py": "def a():\n    pass\n\ndef b():\n    pass\n"}
+    patch_text = "*** Begin Patch\n*** Update File: f.py\n@@ def b():\n-    pass\n+    return 1\n*** End Patch"
+
+    patch, fuzz = text_to_patch(patch_text, orig)
+
+    [chunk] = patch.actions["f.py"].chunks
+    assert chunk.orig_index == 4
+    assert fuzz == 0
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("strip_context", [False, True], ids=["exact", "rstrip"])
+def test_benchmark_multi_chunk_patch_on_large_file(strip_context: bool) -> None:
+    line_count = 100_000
+    # Some lines carry trailing whitespace that a model typically drops from its context.
+    lines = [f"    value_{i % 5000} = compute({i})" + ("  " if i % 7 == 0 else "") for i in range(line_count)]
+    orig = {"big.py": "\n".join(lines)}
+
+    def ctx(line: str) -> str:
+        return line.rstrip() if strip_context else line
+
+    body: list[str] = []
+    for target in range(1_000, line_count, 2_000):
+        body.append("@@")
+        body.extend(f" {ctx(lines[j])}" for j in range(target - 3, target))
+        body.append(f"-{ctx(lines[target])}")
+        body.append(f"+{lines[target]}  # changed")
+        body.extend(f" {ctx(lines[j])}" for j in range(target + 1, target + 4))
+    patch_text = "\n".join(["*** Begin Patch", "*** Update File: big.py", *body, "*** End Patch"])
+
+    started = time.perf_counter()
+    patch, fuzz = text_to_patch(patch_text, orig)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{len(patch.actions['big.py'].chunks)} chunks on {line_count} lines: {elapsed * 1000:.1f}ms (fuzz {fuzz})")
+    assert len(patch.actions["big.py"].chunks) == 50
+    assert (fuzz > 0) == strip_context
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from klaude_code.tool.shell.output_capture import HeadTailBuffer, PipeOutputCapture, TempFileOutputCapture
+
+
+def test_head_tail_buffer_keeps_small_output_in_memory(tmp_path: Path) -> None:
+    buffer = HeadTailBuffer(memory_limit=100, head_chars=10, tail_chars=10, spill_dir=tmp_path)
+    buffer.append("hello ")
+    buffer.append("world")
+
+    assert buffer.render() == "hello world"
+    assert buffer.spill_path is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_head_tail_buffer_spills_full_stream_and_keeps_head_and_tail(tmp_path: Path) -> None:
+    buffer = HeadTailBuffer(memory_limit=50, head_chars=8, tail_chars=8, spill_dir=tmp_path)
+    lines = [f"line-{i:04d}\n" for i in range(1000)]
+    for line in lines:
+        buffer.append(line)
+    rendered = buffer.render()
+    buffer.close()
+
+    assert buffer.spill_path is not None
+    assert Path(buffer.spill_path).read_text(encoding="utf-8") == "".join(lines)
+    assert f"Full output saved to: {buffer.spill_path}" in rendered
+    assert f"of {len(''.join(lines))} chars" in rendered
+    assert rendered.endswith("ne-0999\n")
+    assert "line-000" in rendered
+    assert "line-0500" not in rendered
+
+
+def test_identical_spilled_streams_share_one_blob(tmp_path: Path) -> None:
+    spill_paths: list[Path] = []
+    for _ in range(2):
+        buffer = HeadTailBuffer(memory_limit=50, head_chars=8, tail_chars=8, spill_dir=tmp_path)
+        for i in range(1000):
+            buffer.append(f"line-{i:04d}\n")
+        buffer.render()
+        buffer.close()
+        assert buffer.spill_path is not None
+        spill_paths.append(Path(buffer.spill_path))
+
+    first, second = spill_paths
+    # Both paths handed to the model stay readable but share storage.
+    assert first != second
+    assert first.read_text(encoding="utf-8") == second.read_text(encoding="utf-8")
+    assert first.stat().st_ino == second.stat().st_ino
+
+
+def _spawn_kwargs() -> dict[str, object]:
+    return {"stdin": asyncio.subprocess.DEVNULL, "start_new_session": True}
+
+
+@pytest.mark.skipif(os.name != "posix" or shutil.which("sh") is None, reason="requires POSIX sh")
+@pytest.mark.parametrize("capture_cls", [PipeOutputCapture, TempFileOutputCapture])
+def test_capture_returns_when_shell_exits_despite_background_child(capture_cls: type) -> None:
+    async def _run() -> tuple[str, str, float]:
+        capture = capture_cls()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "sh",
+                "-c",
+                "echo out; echo err >&2; (sleep 5; echo late) &",
+                **capture.popen_kwargs(),
+                **_spawn_kwargs(),
+            )
+        finally:
+            capture.after_spawn()
+        exit_task = asyncio.ensure_future(proc.wait())
+        started = time.monotonic()
+        stdout: list[str] = []
+        stderr: list[str] = []
+        while True:
+            exited = await capture.wait(exit_task, 10)
+            out, err = capture.read_available()
+            stdout.append(out)
+            stderr.append(err)
+            if exited:
+                break
+        elapsed = time.monotonic() - started
+        capture.close()
+        os.killpg(proc.pid, 15)
+        return "".join(stdout), "".join(stderr), elapsed
+
+    stdout, stderr, elapsed = asyncio.run(_run())
+
+    assert stdout == "out\n"
+    assert stderr == "err\n"
+    assert elapsed < 2
+
+
+@pytest.mark.skipif(os.name != "posix", reason="pipe capture is POSIX only")
+def test_pipe_capture_decodes_multibyte_chars_split_across_writes() -> None:
+    script = "import sys, time; b = '中文'.encode(); sys.stdout.buffer.write(b[:2]); sys.stdout.flush(); time.sleep(0.1); sys.stdout.buffer.write(b[2:])"
+
+    async def _run() -> str:
+        capture = PipeOutputCapture()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "python3", "-c", script, **capture.popen_kwargs(), **_spawn_kwargs()
+            )
+        finally:
+            capture.after_spawn()
+        exit_task = asyncio.ensure_future(proc.wait())
+        chunks: list[str] = []
+        while True:
+            exited = await capture.wait(exit_task, 10)
+            chunks.append(capture.read_available()[0])
+            if exited:
+                break
+        capture.close()
+        return "".join(chunks)
+
+    assert asyncio.run(_run()) == "中文"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="pipe capture is POSIX only")
+def test_pipe_capture_keeps_background_child_alive_after_close(tmp_path: Path) -> None:
+    marker = tmp_path / "marker"
+
+    async def _run() -> None:
+        capture = PipeOutputCapture()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "sh",
+                "-c",
+                f"(sleep 0.3; echo still-writing; touch {marker}) &",
+                **capture.popen_kwargs(),
+                **_spawn_kwargs(),
+            )
+        finally:
+            capture.after_spawn()
+        await proc.wait()
+        capture.close()
+        # Keep the loop alive while the child writes into the handed-off pipe.
+        await asyncio.sleep(1.0)
+
+    asyncio.run(_run())
+
+    assert marker.exists()
@@ -12,6 +12,7 @@ if SRC_DIR.is_dir() and str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
 from klaude_code.tool import is_safe_command  # noqa: E402
+from klaude_code.tool.shell.command_safety import is_read_only_command  # noqa: E402
 
 
 class TestCommandSafety(unittest.TestCase):
@@ -113,5 +114,79 @@ class TestCommandSafety(unittest.TestCase):
         self.assert_safe("echo 'unterminated")
 
 
+class TestReadOnlyCommand(unittest.TestCase):
+    def test_inspection_commands_are_read_only(self):
+        for command in (
+            "ls -la",
+            "rg foo src | head -5",
+            "git status --porcelain",
+            "git -C sub log --oneline -n 5",
+            "cd src && rg -n TODO 2>/dev/null",
+            "find . -name '*.py' | wc -l",
+            "sort -u -k2,2 file.txt",
+            "fd -e py -H src",
+            "rg --pre-glob '*.gz' foo",
+            "git diff --stat -- src",
+            "git diff -O order.txt HEAD",
+            "tree -L 2 -a",
+        ):
+            self.assertTrue(is_read_only_command(command), command)
+
+    def test_writers_are_not_read_only(self):
+        for command in (
+            "ls > out.txt",
+            "rm file.txt",
+            "git commit -m msg",
+            "sed -i s/a/b/ file.txt",
+            "find . -name '*.pyc' -delete",
+            "sort -o out.txt file.txt",
+            "sleep 10 &",
+            "echo $(touch x)",
+            "(cd dir1 && ls)",
+            "python script.py",
+            "echo 'unterminated",
+        ):
+            self.assertFalse(is_read_only_command(command), command)
+
+    def test_options_that_write_or_run_programs_are_not_read_only(self):
+        for command in (
+            "fd -e tmp -X rm",
+            "fd . -x rm {}",
+            "fd -HX rm",
+            "fd . --exec rm {}",
+            "fd . --exec-batch rm",
+            "sed -n '1,20p' file.txt",
+            "sed -ni s/a/b/ f",
+            "sed --in-place=.bak s/a/b/ f",
+            "sed -n 's/a/b/w out.txt' f",
+            "sed '1e touch x' f",
+            "sort -uo f f",
+            "sort --out=f f",
+            "sort --compress-program=./x f",
+            "git diff --output=out.txt",
+            "git log --output out.txt",
+            "git diff --ext-diff HEAD",
+            "git log -p --textconv",
+            "git show --ext HEAD",
+            "git grep --textconv foo",
+            "git grep -O vim x",
+            "git grep -nOvim x",
+            "git grep --open-files-in-pager=vim x",
+            "git -c core.pager=./x log",
+            "tree -o out.txt",
+            "tree -aR -H .",
+            "date -s 2020-01-01",
+            "rg --pre ./x foo",
+            "rg --pre=./x foo",
+            "uniq in.txt out.txt",
+        ):
+            self.assertFalse(is_read_only_command(command), command)
+
+    def test_cd_is_read_only_only_without_a_persistent_shell(self):
+        self.assertTrue(is_read_only_command("cd src && ls"))
+        self.assertFalse(is_read_only_command("cd src && ls", persistent_shell=True))
+        self.assertTrue(is_read_only_command("ls src", persistent_shell=True))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,18 @@
+import difflib
+import time
+from unittest.mock import patch
+
+import pytest
 from hypothesis import given, settings
 from hypothesis import strategies as st
 
 from klaude_code.protocol.models import DiffUIExtra
-from klaude_code.tool.file.diff_builder import build_structured_diff
+from klaude_code.tool.file import diff_builder
+from klaude_code.tool.file.diff_builder import (
+    _line_opcodes,  # pyright: ignore[reportPrivateUsage]
+    build_structured_diff,
+    build_unified_diff_text,
+)
 
 
 def _find_spans(diff: DiffUIExtra, kind: str, op: str) -> list[str]:
@@ -113,3 +123,91 @@ def test_diff_builder_identical_no_changes(text: str) -> None:
 
     assert diff.files[0].stats_add == 0
     assert diff.files[0].stats_remove == 0
+
+
+_diff_lines = st.lists(st.sampled_from(["a", "b", "c", "", "  d", "e e"]), max_size=40)
+
+
+@given(before=_diff_lines, after=_diff_lines)
+@settings(max_examples=200, deadline=None)
+def test_unified_diff_text_matches_difflib(before: list[str], after: list[str]) -> None:
+    """Property: the shared hunk formatter reproduces difflib.unified_diff byte for byte."""
+    before_text = "\n".join(before) + "\n"
+    after_text = "\n".join(after) + "\n"
+    expected = "\n".join(
+        difflib.unified_diff(
+            before_text.splitlines(), after_text.splitlines(), fromfile="f", tofile="f", n=2, lineterm=""
+        )
+    )
+
+    assert build_unified_diff_text(before_text, after_text, from_file="f") == expected
+
+
+@given(before=_diff_lines, after=_diff_lines)
+@settings(max_examples=200, deadline=None)
+def test_fast_line_diff_opcodes_rebuild_after(before: list[str], after: list[str]) -> None:
+    """Property: the Myers path yields contiguous opcodes that turn before into after."""
+    with patch.object(diff_builder, "DIFF_FAST_LINE_THRESHOLD", 0):
+        opcodes = _line_opcodes(before, after)
+
+    rebuilt: list[str] = []
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j)
+        if tag == "equal":
+            assert before[i1:i2] == after[j1:j2]
+        rebuilt.extend(after[j1:j2])
+        i, j = i2, j2
+    assert (i, j) == (len(before), len(after))
+    assert rebuilt == after
+
+
+def test_fast_line_diff_keeps_structured_diff_shape() -> None:
+    before = "\n".join(f"line {i}" for i in range(20_000)) + "\n"
+    after = before.replace("line 10000\n", "line 10000 changed\n").replace("line 15000\n", "")
+
+    diff = build_structured_diff(before, after, file_path="big.txt")
+
+    file_diff = diff.files[0]
+    assert (file_diff.stats_add, file_diff.stats_remove) == (1, 2)
+    assert [line.kind for line in file_diff.lines] == [
+        "ctx",
+        "ctx",
+        "remove",
+        "add",
+        "ctx",
+        "ctx",
+        "gap",
+        "ctx",
+        "ctx",
+        "remove",
+        "ctx",
+        "ctx",
+    ]
+    assert [span.op for span in file_diff.lines[3].spans] == ["equal", "insert"]
+    assert diff.raw_unified_diff is not None
+    assert "@@ -9999,5 +9999,5 @@" in diff.raw_unified_diff
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("line_count", [10_000, 50_000, 200_000])
+def test_benchmark_large_file_diff_against_difflib(line_count: int) -> None:
+    before_lines = [f"    entry_{i % 997}: value {i}" for i in range(line_count)]
+    after_lines = list(before_lines)
+    for idx in range(0, line_count, max(1, line_count // 50)):
+        after_lines[idx] += " # edited"
+    before = "\n".join(before_lines) + "\n"
+    after = "\n".join(after_lines) + "\n"
+
+    started = time.perf_counter()
+    diff = build_structured_diff(before, after, file_path="big.txt")
+    fast = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matcher = difflib.SequenceMatcher(None, before.splitlines(), after.splitlines())
+    list(matcher.get_grouped_opcodes(2))
+    "\n".join(difflib.unified_diff(before.splitlines(), after.splitlines(), lineterm=""))
+    baseline = time.perf_counter() - started
+
+    print(f"\n{line_count} lines: diff_builder {fast * 1000:.0f}ms, difflib opcodes+unified {baseline * 1000:.0f}ms")
+    assert diff.files[0].stats_add == 50
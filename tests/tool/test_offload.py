@@ -1,7 +1,9 @@
 # pyright: reportPrivateUsage=false
 """Tests for tool output offload module."""
 
+import os
 import tempfile
+import time
 from pathlib import Path
 
 from hypothesis import given, settings
@@ -12,6 +14,7 @@ from klaude_code.tool.core.offload import (
     HeadTailOffloadStrategy,
     OffloadPolicy,
     OffloadResult,
+    OffloadStore,
     ReadToolStrategy,
     get_strategy,
     offload_tool_output,
@@ -103,6 +106,58 @@ class TestHeadTailOffloadStrategy:
             assert result.truncated_chars == 100 - 10 - 10
 
 
+class TestOffloadStore:
+    """Test content-addressed storage of offloaded output."""
+
+    def _strategy(self, tmpdir: str) -> HeadTailOffloadStrategy:
+        return HeadTailOffloadStrategy(max_length=100, head_chars=10, tail_chars=10, offload_dir=tmpdir)
+
+    def test_identical_output_is_written_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            text = "diff --git " + "x" * 500
+            bash = message.ToolCallPart(call_id="c1", tool_name=tools.BASH, arguments_json="{}")
+            agent = message.ToolCallPart(call_id="c2", tool_name="Agent", arguments_json="{}")
+
+            first = self._strategy(tmpdir).process(text, bash)
+            second = self._strategy(tmpdir).process(text, agent)
+            other = self._strategy(tmpdir).process(text + "!", bash)
+
+            assert first.offloaded_path == second.offloaded_path
+            assert first.offloaded_path != other.offloaded_path
+            assert first.offloaded_path is not None
+            assert f"Full output saved to: {first.offloaded_path}" in second.output
+            assert Path(first.offloaded_path).read_text(encoding="utf-8") == text
+            assert sorted(p.name for p in (Path(tmpdir) / "klaude-offload").iterdir()) == sorted(
+                Path(path).name for path in (first.offloaded_path, other.offloaded_path) if path
+            )
+
+    def test_reuse_refreshes_age_and_gc_removes_stale_blobs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = OffloadStore(tmpdir, max_age_sec=60)
+            kept = store.put("kept")
+            stale = store.put("stale")
+            old = time.time() - 3600
+            os.utime(kept, (old, old))
+            os.utime(stale, (old, old))
+
+            assert store.put("kept") == kept
+            assert store.collect_garbage() == 1
+            assert kept.exists()
+            assert not stale.exists()
+
+    def test_falls_back_to_a_file_per_output_when_store_is_unusable(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "klaude-offload").write_text("not a directory")
+            tool_call = message.ToolCallPart(call_id="c1", tool_name=tools.BASH, arguments_json="{}")
+
+            result = self._strategy(tmpdir).process("a" * 200, tool_call)
+
+            assert result.offloaded_path is not None
+            assert Path(result.offloaded_path).parent == Path(tmpdir)
+            assert Path(result.offloaded_path).name.startswith("klaude-bash-")
+            assert Path(result.offloaded_path).read_text() == "a" * 200
+
+
 class TestStrategyRegistry:
     """Test strategy selection via get_strategy."""
 
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from klaude_code.protocol.models import FileStatus
+from klaude_code.tool.core.context import TodoContext, ToolContext
+from klaude_code.tool.shell import bash_tool, persistent_shell
+from klaude_code.tool.shell.bash_tool import BashTool
+from klaude_code.tool.shell.persistent_shell import PersistentShell, ShellExitedError, acquire_persistent_shell
+
+pytestmark = pytest.mark.skipif(os.name != "posix" or shutil.which("bash") is None, reason="requires bash")
+
+
+def _env(tmp_path: Path) -> dict[str, str]:
+    # A private HOME keeps the user's login profile out of the tests.
+    return {"PATH": os.environ.get("PATH", ""), "HOME": str(tmp_path), "LC_ALL": "C"}
+
+
+class _Collector:
+    def __init__(self) -> None:
+        self.chunks: dict[str, list[bytes]] = {"stdout": [], "stderr": []}
+
+    async def __call__(self, stream: str, data: bytes) -> None:
+        self.chunks[stream].append(data)
+
+    def text(self, stream: str) -> str:
+        return b"".join(self.chunks[stream]).decode()
+
+
+def test_persistent_shell_keeps_cwd_and_env_between_commands(tmp_path: Path) -> None:
+    (tmp_path / "sub").mkdir()
+
+    async def _go() -> list[tuple[int, str, str]]:
+        shell = PersistentShell(work_dir=tmp_path, env=_env(tmp_path))
+        results: list[tuple[int, str, str]] = []
+        try:
+            for command in ("cd sub && export GREETING=hi", "pwd; echo $GREETING", "echo oops >&2; false"):
+                out = _Collector()
+                rc = await shell.run(command, timeout_sec=10, on_output=out)
+                results.append((rc, out.text("stdout"), out.text("stderr")))
+            assert shell.spawn_count == 1
+        finally:
+            await shell.close()
+        return results
+
+    first, second, third = asyncio.run(_go())
+
+    assert first == (0, "", "")
+    assert second == (0, f"{(tmp_path / 'sub').resolve()}\nhi\n", "")
+    assert third == (1, "", "oops\n")
+
+
+def test_persistent_shell_survives_unbalanced_quotes(tmp_path: Path) -> None:
+    async def _go() -> tuple[int, int, str]:
+        shell = PersistentShell(work_dir=tmp_path, env=_env(tmp_path))
+        try:
+            bad = await shell.run("echo 'unterminated", timeout_sec=10, on_output=_Collector())
+            out = _Collector()
+            good = await shell.run("echo ok", timeout_sec=10, on_output=out)
+            return bad, good, out.text("stdout")
+        finally:
+            await shell.close()
+
+    bad, good, stdout = asyncio.run(_go())
+
+    assert bad != 0
+    assert (good, stdout) == (0, "ok\n")
+
+
+def test_persistent_shell_respawns_in_last_cwd_after_timeout(tmp_path: Path) -> None:
+    (tmp_path / "sub").mkdir()
+
+    async def _go() -> str:
+        shell = PersistentShell(work_dir=tmp_path, env=_env(tmp_path))
+        try:
+            await shell.run("cd sub", timeout_sec=10, on_output=_Collector())
+            with pytest.raises(TimeoutError):
+                await shell.run("sleep 30", timeout_sec=0.3, on_output=_Collector())
+            assert not shell.alive
+            out = _Collector()
+            await shell.run("pwd", timeout_sec=10, on_output=out)
+            assert shell.spawn_count == 2
+            return out.text("stdout")
+        finally:
+            await shell.close()
+
+    assert asyncio.run(_go()) == f"{(tmp_path / 'sub').resolve()}\n"
+
+
+def test_persistent_shell_reports_exit_and_respawns(tmp_path: Path) -> None:
+    async def _go() -> tuple[int, str]:
+        shell = PersistentShell(work_dir=tmp_path, env=_env(tmp_path))
+        try:
+            with pytest.raises(ShellExitedError) as exc_info:
+                await shell.run("echo bye; exit 3", timeout_sec=10, on_output=_Collector())
+            out = _Collector()
+            await shell.run("echo back", timeout_sec=10, on_output=out)
+            return exc_info.value.returncode, out.text("stdout")
+        finally:
+            await shell.close()
+
+    assert asyncio.run(_go()) == (3, "back\n")
+
+
+def test_background_output_between_commands_is_not_attributed_to_the_next(tmp_path: Path) -> None:
+    async def _go() -> str:
+        shell = PersistentShell(work_dir=tmp_path, env=_env(tmp_path))
+        try:
+            await shell.run("(sleep 0.1; echo late; echo late >&2) &", timeout_sec=10, on_output=_Collector())
+            await asyncio.sleep(0.5)
+            out = _Collector()
+            await shell.run("echo next", timeout_sec=10, on_output=out)
+            assert out.text("stderr") == ""
+            return out.text("stdout")
+        finally:
+            await shell.close()
+
+    assert asyncio.run(_go()) == "next\n"
+
+
+def test_idle_shell_keeps_draining_a_chatty_background_job(tmp_path: Path) -> None:
+    finished = tmp_path / "finished"
+
+    async def _go() -> str:
+        shell = PersistentShell(work_dir=tmp_path, env=_env(tmp_path))
+        try:
+            # Far more than a pipe buffer: the job blocks unless someone reads while idle.
+            await shell.run(f"(head -c 4000000 /dev/zero; touch {finished}) &", timeout_sec=10, on_output=_Collector())
+            deadline = time.monotonic() + 10
+            while not finished.exists() and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            assert finished.exists()
+            out = _Collector()
+            await shell.run("echo next", timeout_sec=10, on_output=out)
+            return out.text("stdout")
+        finally:
+            await shell.close()
+
+    assert asyncio.run(_go()) == "next\n"
+
+
+def test_overlapped_bash_calls_queue_on_the_shell_after_cd(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "marker.txt").write_text("in sub\n")
+    (tmp_path / "marker.txt").write_text("in root\n")
+    monkeypatch.setattr(bash_tool, "BASH_PERSISTENT_SHELL_ENABLED", True)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    file_tracker: dict[str, FileStatus] = {}
+    context = ToolContext(
+        file_tracker=file_tracker,
+        todo_context=TodoContext(get_todos=lambda: [], set_todos=lambda todos: None),
+        session_id="overlap-session",
+        work_dir=tmp_path,
+    )
+
+    async def _go() -> list[str]:
+        try:
+            await BashTool.call(json.dumps({"command": "cd sub"}), context)
+            shell = acquire_persistent_shell("overlap-session", work_dir=tmp_path, env=_env(tmp_path))
+            results = await asyncio.gather(
+                *(BashTool.call(json.dumps({"command": "cat marker.txt"}), context) for _ in range(2))
+            )
+            assert shell.spawn_count == 1
+            return [result.output_text for result in results]
+        finally:
+            await persistent_shell.close_persistent_shell("overlap-session")
+
+    assert asyncio.run(_go()) == ["in sub", "in sub"]
+    # The read is tracked against the shell's directory, not the session's work_dir.
+    assert [Path(path).resolve() for path in file_tracker] == [(tmp_path / "sub" / "marker.txt").resolve()]
+
+
+@pytest.mark.benchmark
+def test_benchmark_persistent_shell_vs_one_shot(tmp_path: Path) -> None:
+    iterations = 500
+    env = _env(tmp_path)
+
+    async def _one_shot() -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            proc = await asyncio.create_subprocess_exec(
+                "bash",
+                "-lc",
+                "true",
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                cwd=tmp_path,
+            )
+            await proc.communicate()
+        return time.perf_counter() - start
+
+    async def _persistent() -> float:
+        shell = PersistentShell(work_dir=tmp_path, env=env)
+        try:
+            await shell.run("true", timeout_sec=10, on_output=_Collector())
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await shell.run("true", timeout_sec=10, on_output=_Collector())
+            return time.perf_counter() - start
+        finally:
+            await shell.close()
+
+    one_shot = asyncio.run(_one_shot())
+    persistent = asyncio.run(_persistent())
+    print(
+        f"\n{iterations} trivial commands: one-shot {one_shot * 1000:.0f}ms, "
+        f"persistent {persistent * 1000:.0f}ms ({one_shot / persistent:.1f}x)"
+    )
+    assert persistent < one_shot
@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import os
 import shutil
+import time
 from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
@@ -22,7 +24,7 @@ from klaude_code.protocol.models import (
     ToolSideEffect,
     Usage,
 )
-from klaude_code.tool.core.abc import ToolABC, ToolConcurrencyPolicy, ToolMetadata
+from klaude_code.tool.core.abc import ToolABC, ToolConcurrencyPolicy, ToolMetadata, ToolResourceAccess
 from klaude_code.tool.core.context import TodoContext, ToolContext
 from klaude_code.tool.core.runner import (
     ToolCallRequest,
@@ -618,6 +620,196 @@ class TestToolExecutor:
         assert events == []
 
 
+class TestToolExecutorScheduling:
+    """Overlapping of non-conflicting calls within the sequential group."""
+
+    @staticmethod
+    def _path_tool(name: str, *, read_only: bool, log: list[str]) -> type[ToolABC]:
+        class PathTool(ToolABC):
+            @classmethod
+            def resource_access(cls, arguments: str, work_dir: Path) -> ToolResourceAccess | None:
+                del work_dir
+                return ToolResourceAccess(read_only=read_only, paths=frozenset({json.loads(arguments)["path"]}))
+
+            @classmethod
+            def schema(cls) -> llm_param.ToolSchema:
+                return llm_param.ToolSchema(name=name, type="function", description=name, parameters={})
+
+            @classmethod
+            async def call(cls, arguments: str, context: ToolContext) -> message.ToolResultMessage:
+                args = json.loads(arguments)
+                log.append(f"start:{name}:{args['path']}")
+                if context.emit_tool_output_delta is not None:
+                    await context.emit_tool_output_delta(f"{name}:{args['path']}")
+                await asyncio.sleep(args.get("delay", 0.1))
+                log.append(f"end:{name}:{args['path']}")
+                return message.ToolResultMessage(status="success", output_text=f"{name}:{args['path']}")
+
+        return PathTool
+
+    @staticmethod
+    def _call(call_id: str, tool_name: str, path: str, delay: float = 0.1) -> ToolCallRequest:
+        return ToolCallRequest(
+            response_id=None,
+            call_id=call_id,
+            tool_name=tool_name,
+            arguments_json=json.dumps({"path": path, "delay": delay}),
+        )
+
+    def test_independent_reads_overlap_and_keep_call_order(self) -> None:
+        log: list[str] = []
+        history: list[message.HistoryEvent] = []
+        executor = ToolExecutor(
+            context=_tool_context(),
+            registry={"Reader": self._path_tool("Reader", read_only=True, log=log)},
+            append_history=history.extend,
+        )
+        # The first read is the slowest, so later reads finish ahead of their turn.
+        calls = [
+            self._call("r1", "Reader", "/a", delay=0.3),
+            self._call("r2", "Reader", "/b", delay=0.1),
+            self._call("r3", "Reader", "/c", delay=0.1),
+        ]
+
+        async def collect_events() -> list[ToolExecutorEvent]:
+            return [event async for event in executor.run_tools(calls)]
+
+        started = time.monotonic()
+        events = arun(collect_events())
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 0.45
+        assert [type(e).__name__ for e in events] == [
+            "ToolExecutionCallStarted",
+            "ToolExecutionOutputDelta",
+            "ToolExecutionResult",
+        ] * 3
+        results = [e for e in events if isinstance(e, ToolExecutionResult)]
+        assert [r.tool_call.call_id for r in results] == ["r1", "r2", "r3"]
+        assert [r.is_last_in_step for r in results] == [False, False, True]
+        assert [item.call_id for item in history if isinstance(item, message.ToolResultMessage)] == ["r1", "r2", "r3"]
+
+    def test_writer_waits_for_readers_of_same_path(self) -> None:
+        log: list[str] = []
+        executor = ToolExecutor(
+            context=_tool_context(),
+            registry={
+                "Reader": self._path_tool("Reader", read_only=True, log=log),
+                "Writer": self._path_tool("Writer", read_only=False, log=log),
+            },
+            append_history=lambda items: None,
+        )
+        calls = [
+            self._call("r1", "Reader", "/a"),
+            self._call("r2", "Reader", "/b"),
+            self._call("w1", "Writer", "/a"),
+            self._call("r3", "Reader", "/a"),
+        ]
+
+        async def collect_events() -> list[ToolExecutorEvent]:
+            return [event async for event in executor.run_tools(calls)]
+
+        arun(collect_events())
+
+        assert log.index("end:Reader:/a") < log.index("start:Writer:/a")
+        assert log.index("end:Writer:/a") < len(log) - 1 - log[::-1].index("start:Reader:/a")
+        # The unrelated read overlaps the first one.
+        assert log.index("start:Reader:/b") < log.index("end:Reader:/a")
+
+    def test_calls_without_resource_access_stay_exclusive(self) -> None:
+        log: list[str] = []
+        executor = ToolExecutor(
+            context=_tool_context(),
+            registry={"Reader": self._path_tool("Reader", read_only=True, log=log), "MockSuccess": MockSuccessTool},
+            append_history=lambda items: None,
+        )
+        calls = [
+            self._call("r1", "Reader", "/a"),
+            ToolCallRequest(response_id=None, call_id="s1", tool_name="MockSuccess", arguments_json="{}"),
+            self._call("r2", "Reader", "/b"),
+        ]
+
+        assert executor._plan_sequential_dependencies(calls) == [frozenset(), frozenset({0}), frozenset({1})]
+
+    def test_interrupt_keeps_results_finished_ahead_of_their_turn(self) -> None:
+        log: list[str] = []
+        history: list[message.HistoryEvent] = []
+        executor = ToolExecutor(
+            context=_tool_context(),
+            registry={"Reader": self._path_tool("Reader", read_only=True, log=log)},
+            append_history=history.extend,
+        )
+        calls = [
+            self._call("r1", "Reader", "/a", delay=5),
+            self._call("r2", "Reader", "/b", delay=0.01),
+        ]
+
+        async def _test() -> list[ToolExecutorEvent]:
+            seen: list[ToolExecutorEvent] = []
+
+            async def consume() -> None:
+                async for event in executor.run_tools(calls):
+                    seen.append(event)
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return list(executor.on_interrupt())
+
+        events = arun(_test())
+
+        results = {e.tool_call.call_id: e.tool_result for e in events if isinstance(e, ToolExecutionResult)}
+        assert results["r1"].status == "aborted"
+        assert results["r2"].status == "success"
+        assert results["r2"].output_text == "Reader:/b"
+        assert [item.call_id for item in history if isinstance(item, message.ToolResultMessage)] == ["r1", "r2"]
+
+    def test_dependents_of_a_cancelled_call_never_start(self) -> None:
+        log: list[str] = []
+
+        class CancelledReader(ToolABC):
+            @classmethod
+            def resource_access(cls, arguments: str, work_dir: Path) -> ToolResourceAccess | None:
+                del arguments, work_dir
+                return ToolResourceAccess(read_only=True, paths=frozenset({"/a"}))
+
+            @classmethod
+            def schema(cls) -> llm_param.ToolSchema:
+                return llm_param.ToolSchema(name="CancelledReader", type="function", description="", parameters={})
+
+            @classmethod
+            async def call(cls, arguments: str, context: ToolContext) -> message.ToolResultMessage:
+                del arguments, context
+                await asyncio.sleep(0.05)
+                raise asyncio.CancelledError
+
+        executor = ToolExecutor(
+            context=_tool_context(),
+            registry={
+                "Reader": self._path_tool("Reader", read_only=True, log=log),
+                "Writer": self._path_tool("Writer", read_only=False, log=log),
+                "CancelledReader": CancelledReader,
+            },
+            append_history=lambda items: None,
+        )
+        # The slow first read keeps the emitting loop busy while the second call fails.
+        calls = [
+            self._call("r0", "Reader", "/b", delay=0.3),
+            ToolCallRequest(response_id=None, call_id="c1", tool_name="CancelledReader", arguments_json="{}"),
+            self._call("w1", "Writer", "/a"),
+        ]
+
+        async def collect_events() -> list[ToolExecutorEvent]:
+            return [event async for event in executor.run_tools(calls)]
+
+        with pytest.raises(asyncio.CancelledError):
+            arun(collect_events())
+
+        assert "start:Writer:/a" not in log
+
+
 class TestToolExecutorPartition:
     """Test ToolExecutor._partition_tool_calls static method."""
 
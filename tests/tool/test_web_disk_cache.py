@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from klaude_code.protocol import message
+from klaude_code.tool import WebFetchTool
+from klaude_code.tool.core.context import TodoContext, ToolContext
+from klaude_code.tool.web import web_cache
+from klaude_code.tool.web import web_fetch_tool as web_fetch_module
+from klaude_code.tool.web.web_cache import WebCacheEntry, WebDiskCache, make_cache_key
+
+_PAGE = b"<html><head><title>Docs</title></head><body><article><h1>Install</h1>" + b"<p>Run pip install.</p>" * 20
+_PAGE += b"</article></body></html>"
+
+
+class _DocsServer(ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _DocsHandler)
+        self.etag: str | None = '"v1"'
+        self.last_modified: str | None = None
+        self.body = _PAGE
+        self.requests: list[dict[str, str]] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/docs/install"
+
+
+class _DocsHandler(BaseHTTPRequestHandler):
+    server: _DocsServer
+
+    def do_GET(self) -> None:
+        server = self.server
+        server.requests.append(dict(self.headers.items()))
+        not_modified = (server.etag is not None and self.headers.get("If-None-Match") == server.etag) or (
+            server.last_modified is not None and self.headers.get("If-Modified-Since") == server.last_modified
+        )
+        self.send_response(304 if not_modified else 200)
+        if server.etag is not None:
+            self.send_header("ETag", server.etag)
+        if server.last_modified is not None:
+            self.send_header("Last-Modified", server.last_modified)
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(server.body)))
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        del format, args
+
+
+@pytest.fixture
+def docs_server() -> Iterator[_DocsServer]:
+    server = _DocsServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def disk_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[WebDiskCache]:
+    cache = WebDiskCache(tmp_path / "web", max_bytes=1024 * 1024)
+    monkeypatch.setattr(web_cache, "_disk_cache", cache)
+    # The local test server is on loopback, which the SSRF guard rejects.
+    monkeypatch.setattr(web_fetch_module, "check_ssrf", lambda _url: None)
+    monkeypatch.setattr(web_fetch_module, "WEB_FETCH_SAVE_DIR", tmp_path / "saved")
+    web_cache._cache.clear()  # pyright: ignore[reportPrivateUsage]
+    yield cache
+    web_cache._cache.clear()  # pyright: ignore[reportPrivateUsage]
+
+
+def _fetch(url: str) -> message.ToolResultMessage:
+    """Fetch as a new session would: nothing in this process's memory cache."""
+    web_cache._cache.clear()  # pyright: ignore[reportPrivateUsage]
+    todo_context = TodoContext(get_todos=lambda: [], set_todos=lambda todos: None)
+    context = ToolContext(file_tracker={}, todo_context=todo_context, session_id="test", work_dir=Path("/tmp"))
+    args = WebFetchTool.WebFetchArguments(url=url).model_dump_json()
+    return asyncio.run(WebFetchTool.call(args, context))
+
+
+def _expire(cache: WebDiskCache, key: str) -> None:
+    entry = cache.get(key)
+    assert entry is not None
+    cache.put(key, WebCacheEntry(entry.value, entry.stored_at - 3600, entry.etag, entry.last_modified))
+
+
+class TestWebDiskCache:
+    def test_round_trip_and_miss(self, tmp_path: Path) -> None:
+        cache = WebDiskCache(tmp_path, max_bytes=10_000)
+        cache.put("fetch|a", WebCacheEntry("markdown", stored_at=123.0, etag='"x"'))
+
+        assert cache.get("fetch|a") == WebCacheEntry("markdown", stored_at=123.0, etag='"x"')
+        assert cache.get("fetch|b") is None
+        assert not WebCacheEntry("markdown", stored_at=123.0).is_fresh()
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path) -> None:
+        cache = WebDiskCache(tmp_path, max_bytes=10_000)
+        cache.put("fetch|a", WebCacheEntry("markdown", stored_at=time.time()))
+        next(tmp_path.glob("*.json")).write_text("{not json", encoding="utf-8")
+
+        assert cache.get("fetch|a") is None
+
+    def test_least_recently_used_entries_are_evicted_by_size(self, tmp_path: Path) -> None:
+        cache = WebDiskCache(tmp_path, max_bytes=3000)
+        for name in ("a", "b", "c"):
+            cache.put(name, WebCacheEntry("x" * 800, stored_at=time.time()))
+        # Age the files so that reading "a" makes it the most recently used.
+        for index, path in enumerate(sorted(tmp_path.glob("*.json"), key=lambda p: p.stat().st_mtime)):
+            os.utime(path, (1000 + index, 1000 + index))
+        assert cache.get("a") is not None
+
+        cache.put("d", WebCacheEntry("x" * 800, stored_at=time.time()))
+
+        assert cache.get("b") is None
+        assert all(cache.get(name) is not None for name in ("a", "c", "d"))
+        assert sum(path.stat().st_size for path in tmp_path.glob("*.json")) <= 3000
+
+    def test_entry_larger_than_budget_is_not_stored(self, tmp_path: Path) -> None:
+        cache = WebDiskCache(tmp_path, max_bytes=100)
+        cache.put("big", WebCacheEntry("x" * 500, stored_at=time.time()))
+
+        assert cache.get("big") is None
+
+
+class TestWebFetchPersistentCache:
+    def test_fresh_entry_skips_the_request_and_the_conversion(
+        self, docs_server: _DocsServer, disk_cache: WebDiskCache
+    ) -> None:
+        first = _fetch(docs_server.url)
+        assert first.status == "success"
+        assert first.output_text is not None and "Install" in first.output_text
+
+        with patch.object(web_fetch_module, "_convert_html_to_markdown", side_effect=AssertionError):
+            second = _fetch(docs_server.url)
+
+        assert second.output_text == first.output_text
+        assert len(docs_server.requests) == 1
+
+    def test_expired_entry_is_revalidated_with_etag(self, docs_server: _DocsServer, disk_cache: WebDiskCache) -> None:
+        first = _fetch(docs_server.url)
+        key = make_cache_key("fetch", docs_server.url)
+        _expire(disk_cache, key)
+
+        with patch.object(web_fetch_module, "_convert_html_to_markdown", side_effect=AssertionError):
+            second = _fetch(docs_server.url)
+
+        assert second.output_text == first.output_text
+        assert docs_server.requests[-1].get("If-None-Match") == '"v1"'
+        entry = disk_cache.get(key)
+        assert entry is not None and entry.is_fresh()
+
+    def test_changed_page_is_downloaded_again(self, docs_server: _DocsServer, disk_cache: WebDiskCache) -> None:
+        docs_server.etag = None
+        docs_server.last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        _fetch(docs_server.url)
+        key = make_cache_key("fetch", docs_server.url)
+        _expire(disk_cache, key)
+
+        docs_server.last_modified = "Thu, 02 Jan 2025 00:00:00 GMT"
+        docs_server.body = _PAGE.replace(b"Install", b"Upgrade")
+        result = _fetch(docs_server.url)
+
+        assert docs_server.requests[-1].get("If-Modified-Since") == "Wed, 01 Jan 2025 00:00:00 GMT"
+        assert result.output_text is not None and "Upgrade" in result.output_text
+        entry = disk_cache.get(key)
+        assert entry is not None and entry.last_modified == "Thu, 02 Jan 2025 00:00:00 GMT"
+
+    def test_expired_entry_without_validators_is_refetched(
+        self, docs_server: _DocsServer, disk_cache: WebDiskCache
+    ) -> None:
+        docs_server.etag = None
+        _fetch(docs_server.url)
+        _expire(disk_cache, make_cache_key("fetch", docs_server.url))
+
+        _fetch(docs_server.url)
+
+        assert len(docs_server.requests) == 2
+        assert "If-None-Match" not in docs_server.requests[-1]
+        assert "If-Modified-Since" not in docs_server.requests[-1]
+
+
+@pytest.mark.benchmark
+def test_benchmark_repeated_fetch_across_sessions(docs_server: _DocsServer, disk_cache: WebDiskCache) -> None:
+    docs_server.body = _PAGE.replace(b"<p>Run pip install.</p>" * 20, b"<p>Run pip install.</p>" * 5000)
+    rounds = 5
+
+    def _timed(enabled: bool) -> float:
+        web_cache._disk_cache = disk_cache if enabled else None  # pyright: ignore[reportPrivateUsage]
+        _fetch(docs_server.url)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            _fetch(docs_server.url)
+        return (time.perf_counter() - started) / rounds
+
+    uncached = _timed(enabled=False)
+    cached = _timed(enabled=True)
+    print(
+        f"\nfetch of a {len(docs_server.body) // 1024}KiB page: {uncached * 1000:.1f}ms, disk hit {cached * 1000:.1f}ms"
+    )
+    assert cached < uncached
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import urllib.request
+from collections.abc import Callable, Coroutine, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from klaude_code.protocol import message
+from klaude_code.tool import WebFetchTool
+from klaude_code.tool.core.context import TodoContext, ToolContext
+from klaude_code.tool.web import fetch_client as fetch_client_module
+from klaude_code.tool.web import web_cache
+from klaude_code.tool.web import web_fetch_tool as web_fetch_module
+from klaude_code.tool.web.fetch_client import FetchClient, get_fetch_client
+
+_BODY = b"<html><body><article><h1>Page</h1>" + b"<p>Some documentation text.</p>" * 200 + b"</article></body></html>"
+
+
+class _KeepAliveServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency_s: float) -> None:
+        super().__init__(("127.0.0.1", 0), _KeepAliveHandler)
+        self.latency_s = latency_s
+        self.connections = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def url(self, index: int) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/page/{index}"
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are separate writes on a kept-alive socket
+    server: _KeepAliveServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            time.sleep(server.latency_s)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, format: str, *args: object) -> None:
+        del format, args
+
+
+@pytest.fixture
+def server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[_KeepAliveServer]:
+    # The local test server is on loopback, which the SSRF guard rejects.
+    monkeypatch.setattr(web_fetch_module, "check_ssrf", lambda _url: None)
+    monkeypatch.setattr(web_fetch_module, "WEB_FETCH_SAVE_DIR", tmp_path)
+    web_cache._cache.clear()  # pyright: ignore[reportPrivateUsage]
+    server = _KeepAliveServer(latency_s=0.005)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        web_cache._cache.clear()  # pyright: ignore[reportPrivateUsage]
+
+
+def _context() -> ToolContext:
+    todo_context = TodoContext(get_todos=lambda: [], set_todos=lambda todos: None)
+    return ToolContext(file_tracker={}, todo_context=todo_context, session_id="test", work_dir=Path("/tmp"))
+
+
+async def _fetch_all(urls: list[str]) -> list[message.ToolResultMessage]:
+    calls = [WebFetchTool.call(WebFetchTool.WebFetchArguments(url=url).model_dump_json(), _context()) for url in urls]
+    return await asyncio.gather(*calls)
+
+
+def test_concurrent_fetches_share_connections_within_the_per_host_limit(
+    server: _KeepAliveServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def _test() -> list[message.ToolResultMessage]:
+        fetch_client_module._clients[asyncio.get_running_loop()] = FetchClient(max_per_host=3)  # pyright: ignore[reportPrivateUsage]
+        return await _fetch_all([server.url(index) for index in range(30)])
+
+    results = asyncio.run(_test())
+
+    assert all(result.status == "success" for result in results)
+    assert server.requests == 30
+    assert server.peak_in_flight <= 3
+    assert server.connections <= 3
+
+
+def test_each_event_loop_gets_its_own_client() -> None:
+    async def _client() -> FetchClient:
+        first = get_fetch_client()
+        assert get_fetch_client() is first
+        return first
+
+    assert asyncio.run(_client()) is not asyncio.run(_client())
+
+
+def test_conversion_runs_in_the_worker_pool(server: _KeepAliveServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    threads: list[str] = []
+    original = web_fetch_module._process_content  # pyright: ignore[reportPrivateUsage]
+
+    def _recording(content_type: str, text: str) -> str:
+        threads.append(threading.current_thread().name)
+        return original(content_type, text)
+
+    monkeypatch.setattr(web_fetch_module, "_process_content", _recording)
+
+    results = asyncio.run(_fetch_all([server.url(0)]))
+
+    assert results[0].status == "success"
+    assert threads and threads[0].startswith("klaude-webfetch")
+
+
+@pytest.mark.benchmark
+def test_benchmark_hundred_concurrent_fetches(server: _KeepAliveServer) -> None:
+    urls = [server.url(index) for index in range(100)]
+
+    def _timed(fetch_all: Callable[[], Coroutine[Any, Any, object]]) -> tuple[float, int]:
+        connections = server.connections
+        started = time.perf_counter()
+        asyncio.run(fetch_all())
+        return time.perf_counter() - started, server.connections - connections
+
+    async def _per_request_urllib() -> None:
+        # The previous approach: a fresh urllib connection per fetch, each in a thread.
+        def _get(url: str) -> bytes:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                return response.read()
+
+        await asyncio.gather(*(asyncio.to_thread(_get, url) for url in urls))
+
+    async def _pooled() -> None:
+        await asyncio.gather(*(web_fetch_module._fetch_url(url) for url in urls))  # pyright: ignore[reportPrivateUsage]
+
+    baseline, baseline_connections = _timed(_per_request_urllib)
+    pooled, pooled_connections = _timed(_pooled)
+
+    # Sub-agents share one loop in practice; later batches reuse the warm pool.
+    async def _pooled_twice() -> None:
+        await _pooled()
+        started = time.perf_counter()
+        await _pooled()
+        nonlocal warm
+        warm = time.perf_counter() - started
+
+    warm = 0.0
+    _timed(_pooled_twice)
+
+    print(
+        f"\n100 concurrent fetches: urllib per request {baseline * 1000:.0f}ms over {baseline_connections} "
+        f"connections; pooled client {pooled * 1000:.0f}ms over {pooled_connections} connections, "
+        f"{warm * 1000:.0f}ms with a warm pool"
+    )
+    assert pooled_connections < baseline_connections
@@ -4,29 +4,31 @@ import asyncio
 import gzip as gzip_module
 import json
 import socket
-import urllib.error
-import urllib.request
+from collections.abc import AsyncIterator, Callable
 from pathlib import Path
-from typing import Any, cast
 from unittest.mock import patch
 
+import httpx
+import pytest
+
 from klaude_code.tool import WebFetchTool
 from klaude_code.tool.core.context import TodoContext, ToolContext
 from klaude_code.tool.web.external_content import (
     _BOUNDARY_END,  # pyright: ignore[reportPrivateUsage]
     _BOUNDARY_START,  # pyright: ignore[reportPrivateUsage]
 )
+from klaude_code.tool.web.fetch_client import FetchClient
 from klaude_code.tool.web.web_cache import _cache as web_cache  # pyright: ignore[reportPrivateUsage]
 from klaude_code.tool.web.web_fetch_tool import (
     _READABILITY_MAX_HTML_CHARS,  # pyright: ignore[reportPrivateUsage]
     _RETRY_HTTP_STATUS_CODES,  # pyright: ignore[reportPrivateUsage]
     _convert_html_to_markdown,  # pyright: ignore[reportPrivateUsage]
     _decode_content,  # pyright: ignore[reportPrivateUsage]
-    _decompress,  # pyright: ignore[reportPrivateUsage]
     _encode_url,  # pyright: ignore[reportPrivateUsage]
     _extract_content_type_and_charset,  # pyright: ignore[reportPrivateUsage]
     _fetch_url,  # pyright: ignore[reportPrivateUsage]
     _fetch_url_with_retry,  # pyright: ignore[reportPrivateUsage]
+    _FetchResult,  # pyright: ignore[reportPrivateUsage]
     _format_json,  # pyright: ignore[reportPrivateUsage]
     _html_to_markdown_fallback,  # pyright: ignore[reportPrivateUsage]
     _is_pdf_url,  # pyright: ignore[reportPrivateUsage]
@@ -44,11 +46,7 @@ class TestHelperFunctions:
     """Test helper functions for content processing."""
 
     def test_extract_content_type_simple(self) -> None:
-        class MockResponse:
-            def getheader(self, name: str, default: str = "") -> str:
-                return "text/html"
-
-        content_type, charset = _extract_content_type_and_charset(cast(Any, MockResponse()))
+        content_type, charset = _extract_content_type_and_charset("text/html")
         assert content_type == "text/html"
         assert charset is None
 
@@ -59,20 +57,12 @@ class TestHelperFunctions:
         assert "%252F" not in encoded
 
     def test_extract_content_type_with_charset(self) -> None:
-        class MockResponse:
-            def getheader(self, name: str, default: str = "") -> str:
-                return "text/html; charset=utf-8"
-
-        content_type, charset = _extract_content_type_and_charset(cast(Any, MockResponse()))
+        content_type, charset = _extract_content_type_and_charset("text/html; charset=utf-8")
         assert content_type == "text/html"
         assert charset == "utf-8"
 
     def test_extract_content_type_empty(self) -> None:
-        class MockResponse:
-            def getheader(self, name: str, default: str = "") -> str:
-                return default
-
-        content_type, charset = _extract_content_type_and_charset(cast(Any, MockResponse()))
+        content_type, charset = _extract_content_type_and_charset("")
         assert content_type == ""
         assert charset is None
 
@@ -248,8 +238,8 @@ class TestWebFetchTool:
         """Successful fetch should wrap content with security boundaries."""
         web_cache.clear()
 
-        def fake_fetch(*_args: object, **_kwargs: object) -> tuple[str, bytes, str | None]:
-            return ("text/plain", b"Hello from the web", "utf-8")
+        def fake_fetch(*_args: object, **_kwargs: object) -> _FetchResult:
+            return _FetchResult("text/plain", b"Hello from the web", "utf-8")
 
         with patch("klaude_code.tool.web.web_fetch_tool._fetch_url", side_effect=fake_fetch):
             args = WebFetchTool.WebFetchArguments(url="https://example.com/page").model_dump_json()
@@ -265,10 +255,10 @@ class TestWebFetchTool:
         web_cache.clear()
         call_count = 0
 
-        def fake_fetch(*_args: object, **_kwargs: object) -> tuple[str, bytes, str | None]:
+        def fake_fetch(*_args: object, **_kwargs: object) -> _FetchResult:
             nonlocal call_count
             call_count += 1
-            return ("text/plain", b"cached content", "utf-8")
+            return _FetchResult("text/plain", b"cached content", "utf-8")
 
         with patch("klaude_code.tool.web.web_fetch_tool._fetch_url", side_effect=fake_fetch):
             args = WebFetchTool.WebFetchArguments(url="https://example.com/cached").model_dump_json()
@@ -279,108 +269,69 @@ class TestWebFetchTool:
             assert call_count == 1  # Only fetched once
 
 
-class TestFetchUrlRedirectHandling:
-    def test_follow_redirect_http_errors_and_reuse_single_opener(self) -> None:
-        class MockResponse:
-            def __init__(self, status: int, headers: dict[str, str], data: bytes) -> None:
-                self.status = status
-                self._headers = headers
-                self._data = data
-
-            def getheader(self, name: str, default: str = "") -> str:
-                return self._headers.get(name, default)
-
-            def read(self, _size: int = -1) -> bytes:
-                return self._data
-
-            def close(self) -> None:
-                return None
-
-        class MockOpener:
-            def __init__(self) -> None:
-                self.calls = 0
-
-            def open(self, req: urllib.request.Request, timeout: int = 30) -> MockResponse:
-                del timeout
-                self.calls += 1
-                url = req.full_url
-                if self.calls == 1:
-                    raise urllib.error.HTTPError(
-                        url=url,
-                        code=302,
-                        msg="Found",
-                        hdrs=cast(Any, {"Location": "https://accounts.feishu.cn/login"}),
-                        fp=None,
-                    )
-                if self.calls == 2:
-                    raise urllib.error.HTTPError(
-                        url=url,
-                        code=302,
-                        msg="Found",
-                        hdrs=cast(Any, {"Location": "https://my.feishu.cn/wiki/doc?login_redirect_times=1"}),
-                        fp=None,
-                    )
-                return MockResponse(
-                    status=200,
-                    headers={"Content-Type": "text/plain; charset=utf-8"},
-                    data=b"ok",
-                )
-
-        mock_opener = MockOpener()
+def _mock_client(handler: Callable[[httpx.Request], httpx.Response]) -> FetchClient:
+    return FetchClient(transport=httpx.MockTransport(handler))
 
-        with (
-            patch(
-                "klaude_code.tool.web.web_fetch_tool.urllib.request.build_opener", return_value=mock_opener
-            ) as patched_build,
-            patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None),
-        ):
-            content_type, data, charset = _fetch_url("https://my.feishu.cn/wiki/doc")
+
+def _redirect(location: str) -> httpx.Response:
+    return httpx.Response(302, headers={"Location": location})
+
+
+class TestFetchUrlRedirectHandling:
+    def test_follow_redirects_on_one_pooled_client(self) -> None:
+        requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            if len(requested) == 1:
+                return _redirect("https://accounts.feishu.cn/login")
+            if len(requested) == 2:
+                return _redirect("https://my.feishu.cn/wiki/doc?login_redirect_times=1")
+            return httpx.Response(200, headers={"Content-Type": "text/plain; charset=utf-8"}, content=b"ok")
+
+        with patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None) as ssrf:
+            content_type, data, charset, *_ = asyncio.run(
+                _fetch_url("https://my.feishu.cn/wiki/doc", client=_mock_client(handler))
+            )
 
         assert content_type == "text/plain"
         assert charset == "utf-8"
         assert data == b"ok"
-        assert mock_opener.calls == 3
-        assert patched_build.call_count == 1
+        assert len(requested) == 3
+        assert ssrf.call_count == 3  # every hop is checked
 
     def test_too_many_redirects_returns_error(self) -> None:
-        class LoopOpener:
-            def open(self, req: urllib.request.Request, timeout: int = 30) -> object:
-                del timeout
-                url = req.full_url
-                raise urllib.error.HTTPError(
-                    url=url,
-                    code=302,
-                    msg="Found",
-                    hdrs=cast(Any, {"Location": "https://my.feishu.cn/wiki/doc"}),
-                    fp=None,
-                )
+        def handler(request: httpx.Request) -> httpx.Response:
+            del request
+            return _redirect("https://my.feishu.cn/wiki/doc")
 
         with (
-            patch("klaude_code.tool.web.web_fetch_tool.urllib.request.build_opener", return_value=LoopOpener()),
             patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None),
+            pytest.raises(httpx.TooManyRedirects, match="Too many redirects"),
         ):
-            try:
-                _fetch_url("https://my.feishu.cn/wiki/doc", max_redirects=2)
-                raise AssertionError("Expected URLError")
-            except urllib.error.URLError as e:
-                assert "Too many redirects" in str(e.reason)
+            asyncio.run(_fetch_url("https://my.feishu.cn/wiki/doc", max_redirects=2, client=_mock_client(handler)))
 
-    def test_feishu_style_multi_hop_redirect_chain(self) -> None:
-        class MockResponse:
-            def __init__(self, status: int, headers: dict[str, str], data: bytes) -> None:
-                self.status = status
-                self._headers = headers
-                self._data = data
+    def test_cookies_set_by_a_hop_are_sent_on_the_next_only_within_one_fetch(self) -> None:
+        seen_cookies: list[str | None] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_cookies.append(request.headers.get("Cookie"))
+            if request.url.path == "/login":
+                return httpx.Response(302, headers={"Location": "/doc", "Set-Cookie": "session=abc; Path=/"})
+            return httpx.Response(200, headers={"Content-Type": "text/plain"}, content=b"doc")
+
+        client = _mock_client(handler)
+        with patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None):
 
-            def getheader(self, name: str, default: str = "") -> str:
-                return self._headers.get(name, default)
+            async def _twice() -> None:
+                await _fetch_url("https://example.com/login", client=client)
+                await _fetch_url("https://example.com/doc", client=client)
 
-            def read(self, _size: int = -1) -> bytes:
-                return self._data
+            asyncio.run(_twice())
 
-            def close(self) -> None:
-                return None
+        assert seen_cookies == [None, "session=abc", None]
 
+    def test_feishu_style_multi_hop_redirect_chain(self) -> None:
         start_url = "https://my.feishu.cn/wiki/Pi3ZwnUUziWu3NkDi0acXrnInRg"
         redirects = [
             "https://accounts.feishu.cn/accounts/page/login?app_id=2&query_scope=all&redirect_uri=https%3A%2F%2Fmy.feishu.cn%2Fwiki%2FPi3ZwnUUziWu3NkDi0acXrnInRg%3Flogin_redirect_times%3D1&with_guest=1",
@@ -389,86 +340,77 @@ class TestFetchUrlRedirectHandling:
             "https://my.feishu.cn/wiki/Pi3ZwnUUziWu3NkDi0acXrnInRg?login_redirect_times=1",
             start_url,
         ]
+        requested_urls: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested_urls.append(str(request.url))
+            if len(requested_urls) <= len(redirects):
+                return _redirect(redirects[len(requested_urls) - 1])
+            return httpx.Response(
+                200, headers={"Content-Type": "text/html; charset=utf-8"}, content=b"<html><body>ok</body></html>"
+            )
 
-        class MockOpener:
-            def __init__(self) -> None:
-                self.calls = 0
-                self.requested_urls: list[str] = []
-
-            def open(self, req: urllib.request.Request, timeout: int = 30) -> MockResponse:
-                del timeout
-                self.calls += 1
-                url = req.full_url
-                self.requested_urls.append(url)
-
-                if self.calls <= len(redirects):
-                    raise urllib.error.HTTPError(
-                        url=url,
-                        code=302,
-                        msg="Found",
-                        hdrs=cast(Any, {"Location": redirects[self.calls - 1]}),
-                        fp=None,
-                    )
-
-                return MockResponse(
-                    status=200,
-                    headers={"Content-Type": "text/html; charset=utf-8"},
-                    data=b"<html><body>ok</body></html>",
-                )
-
-        mock_opener = MockOpener()
-
-        with (
-            patch("klaude_code.tool.web.web_fetch_tool.urllib.request.build_opener", return_value=mock_opener),
-            patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None),
-        ):
-            content_type, data, charset = _fetch_url(start_url)
+        with patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None):
+            content_type, data, charset, *_ = asyncio.run(_fetch_url(start_url, client=_mock_client(handler)))
 
         assert content_type == "text/html"
         assert charset == "utf-8"
         assert data == b"<html><body>ok</body></html>"
-
-        assert mock_opener.requested_urls == [
-            start_url,
-            redirects[0],
-            redirects[1],
-            redirects[2],
-            redirects[3],
-            redirects[4],
-        ]
+        assert requested_urls == [start_url, *redirects]
 
         # Ensure redirect_uri query was not double-encoded while hopping across login endpoints.
         assert "%253A" not in redirects[0]
-        assert "%253A" not in mock_opener.requested_urls[1]
+        assert "%253A" not in requested_urls[1]
+
+
+class TestFetchUrlBody:
+    def test_gzip_response_is_decoded(self) -> None:
+        html_content = b"<html><body><p>gzip content</p></body></html>"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            del request
+            return httpx.Response(
+                200,
+                headers={"Content-Type": "text/html; charset=utf-8", "Content-Encoding": "gzip"},
+                content=gzip_module.compress(html_content),
+            )
+
+        with patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None):
+            result = asyncio.run(_fetch_url("https://example.com/page", client=_mock_client(handler)))
+
+        assert result.data == html_content
+        assert result.charset == "utf-8"
 
+    def test_body_read_stops_at_the_byte_budget(self) -> None:
+        chunks_sent = 0
 
-class TestDecompress:
-    """Test gzip/deflate decompression."""
+        async def body() -> AsyncIterator[bytes]:
+            nonlocal chunks_sent
+            for _ in range(1000):
+                chunks_sent += 1
+                yield b"x" * 1024
 
-    def test_decompress_gzip(self) -> None:
-        original = b"Hello, compressed world!"
-        compressed = gzip_module.compress(original)
-        assert _decompress(compressed, "gzip") == original
+        def handler(request: httpx.Request) -> httpx.Response:
+            del request
+            return httpx.Response(200, headers={"Content-Type": "text/plain"}, content=body())
 
-    def test_decompress_gzip_case_insensitive(self) -> None:
-        original = b"case insensitive"
-        compressed = gzip_module.compress(original)
-        assert _decompress(compressed, "GZIP") == original
+        with patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None):
+            result = asyncio.run(_fetch_url("https://example.com/huge", max_bytes=10_000, client=_mock_client(handler)))
 
-    def test_decompress_identity(self) -> None:
-        data = b"plain bytes"
-        assert _decompress(data, "") == data
-        assert _decompress(data, "identity") == data
+        assert len(result.data) == 10_000
+        assert chunks_sent < 20
 
-    def test_decompress_gzip_truncated_returns_raw(self) -> None:
-        # Truncated gzip should return raw data rather than raise
-        truncated = gzip_module.compress(b"full content")[:10]
-        result = _decompress(truncated, "gzip")
-        assert isinstance(result, bytes)
+    def test_error_status_raises(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            del request
+            return httpx.Response(404)
 
-    def test_decompress_unknown_encoding_returns_raw(self) -> None:
-        data = b"some data"
-        assert _decompress(data, "br") == data
+        with (
+            patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None),
+            pytest.raises(httpx.HTTPStatusError) as exc_info,
+        ):
+            asyncio.run(_fetch_url("https://example.com/missing", client=_mock_client(handler)))
+        assert exc_info.value.response.status_code == 404
 
 
 class TestStripNoiseElements:
@@ -498,99 +440,79 @@ class TestStripNoiseElements:
         assert "article" in result
 
 
-class TestFetchUrlWithRetry:
-    """Test retry behaviour on transient errors."""
-
-    def _make_mock_response(self, status: int, content_type: str, data: bytes) -> object:
-        class MockResponse:
-            def __init__(self) -> None:
-                self.status = status
-                self._data = data
-
-            def getheader(self, name: str, default: str = "") -> str:
-                if name == "Content-Type":
-                    return content_type
-                return default
-
-            def read(self, _size: int = -1) -> bytes:
-                return self._data
+def _status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://x.com/")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(code, request=request))
 
-            def close(self) -> None:
-                pass
 
-        return MockResponse()
+class TestFetchUrlWithRetry:
+    """Test retry behaviour on transient errors."""
 
     def test_retry_on_500_then_success(self) -> None:
         call_count = 0
 
-        def fake_fetch(*_args: object, **_kwargs: object) -> tuple[str, bytes, str | None]:
+        def fake_fetch(*_args: object, **_kwargs: object) -> _FetchResult:
             nonlocal call_count
             call_count += 1
             if call_count == 1:
-                raise urllib.error.HTTPError(
-                    url="https://x.com/", code=500, msg="Internal Server Error", hdrs=cast(Any, {}), fp=None
-                )
-            return ("text/plain", b"ok", "utf-8")
+                raise _status_error(500)
+            return _FetchResult("text/plain", b"ok", "utf-8")
 
         with (
             patch("klaude_code.tool.web.web_fetch_tool._fetch_url", side_effect=fake_fetch),
-            patch("klaude_code.tool.web.web_fetch_tool.time.sleep"),
+            patch("klaude_code.tool.web.web_fetch_tool._RETRY_BACKOFF_SEC", 0),
         ):
-            _content_type, data, _charset = _fetch_url_with_retry("https://x.com/")
+            result = asyncio.run(_fetch_url_with_retry("https://x.com/"))
 
         assert call_count == 2
-        assert data == b"ok"
+        assert result.data == b"ok"
 
     def test_no_retry_on_404(self) -> None:
         call_count = 0
 
-        def fake_fetch(*_args: object, **_kwargs: object) -> tuple[str, bytes, str | None]:
+        def fake_fetch(*_args: object, **_kwargs: object) -> _FetchResult:
             nonlocal call_count
             call_count += 1
-            raise urllib.error.HTTPError(url="https://x.com/", code=404, msg="Not Found", hdrs=cast(Any, {}), fp=None)
+            raise _status_error(404)
 
-        with patch("klaude_code.tool.web.web_fetch_tool._fetch_url", side_effect=fake_fetch):
-            try:
-                _fetch_url_with_retry("https://x.com/")
-                raise AssertionError("Expected HTTPError")
-            except urllib.error.HTTPError as e:
-                assert e.code == 404
+        with (
+            patch("klaude_code.tool.web.web_fetch_tool._fetch_url", side_effect=fake_fetch),
+            pytest.raises(httpx.HTTPStatusError) as exc_info,
+        ):
+            asyncio.run(_fetch_url_with_retry("https://x.com/"))
+        assert exc_info.value.response.status_code == 404
         assert call_count == 1
 
     def test_retry_on_timeout_then_success(self) -> None:
         call_count = 0
 
-        def fake_fetch(*_args: object, **_kwargs: object) -> tuple[str, bytes, str | None]:
+        def fake_fetch(*_args: object, **_kwargs: object) -> _FetchResult:
             nonlocal call_count
             call_count += 1
             if call_count == 1:
-                raise TimeoutError("timed out")
-            return ("text/plain", b"ok", None)
+                raise httpx.ReadTimeout("timed out")
+            return _FetchResult("text/plain", b"ok", None)
 
         with (
             patch("klaude_code.tool.web.web_fetch_tool._fetch_url", side_effect=fake_fetch),
-            patch("klaude_code.tool.web.web_fetch_tool.time.sleep"),
+            patch("klaude_code.tool.web.web_fetch_tool._RETRY_BACKOFF_SEC", 0),
         ):
-            _content_type, data, _charset = _fetch_url_with_retry("https://x.com/")
+            result = asyncio.run(_fetch_url_with_retry("https://x.com/"))
 
         assert call_count == 2
-        assert data == b"ok"
+        assert result.data == b"ok"
 
     def test_retry_exhausted_raises_last_exception(self) -> None:
-        def fake_fetch(*_args: object, **_kwargs: object) -> tuple[str, bytes, str | None]:
-            raise urllib.error.HTTPError(
-                url="https://x.com/", code=503, msg="Service Unavailable", hdrs=cast(Any, {}), fp=None
-            )
+        def fake_fetch(*_args: object, **_kwargs: object) -> _FetchResult:
+            raise _status_error(503)
 
         with (
             patch("klaude_code.tool.web.web_fetch_tool._fetch_url", side_effect=fake_fetch),
-            patch("klaude_code.tool.web.web_fetch_tool.time.sleep"),
+            patch("klaude_code.tool.web.web_fetch_tool._RETRY_BACKOFF_SEC", 0),
+            pytest.raises(httpx.HTTPStatusError) as exc_info,
         ):
-            try:
-                _fetch_url_with_retry("https://x.com/")
-                raise AssertionError("Expected HTTPError")
-            except urllib.error.HTTPError as e:
-                assert e.code == 503
+            asyncio.run(_fetch_url_with_retry("https://x.com/"))
+        assert exc_info.value.response.status_code == 503
 
     def test_retry_status_codes_include_common_server_errors(self) -> None:
         assert 500 in _RETRY_HTTP_STATUS_CODES
@@ -599,42 +521,3 @@ class TestFetchUrlWithRetry:
         assert 504 in _RETRY_HTTP_STATUS_CODES
         assert 404 not in _RETRY_HTTP_STATUS_CODES
         assert 429 not in _RETRY_HTTP_STATUS_CODES
-
-
-class TestGzipFetchIntegration:
-    """Test that gzip-compressed responses are correctly decoded end-to-end."""
-
-    def test_fetch_url_decompresses_gzip_response(self) -> None:
-        html_content = b"<html><body><p>gzip content</p></body></html>"
-        compressed = gzip_module.compress(html_content)
-
-        class MockResponse:
-            status = 200
-            _data = compressed
-
-            def getheader(self, name: str, default: str = "") -> str:
-                if name == "Content-Type":
-                    return "text/html; charset=utf-8"
-                if name == "Content-Encoding":
-                    return "gzip"
-                return default
-
-            def read(self, _size: int = -1) -> bytes:
-                return self._data
-
-            def close(self) -> None:
-                pass
-
-        class MockOpener:
-            def open(self, req: object, timeout: int = 30) -> MockResponse:
-                del req, timeout
-                return MockResponse()
-
-        with (
-            patch("klaude_code.tool.web.web_fetch_tool.urllib.request.build_opener", return_value=MockOpener()),
-            patch("klaude_code.tool.web.web_fetch_tool.check_ssrf", return_value=None),
-        ):
-            _content_type, data, charset = _fetch_url("https://example.com/page")
-
-        assert data == html_content
-        assert charset == "utf-8"
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from klaude_code.config.config import Config, WebSearchConfig, WebSearchProviderConfig
+from klaude_code.protocol import message
+from klaude_code.tool import WebSearchTool
+from klaude_code.tool.core.context import TodoContext, ToolContext
+from klaude_code.tool.web import web_search_tool
+from klaude_code.tool.web.search_hedge import AllProvidersFailedError, SearchProviderStatsRegistry, hedged_call
+from klaude_code.tool.web.web_cache import _cache as web_cache  # pyright: ignore[reportPrivateUsage]
+from klaude_code.tool.web.web_search_tool import SearchOutcome, SearchResult, search_provider_stats
+
+
+class _FakeProviders:
+    """Local stand-ins for search providers with scripted latency and failures."""
+
+    def __init__(self, latency_s: dict[str, float], failing: frozenset[str] = frozenset()) -> None:
+        self.latency_s = latency_s
+        self.failing = failing
+        self.started: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def __call__(self, name: str) -> str:
+        self.started.append(name)
+        try:
+            await asyncio.sleep(self.latency_s[name])
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        if name in self.failing:
+            raise RuntimeError(f"{name} rate limited")
+        return f"results from {name}"
+
+
+def _hedged(
+    providers: _FakeProviders, stats: SearchProviderStatsRegistry, names: tuple[str, ...] = ("exa", "brave")
+) -> tuple[str, str]:
+    return asyncio.run(hedged_call(names, providers, stats))
+
+
+def test_fast_primary_is_not_hedged() -> None:
+    providers = _FakeProviders({"exa": 0.01, "brave": 0.01})
+    stats = SearchProviderStatsRegistry(default_delay_s=1.0)
+
+    assert _hedged(providers, stats) == ("exa", "results from exa")
+    assert providers.started == ["exa"]
+    assert stats.get("exa").latency_ewma_s is not None
+
+
+def test_slow_primary_is_hedged_and_the_first_answer_wins() -> None:
+    providers = _FakeProviders({"exa": 5.0, "brave": 0.01})
+    stats = SearchProviderStatsRegistry(default_delay_s=0.05)
+
+    started = time.perf_counter()
+    assert _hedged(providers, stats) == ("brave", "results from brave")
+
+    assert time.perf_counter() - started < 1.0
+    assert providers.cancelled == ["exa"]
+    assert stats.get("exa").in_flight == 0
+    assert stats.get("brave").hedges == 1
+    assert stats.get("brave").hedge_wins == 1
+    # The abandoned primary is charged at least the time it was given.
+    assert (stats.get("exa").latency_ewma_s or 0) >= 0.05
+
+
+def test_failing_primary_falls_back_without_waiting_for_the_hedge_delay() -> None:
+    providers = _FakeProviders({"exa": 0.01, "brave": 0.01}, failing=frozenset({"exa"}))
+    stats = SearchProviderStatsRegistry(default_delay_s=5.0)
+
+    started = time.perf_counter()
+    assert _hedged(providers, stats) == ("brave", "results from brave")
+
+    assert time.perf_counter() - started < 1.0
+    assert stats.get("exa").errors == 1
+    assert stats.get("brave").hedges == 0
+
+
+def test_failure_during_a_hedge_starts_the_next_provider_immediately() -> None:
+    providers = _FakeProviders({"exa": 0.2, "brave": 5.0, "tavily": 0.01}, failing=frozenset({"exa"}))
+    stats = SearchProviderStatsRegistry(default_delay_s=0.05)
+    # exa is hedged after 0.05s; brave, the hedge, would only be hedged itself after 2s.
+    for _ in range(5):
+        stats.record_success("exa", 0.05)
+        stats.record_success("brave", 2.0)
+        stats.record_success("tavily", 3.0)
+
+    started = time.perf_counter()
+    assert _hedged(providers, stats, ("exa", "brave", "tavily")) == ("tavily", "results from tavily")
+
+    assert time.perf_counter() - started < 1.0
+    assert providers.started == ["exa", "brave", "tavily"]
+    assert providers.cancelled == ["brave"]
+    assert stats.get("tavily").hedges == 0
+
+
+def test_every_provider_failing_reports_all_errors() -> None:
+    providers = _FakeProviders({"exa": 0.01, "brave": 0.01}, failing=frozenset({"exa", "brave"}))
+
+    with pytest.raises(AllProvidersFailedError) as exc_info:
+        _hedged(providers, SearchProviderStatsRegistry(default_delay_s=0.05))
+
+    assert exc_info.value.errors == ["exa: exa rate limited", "brave: brave rate limited"]
+
+
+def test_primary_is_chosen_from_latency_and_error_history() -> None:
+    stats = SearchProviderStatsRegistry(default_delay_s=1.0)
+    assert stats.rank(["exa", "brave"]) == ["exa", "brave"]  # no history: configured order
+
+    for _ in range(5):
+        stats.record_success("exa", 0.8)
+        stats.record_success("brave", 0.3)
+    assert stats.rank(["exa", "brave"]) == ["brave", "exa"]
+
+    for _ in range(5):
+        stats.record_failure("brave", 0.01)
+    assert stats.rank(["exa", "brave"]) == ["exa", "brave"]
+
+
+def test_hedge_delay_follows_the_latency_percentile() -> None:
+    stats = SearchProviderStatsRegistry(percentile=90, default_delay_s=3.0)
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        stats.record_success("exa", latency)
+    assert stats.hedge_delay("exa") == 3.0  # too few samples yet
+
+    for latency in (0.5, 0.6, 0.7, 0.8, 0.9, 1.0):
+        stats.record_success("exa", latency)
+    assert stats.hedge_delay("exa") == pytest.approx(0.9)
+
+
+@pytest.fixture
+def hedged_search(isolated_home: Path) -> Iterator[SearchProviderStatsRegistry]:
+    del isolated_home
+    web_cache.clear()
+    stats = SearchProviderStatsRegistry(default_delay_s=0.05)
+    with (
+        patch.object(web_search_tool, "_provider_stats", stats),
+        patch.dict(os.environ, {"EXA_API_KEY": "exa-key", "BRAVE_API_KEY": "brave-key"}),
+        patch("klaude_code.config.config.get_auth_env", return_value=None),
+    ):
+        yield stats
+    web_cache.clear()
+
+
+def _search(config: Config) -> message.ToolResultMessage:
+    todo_context = TodoContext(get_todos=lambda: [], set_todos=lambda todos: None)
+    context = ToolContext(file_tracker={}, todo_context=todo_context, session_id="test", work_dir=Path("/tmp"))
+    with patch("klaude_code.tool.web.web_search_tool.load_config", return_value=config):
+        args = WebSearchTool.WebSearchArguments(query="hedged query").model_dump_json()
+        return asyncio.run(WebSearchTool.call(args, context))
+
+
+def _outcome(name: str) -> SearchOutcome:
+    return SearchOutcome(
+        results=[SearchResult(title=f"{name} hit", url=f"https://{name}.example", snippet="", position=1)]
+    )
+
+
+def _config(*, hedge: bool) -> Config:
+    return Config(
+        web_search=WebSearchConfig(
+            providers=[
+                WebSearchProviderConfig(provider="exa", api_key="${EXA_API_KEY}"),
+                WebSearchProviderConfig(provider="brave", api_key="${BRAVE_API_KEY}"),
+            ],
+            hedge=hedge,
+        )
+    )
+
+
+def _slow_exa(_query: str, _max_results: int, _api_key: str) -> SearchOutcome:
+    time.sleep(0.3)
+    return _outcome("exa")
+
+
+def _fast_brave(_query: str, _max_results: int, _api_key: str) -> SearchOutcome:
+    return _outcome("brave")
+
+
+def test_hedged_tool_returns_the_faster_provider(hedged_search: SearchProviderStatsRegistry) -> None:
+    with (
+        patch.object(web_search_tool, "_search_exa", side_effect=_slow_exa),
+        patch.object(web_search_tool, "_search_brave", side_effect=_fast_brave),
+    ):
+        result = _search(_config(hedge=True))
+
+    assert result.status == "success"
+    assert result.output_text is not None and "brave hit" in result.output_text
+    stats = search_provider_stats()
+    assert stats["brave"].hedge_wins == 1
+    assert stats["exa"].calls == 1
+
+
+def test_abandoned_thread_call_stays_in_flight_until_its_request_ends(
+    hedged_search: SearchProviderStatsRegistry,
+) -> None:
+    todo_context = TodoContext(get_todos=lambda: [], set_todos=lambda todos: None)
+    context = ToolContext(file_tracker={}, todo_context=todo_context, session_id="test", work_dir=Path("/tmp"))
+    args = WebSearchTool.WebSearchArguments(query="abandoned query").model_dump_json()
+
+    async def _go() -> None:
+        result = await WebSearchTool.call(args, context)
+        assert result.output_text is not None and "brave hit" in result.output_text
+        # The cancelled exa request keeps running in its worker thread.
+        exa = hedged_search.get("exa")
+        assert (exa.in_flight, exa.calls) == (1, 0)
+        await asyncio.sleep(0.5)
+        assert (exa.in_flight, exa.calls) == (0, 1)
+        assert (exa.latency_ewma_s or 0) >= 0.3
+        assert hedged_search.get("brave").in_flight == 0
+
+    with (
+        patch("klaude_code.tool.web.web_search_tool.load_config", return_value=_config(hedge=True)),
+        patch.object(web_search_tool, "_search_exa", side_effect=_slow_exa),
+        patch.object(web_search_tool, "_search_brave", side_effect=_fast_brave),
+    ):
+        asyncio.run(_go())
+
+
+def test_sequential_mode_waits_for_the_first_provider_and_records_stats(
+    hedged_search: SearchProviderStatsRegistry,
+) -> None:
+    with (
+        patch.object(web_search_tool, "_search_exa", side_effect=_slow_exa),
+        patch.object(web_search_tool, "_search_brave", side_effect=_fast_brave),
+    ):
+        result = _search(_config(hedge=False))
+
+    assert result.output_text is not None and "exa hit" in result.output_text
+    stats = search_provider_stats()
+    assert set(stats) == {"exa"}
+    assert (stats["exa"].latency_ewma_s or 0) >= 0.3
+
+
+@pytest.mark.benchmark
+def test_benchmark_hedging_against_a_slow_tail() -> None:
+    # The primary answers in 20ms, except every fifth call which stalls for 1s.
+    calls = 0
+
+    async def _provider(name: str) -> str:
+        nonlocal calls
+        if name == "exa":
+            calls += 1
+            await asyncio.sleep(1.0 if calls % 5 == 0 else 0.02)
+        else:
+            await asyncio.sleep(0.05)
+        return name
+
+    async def _run(hedge: bool) -> list[float]:
+        nonlocal calls
+        calls = 0
+        stats = SearchProviderStatsRegistry(percentile=90, default_delay_s=0.2)
+        latencies: list[float] = []
+        for _ in range(20):
+            started = time.perf_counter()
+            if hedge:
+                await hedged_call(["exa", "brave"], _provider, stats)
+            else:
+                await _provider("exa")
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    sequential = sorted(asyncio.run(_run(hedge=False)))
+    hedged = sorted(asyncio.run(_run(hedge=True)))
+    print(
+        f"\n20 searches, 1-in-5 primary stalls: sequential p95 {sequential[18] * 1000:.0f}ms "
+        f"total {sum(sequential):.2f}s; hedged p95 {hedged[18] * 1000:.0f}ms total {sum(hedged):.2f}s"
+    )
+    assert sum(hedged) < sum(sequential)
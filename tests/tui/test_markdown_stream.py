@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import io
 import re
+import time
 from pathlib import Path
 from typing import Any, cast
 
@@ -14,6 +15,7 @@ from rich.theme import Theme
 from klaude_code.tui.components.rich.markdown import MarkdownStream
 
 _ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+_HYPERLINK_RE = re.compile(r"\x1b\]8;[^\x1b]*\x1b\\")
 
 
 def _make_stream(*, width: int = 80, scrollback_write_sink: Any = None) -> MarkdownStream:
@@ -609,3 +611,94 @@ def test_effective_min_delay_scales_with_buffer_size() -> None:
 
     # ...and is capped so very long messages still repaint at least once per second.
     assert stream._effective_min_delay(MARKDOWN_STREAM_ADAPTIVE_DELAY_CHARS * 10_000) == MARKDOWN_STREAM_MAX_DELAY_S
+
+
+_MIXED_DOCUMENT = (
+    "# Plan\n\n"
+    "Intro paragraph with **bold** text, `code` spans and a [link](https://example.com).\n\n"
+    "1. first step\n2. second step\n\n"
+    "- bullet one\n- bullet two\n  - nested\n\n"
+    "```python\nprint('hello')\n\nprint('world')\n```\n\n"
+    "| a | b |\n| - | - |\n| 1 | 2 |\n\n"
+    "## Details\n\n"
+    "> quoted line\n\n"
+    "Closing paragraph.\n"
+)
+
+
+def _tokens(text: str, size: int = 3) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _plain_output(text_chunks: list[str], *, width: int = 80) -> str:
+    out = io.StringIO()
+    console = Console(file=out, force_terminal=True, width=width)
+    stream = MarkdownStream(console=console, left_margin=2, mark=">", live_sink=lambda _: None)
+    buffer = ""
+    for chunk in text_chunks[:-1]:
+        buffer += chunk
+        stream.min_delay = 0
+        stream.update(buffer)
+    stream.update(buffer + text_chunks[-1], final=True)
+    return _HYPERLINK_RE.sub("", _ANSI_ESCAPE_RE.sub("", out.getvalue()))
+
+
+def test_token_by_token_stream_matches_direct_render() -> None:
+    assert _plain_output(_tokens(_MIXED_DOCUMENT)) == _plain_output([_MIXED_DOCUMENT])
+
+
+def test_update_parses_only_text_after_checkpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    stream = _make_stream()
+    parsed: list[str] = []
+    original_parse = stream._parser.parse
+
+    def _recording_parse(src: str, env: Any = None) -> Any:
+        parsed.append(src)
+        return original_parse(src, env)
+
+    monkeypatch.setattr(stream._parser, "parse", _recording_parse)
+    text = "".join(f"Paragraph {index}.\n\n" for index in range(20))
+    stream.min_delay = 0
+    stream.update(text)
+    parsed.clear()
+
+    stream.min_delay = 0
+    stream.update(text + "Tail")
+
+    assert stream._checkpoint_source  # pyright: ignore[reportPrivateUsage]
+    assert parsed
+    assert all(len(src) < len(text) // 2 for src in parsed)
+
+
+@pytest.mark.benchmark
+def test_benchmark_token_by_token_stream(monkeypatch: pytest.MonkeyPatch) -> None:
+    section = (
+        "## Section\n\nSome *emphasis* and a [link](https://example.com) in a paragraph of text.\n\n"
+        "- item one\n- item two\n\n```python\nx = 1\n```\n\n"
+    )
+    document = section * (100_000 // len(section))
+    chunks = _tokens(document, size=4)
+
+    def _run(incremental: bool) -> float:
+        stream = _make_stream()
+        if not incremental:
+            # Previous behaviour: every frame parses and renders the whole buffer.
+            monkeypatch.setattr(stream, "_advance_checkpoint", lambda *args, **kwargs: None)
+        buffer: list[str] = []
+        started = time.perf_counter()
+        # Frames arrive at the throttled cadence, not on every token.
+        for index, chunk in enumerate(chunks):
+            buffer.append(chunk)
+            if index % 2000 == 0:
+                # `update` adapts its own throttle to render cost; the sampling above stands in for it.
+                stream.min_delay = 0
+                stream.update("".join(buffer))
+        stream.update("".join(buffer), final=True)
+        return time.perf_counter() - started
+
+    full = _run(incremental=False)
+    incremental = _run(incremental=True)
+    print(
+        f"\n{len(document)} chars in {len(chunks)} tokens: full re-render {full:.2f}s, incremental {incremental:.2f}s"
+    )
+    assert incremental < full
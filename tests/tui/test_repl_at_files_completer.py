@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import random
+import threading
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
 
@@ -7,8 +10,11 @@ import pytest
 from prompt_toolkit.document import Document
 
 from klaude_code.tui.input.completers import (  # pyright: ignore[reportPrivateUsage]
+    _add_ranked_path,
     _AtFilesCompleter,
     _CmdResult,
+    _PathIndex,
+    _RankedPath,
     path_matches_query,
 )
 
@@ -463,3 +469,108 @@ def test_git_paths_for_keyword_decodes_git_quoted_cjk_paths(
     assert not truncated
     assert "cases/wechat-longform/case-1-农行/source.txt" in candidates
     assert "cases/wechat-longform/case-3-高原/source.txt" in candidates
+
+
+def _linear_rank(paths: list[str], query: str, limit: int) -> list[str]:
+    ranked: list[_RankedPath] = []
+    for path in paths:
+        _add_ranked_path(ranked, path, query, limit=limit)
+    return [path for _, _, path in ranked]
+
+
+def _synthetic_paths(count: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    """Build a repository-shaped tree: a few thousand directories holding many files."""
+    rng = random.Random(seed)
+    syllables = ["com", "po", "nent", "tool", "block", "fu", "zzy", "ser", "ver", "ap", "i", "te", "st", "core", "ui"]
+    words = sorted({"".join(rng.sample(syllables, rng.randint(1, 3))) for _ in range(400)})
+    extensions = [".py", ".ts", ".tsx", ".rs", ".md", ".json"]
+    directories = [""]
+    while len(directories) < max(count // 20, 1):
+        parent = rng.choice(directories)
+        if parent.count("/") < 6:
+            directories.append(f"{parent}{rng.choice([*words, '.github', 'tests'])}/")
+    files = {
+        f"{rng.choice(directories)}{rng.choice(['', 'test_', '_'])}{rng.choice(words)}{rng.choice(extensions)}"
+        for _ in range(count)
+    }
+    return sorted(set(directories) - {""}), sorted(files)
+
+
+def test_path_index_matches_linear_ranking_while_typing_and_deleting(tmp_path: Path) -> None:
+    directories, files = _synthetic_paths(3000)
+    index = _PathIndex(tmp_path, directories, files, stamp=None)
+
+    typed = ["t", "to", "too", "tool", "toolb", "tool", "to", "tb", "tbx", "s", "sf", "sfz", "./", "test", "zzz"]
+    for query in typed:
+        ranked, _truncated = index.rank(query, limit=15)
+        assert ranked == _linear_rank(directories + files, query, 15), query
+
+
+def test_stale_path_index_refreshes_in_background(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    git_index = tmp_path / ".git" / "index"
+    git_index.parent.mkdir()
+    git_index.write_bytes(b"v1")
+    completer = _AtFilesCompleter()  # pyright: ignore[reportPrivateUsage]
+    monkeypatch.setattr(completer, "_get_git_repo_root", lambda _cwd: tmp_path)  # pyright: ignore[reportUnknownArgumentType,reportUnknownLambdaType]
+
+    git_lines = ["src/old_module.py"]
+    listing_threads: list[threading.Thread] = []
+    release = threading.Event()
+
+    def fake_run_cmd(cmd: list[str], cwd: Path | None = None, *, timeout_sec: float) -> _CmdResult:
+        del cwd, timeout_sec
+        listing_threads.append(threading.current_thread())
+        if listing_threads[-1] is not threading.main_thread():
+            assert release.wait(5)
+        return _CmdResult(True, [] if "--recurse-submodules" in cmd else list(git_lines))
+
+    monkeypatch.setattr(completer, "_run_cmd", fake_run_cmd)
+
+    assert completer._git_paths_for_keyword(tmp_path, "module", max_results=5)[0] == ["src/old_module.py"]  # pyright: ignore[reportPrivateUsage]
+    assert listing_threads == [threading.main_thread()] * 2
+
+    git_lines = ["src/old_module.py", "src/new_module.py"]
+    git_index.write_bytes(b"v2-longer")
+
+    # The keystroke is answered from the previous index while git runs elsewhere.
+    started = time.perf_counter()
+    assert completer._git_paths_for_keyword(tmp_path, "module", max_results=5)[0] == ["src/old_module.py"]  # pyright: ignore[reportPrivateUsage]
+    assert time.perf_counter() - started < 1
+    release.set()
+    refresh = completer._path_index_refresh  # pyright: ignore[reportPrivateUsage]
+    assert refresh is not None
+    refresh.join(5)
+
+    assert threading.main_thread() not in listing_threads[2:]
+    candidates, _ = completer._git_paths_for_keyword(tmp_path, "module", max_results=5)  # pyright: ignore[reportPrivateUsage]
+    assert candidates == ["src/new_module.py", "src/old_module.py"]
+    assert len(listing_threads) == 4
+
+
+@pytest.mark.benchmark
+def test_benchmark_incremental_path_index_keystrokes(tmp_path: Path) -> None:
+    directories, files = _synthetic_paths(300_000, seed=1)
+    paths = directories + files
+    keystrokes = ["c", "co", "com", "comp", "compo", "compon", "tbl", "tblo"]
+
+    # Previous behaviour: every keystroke scores the whole listing.
+    started = time.perf_counter()
+    expected = _linear_rank(paths, keystrokes[-1], 60)
+    linear = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = _PathIndex(tmp_path, directories, files, stamp=None)
+    build = time.perf_counter() - started
+    timings: list[float] = []
+    ranked: list[str] = []
+    for query in keystrokes:
+        started = time.perf_counter()
+        ranked, _ = index.rank(query, limit=60)
+        timings.append(time.perf_counter() - started)
+
+    print(
+        f"\n{len(paths)} paths: linear {linear * 1000:.0f}ms/keystroke, index build {build * 1000:.0f}ms, "
+        f"indexed first {timings[0] * 1000:.0f}ms, later max {max(timings[1:]) * 1000:.0f}ms"
+    )
+    assert ranked == expected
+    assert max(timings) < linear
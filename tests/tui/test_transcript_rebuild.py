@@ -11,11 +11,15 @@ Covers the three pillars of the running Ctrl+O toggle:
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Any
 
+import pytest
+
 from klaude_code.control.event_tape import EventTape, apply_retractions
 from klaude_code.protocol import events, llm_param
 from klaude_code.protocol.models import SubAgentState
+from klaude_code.tui import display as display_module
 from klaude_code.tui.display import TUIDisplay
 from klaude_code.tui.machine import DisplayStateMachine
 from klaude_code.tui.transcript_detail import Detail, TranscriptDetail
@@ -355,3 +359,114 @@ def test_retraction_repaints_without_the_withdrawn_turn(monkeypatch: Any) -> Non
         assert "retract me" not in writes[-1][0]
 
     asyncio.run(_test())
+
+
+# ---------------------------------------------------------------------------
+# Viewport-bounded rebuilds and the per-width output cache
+# ---------------------------------------------------------------------------
+
+
+async def _play_turns(display: TUIDisplay, sid: str, turns: range) -> None:
+    """Feed finished turns the way a reattach does, as one history replay."""
+    history: list[events.ReplayEventUnion] = []
+    for index in turns:
+        history += [
+            events.UserMessageEvent(session_id=sid, content=f"question {index}"),
+            events.TaskStartEvent(session_id=sid, model_id="test-model"),
+            events.AssistantTextStartEvent(session_id=sid),
+            events.AssistantTextDeltaEvent(session_id=sid, content=f"Answer {index}.\n\n- point a\n- point b\n"),
+            events.AssistantTextEndEvent(session_id=sid),
+            events.TaskFinishEvent(session_id=sid, task_result="done"),
+        ]
+    await display.consume_envelope(
+        make_envelope(events.ReplayHistoryEvent(session_id=sid, updated_at=0.0, events=history))
+    )
+
+
+def test_bounded_refresh_paints_only_the_newest_turns(monkeypatch: Any) -> None:
+    monkeypatch.setattr(display_module, "TRANSCRIPT_REBUILD_SCREENS", 1)
+
+    async def _test() -> None:
+        writes = patch_scrollback_writes(monkeypatch)
+        display = TUIDisplay()
+        await display.consume_envelope(make_envelope(_welcome("s1")))
+        await _play_turns(display, "s1", range(40))
+
+        await display.consume_envelope(make_envelope(events.RefreshDisplayEvent(session_id="s1")))
+        bounded, _ = writes[-1]
+        await display.consume_envelope(make_envelope(events.RefreshDisplayEvent(session_id="s1", full_history=True)))
+        full, _ = writes[-1]
+
+        assert "question 39" in bounded
+        assert "question 0 " not in bounded
+        assert "earlier turns not shown" in bounded
+        assert "question 0 " in full
+        assert "not shown" not in full
+        # The painted turns render exactly as they do in the full transcript.
+        first_painted = bounded.index("❯")
+        assert full.endswith(bounded[first_painted:])
+
+    asyncio.run(_test())
+
+
+def test_rebuild_output_cache_matches_a_fresh_render(monkeypatch: Any) -> None:
+    async def _test() -> None:
+        writes = patch_scrollback_writes(monkeypatch)
+        display = TUIDisplay()
+        await display.consume_envelope(make_envelope(_welcome("s1")))
+        await _play_turns(display, "s1", range(5))
+        refresh = events.RefreshDisplayEvent(session_id="s1", full_history=True)
+        await display.consume_envelope(make_envelope(refresh))
+
+        printed: list[object] = []
+        console = display._renderer.console  # pyright: ignore[reportPrivateUsage]
+        original_print = console.print
+
+        def _recording_print(*objects: Any, **kwargs: Any) -> None:
+            printed.append(objects)
+            original_print(*objects, **kwargs)
+
+        monkeypatch.setattr(console, "print", _recording_print)
+        await _play_turns(display, "s1", range(5, 6))
+        printed.clear()
+        await display.consume_envelope(make_envelope(refresh))
+        cached, _ = writes[-1]
+        # Only the new turn was rendered again; the rest came from the cache.
+        assert 0 < len(printed) < 10
+
+        fresh_display = TUIDisplay()
+        for item in display._tape.snapshot():  # pyright: ignore[reportPrivateUsage]
+            await fresh_display.consume_envelope(make_envelope(item))
+        await fresh_display.consume_envelope(make_envelope(refresh))
+        assert writes[-1][0] == cached
+
+    asyncio.run(_test())
+
+
+@pytest.mark.benchmark
+def test_benchmark_refresh_of_a_long_session(monkeypatch: Any) -> None:
+    patch_scrollback_writes(monkeypatch)
+
+    async def _refresh_time(display: TUIDisplay, *, full_history: bool) -> float:
+        started = time.perf_counter()
+        await display.consume_envelope(
+            make_envelope(events.RefreshDisplayEvent(session_id="s1", full_history=full_history))
+        )
+        return time.perf_counter() - started
+
+    async def _test() -> None:
+        display = TUIDisplay()
+        await display.consume_envelope(make_envelope(_welcome("s1")))
+        await _play_turns(display, "s1", range(1000))
+
+        full = await _refresh_time(display, full_history=True)
+        full_cached = await _refresh_time(display, full_history=True)
+        bounded = await _refresh_time(display, full_history=False)
+        print(
+            f"\n1000 turns: full repaint {full * 1000:.0f}ms, "
+            f"again from cache {full_cached * 1000:.0f}ms, viewport-bounded {bounded * 1000:.0f}ms"
+        )
+        assert bounded < full
+        assert full_cached < full
+
+    asyncio.run(_test())